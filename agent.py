@@ -29,37 +29,47 @@ Repository: https://github.com/jmenichole/TiltCheck
 """
 
 import os
+import time
+import asyncio
 import logging
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
-from uagents import Agent, Context, Model
+from datetime import timedelta
+from typing import List, Optional, Set, Tuple, Union
+from uagents import Agent, Context
 from uagents.setup import fund_agent_if_low
+from agent_models import (ChatMessage, TiltAlert, AlertSubscription, TiltScoreUpdate,
+                          RiskLeaderboardRequest, RiskLeaderboardResponse,
+                          ProfilingRequest, ProfilingResponse)
+from agent_logging import configure_logging
+from session_watcher import SessionFileWatcher
+from session_schema import DEFAULT_PLAYER_ID, REQUIRED_COLUMNS
+from session_store import SessionStoreWriter
+from inbound_pipeline import InboundPipeline
+from alert_delivery import AlertDispatcher, SubscriberRegistry
+from tilt_engine import BetEvent, TiltEngine, SessionFileTail
+from alert_records import AlertRecord, record_from_hit
+from tilt_alerts import build_rapid_spin_alert, build_balance_drop_alert
+from checkpoint import DetectorCheckpoint
+from ingest_dedup import EventDeduplicator, duplicate_key_columns
+from ipc_ingest import IngestServer
+from profiling_hooks import ProfilingHooks
+from alert_log import AlertLog, KIND_ALERT, KIND_ANALYSIS, alert_record
+from community_stats import CommunityStats
+from eval_scheduler import EvalScheduler
+from risk_leaderboard import RiskLeaderboard, SOURCE_ENGINE, SOURCE_TILT_SCORE, engine_risk, tilt_score_risk
 
 # Configure logging
-logging.basicConfig(
+# TILTCHECK_LOG_MODE=async moves log I/O off the event loop onto a listener
+# thread; TILTCHECK_LOG_FORMAT=json emits one structured line per record
+configure_logging(
+    mode=os.environ.get("TILTCHECK_LOG_MODE", "sync"),
+    fmt=os.environ.get("TILTCHECK_LOG_FORMAT", "text"),
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    sample_burst=int(os.environ.get("TILTCHECK_LOG_SAMPLE_BURST", "0"))
 )
 logger = logging.getLogger(__name__)
 
 
-# Define message models for ASI Chat Protocol
-class ChatMessage(Model):
-    """Chat message model for ASI Chat Protocol"""
-    message: str
-    timestamp: str
-    alert_type: str
-
-
-class TiltAlert(Model):
-    """Model for tilt alert information"""
-    alert_message: str
-    risk_level: str
-    timestamp: str
-    details: Dict[str, Any]
-
-
 # Initialize the TiltCheck Agent
 # Note: Use the seed phrase from AGENT_SEED_PHRASE environment variable for production
 agent_seed = os.environ.get("AGENT_SEED_PHRASE", "tiltcheck_secure_seed_phrase_2024")
@@ -82,16 +92,156 @@ except Exception as e:
 
 logger.info(f"TiltCheck Agent initialized with address: {tiltcheck_agent.address}")
 
+# Session data file watcher - evaluates within milliseconds of an append
+# instead of waiting for the next interval tick
+# TILTCHECK_WATCH_MODE: auto (inotify with polling fallback), inotify or poll
+SESSION_FILE = os.environ.get("TILTCHECK_SESSION_FILE", "session_data.csv")
+
+session_watcher = SessionFileWatcher(
+    SESSION_FILE,
+    debounce=float(os.environ.get("TILTCHECK_WATCH_DEBOUNCE", "0.05")),
+    mode=os.environ.get("TILTCHECK_WATCH_MODE", "auto")
+)
+
+# Incremental detection: only rows appended since the last check are read,
+# and only players with new bets are re-evaluated
+detection_engine = TiltEngine()
+session_tail = SessionFileTail(SESSION_FILE)
+# Players without new bets for this long lose their detection window
+IDLE_PLAYER_SECONDS = float(os.environ.get("TILTCHECK_IDLE_PLAYER_SECONDS", "3600"))
+
+# Drops re-delivered bet rows (feed retries) before they reach the engine
+ingest_dedup = EventDeduplicator(
+    window_seconds=float(os.environ.get("TILTCHECK_DEDUP_WINDOW", "900.0"))
+)
+
+# Live ranking of the players closest to tilt, updated as their windows change
+risk_leaderboard = RiskLeaderboard()
+
+# Risk-adaptive evaluation: players near a threshold are evaluated in the
+# same tick, quieter players are batched up to TILTCHECK_EVAL_MAX_INTERVAL
+eval_scheduler = EvalScheduler(
+    min_interval=float(os.environ.get("TILTCHECK_EVAL_MIN_INTERVAL", "1.0")),
+    max_interval=float(os.environ.get("TILTCHECK_EVAL_MAX_INTERVAL", "120.0"))
+)
+
+# Approximate community-wide numbers (distinct players, spins, top games)
+# in fixed memory per minute
+community_stats = CommunityStats(
+    retention_minutes=int(os.environ.get("TILTCHECK_STATS_MINUTES", "60"))
+)
+
+# On-demand diagnostics for live traffic: SIGUSR1 (or a ProfilingRequest from
+# an admin agent) profiles the next tilt check ticks, SIGUSR2 takes a memory
+# snapshot; reports go to TILTCHECK_PROFILE_DIR
+profiling_hooks = ProfilingHooks(os.environ.get("TILTCHECK_PROFILE_DIR", "profiles"))
+PROFILE_TICKS = int(os.environ.get("TILTCHECK_PROFILE_TICKS", "10"))
+ADMIN_AGENTS = {a.strip() for a in os.environ.get("TILTCHECK_ADMIN_AGENTS", "").split(",") if a.strip()}
+
+# Agents trusted to send tilt scores (the Solana scorer) and to read the
+# risk leaderboard (dashboards); messages from anyone else are ignored
+SCORER_AGENTS = {a.strip() for a in os.environ.get("TILTCHECK_SCORER_AGENTS", "").split(",") if a.strip()}
+DASHBOARD_AGENTS = {a.strip() for a in os.environ.get("TILTCHECK_DASHBOARD_AGENTS", "").split(",") if a.strip()}
+
+# Detector state checkpoint so restarts resume from the last file offset
+detector_checkpoint = DetectorCheckpoint(
+    os.environ.get("TILTCHECK_CHECKPOINT_FILE", "tiltcheck_checkpoint.json"),
+    interval=float(os.environ.get("TILTCHECK_CHECKPOINT_INTERVAL", "30.0"))
+)
+
+
+def detector_state() -> dict:
+    """Snapshot of everything needed to resume detection after a restart."""
+    return {
+        "session_file": os.path.abspath(SESSION_FILE),
+        "tail": session_tail.state(),
+        "engine": detection_engine.snapshot(),
+        "dedup": ingest_dedup.state()
+    }
+
+
+def restore_detector_state() -> bool:
+    """Restore the last checkpoint, if it belongs to the current session file."""
+    state = detector_checkpoint.load()
+    if not state or state.get("session_file") != os.path.abspath(SESSION_FILE):
+        return False
+    detection_engine.restore(state["engine"])
+    session_tail.restore(state["tail"])
+    ingest_dedup.restore(state.get("dedup", {}))
+    for player_id in detection_engine.players:
+        risk_leaderboard.update(player_id, SOURCE_ENGINE, engine_risk(detection_engine, player_id))
+    logger.info("Resumed detection for %d players at offset %d of %s",
+                len(detection_engine.players), session_tail.offset, SESSION_FILE)
+    return True
+
+
+restore_detector_state()
+
+# Optional shared memory session store - other processes on this host
+# (dashboard, Solana scorer) attach with session_store.SessionStoreReader
+# instead of loading their own copy of the session data. Snapshots are
+# reloaded and published off the event loop, at most once per interval
+shared_store_name = os.environ.get("TILTCHECK_SHARED_STORE")
+shared_store = None
+if shared_store_name:
+    shared_store = SessionStoreWriter(
+        shared_store_name,
+        interval=float(os.environ.get("TILTCHECK_SHARED_STORE_INTERVAL", "10.0"))
+    )
+    logger.info(f"Publishing session data to shared store: {shared_store_name}")
+
+# Optional durable alert log - every alert and tilt score update is written
+# to rotating JSONL segments under TILTCHECK_ALERT_LOG_DIR, indexed by player
+# and time (query with `python alert_log.py <dir> --player ...`). Batches
+# are written and fsynced by the log's writer thread, off the event loop.
+alert_log_dir = os.environ.get("TILTCHECK_ALERT_LOG_DIR")
+alert_log = AlertLog(
+    alert_log_dir,
+    segment_bytes=int(float(os.environ.get("TILTCHECK_ALERT_LOG_SEGMENT_MB", "64")) * 1024 * 1024),
+    segment_seconds=float(os.environ.get("TILTCHECK_ALERT_LOG_SEGMENT_HOURS", "24")) * 3600,
+    background=True
+) if alert_log_dir else None
+
+
+def record_alerts(alerts: List[Union[TiltAlert, AlertRecord]]):
+    """Append alerts to the alert log, if one is configured."""
+    if alert_log is None:
+        return
+    for alert in alerts:
+        player_id = alert.player_id if isinstance(alert, AlertRecord) else alert.details.get("player_id")
+        alert_log.append(KIND_ALERT, player_id or DEFAULT_PLAYER_ID, alert_record(alert))
+
+
+# Alert subscribers (Discord bot, dashboard, vault service). Agents listed in
+# TILTCHECK_SUBSCRIBER_AGENTS (or the configured subscribers) can also
+# subscribe at runtime by sending an AlertSubscription message.
+subscriber_registry = SubscriberRegistry(
+    path=os.environ.get("TILTCHECK_SUBSCRIBERS_FILE"),
+    initial=os.environ.get("TILTCHECK_ALERT_SUBSCRIBERS", "").split(",")
+)
+SUBSCRIBER_AGENTS = {
+    a.strip()
+    for name in ("TILTCHECK_SUBSCRIBER_AGENTS", "TILTCHECK_ALERT_SUBSCRIBERS")
+    for a in os.environ.get(name, "").split(",") if a.strip()
+}
+
+alert_dispatcher = AlertDispatcher(
+    subscriber_registry,
+    timeout=float(os.environ.get("TILTCHECK_DELIVERY_TIMEOUT", "5.0")),
+    retries=int(os.environ.get("TILTCHECK_DELIVERY_RETRIES", "3"))
+)
+
 
 def load_csv_data(filepath: str) -> Optional[pd.DataFrame]:
     """
     Load gambling session data from CSV file.
     
     Expected CSV format:
-    - timestamp: ISO format datetime or Unix timestamp
+    - timestamp: ISO format datetime or Unix epoch nanoseconds
     - bet_amount: numeric bet amount
     - outcome: win/loss/push
     - balance: current balance after bet
+    - player_id: (optional) player identifier for multi-player files
     
     Args:
         filepath: Path to CSV file
@@ -103,28 +253,38 @@ def load_csv_data(filepath: str) -> Optional[pd.DataFrame]:
         df = pd.read_csv(filepath)
         
         # Validate required columns
-        required_columns = ['timestamp', 'bet_amount', 'outcome', 'balance']
-        if not all(col in df.columns for col in required_columns):
-            logger.error(f"Missing required columns. Need: {required_columns}")
+        if not all(col in df.columns for col in REQUIRED_COLUMNS):
+            logger.error("Missing required columns. Need: %s", REQUIRED_COLUMNS)
             return None
         
+        # Drop re-delivered rows (by event_id, or player/timestamp/bet/balance)
+        rows = len(df)
+        df = df.drop_duplicates(subset=duplicate_key_columns(df.columns))
+        if len(df) < rows:
+            logger.info("Dropped %d duplicate rows from %s", rows - len(df), filepath)
+        
         # Convert timestamp to datetime
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         
-        # Sort by timestamp
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        # Sort by timestamp (stable, so equal timestamps keep file order)
+        df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
         
-        logger.info(f"Successfully loaded {len(df)} records from {filepath}")
+        logger.info("Successfully loaded %d records from %s", len(df), filepath)
         return df
         
     except FileNotFoundError:
-        logger.error(f"File not found: {filepath}")
+        logger.error("File not found: %s", filepath)
         return None
     except Exception as e:
-        logger.error(f"Error loading CSV: {str(e)}")
+        logger.error("Error loading CSV: %s", e)
         return None
 
 
+def load_shared_store_data() -> Optional[pd.DataFrame]:
+    """Load the session file for the shared store (runs in a worker thread)."""
+    return load_csv_data(SESSION_FILE)
+
+
 def check_rapid_spinning(df: pd.DataFrame, window_minutes: int = 5, 
                         threshold_spins: int = 50) -> Optional[TiltAlert]:
     """
@@ -151,19 +311,7 @@ def check_rapid_spinning(df: pd.DataFrame, window_minutes: int = 5,
     spin_count = len(recent_spins)
     
     if spin_count > threshold_spins:
-        logger.warning(f"Rapid spinning detected: {spin_count} spins in {window_minutes} minutes")
-        
-        return TiltAlert(
-            alert_message=f"⚠️ Tilt Alert: You've been spinning too fast. Take a break.",
-            risk_level="HIGH",
-            timestamp=datetime.now().isoformat(),
-            details={
-                "spin_count": spin_count,
-                "time_window_minutes": window_minutes,
-                "threshold": threshold_spins,
-                "avg_spin_rate": f"{spin_count / window_minutes:.1f} spins/min"
-            }
-        )
+        return build_rapid_spin_alert(spin_count, window_minutes, threshold_spins)
     
     return None
 
@@ -206,21 +354,7 @@ def check_balance_drop(df: pd.DataFrame, window_minutes: int = 10,
     drop_percentage = balance_change / start_balance
     
     if drop_percentage >= drop_threshold:
-        logger.warning(f"Significant balance drop detected: {drop_percentage*100:.1f}% in {window_minutes} minutes")
-        
-        return TiltAlert(
-            alert_message=f"⚠️ Tilt Alert: Your balance is dropping quickly. Vault some winnings.",
-            risk_level="HIGH",
-            timestamp=datetime.now().isoformat(),
-            details={
-                "start_balance": float(start_balance),
-                "end_balance": float(end_balance),
-                "balance_lost": float(balance_change),
-                "drop_percentage": f"{drop_percentage*100:.1f}%",
-                "time_window_minutes": window_minutes,
-                "threshold": f"{drop_threshold*100}%"
-            }
-        )
+        return build_balance_drop_alert(start_balance, end_balance, window_minutes, drop_threshold)
     
     return None
 
@@ -229,6 +363,9 @@ def check_all_tilt_conditions(df: pd.DataFrame) -> List[TiltAlert]:
     """
     Check all tilt detection rules against the session data.
     
+    Has no side effects, so it can serve as a reference for the engine;
+    callers that act on the alerts log them with record_alerts().
+    
     Args:
         df: DataFrame with session data
         
@@ -247,27 +384,9 @@ def check_all_tilt_conditions(df: pd.DataFrame) -> List[TiltAlert]:
     if balance_drop_alert:
         alerts.append(balance_drop_alert)
     
-    logger.info(f"Tilt check complete: {len(alerts)} alerts detected")
     return alerts
 
 
-def create_chat_message(alert: TiltAlert) -> ChatMessage:
-    """
-    Wrap a TiltAlert into a ChatMessage for the ASI Chat Protocol.
-    
-    Args:
-        alert: TiltAlert object
-        
-    Returns:
-        ChatMessage ready to be sent
-    """
-    return ChatMessage(
-        message=alert.alert_message,
-        timestamp=alert.timestamp,
-        alert_type=alert.risk_level
-    )
-
-
 @tiltcheck_agent.on_event("startup")
 async def startup_handler(ctx: Context):
     """
@@ -278,53 +397,340 @@ async def startup_handler(ctx: Context):
     logger.info("=" * 60)
     logger.info(f"Agent Address: {ctx.agent.address}")
     logger.info(f"Agent Name: {ctx.agent.name}")
+    logger.info(f"Watching session data: {SESSION_FILE}")
     logger.info("Monitoring for tilt behavior...")
     logger.info("=" * 60)
+    
+    # Evaluate on file changes; the interval handler below stays as a
+    # safety net for filesystems that do not deliver notifications
+    asyncio.ensure_future(session_watcher.run(lambda: check_tilt_interval(ctx)))
+    
+    asyncio.ensure_future(eval_scheduler.run(evaluate_players))
+    
+    inbound_pipeline.start()
+    
+    if ingest_server is not None:
+        await ingest_server.start(ipc_socket_path)
+    
+    profiling_hooks.install_signal_handlers(asyncio.get_running_loop(), PROFILE_TICKS)
+    
+    alert_dispatcher.bind(ctx.send)
+    alert_dispatcher.start()
+    logger.info("Alert subscribers: %d", len(subscriber_registry))
 
 
 @tiltcheck_agent.on_interval(period=30.0)
+@profiling_hooks.profiled
 async def check_tilt_interval(ctx: Context):
     """
-    Periodic interval handler to check for tilt conditions.
-    Runs every 30 seconds to analyze session data.
-    """
-    logger.info("Running periodic tilt check...")
+    Tilt check handler.
     
-    # Load session data
-    csv_file = "session_data.csv"
-    df = load_csv_data(csv_file)
+    Triggered by the session file watcher on every (debounced) change, and
+    every 30 seconds as a fallback. Skipped entirely when the session file's
+    fingerprint has not changed since the last evaluation.
     
-    if df is None:
-        logger.warning(f"Could not load session data from {csv_file}")
+    Only rows appended since the previous check are read, and only players
+    with new bets are scheduled for evaluation: players close to a threshold
+    are evaluated right away, the rest by the eval_scheduler later.
+    """
+    if session_watcher.claim_change() is None:
+        # A snapshot held back by the publish interval still goes out
+        if shared_store is not None:
+            await shared_store.maybe_publish(load_shared_store_data)
         return
     
-    # Check for tilt conditions
-    alerts = check_all_tilt_conditions(df)
+    logger.info("Running tilt check...")
     
-    # Send chat messages for each alert
-    for alert in alerts:
-        chat_msg = create_chat_message(alert)
+    # Read new rows and update the per-player windows
+    position = (session_tail.inode, session_tail.offset)
+    events = ingest_dedup.unseen(session_tail.read_new())
+    changed_players, alert_count = await ingest_events(events)
+    ingest_dedup.record(events)
+    
+    # Republish the snapshot only when the file actually grew or was replaced
+    # (a touch or a partial last row leaves the tail where it was)
+    if shared_store is not None:
+        if (session_tail.inode, session_tail.offset) != position:
+            shared_store.stale = True
+        await shared_store.maybe_publish(load_shared_store_data)
+    
+    logger.info("Tilt check complete: %d new bets, %d players changed, %d alerts detected",
+                len(events), len(changed_players), alert_count)
+    
+    if alert_log is not None:
+        alert_log.maybe_flush()
+    
+    await detector_checkpoint.maybe_save(detector_state)
+
+
+async def ingest_events(events: List[BetEvent]) -> Tuple[Set[str], int]:
+    """
+    Feed new bets to the detectors.
+    
+    Updates the per-player windows, community stats and risk leaderboard,
+    schedules the changed players and evaluates the urgent ones right away
+    (the scheduler loop handles the rest).
+    
+    Returns:
+        Players that received bets, and the number of alerts sent
+    """
+    changed_players = detection_engine.ingest(events)
+    community_stats.ingest(events)
+    now = time.monotonic()
+    for player_id in changed_players:
+        risk_leaderboard.update(player_id, SOURCE_ENGINE, engine_risk(detection_engine, player_id))
+        eval_scheduler.schedule(player_id, risk_leaderboard.score(player_id), now)
+    
+    alert_count = await evaluate_players(eval_scheduler.pop_due(now))
+    return changed_players, alert_count
+
+
+@profiling_hooks.profiled
+async def ingest_socket_bets(events: List[BetEvent]):
+    """Detect on bets received over the local ingestion socket."""
+    events = ingest_dedup.unseen(events)
+    changed_players, alert_count = await ingest_events(events)
+    # Fingerprints only once the engine took the bets, so a failed batch
+    # is not dropped as a duplicate when the producer retries it
+    ingest_dedup.record(events)
+    logger.debug("Socket ingest: %d new bets, %d players changed, %d alerts detected",
+                 len(events), len(changed_players), alert_count)
+    await detector_checkpoint.maybe_save(detector_state)
+
+
+# Optional local ingestion socket: producers on this host (the Discord bot,
+# feed relays) send bets directly instead of appending to the session file
+ipc_socket_path = os.environ.get("TILTCHECK_IPC_SOCKET")
+ingest_server = IngestServer(
+    ingest_socket_bets,
+    maxsize=int(os.environ.get("TILTCHECK_IPC_QUEUE", "256")),
+    block_timeout=float(os.environ.get("TILTCHECK_IPC_BLOCK_TIMEOUT", "0.5"))
+) if ipc_socket_path else None
+
+
+async def evaluate_players(player_ids: List[str]) -> int:
+    """
+    Evaluate the tilt rules for players and send their alerts.
+    
+    Args:
+        player_ids: Players whose evaluation is due
         
-        logger.info("=" * 60)
-        logger.info("🚨 TILT ALERT DETECTED 🚨")
-        logger.info(f"Message: {chat_msg.message}")
-        logger.info(f"Risk Level: {alert.risk_level}")
-        logger.info(f"Timestamp: {chat_msg.timestamp}")
-        logger.info(f"Details: {alert.details}")
-        logger.info("=" * 60)
+    Returns:
+        Number of alerts sent
+    """
+    # Compact records; details and the TiltAlert model are only built for
+    # delivery
+    alerts = [record_from_hit(hit) for hit in detection_engine.evaluate(player_ids)]
+    record_alerts(alerts)
+    
+    for alert in alerts:
+        # One structured record per alert with the numeric fields only; the
+        # formatted details are left to subscribers and the alert log reader
+        fields = alert.to_json_dict()
+        logger.warning(
+            "🚨 TILT ALERT DETECTED 🚨 %s | risk=%s | %s",
+            alert.alert_message, alert.risk_level, fields,
+            extra={"fields": {
+                "event": "tilt_alert",
+                "risk_level": alert.risk_level,
+                "alert": fields
+            }}
+        )
         
-        # In a real implementation, you would send this to other agents
-        # using ctx.send() with the target agent's address
-        # For demo purposes, we're logging it
+        # Fan out to subscriber agents in the background; never blocks the tick
+        alert_dispatcher.publish(alert)
+    
+    return len(alerts)
+
+
+async def process_chat_batch(batch: List[tuple]):
+    """
+    Process a batch of queued (sender, message) pairs.
+    
+    Args:
+        batch: ChatMessage or TiltAlert messages drained from the inbound pipeline
+    """
+    for sender, msg in batch:
+        if isinstance(msg, TiltAlert):
+            logger.info("Received tilt alert from %s: %s | Risk Level: %s | Timestamp: %s",
+                        sender, msg.alert_message, msg.risk_level, msg.timestamp)
+        else:
+            logger.info("Received message from %s: %s | Alert Type: %s | Timestamp: %s",
+                        sender, msg.message, msg.alert_type, msg.timestamp)
+
+
+# Bounded inbound queue so bursts from peer agents cannot starve tilt checks
+# TILTCHECK_INBOX_POLICY: drop_oldest, reject or block
+inbound_pipeline = InboundPipeline(
+    process_chat_batch,
+    maxsize=int(os.environ.get("TILTCHECK_INBOX_SIZE", "1000")),
+    batch_size=int(os.environ.get("TILTCHECK_INBOX_BATCH", "50")),
+    overflow=os.environ.get("TILTCHECK_INBOX_POLICY", "drop_oldest")
+)
 
 
 @tiltcheck_agent.on_message(model=ChatMessage)
 async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
     """
     Handler for incoming chat messages.
+    
+    Only enqueues the message; process_chat_batch does the work.
+    """
+    if not await inbound_pipeline.submit((sender, msg)):
+        logger.warning("Inbound queue full, rejected message from %s", sender)
+
+
+@tiltcheck_agent.on_message(model=TiltAlert)
+async def handle_tilt_alert(ctx: Context, sender: str, msg: TiltAlert):
+    """
+    Handler for tilt alerts forwarded by peer agents.
+    """
+    if not await inbound_pipeline.submit((sender, msg)):
+        logger.warning("Inbound queue full, rejected alert from %s", sender)
+
+
+@tiltcheck_agent.on_message(model=AlertSubscription)
+async def handle_alert_subscription(ctx: Context, sender: str, msg: AlertSubscription):
+    """
+    Handler for agents subscribing to or unsubscribing from tilt alerts;
+    only agents in SUBSCRIBER_AGENTS may subscribe.
+    """
+    if msg.action == "subscribe":
+        if sender not in SUBSCRIBER_AGENTS:
+            logger.warning("Rejected alert subscription from unlisted agent %s", sender)
+            return
+        if subscriber_registry.add(sender):
+            logger.info("Alert subscriber added: %s", sender)
+    elif msg.action == "unsubscribe":
+        if subscriber_registry.remove(sender):
+            logger.info("Alert subscriber removed: %s", sender)
+    else:
+        logger.warning("Unknown subscription action from %s: %s", sender, msg.action)
+
+
+@tiltcheck_agent.on_message(model=TiltScoreUpdate)
+async def handle_tilt_score_update(ctx: Context, sender: str, msg: TiltScoreUpdate):
+    """
+    Handler for tilt scores from the Solana scorer; re-ranks the player and
+    records the score in the alert log. Only agents in SCORER_AGENTS are
+    accepted.
+    """
+    if sender not in SCORER_AGENTS:
+        logger.warning("Ignoring tilt score update from unauthorized agent %s", sender)
+        return
+    risk_leaderboard.update(msg.player_id, SOURCE_TILT_SCORE, tilt_score_risk(msg.tilt_score))
+    if alert_log is not None:
+        alert_log.append(KIND_ANALYSIS, msg.player_id, {"tilt_score": msg.tilt_score, "source": sender})
+
+
+@tiltcheck_agent.on_message(model=RiskLeaderboardRequest, replies=RiskLeaderboardResponse)
+async def handle_leaderboard_request(ctx: Context, sender: str, msg: RiskLeaderboardRequest):
+    """
+    Handler for dashboard requests for the highest-risk players; only
+    agents in DASHBOARD_AGENTS are answered.
+    """
+    if sender not in DASHBOARD_AGENTS:
+        logger.warning("Ignoring leaderboard request from unauthorized agent %s", sender)
+        return
+    players = [
+        {"player_id": player_id, "risk": risk, "components": risk_leaderboard.components(player_id)}
+        for player_id, risk in risk_leaderboard.top(msg.k)
+    ]
+    await ctx.send(sender, RiskLeaderboardResponse(players=players))
+
+
+@tiltcheck_agent.on_message(model=ProfilingRequest, replies=ProfilingResponse)
+async def handle_profiling_request(ctx: Context, sender: str, msg: ProfilingRequest):
+    """
+    Handler for diagnostics requests; only agents in TILTCHECK_ADMIN_AGENTS
+    are served.
+    """
+    if sender not in ADMIN_AGENTS:
+        logger.warning("Ignoring profiling request from non-admin agent %s", sender)
+        return
+    
+    try:
+        if msg.action == "profile":
+            profiling_hooks.request_profile(msg.ticks)
+            message = f"Profiling the next {msg.ticks} tilt check ticks"
+        elif msg.action == "memory":
+            path = profiling_hooks.snapshot_memory()
+            message = f"Memory report written to {path}" if path else "Memory tracing started"
+        elif msg.action == "memory_stop":
+            profiling_hooks.stop_memory()
+            message = "Memory tracing stopped"
+        else:
+            message = f"Unknown action: {msg.action}"
+    except ValueError as e:
+        message = str(e)
+    
+    logger.info("Profiling request from %s: %s", sender, message)
+    await ctx.send(sender, ProfilingResponse(action=msg.action, message=message,
+                                             files=profiling_hooks.files))
+
+
+@tiltcheck_agent.on_interval(period=60.0)
+async def report_pipeline_metrics(ctx: Context):
+    """
+    Periodic report of inbound queue and alert delivery counters; also
+    writes alert log records left in its buffer.
+    """
+    inbound = inbound_pipeline.metrics()
+    delivery = alert_dispatcher.metrics()
+    scheduler = eval_scheduler.metrics()
+    if inbound["dropped"] or inbound["rejected"] or inbound["failed"] or delivery["failed"]:
+        logger.warning("Inbound pipeline: %s | Alert delivery: %s | Evaluations: %s",
+                       inbound, delivery, scheduler)
+    else:
+        logger.debug("Inbound pipeline: %s | Alert delivery: %s | Evaluations: %s",
+                     inbound, delivery, scheduler)
+    if ingest_server is not None:
+        ingest = ingest_server.metrics()
+        if ingest["rejected"] or ingest["invalid"] or ingest["failed"]:
+            logger.warning("Socket ingest: %s", ingest)
+        else:
+            logger.debug("Socket ingest: %s", ingest)
+    if alert_log is not None:
+        alert_log.maybe_flush()
+        logger.debug("Alert log: %s", alert_log.metrics())
+
+
+@tiltcheck_agent.on_interval(period=60.0)
+async def evict_idle_players(ctx: Context):
+    """
+    Periodically drop the detection windows, deduplication state and
+    leaderboard entries of players who stopped betting.
+    """
+    detection_engine.evict_idle(IDLE_PLAYER_SECONDS)
+    ingest_dedup.evict_idle(IDLE_PLAYER_SECONDS)
+    risk_leaderboard.evict_idle(IDLE_PLAYER_SECONDS)
+
+
+@tiltcheck_agent.on_interval(period=60.0)
+async def report_community_stats(ctx: Context):
+    """
+    Periodic community-wide summary over the last few minutes.
+    """
+    if not community_stats.buckets:
+        return
+    summary = community_stats.summary(last_minutes=5, k=5)
+    logger.info("Community (last %d min): %d spins, ~%d distinct players, top games %s",
+                summary["minutes"], summary["spins"], summary["distinct_players"], summary["top_games"],
+                extra={"fields": {"event": "community_stats", **summary}})
+
+
+@tiltcheck_agent.on_event("shutdown")
+async def shutdown_handler(ctx: Context):
+    """
+    Handler called when the agent stops; writes a final checkpoint.
     """
-    logger.info(f"Received message from {sender}: {msg.message}")
-    logger.info(f"Alert Type: {msg.alert_type} | Timestamp: {msg.timestamp}")
+    eval_scheduler.stop()
+    if ingest_server is not None:
+        await ingest_server.stop()
+    detector_checkpoint.save(detector_state())
+    logger.info("Detector state saved to %s", detector_checkpoint.filepath)
+    if alert_log is not None:
+        alert_log.close()
 
 
 def main():
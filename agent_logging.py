@@ -0,0 +1,173 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Agent Logging
+
+Logging setup for the agent's detection hot path:
+- async mode: records are put on an in-memory queue and written by a
+  background listener thread, so a slow stdout (container log drivers)
+  never blocks the event loop. Message formatting is deferred to that
+  thread as well.
+- json format: one structured line per record; fields passed with
+  `extra={"fields": {...}}` become top-level keys.
+- sampling: repetitive INFO/DEBUG messages (same logger and template) are
+  rate limited; the next emitted record reports how many were suppressed.
+  WARNING and above are never sampled, so alerts are always written.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats each record as a single JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text format, plus a note about suppressed repeats."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            line += f" ({suppressed} similar messages suppressed)"
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate limit repetitive records per (logger, message template).
+
+    Each template may emit `burst` records per `interval` seconds. Records
+    at or above `exempt_level` always pass.
+    """
+
+    def __init__(self, burst: int = 10, interval: float = 60.0,
+                 exempt_level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.exempt_level = exempt_level
+        # template key -> [window start, emitted in window, suppressed]
+        self._windows: Dict[Tuple[str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock QueueHandler formats the message in the caller's thread;
+    here the record is enqueued as-is. Log arguments must therefore not be
+    mutated after the logging call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_listener(listener: logging.handlers.QueueListener):
+    # Flush queued records at exit unless the listener was already stopped
+    if getattr(listener, "_thread", None) is not None:
+        listener.stop()
+
+
+def configure_logging(mode: str = "sync", fmt: str = "text", level: int = logging.INFO,
+                      sample_burst: int = 0, sample_interval: float = 60.0
+                      ) -> Optional[logging.handlers.QueueListener]:
+    """
+    Configure root logging for the agent.
+
+    Args:
+        mode: "sync" (write in the calling thread) or "async" (queue + listener thread)
+        fmt: "text" or "json"
+        level: Root log level
+        sample_burst: Records per template per interval (0 disables sampling)
+        sample_interval: Sampling window in seconds
+
+    Returns:
+        The running QueueListener in async mode, otherwise None
+    """
+    if mode not in ("sync", "async"):
+        raise ValueError(f"Unknown log mode: {mode}")
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unknown log format: {fmt}")
+
+    formatter = StructuredFormatter() if fmt == "json" else TextFormatter(DEFAULT_FORMAT)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    listener = None
+    if mode == "async":
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        front = LazyQueueHandler(log_queue)
+        listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(_stop_listener, listener)
+    else:
+        front = stream_handler
+
+    if sample_burst > 0:
+        front.addFilter(SamplingFilter(burst=sample_burst, interval=sample_interval))
+
+    root.addHandler(front)
+    return listener
@@ -0,0 +1,71 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Agent Message Models
+
+ASI Chat Protocol message models shared by agent.py and the tools that
+talk to it. Kept separate so importing them does not create or fund an
+agent.
+"""
+
+from typing import Any, Dict, List
+from uagents import Model
+
+
+# Define message models for ASI Chat Protocol
+class ChatMessage(Model):
+    """Chat message model for ASI Chat Protocol"""
+    message: str
+    timestamp: str
+    alert_type: str
+
+
+class TiltAlert(Model):
+    """Model for tilt alert information"""
+    alert_message: str
+    risk_level: str
+    timestamp: str
+    details: Dict[str, Any]
+
+
+class AlertSubscription(Model):
+    """Request to start or stop receiving TiltAlert messages"""
+    action: str  # "subscribe" or "unsubscribe"
+
+
+class TiltScoreUpdate(Model):
+    """Latest TiltCheckSolanaAgent tilt score (0-100) for a player"""
+    player_id: str
+    tilt_score: float
+
+
+class RiskLeaderboardRequest(Model):
+    """Request for the players currently closest to tilt"""
+    k: int = 10
+
+
+class RiskLeaderboardResponse(Model):
+    """Highest-risk players, highest first"""
+    players: List[Dict[str, Any]]  # player_id, risk, components
+
+
+class ProfilingRequest(Model):
+    """Admin request for diagnostics from a running agent"""
+    action: str  # "profile", "memory" or "memory_stop"
+    ticks: int = 10  # tilt check ticks to profile
+
+
+class ProfilingResponse(Model):
+    """Outcome of a ProfilingRequest"""
+    action: str
+    message: str
+    files: List[str]  # reports written so far
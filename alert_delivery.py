@@ -0,0 +1,261 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Alert Delivery
+
+Subscriber registry and concurrent fan-out of tilt alerts to subscriber
+agents (Discord bot, dashboard, vault service).
+
+The detection tick only calls AlertDispatcher.publish(), which enqueues the
+alert and returns immediately. A background worker starts one delivery per
+alert, at most `max_deliveries` at a time; each delivery sends to all
+subscribers concurrently with a per-destination timeout and retries with
+exponential backoff. A slow or unreachable subscriber only delays its own
+retries, never the other subscribers or the next alert. When deliveries
+stall, alerts wait in the bounded queue and the oldest are dropped.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# (destination address, message) -> delivery status, e.g. Context.send
+SendFunction = Callable[[str, Any], Awaitable[Any]]
+
+
+class DeliveryError(Exception):
+    """Raised when a subscriber reports a failed delivery."""
+
+
+class SubscriberRegistry:
+    """Set of subscriber agent addresses, optionally persisted to a JSON file."""
+
+    def __init__(self, path: Optional[str] = None, initial: Optional[List[str]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            path: JSON file to load from and save to (None keeps it in memory)
+            initial: Addresses that are always subscribed
+        """
+        self.path = path
+        self._addresses: Set[str] = set(a.strip() for a in (initial or []) if a.strip())
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self._addresses.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error("Could not load subscribers from %s: %s", path, e)
+
+    def add(self, address: str) -> bool:
+        """Subscribe an address. Returns False if it was already subscribed."""
+        if address in self._addresses:
+            return False
+        self._addresses.add(address)
+        self._save()
+        return True
+
+    def remove(self, address: str) -> bool:
+        """Unsubscribe an address. Returns False if it was not subscribed."""
+        if address not in self._addresses:
+            return False
+        self._addresses.discard(address)
+        self._save()
+        return True
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(sorted(self._addresses), f)
+        os.replace(tmp_path, self.path)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._addresses))
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._addresses
+
+
+class AlertDispatcher:
+    """Decoupled, concurrent, retrying delivery of alerts to all subscribers."""
+
+    def __init__(self, registry: SubscriberRegistry, send: Optional[SendFunction] = None,
+                 timeout: float = 5.0, retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 8.0, queue_size: int = 1000, max_in_flight: int = 200,
+                 max_deliveries: int = 100):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            registry: Subscribers to deliver to
+            send: Coroutine function (address, message) -> status; usually ctx.send
+            timeout: Per-destination, per-attempt timeout in seconds
+            retries: Retries after the first failed attempt
+            backoff: Initial retry delay in seconds (doubled per retry, with jitter)
+            max_backoff: Upper bound for the retry delay
+            queue_size: Alerts buffered before the oldest is dropped
+            max_in_flight: Cap on concurrent sends across all deliveries
+            max_deliveries: Cap on alerts being delivered at once; further
+                alerts stay in the queue
+        """
+        self.registry = registry
+        self.send = send
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight
+        self.max_deliveries = max_deliveries
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._deliveries: Set[asyncio.Task] = set()
+
+        self.published = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.per_destination: Dict[str, Dict[str, int]] = {}
+
+    def bind(self, send: SendFunction):
+        """Set the send function (e.g. ctx.send once the agent has started)."""
+        self.send = send
+
+    def start(self):
+        """Start the background worker on the running event loop."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._slots = asyncio.Semaphore(self.max_deliveries)
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self, drain: bool = True):
+        """Stop the worker, optionally waiting for queued and in-flight deliveries."""
+        if self._worker is None:
+            return
+        if drain:
+            await self._queue.join()
+            if self._deliveries:
+                await asyncio.gather(*self._deliveries, return_exceptions=True)
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+    def publish(self, message: Any) -> bool:
+        """
+        Queue an alert for delivery without waiting.
+
+        An alert_records.AlertRecord is converted to its TiltAlert only when
+        it is delivered, so nothing is built when nobody is subscribed.
+
+        Returns:
+            False if the dispatcher is not running or there are no subscribers
+        """
+        if self._queue is None or not len(self.registry):
+            return False
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+        self.published += 1
+        return True
+
+    async def _run(self):
+        while True:
+            # Take a slot first, so stalled deliveries leave alerts in the
+            # bounded queue instead of piling up as tasks
+            await self._slots.acquire()
+            try:
+                message = await self._queue.get()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.ensure_future(self.deliver(message))
+            self._deliveries.add(task)
+            task.add_done_callback(self._delivery_done)
+            self._queue.task_done()
+
+    def _delivery_done(self, task: asyncio.Task):
+        self._deliveries.discard(task)
+        self._slots.release()
+
+    async def deliver(self, message: Any) -> Dict[str, bool]:
+        """
+        Send one message to every subscriber concurrently.
+
+        Returns:
+            Mapping of address to whether delivery eventually succeeded
+        """
+        if hasattr(message, "to_tilt_alert"):
+            message = message.to_tilt_alert()
+        addresses = list(self.registry)
+        outcomes = await asyncio.gather(
+            *(self._deliver_one(address, message) for address in addresses),
+            return_exceptions=True
+        )
+        return {address: outcome is True for address, outcome in zip(addresses, outcomes)}
+
+    async def _deliver_one(self, address: str, message: Any) -> bool:
+        stats = self.per_destination.setdefault(address, {"delivered": 0, "failed": 0})
+        delay = self.backoff
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    status = await asyncio.wait_for(self.send(address, message), self.timeout)
+                if getattr(getattr(status, "status", None), "value", None) == "failed":
+                    raise DeliveryError(getattr(status, "detail", "delivery failed"))
+                self.delivered += 1
+                stats["delivered"] += 1
+                return True
+            except Exception as e:
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e)
+                if attempt == self.retries:
+                    self.failed += 1
+                    stats["failed"] += 1
+                    logger.warning("Alert delivery to %s failed after %d attempts: %s",
+                                   address, attempt + 1, reason)
+                    return False
+                self.retried += 1
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, self.max_backoff)
+        return False
+
+    def metrics(self) -> Dict[str, int]:
+        """Return delivery counters."""
+        return {
+            "subscribers": len(self.registry),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._deliveries),
+            "published": self.published,
+            "dropped": self.dropped,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Alert Log
+
+Durable, append-only record of tilt alerts and analysis results, queryable
+by player and time range (compliance asks for per-player alert histories).
+
+Records are buffered and written in batches to JSONL segment files
+(`segment-000001.jsonl`, ...), one record per line:
+
+    {"ts": 1705312800.5, "kind": "alert", "player_id": "p1", "data": {...}}
+
+A segment is sealed when it reaches `segment_bytes` or is older than
+`segment_seconds`. Sealing writes a sidecar index (`segment-000001.idx.json`)
+with the segment's time range and, per player, the time range and byte
+offsets of that player's records. Queries skip segments outside the time
+range and seek directly to a player's lines; only the open segment is
+indexed in memory.
+
+After a crash the open segment (and any segment sealed without its index)
+is re-indexed on start, and a partially written last line is cut off.
+
+With `background=True` a writer thread does all file writes and fsyncs, so
+append() and maybe_flush() called from an event loop only touch the
+in-memory buffer.
+
+Usage:
+    python alert_log.py alerts/ --player p1 --since 2025-01-06 --until 2025-01-13
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+KIND_ALERT = "alert"
+KIND_ANALYSIS = "analysis"
+
+INDEX_VERSION = 1
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx.json"
+
+
+class SegmentIndex:
+    """Time range of a segment and per-player [first ts, last ts, offsets]."""
+
+    __slots__ = ("path", "start", "end", "count", "size", "created", "players")
+
+    def __init__(self, path: str, created: Optional[float] = None):
+        self.path = path
+        self.start = None
+        self.end = None
+        self.count = 0
+        self.size = 0
+        self.created = created
+        self.players: Dict[str, list] = {}
+
+    @property
+    def index_path(self) -> str:
+        return self.path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+
+    def add(self, offset: int, ts: float, player_id: str, length: int):
+        self.start = ts if self.start is None else min(self.start, ts)
+        self.end = ts if self.end is None else max(self.end, ts)
+        self.count += 1
+        self.size = offset + length
+        entry = self.players.get(player_id)
+        if entry is None:
+            self.players[player_id] = [ts, ts, [offset]]
+        else:
+            entry[0] = min(entry[0], ts)
+            entry[1] = max(entry[1], ts)
+            entry[2].append(offset)
+
+    def overlaps(self, since: Optional[float], until: Optional[float], player_id: Optional[str] = None) -> bool:
+        """Whether the segment (or the player's part of it) can hold records in [since, until)."""
+        if self.count == 0:
+            return False
+        start, end = self.start, self.end
+        if player_id is not None:
+            entry = self.players.get(player_id)
+            if entry is None:
+                return False
+            start, end = entry[0], entry[1]
+        return (since is None or end >= since) and (until is None or start < until)
+
+    def to_dict(self) -> Dict:
+        return {"version": INDEX_VERSION, "segment": os.path.basename(self.path), "start": self.start,
+                "end": self.end, "count": self.count, "size": self.size, "created": self.created,
+                "players": self.players}
+
+    @classmethod
+    def from_dict(cls, path: str, data: Dict) -> "SegmentIndex":
+        index = cls(path, data.get("created"))
+        index.start, index.end = data["start"], data["end"]
+        index.count, index.size = data["count"], data["size"]
+        index.players = data["players"]
+        return index
+
+    @classmethod
+    def scan(cls, path: str, repair: bool = False) -> "SegmentIndex":
+        """
+        Index a segment by reading it; stops at an incomplete or unreadable line.
+
+        Args:
+            path: Segment file
+            repair: Truncate the file after the last complete record
+        """
+        index = cls(path)
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError as e:
+                    if repair:
+                        logger.warning("Truncating %s at byte %d: %s", path, offset, e)
+                    break
+                if index.created is None:
+                    index.created = record["ts"]
+                index.add(offset, record["ts"], record["player_id"], len(line))
+                offset += len(line)
+        if repair and os.path.getsize(path) > offset:
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+        index.size = offset
+        return index
+
+
+class AlertLog:
+    """Buffered, rotating JSONL log of alerts and analysis results with a player/time index."""
+
+    def __init__(self, directory: str, batch_size: int = 256, flush_interval: float = 5.0,
+                 segment_bytes: int = 64 * 1024 * 1024, segment_seconds: float = 24 * 3600,
+                 fsync: bool = True, read_only: bool = False, background: bool = False):
+        """
+        Open (or create) a log directory.
+
+        Args:
+            directory: Directory for segments and their indexes
+            batch_size: Buffered records that trigger a write
+            flush_interval: Maximum seconds a record stays buffered (checked on
+                append and maybe_flush)
+            segment_bytes: Seal a segment once it reaches this size
+            segment_seconds: Seal a segment once its first record is this old
+            fsync: fsync every batch
+            read_only: Only query (safe while an agent is writing the directory)
+            background: Write batches from a writer thread instead of the
+                calling thread (for use from an event loop)
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.fsync = fsync
+        self.read_only = read_only
+        self.sealed: List[SegmentIndex] = []
+        self.active: Optional[SegmentIndex] = None
+        self._buffer: List[Dict] = []
+        self._oldest = 0.0
+        # _lock guards the buffer only; _io_lock serializes segment writes and
+        # index changes (always taken before _lock)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self.records_written = 0
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+        self._open()
+
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = None
+        if background and not read_only:
+            self._writer = threading.Thread(target=self._write_loop, name="alert-log-writer", daemon=True)
+            self._writer.start()
+
+    def _segment_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")))
+
+    def _open(self):
+        paths = self._segment_paths()
+        for n, path in enumerate(paths):
+            index_path = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+            try:
+                with open(index_path) as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.sealed.append(SegmentIndex.from_dict(path, data))
+                    continue
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning("Rebuilding unreadable index %s: %s", index_path, e)
+
+            index = SegmentIndex.scan(path, repair=not self.read_only)
+            if n == len(paths) - 1:
+                self.active = index
+                logger.info("Recovered open segment %s (%d records)", path, index.count)
+            else:
+                if not self.read_only:
+                    self._write_index(index)
+                self.sealed.append(index)
+
+    def append(self, kind: str, player_id: str, data: Dict, ts: Optional[float] = None):
+        """
+        Buffer a record; writes the buffer when it is full or too old.
+
+        Args:
+            kind: KIND_ALERT or KIND_ANALYSIS
+            player_id: Player the record is about
+            data: JSON-serializable payload
+            ts: Epoch seconds (default: now)
+        """
+        if self.read_only:
+            raise RuntimeError("alert log opened read-only")
+        record = {"ts": time.time() if ts is None else float(ts), "kind": kind,
+                  "player_id": str(player_id), "data": data}
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(record)
+            due = self._due()
+        if due:
+            self._request_flush()
+
+    def _due(self) -> bool:
+        """Whether the buffer should be written (caller holds _lock)."""
+        return bool(self._buffer) and (len(self._buffer) >= self.batch_size or
+                                       time.monotonic() - self._oldest >= self.flush_interval)
+
+    def _request_flush(self):
+        if self._writer is not None:
+            self._wake.set()
+        else:
+            self.flush()
+
+    def maybe_flush(self) -> bool:
+        """Write the buffer if its oldest record has waited flush_interval seconds."""
+        with self._lock:
+            due = self._due()
+        if due:
+            self._request_flush()
+        return due
+
+    def flush(self):
+        """Write all buffered records (in the calling thread)."""
+        with self._io_lock:
+            self._flush()
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                with self._io_lock:
+                    with self._lock:
+                        due = self._due()
+                    if due:
+                        self._flush()
+            except Exception:
+                logger.exception("Alert log write failed in %s", self.directory)
+
+    def _flush(self):
+        """Write the buffer to the open segment (caller holds _io_lock)."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        now = time.time()
+        if self.active is not None and (self.active.size >= self.segment_bytes or
+                                        now - (self.active.created or now) >= self.segment_seconds):
+            self._seal()
+        if self.active is None:
+            self.active = SegmentIndex(self._next_segment_path(), batch[0]["ts"])
+
+        lines = [json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n" for record in batch]
+        offset = self.active.size
+        with open(self.active.path, "ab") as f:
+            f.write(b"".join(lines))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        for record, line in zip(batch, lines):
+            self.active.add(offset, record["ts"], record["player_id"], len(line))
+            offset += len(line)
+        self.records_written += len(batch)
+
+    def _next_segment_path(self) -> str:
+        last = self.active or (self.sealed[-1] if self.sealed else None)
+        number = int(os.path.basename(last.path)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1 if last else 1
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _write_index(self, index: SegmentIndex):
+        tmp_path = index.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index.to_dict(), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, index.index_path)
+
+    def _seal(self):
+        self._write_index(self.active)
+        self.sealed.append(self.active)
+        logger.info("Sealed %s (%d records)", self.active.path, self.active.count)
+        self.active = None
+
+    def rotate(self):
+        """Write the buffer and seal the open segment."""
+        with self._io_lock:
+            self._flush()
+            if self.active is not None and self.active.count:
+                self._seal()
+
+    def close(self):
+        """Stop the writer thread and write the buffer. The open segment stays open for the next start."""
+        if self._writer is not None:
+            self._closed = True
+            self._wake.set()
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def query(self, player_id: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, kind: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Records matching all given filters, in write order (buffered records last).
+
+        Args:
+            player_id: Only this player
+            since: Epoch seconds, inclusive
+            until: Epoch seconds, exclusive
+            kind: KIND_ALERT or KIND_ANALYSIS
+        """
+        # Snapshot what is on disk now; the files are read without the locks
+        with self._io_lock:
+            segments = [(index.path, index.size, list(index.players[player_id][2]) if player_id is not None else None)
+                        for index in self.sealed + ([self.active] if self.active is not None else [])
+                        if index.overlaps(since, until, player_id)]
+            with self._lock:
+                buffered = list(self._buffer)
+
+        def matches(record):
+            return ((player_id is None or record["player_id"] == player_id) and
+                    (since is None or record["ts"] >= since) and
+                    (until is None or record["ts"] < until) and
+                    (kind is None or record["kind"] == kind))
+
+        for path, size, offsets in segments:
+            with open(path, "rb") as f:
+                if offsets is None:
+                    offset = 0
+                    while offset < size:
+                        line = f.readline()
+                        offset += len(line)
+                        record = json.loads(line)
+                        if matches(record):
+                            yield record
+                    continue
+                for offset in offsets:
+                    f.seek(offset)
+                    record = json.loads(f.readline())
+                    if matches(record):
+                        yield record
+        for record in buffered:
+            if matches(record):
+                yield record
+
+    def players(self) -> List[str]:
+        """Players with written records."""
+        with self._io_lock:
+            segments = self.sealed + ([self.active] if self.active is not None else [])
+            return sorted({player_id for index in segments for player_id in index.players})
+
+    def metrics(self) -> Dict:
+        with self._io_lock:
+            segments = self.sealed + ([self.active] if self.active is not None else [])
+            return {
+                "segments": len(segments),
+                "records": sum(index.count for index in segments),
+                "bytes": sum(index.size for index in segments),
+                "buffered": len(self._buffer),
+                "written": self.records_written,
+            }
+
+
+def alert_record(alert) -> Dict:
+    """Payload for a TiltAlert, or the numeric form of an alert_records.AlertRecord."""
+    if hasattr(alert, "to_json_dict"):
+        return alert.to_json_dict()
+    return {"alert_message": alert.alert_message, "risk_level": alert.risk_level,
+            "timestamp": alert.timestamp, "details": alert.details}
+
+
+def _epoch(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return pd.Timestamp(value).timestamp()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print matching records as JSON lines."""
+    parser = argparse.ArgumentParser(description="Query the TiltCheck alert log")
+    parser.add_argument("directory", help="Alert log directory (TILTCHECK_ALERT_LOG_DIR)")
+    parser.add_argument("--player", help="Player ID")
+    parser.add_argument("--since", help="Start time, ISO or epoch seconds (inclusive)")
+    parser.add_argument("--until", help="End time, ISO or epoch seconds (exclusive)")
+    parser.add_argument("--kind", choices=(KIND_ALERT, KIND_ANALYSIS))
+    parser.add_argument("--stats", action="store_true", help="Print segment and record counts only")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 1
+    log = AlertLog(args.directory, read_only=True)
+    if args.stats:
+        print(json.dumps(log.metrics()))
+        return 0
+    for record in log.query(args.player, _epoch(args.since), _epoch(args.until), args.kind):
+        print(json.dumps(record, separators=(",", ":")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
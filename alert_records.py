@@ -0,0 +1,259 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Alert Records
+
+Compact alerts for the detection hot path. An AlertRecord is a tuple of
+numbers (rule, time, window, threshold, spin count, balances) plus the
+player and tenant. The alert text is one shared string per rule. The
+`details` dict with its formatted percentages and rates, the ISO
+timestamp and the TiltAlert model are only built when they are read:
+to log or display an alert, or to deliver it to subscribers.
+
+`details` and `to_tilt_alert()` produce exactly what the TiltAlert
+builders always sent, so subscribers see no difference.
+
+Serialization without the formatted fields:
+- to_json_dict()/to_json() and from_json_dict(),
+- encode_alert()/decode_alert() binary records (layout below), and
+  encode_alerts()/decode_alerts() for batches.
+
+Binary layout (version 1, little-endian):
+
+    offset  size  field
+    0       1     format version (1)
+    1       1     rule (index into RULES)
+    2       8     created, float64 epoch seconds
+    10      2     window minutes
+    12      8     threshold, float64
+    20      4     spin count
+    24      8     start balance, float64
+    32      8     end balance, float64
+    40      1+n   player ID, u8 length + UTF-8 (length 0 = none)
+    ..      1+n   tenant, u8 length + UTF-8 (length 0 = none)
+"""
+
+import json
+import struct
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from tilt_engine import RULE_BALANCE_DROP, RULE_RAPID_SPINNING, RuleHit
+
+RISK_HIGH = "HIGH"
+
+RULES = (RULE_RAPID_SPINNING, RULE_BALANCE_DROP)
+RULE_IDS = {rule: index for index, rule in enumerate(RULES)}
+
+ALERT_MESSAGES = {
+    RULE_RAPID_SPINNING: "⚠️ Tilt Alert: You've been spinning too fast. Take a break.",
+    RULE_BALANCE_DROP: "⚠️ Tilt Alert: Your balance is dropping quickly. Vault some winnings.",
+}
+
+FORMAT_VERSION = 1
+RECORD = struct.Struct("<BBdHdIdd")
+COUNT = struct.Struct("<I")
+MAX_ID_BYTES = 255
+
+
+class AlertRecord(NamedTuple):
+    """A fired tilt rule, with formatting deferred until display."""
+    rule: str
+    created: float  # epoch seconds
+    window_minutes: int
+    threshold: float  # spins for rapid spinning, fraction for balance drop
+    spin_count: int = 0
+    start_balance: float = 0.0
+    end_balance: float = 0.0
+    player_id: Optional[str] = None
+    tenant: Optional[str] = None
+
+    @property
+    def alert_message(self) -> str:
+        return ALERT_MESSAGES[self.rule]
+
+    @property
+    def risk_level(self) -> str:
+        return RISK_HIGH
+
+    @property
+    def timestamp(self) -> str:
+        """Local ISO timestamp, as datetime.now().isoformat() gave at creation."""
+        return datetime.fromtimestamp(self.created).isoformat()
+
+    @property
+    def details(self) -> Dict:
+        """The TiltAlert details dict (built on every access)."""
+        if self.rule == RULE_RAPID_SPINNING:
+            details = {
+                "spin_count": self.spin_count,
+                "time_window_minutes": self.window_minutes,
+                "threshold": self.threshold,
+                "avg_spin_rate": f"{self.spin_count / self.window_minutes:.1f} spins/min"
+            }
+        else:
+            balance_change = self.start_balance - self.end_balance
+            details = {
+                "start_balance": self.start_balance,
+                "end_balance": self.end_balance,
+                "balance_lost": float(balance_change),
+                "drop_percentage": f"{balance_change / self.start_balance * 100:.1f}%",
+                "time_window_minutes": self.window_minutes,
+                "threshold": f"{self.threshold * 100}%"
+            }
+        if self.player_id is not None:
+            details["player_id"] = self.player_id
+        if self.tenant is not None:
+            details["tenant"] = self.tenant
+        return details
+
+    def to_tilt_alert(self):
+        """The TiltAlert model for delivery to other agents."""
+        from agent_models import TiltAlert
+        return TiltAlert(alert_message=self.alert_message, risk_level=self.risk_level,
+                         timestamp=self.timestamp, details=self.details)
+
+    def to_json_dict(self) -> Dict:
+        """Numeric JSON form (no formatted strings)."""
+        data = {"rule": self.rule, "ts": self.created, "window_minutes": self.window_minutes,
+                "threshold": self.threshold}
+        if self.rule == RULE_RAPID_SPINNING:
+            data["spin_count"] = self.spin_count
+        else:
+            data["start_balance"] = self.start_balance
+            data["end_balance"] = self.end_balance
+        if self.player_id is not None:
+            data["player_id"] = self.player_id
+        if self.tenant is not None:
+            data["tenant"] = self.tenant
+        return data
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_json_dict(), separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def from_json_dict(cls, data: Dict) -> "AlertRecord":
+        if data["rule"] not in RULE_IDS:
+            raise ValueError(f"Unknown rule: {data['rule']}")
+        return cls(data["rule"], data["ts"], data["window_minutes"], data["threshold"],
+                   data.get("spin_count", 0), data.get("start_balance", 0.0), data.get("end_balance", 0.0),
+                   data.get("player_id"), data.get("tenant"))
+
+
+def rapid_spin_record(spin_count: int, window_minutes: int, threshold_spins: int,
+                      player_id: Optional[str] = None) -> AlertRecord:
+    """Record a rapid spinning alert."""
+    return AlertRecord(RULE_RAPID_SPINNING, time.time(), window_minutes, threshold_spins,
+                       spin_count=spin_count, player_id=player_id)
+
+
+def balance_drop_record(start_balance: float, end_balance: float, window_minutes: int,
+                        drop_threshold: float, player_id: Optional[str] = None) -> AlertRecord:
+    """Record a balance drop alert."""
+    return AlertRecord(RULE_BALANCE_DROP, time.time(), window_minutes, drop_threshold,
+                       start_balance=float(start_balance), end_balance=float(end_balance),
+                       player_id=player_id)
+
+
+def record_from_hit(hit: RuleHit) -> AlertRecord:
+    """Record for a TiltEngine rule hit, tagged with the player."""
+    metrics = hit.metrics
+    if hit.rule == RULE_RAPID_SPINNING:
+        return rapid_spin_record(metrics["spin_count"], metrics["time_window_minutes"],
+                                 metrics["threshold"], hit.player_id)
+    return balance_drop_record(metrics["start_balance"], metrics["end_balance"],
+                               metrics["time_window_minutes"], metrics["threshold"], hit.player_id)
+
+
+def _id_bytes(name: str, value: Optional[str]) -> bytes:
+    data = value.encode("utf-8") if value else b""
+    if len(data) > MAX_ID_BYTES:
+        raise ValueError(f"{name} longer than {MAX_ID_BYTES} bytes")
+    return bytes([len(data)]) + data
+
+
+def encode_alert(record: AlertRecord) -> bytes:
+    """
+    Encode one record (40 bytes plus player and tenant IDs).
+
+    Raises:
+        ValueError: For an unknown rule, or IDs or numbers that do not fit
+    """
+    try:
+        rule = RULE_IDS[record.rule]
+        packed = RECORD.pack(FORMAT_VERSION, rule, record.created, record.window_minutes, record.threshold,
+                             record.spin_count, record.start_balance, record.end_balance)
+    except (KeyError, struct.error) as e:
+        raise ValueError(f"Alert does not fit the record: {e}") from None
+    return packed + _id_bytes("player_id", record.player_id) + _id_bytes("tenant", record.tenant)
+
+
+def decode_alert_from(data: bytes, offset: int = 0) -> Tuple[AlertRecord, int]:
+    """
+    Decode the record starting at `offset`.
+
+    Returns:
+        (record, offset just past it)
+
+    Raises:
+        ValueError: On an unknown version or rule, or truncated data
+    """
+    if len(data) < offset + RECORD.size + 2:
+        raise ValueError("Truncated alert record")
+    version, rule, created, window, threshold, spins, start, end = RECORD.unpack_from(data, offset)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported alert format version {version}")
+    if rule >= len(RULES):
+        raise ValueError(f"Unknown rule ID {rule}")
+
+    ids = []
+    offset += RECORD.size
+    for _ in range(2):
+        if offset >= len(data):
+            raise ValueError("Truncated alert record")
+        length = data[offset]
+        value = bytes(data[offset + 1:offset + 1 + length])
+        if len(value) != length:
+            raise ValueError("Truncated alert record")
+        ids.append(value.decode("utf-8") if length else None)
+        offset += 1 + length
+
+    if RULES[rule] == RULE_RAPID_SPINNING:
+        threshold = int(threshold)
+    return AlertRecord(RULES[rule], created, window, threshold, spins, start, end, *ids), offset
+
+
+def decode_alert(data: bytes) -> AlertRecord:
+    """Decode one record."""
+    return decode_alert_from(data)[0]
+
+
+def encode_alerts(records: Iterable[AlertRecord]) -> bytes:
+    """Encode several records into one buffer (uint32 count, then records)."""
+    encoded = [encode_alert(record) for record in records]
+    return COUNT.pack(len(encoded)) + b"".join(encoded)
+
+
+def decode_alerts(data: bytes) -> List[AlertRecord]:
+    """Decode a buffer written by encode_alerts()."""
+    if len(data) < COUNT.size:
+        raise ValueError("Truncated alert buffer")
+    (count,) = COUNT.unpack_from(data)
+    offset = COUNT.size
+    records = []
+    for _ in range(count):
+        record, offset = decode_alert_from(data, offset)
+        records.append(record)
+    if offset != len(data):
+        raise ValueError("Trailing bytes after the last alert")
+    return records
@@ -0,0 +1,148 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Detector Checkpoints
+
+Periodic, crash-consistent snapshots of detector state (per-player windows,
+alert cooldowns and the session file offset) so a restarted agent resumes
+where it stopped instead of re-reading the whole session file and
+re-sending alerts.
+
+Snapshots are written to a temporary file, fsynced and atomically renamed
+over the previous checkpoint, so a crash mid-write leaves the last good
+checkpoint in place. Periodic saves do the file I/O in a worker thread so
+a slow disk does not stall the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class DetectorCheckpoint:
+    """Atomic JSON checkpoint file with a minimum save interval."""
+
+    def __init__(self, filepath: str, interval: float = 30.0):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            filepath: Checkpoint file path
+            interval: Minimum seconds between maybe_save() writes
+        """
+        self.filepath = filepath
+        self.interval = interval
+        self.last_saved = 0.0
+        self._writing = False
+        self._lock = threading.Lock()
+        # Serialization order of the latest and the last written contents
+        self._serial = 0
+        self._written = 0
+
+    def save(self, state: Dict):
+        """Write a checkpoint atomically."""
+        self.write(self.serialize(state), self._next_serial())
+
+    def _next_serial(self) -> int:
+        self._serial += 1
+        return self._serial
+
+    def serialize(self, state: Dict) -> str:
+        """Checkpoint file contents for a state."""
+        payload = {"version": CHECKPOINT_VERSION, "saved_at": time.time(), "state": state}
+        return json.dumps(payload, separators=(',', ':'))
+
+    def write(self, data: str, serial: int = 0):
+        """
+        Write serialized contents atomically (blocking; safe from a worker thread).
+
+        Args:
+            data: serialize() output
+            serial: Order in which the contents were serialized; older
+                contents never replace a newer checkpoint
+        """
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        tmp_path = f"{self.filepath}.tmp"
+
+        with self._lock:
+            if serial and serial < self._written:
+                return
+            self._written = serial
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+
+            # Persist the rename itself
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+
+        self.last_saved = time.monotonic()
+
+    async def maybe_save(self, state_fn: Callable[[], Dict]) -> bool:
+        """
+        Save if at least `interval` seconds passed since the last save.
+
+        The state is built and serialized on the event loop, so it is
+        consistent; the file write and fsyncs run in the default executor.
+
+        Args:
+            state_fn: Builds the state; only called when a save is due
+        """
+        if self._writing or time.monotonic() - self.last_saved < self.interval:
+            return False
+        data = self.serialize(state_fn())
+        self._writing = True
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.write, data, self._next_serial())
+        finally:
+            self._writing = False
+        return True
+
+    def load(self) -> Optional[Dict]:
+        """
+        Read the last checkpoint.
+
+        Returns:
+            The saved state, or None if there is no usable checkpoint
+        """
+        try:
+            with open(self.filepath, 'r') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error("Ignoring unreadable checkpoint %s: %s", self.filepath, e)
+            return None
+
+        if payload.get("version") != CHECKPOINT_VERSION:
+            logger.warning("Ignoring checkpoint %s with version %s", self.filepath, payload.get("version"))
+            return None
+
+        age = time.time() - payload.get("saved_at", 0)
+        logger.info("Loaded checkpoint %s (%.0fs old)", self.filepath, age)
+        return payload["state"]
@@ -0,0 +1,350 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Detector Cluster
+
+Spreads players over several detector nodes so one process is no longer
+the ceiling on how many players can be monitored.
+
+- HashRing assigns players to nodes by consistent hashing with virtual
+  nodes: adding or removing a node only moves about 1/N of the players.
+- ClusterNode wraps a TiltEngine holding only the players it owns. On a
+  membership change it exports the windows and cooldowns of players that
+  moved away, so the new owner continues from the same state instead of
+  re-reading history. It keeps them until the handoff is confirmed.
+- serve_node() exposes a node over multiprocessing.connection (Unix
+  socket or TCP, authenticated with a shared key).
+- ClusterClient is the routing helper: it finds the owning node for a
+  player, sends each node its share of the events, and coordinates the
+  state handoff when members join or leave.
+
+Usage:
+    python cluster.py --node-id n1 --address /tmp/tiltcheck_n1.sock
+"""
+
+import argparse
+import logging
+import os
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from multiprocessing.connection import Client, Listener
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from community_stats import hash64
+from tilt_engine import BetEvent, RuleHit, TiltEngine, TiltRules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VNODES = 128
+
+
+def ring_hash(key: str) -> int:
+    """Stable 64-bit position on the ring."""
+    return hash64(key)
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.nodes = set()
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        self._rebuild()
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self._rebuild()
+
+    def _rebuild(self):
+        points = sorted(
+            (ring_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(self.vnodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        """Node owning a key (the first virtual node clockwise from its hash)."""
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect_right(self._points, ring_hash(key))
+        return self._owners[index % len(self._owners)]
+
+
+class ClusterNode:
+    """A detector node that owns the players the ring assigns to it."""
+
+    def __init__(self, node_id: str, members: Iterable[str] = (), rules: Optional[TiltRules] = None,
+                 vnodes: int = DEFAULT_VNODES):
+        self.node_id = node_id
+        self.engine = TiltEngine(rules)
+        self.ring = HashRing(members or [node_id], vnodes)
+        # Players exported by the last set_members(), dropped by release()
+        self.handing_off: List[str] = []
+
+    def owns(self, player_id: str) -> bool:
+        return self.ring.node_for(player_id) == self.node_id
+
+    def ingest(self, events: List[BetEvent], now: Optional[float] = None) -> Tuple[List[RuleHit], List[BetEvent]]:
+        """
+        Ingest and evaluate the events of owned players.
+
+        Returns:
+            (hits, misrouted events that belong to another node)
+        """
+        owned, misrouted = [], []
+        for event in events:
+            (owned if self.owns(event.player_id) else misrouted).append(event)
+        changed = self.engine.ingest(owned)
+        return self.engine.evaluate(changed, now), misrouted
+
+    def set_members(self, members: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Switch to a new membership and export the players that moved away.
+
+        The players stay in the engine until release() is called, so a
+        handoff that fails can be retried by the next rebalance.
+
+        Returns:
+            New owner node -> export_players() state to hand over
+        """
+        self.ring = HashRing(members, self.ring.vnodes)
+        moved = defaultdict(list)
+        for player_id in set(self.engine.players) | set(self.engine.cooldowns):
+            owner = self.ring.node_for(player_id)
+            if owner != self.node_id:
+                moved[owner].append(player_id)
+
+        handoff = {owner: self.engine.export_players(players) for owner, players in moved.items()}
+        self.handing_off = [player_id for players in moved.values() for player_id in players]
+        if moved:
+            logger.info("Node %s handing off %d players to %d nodes", self.node_id,
+                        sum(len(p) for p in moved.values()), len(moved))
+        return handoff
+
+    def release(self) -> int:
+        """Drop the players exported by set_members() once the new owners hold them."""
+        players, self.handing_off = self.handing_off, []
+        self.engine.drop_players(players)
+        return len(players)
+
+    def accept_handoff(self, state: Dict) -> int:
+        """Take over players handed off by another node."""
+        self.engine.import_players(state)
+        return len(state.get("players", {}))
+
+    def handle(self, request: Dict):
+        """Dispatch one request received over the connection."""
+        op = request.get("op")
+        if op == "ingest":
+            return self.ingest(request["events"], request.get("now"))
+        if op == "members":
+            return self.set_members(request["members"])
+        if op == "handoff":
+            return self.accept_handoff(request["state"])
+        if op == "release":
+            return self.release()
+        if op == "players":
+            return sorted(self.engine.players)
+        if op == "ping":
+            return self.node_id
+        raise ValueError(f"Unknown op: {op}")
+
+
+def serve_node(node: ClusterNode, address, authkey: bytes):
+    """
+    Serve a node until a "shutdown" request arrives.
+
+    Each request is a dict with an "op" key; the reply is ("ok", result)
+    or ("error", message). Every client connection gets its own thread,
+    and requests are applied under one lock so the engine stays
+    single-threaded.
+    """
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def handle_connection(conn):
+        with conn:
+            while not stopped.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if request.get("op") == "shutdown":
+                    stopped.set()
+                    conn.send(("ok", None))
+                    # Wake the accept() below so the server loop sees the flag
+                    try:
+                        Client(address, authkey=authkey).close()
+                    except OSError:
+                        pass
+                    return
+                try:
+                    with lock:
+                        reply = ("ok", node.handle(request))
+                except Exception as e:
+                    logger.exception("Request %s failed", request.get("op"))
+                    reply = ("error", str(e))
+                conn.send(reply)
+
+    with Listener(address, authkey=authkey) as listener:
+        logger.info("Cluster node %s listening on %s", node.node_id, address)
+        while not stopped.is_set():
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # Failed authentication or handshake; keep serving
+                logger.warning("Rejected connection: %s", e)
+                continue
+            if stopped.is_set():
+                conn.close()
+                break
+            threading.Thread(target=handle_connection, args=(conn,), daemon=True).start()
+
+
+class ClusterClient:
+    """Routing helper: finds a player's node and coordinates rebalances."""
+
+    def __init__(self, members: Dict[str, object], authkey: bytes, vnodes: int = DEFAULT_VNODES):
+        """
+        Initialize the client.
+
+        Args:
+            members: Node ID -> connection address
+            authkey: Shared authentication key of the nodes
+            vnodes: Virtual nodes per member (must match the nodes)
+        """
+        self.members = dict(members)
+        self.authkey = authkey
+        self.vnodes = vnodes
+        self.ring = HashRing(self.members, vnodes)
+        self._connections = {}
+
+    def node_for(self, player_id: str) -> str:
+        """Node ID owning a player."""
+        return self.ring.node_for(player_id)
+
+    def address_for(self, player_id: str):
+        """Connection address of the node owning a player."""
+        return self.members[self.node_for(player_id)]
+
+    def _call(self, node_id: str, op: str, **payload):
+        conn = self._connections.get(node_id)
+        if conn is None:
+            conn = self._connections[node_id] = Client(self.members[node_id], authkey=self.authkey)
+        conn.send(dict(payload, op=op))
+        status, result = conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Node {node_id} failed {op}: {result}")
+        return result
+
+    def ingest(self, events: Iterable[BetEvent], now: Optional[float] = None) -> List[RuleHit]:
+        """Send every node its players' events and collect the rule hits."""
+        by_node = defaultdict(list)
+        for event in events:
+            by_node[self.node_for(event.player_id)].append(event)
+
+        hits = []
+        for node_id, node_events in by_node.items():
+            node_hits, misrouted = self._call(node_id, "ingest", events=node_events, now=now)
+            if misrouted:
+                raise RuntimeError(f"Node {node_id} disagrees on ownership of {len(misrouted)} events")
+            hits.extend(node_hits)
+        return hits
+
+    def players(self, node_id: str) -> List[str]:
+        """Players currently held by a node."""
+        return self._call(node_id, "players")
+
+    def rebalance(self, members: Dict[str, object]) -> int:
+        """
+        Move to a new membership and hand off state between nodes.
+
+        Nodes that are leaving must still be reachable so they can export
+        their players. Players are handed to their new owners first and only
+        then dropped from the old ones, so a failed handoff loses no state.
+        Returns the number of players that moved.
+        """
+        old_members = self.members
+        self.members = {**old_members, **members}
+        new_ids = sorted(members)
+
+        handoffs = {}
+        for node_id in sorted(self.members):
+            handoffs[node_id] = self._call(node_id, "members", members=new_ids)
+
+        moved = 0
+        for source, targets in handoffs.items():
+            for target, state in targets.items():
+                moved += self._call(target, "handoff", state=state)
+        for source, targets in handoffs.items():
+            if targets:
+                self._call(source, "release")
+
+        for node_id in set(self.members) - set(members):
+            self.close(node_id)
+        self.members = dict(members)
+        self.ring = HashRing(self.members, self.vnodes)
+        logger.info("Cluster rebalanced to %d nodes, %d players moved", len(members), moved)
+        return moved
+
+    def shutdown(self, node_id: str):
+        """Stop a node's server."""
+        self._call(node_id, "shutdown")
+        self.close(node_id)
+
+    def close(self, node_id: Optional[str] = None):
+        """Close one or all connections."""
+        for key in ([node_id] if node_id else list(self._connections)):
+            conn = self._connections.pop(key, None)
+            if conn is not None:
+                conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run one cluster node."""
+    parser = argparse.ArgumentParser(description="Run a TiltCheck detector cluster node")
+    parser.add_argument("--node-id", required=True, help="Unique node ID (its position on the ring)")
+    parser.add_argument("--address", required=True,
+                        help="Unix socket path, or host:port for TCP")
+    args = parser.parse_args(argv)
+
+    authkey = os.environ.get("TILTCHECK_CLUSTER_KEY")
+    if not authkey:
+        parser.error("TILTCHECK_CLUSTER_KEY must be set")
+
+    address = args.address
+    if ":" in address and not address.startswith("/"):
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    serve_node(ClusterNode(args.node_id), address, authkey.encode())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
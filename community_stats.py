@@ -0,0 +1,283 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Community Statistics
+
+Fixed-memory, approximate community-wide numbers built from the same bet
+events the detection engine ingests:
+- distinct active players per minute (HyperLogLog),
+- spins per minute (exact counter) and per-player spin estimates
+  (count-min sketch),
+- most played games and most active players (Misra-Gries heavy hitters).
+
+Stats are kept in per-minute buckets (by bet timestamp) for a bounded
+number of minutes. Every structure is mergeable, so shards and tenants
+can be combined with merge() or shipped as JSON with to_dict()/from_dict().
+"""
+
+import base64
+import hashlib
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tilt_engine import BetEvent, NS_PER_MINUTE
+
+
+def hash64(key: str) -> int:
+    """Stable 64-bit hash (identical across processes, unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HyperLogLog:
+    """Distinct count estimate with about 1.04 / sqrt(2^precision) relative error."""
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, key: str):
+        h = hash64(key)
+        index = h >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rest = h & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+
+class CountMinSketch:
+    """Frequency estimates that never undercount; overcount is at most ~e/width of the total."""
+
+    def __init__(self, width: int = 1024, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+
+    def _columns(self, key: str) -> List[int]:
+        # Kirsch-Mitzenmacher: derive `depth` hashes from two halves of one hash
+        h = hash64(key)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1):
+        for row, column in zip(self.rows, self._columns(key)):
+            row[column] += count
+
+    def estimate(self, key: str) -> int:
+        return min(row[column] for row, column in zip(self.rows, self._columns(key)))
+
+    def merge(self, other: "CountMinSketch"):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches with different dimensions")
+        for row, other_row in zip(self.rows, other.rows):
+            for i, value in enumerate(other_row):
+                if value:
+                    row[i] += value
+
+
+class HeavyHitters:
+    """
+    Misra-Gries summary with `capacity` counters.
+
+    Any key with more than total / (capacity + 1) occurrences is kept, and
+    kept counts undercount by at most that much.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self.counters: Dict[str, int] = {}
+
+    def add(self, key: str, count: int = 1):
+        counters = self.counters
+        if key in counters:
+            counters[key] += count
+        elif len(counters) < self.capacity:
+            counters[key] = count
+        else:
+            counters[key] = count
+            self._decrement(min(counters.values()))
+
+    def _decrement(self, amount: int):
+        self.counters = {k: v - amount for k, v in self.counters.items() if v > amount}
+
+    def top(self, k: int = 10) -> List[Tuple[str, int]]:
+        return sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def merge(self, other: "HeavyHitters"):
+        for key, count in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + count
+        if len(self.counters) > self.capacity:
+            # Subtract the (capacity + 1)-th largest count to restore the bound
+            counts = sorted(self.counters.values(), reverse=True)
+            self._decrement(counts[self.capacity])
+
+
+class MinuteStats:
+    """All sketches for one minute of bets."""
+
+    def __init__(self, precision: int = 12, cms_width: int = 1024, cms_depth: int = 4,
+                 heavy_hitters: int = 32):
+        self.spins = 0
+        self.players = HyperLogLog(precision)
+        self.player_spins = CountMinSketch(cms_width, cms_depth)
+        self.top_players = HeavyHitters(heavy_hitters)
+        self.top_games = HeavyHitters(heavy_hitters)
+
+    def add(self, event: BetEvent):
+        self.spins += 1
+        self.players.add(event.player_id)
+        self.player_spins.add(event.player_id)
+        self.top_players.add(event.player_id)
+        if event.game:
+            self.top_games.add(event.game)
+
+    def merge(self, other: "MinuteStats"):
+        self.spins += other.spins
+        self.players.merge(other.players)
+        self.player_spins.merge(other.player_spins)
+        self.top_players.merge(other.top_players)
+        self.top_games.merge(other.top_games)
+
+
+class CommunityStats:
+    """Per-minute community sketches over a bounded retention window."""
+
+    def __init__(self, retention_minutes: int = 60, precision: int = 12, cms_width: int = 1024,
+                 cms_depth: int = 4, heavy_hitters: int = 32):
+        """
+        Initialize the stats.
+
+        Args:
+            retention_minutes: Minute buckets kept (older ones are dropped)
+            precision: HyperLogLog precision (2^precision one-byte registers)
+            cms_width: Count-min sketch counters per row
+            cms_depth: Count-min sketch rows
+            heavy_hitters: Misra-Gries counters for top players and games
+        """
+        self.retention_minutes = retention_minutes
+        self._params = (precision, cms_width, cms_depth, heavy_hitters)
+        self.buckets: Dict[int, MinuteStats] = {}
+
+    def _bucket(self, minute: int) -> MinuteStats:
+        bucket = self.buckets.get(minute)
+        if bucket is None:
+            bucket = self.buckets[minute] = MinuteStats(*self._params)
+        return bucket
+
+    def ingest(self, events: Iterable[BetEvent]):
+        """Add bet events to their minute buckets."""
+        bucket, current = None, None
+        for event in events:
+            minute = event.timestamp // NS_PER_MINUTE
+            if minute != current:
+                bucket, current = self._bucket(minute), minute
+            bucket.add(event)
+        self._evict()
+
+    def _evict(self):
+        if len(self.buckets) <= self.retention_minutes:
+            return
+        for minute in sorted(self.buckets)[:-self.retention_minutes]:
+            del self.buckets[minute]
+
+    def minutes(self) -> List[int]:
+        """Minute indexes (since the epoch) with data, oldest first."""
+        return sorted(self.buckets)
+
+    def per_minute(self) -> List[Dict]:
+        """Distinct players and spins for every retained minute."""
+        return [
+            {"minute": minute, "spins": self.buckets[minute].spins,
+             "distinct_players": self.buckets[minute].players.count()}
+            for minute in self.minutes()
+        ]
+
+    def window(self, last_minutes: Optional[int] = None) -> MinuteStats:
+        """Merge the most recent `last_minutes` buckets (all if None)."""
+        merged = MinuteStats(*self._params)
+        minutes = self.minutes()
+        if last_minutes is not None:
+            minutes = minutes[-last_minutes:] if last_minutes > 0 else []
+        for minute in minutes:
+            merged.merge(self.buckets[minute])
+        return merged
+
+    def summary(self, last_minutes: Optional[int] = None, k: int = 10) -> Dict:
+        """Community numbers over the most recent minutes."""
+        merged = self.window(last_minutes)
+        return {
+            "minutes": len(self.buckets) if last_minutes is None else min(last_minutes, len(self.buckets)),
+            "spins": merged.spins,
+            "distinct_players": merged.players.count(),
+            "top_players": merged.top_players.top(k),
+            "top_games": merged.top_games.top(k),
+        }
+
+    def merge(self, other: "CommunityStats"):
+        """Merge another shard's stats into this one."""
+        if other._params != self._params:
+            raise ValueError("Cannot merge community stats with different sketch parameters")
+        for minute, bucket in other.buckets.items():
+            self._bucket(minute).merge(bucket)
+        self._evict()
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable export, e.g. for shipping a shard's stats."""
+        precision, cms_width, cms_depth, heavy_hitters = self._params
+        return {
+            "retention_minutes": self.retention_minutes,
+            "params": {"precision": precision, "cms_width": cms_width,
+                       "cms_depth": cms_depth, "heavy_hitters": heavy_hitters},
+            "buckets": {
+                str(minute): {
+                    "spins": b.spins,
+                    "players": base64.b64encode(bytes(b.players.registers)).decode('ascii'),
+                    "player_spins": [base64.b64encode(row.tobytes()).decode('ascii')
+                                     for row in b.player_spins.rows],
+                    "top_players": b.top_players.counters,
+                    "top_games": b.top_games.counters,
+                }
+                for minute, b in self.buckets.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CommunityStats":
+        """Re-create stats from a to_dict() export."""
+        stats = cls(retention_minutes=data["retention_minutes"], **data["params"])
+        for minute, b in data["buckets"].items():
+            bucket = stats._bucket(int(minute))
+            bucket.spins = b["spins"]
+            bucket.players.registers = bytearray(base64.b64decode(b["players"]))
+            for row, encoded in zip(bucket.player_spins.rows, b["player_spins"]):
+                row[:] = array('q', base64.b64decode(encoded))
+            bucket.top_players.counters = dict(b["top_players"])
+            bucket.top_games.counters = dict(b["top_games"])
+        return stats
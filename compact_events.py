@@ -0,0 +1,158 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Compact Event Storage
+
+Struct-of-arrays container for bets, used for the per-player windows the
+detection engine keeps in memory. Each bet takes 25 bytes:
+- timestamp: int64 nanoseconds since the epoch,
+- outcome: int8 code (session_schema.OUTCOME_CODES),
+- bet amount and balance: float64, exactly the float the parser produced.
+
+A list of BetEvent tuples costs roughly 180 bytes per bet (tuple, boxed
+int and floats, list slot). Amounts are kept as the original floats (not
+rounded to a fixed number of decimals) so the engine's balance-drop
+comparison sees the same values as the DataFrame rules in agent.py.
+
+view() and to_numpy() slice the columns without copying. While such a
+view is alive the arrays cannot grow (Python raises BufferError), so
+release views before appending more events.
+"""
+
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from session_schema import decode_outcome, encode_outcome
+
+BYTES_PER_EVENT = 8 + 1 + 8 + 8
+
+
+class ColumnView(NamedTuple):
+    """Zero-copy memoryviews over a range of rows."""
+    timestamps: memoryview
+    outcomes: memoryview
+    bets: memoryview
+    balances: memoryview
+
+
+class EventColumns:
+    """Typed, append-friendly columns of bets."""
+
+    __slots__ = ("timestamps", "outcomes", "bets", "balances")
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.outcomes = array('b')
+        self.bets = array('d')
+        self.balances = array('d')
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the column data."""
+        return len(self) * BYTES_PER_EVENT
+
+    def append(self, timestamp: int, bet_amount: float, outcome: str, balance: float):
+        self.timestamps.append(timestamp)
+        self.outcomes.append(encode_outcome(outcome))
+        self.bets.append(bet_amount)
+        self.balances.append(balance)
+
+    def insert(self, index: int, timestamp: int, bet_amount: float, outcome: str, balance: float):
+        if index >= len(self.timestamps):
+            self.append(timestamp, bet_amount, outcome, balance)
+            return
+        self.timestamps.insert(index, timestamp)
+        self.outcomes.insert(index, encode_outcome(outcome))
+        self.bets.insert(index, bet_amount)
+        self.balances.insert(index, balance)
+
+    def extend(self, events: Iterable):
+        """Append objects with timestamp/bet_amount/outcome/balance attributes (e.g. BetEvent)."""
+        for event in events:
+            self.append(event.timestamp, event.bet_amount, event.outcome, event.balance)
+
+    def delete_prefix(self, count: int):
+        """Drop the first `count` rows."""
+        if count:
+            del self.timestamps[:count]
+            del self.outcomes[:count]
+            del self.bets[:count]
+            del self.balances[:count]
+
+    def bet(self, index: int) -> float:
+        return self.bets[index]
+
+    def balance(self, index: int) -> float:
+        return self.balances[index]
+
+    def outcome(self, index: int) -> str:
+        return decode_outcome(self.outcomes[index])
+
+    def row(self, index: int) -> List:
+        """One row as [timestamp, bet_amount, outcome, balance]."""
+        return [self.timestamps[index], self.bet(index), self.outcome(index), self.balance(index)]
+
+    def rows(self) -> Iterator[List]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> ColumnView:
+        """Zero-copy view of rows [start, stop)."""
+        return ColumnView(
+            memoryview(self.timestamps)[start:stop],
+            memoryview(self.outcomes)[start:stop],
+            memoryview(self.bets)[start:stop],
+            memoryview(self.balances)[start:stop],
+        )
+
+    def to_numpy(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Zero-copy NumPy arrays of rows [start, stop) (requires numpy).
+
+        Returns:
+            Dict of timestamp (int64 ns), outcome (int8), bet_amount and
+            balance (float64)
+        """
+        import numpy as np
+
+        view = self.view(start, stop)
+        return {
+            "timestamp": np.frombuffer(view.timestamps, dtype=np.int64),
+            "outcome": np.frombuffer(view.outcomes, dtype=np.int8),
+            "bet_amount": np.frombuffer(view.bets, dtype=np.float64),
+            "balance": np.frombuffer(view.balances, dtype=np.float64),
+        }
+
+    @classmethod
+    def from_dataframe(cls, df) -> "EventColumns":
+        """
+        Build columns from a loaded session DataFrame without per-row objects.
+
+        Args:
+            df: DataFrame with timestamp (datetime64), bet_amount, outcome, balance
+        """
+        import numpy as np
+
+        columns = cls()
+        timestamps = df['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        outcomes = df['outcome'].map(encode_outcome).to_numpy(dtype=np.int8)
+        bets = np.ascontiguousarray(df['bet_amount'].to_numpy(dtype=np.float64))
+        balances = np.ascontiguousarray(df['balance'].to_numpy(dtype=np.float64))
+
+        columns.timestamps.frombytes(timestamps.tobytes())
+        columns.outcomes.frombytes(outcomes.tobytes())
+        columns.bets.frombytes(bets.tobytes())
+        columns.balances.frombytes(balances.tobytes())
+        return columns
@@ -20,8 +20,11 @@ without starting the uAgents framework (which would require network connectivity
 
 import pandas as pd
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from datetime import timedelta
+from typing import Optional
+
+from alert_records import AlertRecord, balance_drop_record, rapid_spin_record
+from session_summary import SessionSummaryEngine
 
 # Configure logging
 logging.basicConfig(
@@ -31,15 +34,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class TiltAlert:
-    """Model for tilt alert information"""
-    def __init__(self, alert_message: str, risk_level: str, timestamp: str, details: Dict):
-        self.alert_message = alert_message
-        self.risk_level = risk_level
-        self.timestamp = timestamp
-        self.details = details
-
-
 def load_csv_data(filepath: str) -> Optional[pd.DataFrame]:
     """Load gambling session data from CSV file."""
     try:
@@ -69,7 +63,7 @@ def load_csv_data(filepath: str) -> Optional[pd.DataFrame]:
 
 
 def check_rapid_spinning(df: pd.DataFrame, window_minutes: int = 5, 
-                        threshold_spins: int = 50) -> Optional[TiltAlert]:
+                        threshold_spins: int = 50) -> Optional[AlertRecord]:
     """Check if player has made too many spins in a short time window."""
     if len(df) < 2:
         return None
@@ -82,25 +76,13 @@ def check_rapid_spinning(df: pd.DataFrame, window_minutes: int = 5,
     spin_count = len(recent_spins)
     
     if spin_count > threshold_spins:
-        logger.warning(f"Rapid spinning detected: {spin_count} spins in {window_minutes} minutes")
-        
-        return TiltAlert(
-            alert_message=f"⚠️ Tilt Alert: You've been spinning too fast. Take a break.",
-            risk_level="HIGH",
-            timestamp=datetime.now().isoformat(),
-            details={
-                "spin_count": spin_count,
-                "time_window_minutes": window_minutes,
-                "threshold": threshold_spins,
-                "avg_spin_rate": f"{spin_count / window_minutes:.1f} spins/min"
-            }
-        )
+        return rapid_spin_record(spin_count, window_minutes, threshold_spins)
     
     return None
 
 
 def check_balance_drop(df: pd.DataFrame, window_minutes: int = 10, 
-                       drop_threshold: float = 0.30) -> Optional[TiltAlert]:
+                       drop_threshold: float = 0.30) -> Optional[AlertRecord]:
     """Check if player's balance has dropped significantly in a time window."""
     if len(df) < 2:
         return None
@@ -125,26 +107,12 @@ def check_balance_drop(df: pd.DataFrame, window_minutes: int = 10,
     drop_percentage = balance_change / start_balance
     
     if drop_percentage >= drop_threshold:
-        logger.warning(f"Significant balance drop detected: {drop_percentage*100:.1f}% in {window_minutes} minutes")
-        
-        return TiltAlert(
-            alert_message=f"⚠️ Tilt Alert: Your balance is dropping quickly. Vault some winnings.",
-            risk_level="HIGH",
-            timestamp=datetime.now().isoformat(),
-            details={
-                "start_balance": float(start_balance),
-                "end_balance": float(end_balance),
-                "balance_lost": float(balance_change),
-                "drop_percentage": f"{drop_percentage*100:.1f}%",
-                "time_window_minutes": window_minutes,
-                "threshold": f"{drop_threshold*100}%"
-            }
-        )
+        return balance_drop_record(start_balance, end_balance, window_minutes, drop_threshold)
     
     return None
 
 
-def display_alert(alert: TiltAlert):
+def display_alert(alert: AlertRecord):
     """Display a formatted alert"""
     print("=" * 70)
     print("🚨 TILT ALERT DETECTED 🚨")
@@ -172,21 +140,21 @@ def demo_tilt_detection(csv_file: str):
         print("❌ Failed to load session data")
         return
     
-    # Show session summary
+    # Show session summary (computed in one pass over the bets)
+    summary_engine = SessionSummaryEngine()
+    summary_engine.add_dataframe(df, session_id=csv_file)
+    summary = summary_engine.summary(csv_file)
     print("\n📊 Session Summary:")
-    print(f"  - Total spins: {len(df)}")
-    print(f"  - Time range: {df['timestamp'].min()} to {df['timestamp'].max()}")
-    duration = (df['timestamp'].max() - df['timestamp'].min()).total_seconds() / 60
-    print(f"  - Session duration: {duration:.1f} minutes")
-    print(f"  - Starting balance: ${df.iloc[0]['balance']:.2f}")
-    print(f"  - Ending balance: ${df.iloc[-1]['balance']:.2f}")
-    print(f"  - Total bet amount: ${df['bet_amount'].sum():.2f}")
-    
-    # Calculate overall stats
-    wins = len(df[df['outcome'] == 'win'])
-    losses = len(df[df['outcome'] == 'loss'])
-    win_rate = (wins / len(df)) * 100 if len(df) > 0 else 0
-    print(f"  - Win rate: {win_rate:.1f}% ({wins} wins, {losses} losses)")
+    print(f"  - Total spins: {summary['bets']}")
+    print(f"  - Time range: {pd.Timestamp(summary['first_timestamp'])} to {pd.Timestamp(summary['last_timestamp'])}")
+    print(f"  - Session duration: {summary['duration_minutes']:.1f} minutes")
+    print(f"  - Starting balance: ${summary['start_balance']:.2f}")
+    print(f"  - Ending balance: ${summary['end_balance']:.2f}")
+    print(f"  - Total bet amount: ${summary['total_bet']:.2f}")
+    print(f"  - Win rate: {summary['win_rate']:.1f}% ({summary['wins']} wins, {summary['losses']} losses)")
+    print(f"  - Longest streaks: {summary['longest_win_streak']} wins, {summary['longest_loss_streak']} losses")
+    print(f"  - Peak drawdown: ${summary['peak_drawdown']:.2f} ({summary['peak_drawdown_pct']:.1f}%)")
+    print(f"  - Pace: {summary['bets_per_minute']:.1f} bets/minute")
     
     # Check for tilt conditions
     print("\n🔍 Checking for Tilt Conditions...\n")
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Differential Testing Harness
+
+Checks that every faster detection path makes the same alert decisions as
+the reference rules:
+- check_rapid_spinning / check_balance_drop (the DataFrame rules, run on a
+  stable timestamp sort as load_csv_data does) for the session detectors,
+- TiltCheckSolanaAgent._calculate_tilt_score and _get_risk_level for the
+  tilt score paths.
+
+Sessions are generated at random and from adversarial families: bets
+exactly on window boundaries, exactly 50/51 spins, ties on one timestamp,
+exact 30% drops, zero and negative balances, unsorted input, sessions of
+0-2 bets, amounts with more than 4 decimals or below a cent, and NaN or
+infinite amounts. Non-finite rows are invalid input: the session file tail
+and the ingestion socket reject them, so the oracle sees the session
+without them. Every implementation in DETECTOR_IMPLEMENTATIONS and
+SCORE_IMPLEMENTATIONS is compared with the oracle on each input. Each
+divergence is shrunk to a minimal reproducer: fewest bets for sessions,
+simplest metrics for scores.
+
+A new fast path only needs an entry in one of the two registries.
+
+The default oracle is demo_agent, which runs the same rule bodies as
+agent.py without starting an agent. reference_drift() compares the two
+copies' syntax trees (ignoring docstrings and the alert type they build)
+and the harness refuses to run on a drifted copy.
+
+Usage:
+    python differential_harness.py --sessions 1000 --seed 7 [--reference agent] [--output repro/]
+"""
+
+import argparse
+import ast
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from session_schema import DEFAULT_PLAYER_ID
+from tilt_engine import (RULE_BALANCE_DROP, RULE_RAPID_SPINNING, BetEvent, NS_PER_MINUTE, SessionFileTail,
+                         TiltEngine, TiltRules)
+
+logger = logging.getLogger(__name__)
+
+# The Solana scorer lives with the MCP agents
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp", "agents")
+
+SESSION_START = 1_705_312_800 * 1_000_000_000  # 2024-01-15T10:00:00Z
+SESSION_KINDS = ("random", "spin_boundary", "drop_boundary", "ties", "zero_balance", "unsorted", "tiny",
+                 "precision", "non_finite")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REFERENCE_RULES = ("check_rapid_spinning", "check_balance_drop")
+# agent.py builds TiltAlert models, demo_agent builds AlertRecords
+_ALERT_BUILDERS = {"build_rapid_spin_alert": "rapid_spin_record", "build_balance_drop_alert": "balance_drop_record"}
+
+# A session is a list of (timestamp ns, bet_amount, outcome, balance) rows
+Row = Tuple[int, float, str, float]
+# (bet_frequency, balance_volatility, duration_minutes, loss_streak)
+Metrics = Tuple[float, float, float, int]
+
+
+class Decision(NamedTuple):
+    """Alert decisions for a session: spin count if rapid spinning fired, balances if the drop fired."""
+    rapid_spinning: Optional[int]
+    balance_drop: Optional[Tuple[float, float]]
+
+
+class Divergence(NamedTuple):
+    """An input on which an implementation disagrees with the oracle (already minimized)."""
+    family: str  # "session" or "score"
+    implementation: str
+    input: object
+    expected: object
+    actual: object
+    original_size: int
+
+    def reproducer(self) -> str:
+        """Session CSV or JSON metrics that reproduce the divergence."""
+        if self.family == "score":
+            return json.dumps(dict(zip(("bet_frequency", "balance_volatility", "duration_minutes",
+                                        "loss_streak"), self.input)))
+        lines = ["timestamp,bet_amount,outcome,balance"]
+        for timestamp, bet_amount, outcome, balance in self.input:
+            lines.append(f"{pd.Timestamp(timestamp).isoformat()},{bet_amount!r},{outcome},{balance!r}")
+        return "\n".join(lines) + "\n"
+
+
+class HarnessReport(NamedTuple):
+    sessions: int
+    scores: int
+    divergences: List[Divergence]
+
+
+def load_reference(source: str = "demo_agent") -> Dict[str, Callable]:
+    """
+    Reference rule functions.
+
+    demo_agent carries the same rule bodies as agent.py without creating an
+    agent (reference_drift() checks that they match); "agent" imports
+    agent.py itself (starts its uAgents setup).
+    """
+    if source not in ("demo_agent", "agent"):
+        raise ValueError(f"Unknown reference: {source}")
+    module = __import__(source)
+    return {"rapid_spinning": module.check_rapid_spinning, "balance_drop": module.check_balance_drop}
+
+
+def _rule_tree(module: str, name: str) -> str:
+    """Normalized syntax tree of a rule function, read from the module source."""
+    with open(os.path.join(HERE, f"{module}.py")) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            node.returns = None
+            if ast.get_docstring(node) is not None:
+                node.body = node.body[1:]
+            for child in ast.walk(node):
+                if isinstance(child, ast.Name):
+                    child.id = _ALERT_BUILDERS.get(child.id, child.id)
+            return ast.dump(node)
+    raise ValueError(f"{module}.py has no {name}()")
+
+
+def reference_drift() -> List[str]:
+    """Rule functions whose demo_agent copy differs from agent.py (empty when in sync)."""
+    return [name for name in REFERENCE_RULES if _rule_tree("demo_agent", name) != _rule_tree("agent", name)]
+
+
+def valid_rows(rows: List["Row"]) -> List["Row"]:
+    """Rows with finite amounts; the ingestion paths reject the others."""
+    return [row for row in rows if math.isfinite(row[1]) and math.isfinite(row[3])]
+
+
+_scorer = None
+
+
+def _solana_agent():
+    global _scorer
+    if _scorer is None:
+        if AGENTS_DIR not in sys.path:
+            sys.path.append(AGENTS_DIR)
+        from tiltcheck_solana_agent import TiltCheckSolanaAgent
+        _scorer = TiltCheckSolanaAgent()
+    return _scorer
+
+
+# Session generation -------------------------------------------------------
+
+def _bets(rng: random.Random, timestamps: List[int], start_balance: float) -> List[Row]:
+    rows, balance = [], start_balance
+    for timestamp in timestamps:
+        bet = round(rng.choice((1, 2, 5, 10, 25)) * rng.choice((1, 1, 2)), 2)
+        outcome = rng.choice(("loss", "loss", "win", "push"))
+        balance = round(balance + (bet if outcome == "win" else -bet if outcome == "loss" else 0), 2)
+        rows.append((timestamp, float(bet), outcome, float(balance)))
+    return rows
+
+
+def generate_session(rng: random.Random, kind: str, rules: TiltRules = TiltRules()) -> List[Row]:
+    """One session of the given family (see SESSION_KINDS)."""
+    spin_ns = rules.spin_window_minutes * NS_PER_MINUTE
+    drop_ns = rules.drop_window_minutes * NS_PER_MINUTE
+
+    if kind == "random":
+        count = rng.randrange(2, 160)
+        gap = rng.choice((1, 3, 6, 20, 60))
+        timestamps, t = [], SESSION_START
+        for _ in range(count):
+            t += int(rng.expovariate(1 / gap) * 1e9)
+            timestamps.append(t)
+        return _bets(rng, timestamps, rng.choice((50.0, 200.0, 1000.0)))
+
+    if kind == "spin_boundary":
+        # threshold_spins + {-1, 0, 1, 2} bets inside the window, the first exactly on its edge
+        latest = SESSION_START + spin_ns + rng.randrange(0, 3) * NS_PER_MINUTE
+        inside = rules.threshold_spins + rng.choice((-1, 0, 1, 2))
+        timestamps = [latest - spin_ns] + sorted(rng.randrange(latest - spin_ns, latest + 1)
+                                                 for _ in range(inside - 2)) + [latest]
+        before = [latest - spin_ns - rng.choice((1, 1_000, NS_PER_MINUTE)) for _ in range(rng.randrange(0, 4))]
+        return _bets(rng, sorted(before) + timestamps, 1000.0)
+
+    if kind == "drop_boundary":
+        # Exactly threshold drop (and just around it) between the window edge and the latest bet
+        start_balance = rng.choice((100.0, 1000.0, 333.33, 0.1))
+        factor = 1 - rules.drop_threshold + rng.choice((0.0, 0.0, 0.0001, -0.0001))
+        latest = SESSION_START + drop_ns
+        edge = latest - drop_ns
+        rows = [(edge - rng.choice((1, NS_PER_MINUTE)), 5.0, "win", start_balance * 2)] if rng.random() < 0.5 else []
+        rows.append((edge, 5.0, "loss", start_balance))
+        for t in sorted(rng.randrange(edge, latest) for _ in range(rng.randrange(0, 5))):
+            rows.append((t, 5.0, "loss", round(start_balance * rng.uniform(factor, 1.2), 2)))
+        rows.append((latest, 5.0, "loss", round(start_balance * factor, 4)))
+        return rows
+
+    if kind == "ties":
+        # Many bets on few timestamps; file order decides first/last balance
+        stamps = [SESSION_START + i * rng.choice((1, 30, 60)) * 1_000_000_000 for i in range(rng.randrange(1, 5))]
+        return _bets(rng, sorted(rng.choice(stamps) for _ in range(rng.randrange(2, 80))), 500.0)
+
+    if kind == "zero_balance":
+        rows = _bets(rng, [SESSION_START + i * 5_000_000_000 for i in range(rng.randrange(2, 60))], 0.0)
+        if rng.random() < 0.5:
+            rows[0] = rows[0][:3] + (rng.choice((0.0, -10.0)),)
+        return rows
+
+    if kind == "unsorted":
+        rows = generate_session(rng, rng.choice(("random", "spin_boundary", "drop_boundary", "ties")), rules)
+        rng.shuffle(rows)
+        return rows
+
+    if kind == "tiny":
+        return _bets(rng, [SESSION_START + i * NS_PER_MINUTE for i in range(rng.randrange(0, 3))], 100.0)
+
+    if kind == "precision":
+        # Unrounded and sub-cent balances a hair either side of the drop threshold
+        start_balance = rng.choice((100.00004, 0.00015, 0.004999, rng.uniform(1e-6, 1e-2), rng.uniform(1, 1e6)))
+        end_balance = rng.choice((start_balance * (1 - rules.drop_threshold),
+                                  0.70000003 * start_balance, 0.69999997 * start_balance,
+                                  start_balance - rules.drop_threshold * start_balance * (1 - 1e-7),
+                                  rng.choice((70.00003, 0.0001, 0.0035))))
+        latest = SESSION_START + rng.randrange(1, 10) * NS_PER_MINUTE
+        middle = [(t, rng.uniform(1e-5, 1.0), "loss", rng.uniform(end_balance, start_balance))
+                  for t in sorted(rng.randrange(SESSION_START, latest) for _ in range(rng.randrange(0, 4)))]
+        return ([(SESSION_START, rng.uniform(1e-5, 1.0), "loss", start_balance)] + middle
+                + [(latest, rng.uniform(1e-5, 1.0), "loss", end_balance)])
+
+    if kind == "non_finite":
+        rows = generate_session(rng, rng.choice(("spin_boundary", "drop_boundary", "precision")), rules)
+        for _ in range(rng.randrange(1, 4)):
+            index = rng.randrange(len(rows))
+            value = rng.choice((float("nan"), float("inf"), float("-inf")))
+            column = rng.choice((1, 3))
+            rows[index] = rows[index][:column] + (value,) + rows[index][column + 1:]
+        return rows
+
+    raise ValueError(f"Unknown session kind: {kind}")
+
+
+def generate_metrics(rng: random.Random) -> Metrics:
+    """Scorer inputs, mostly on or next to the scoring thresholds."""
+    def near(*edges):
+        edge = rng.choice(edges)
+        return edge + rng.choice((0, 0, 1e-9, -1e-9, 1, -1)) if rng.random() < 0.7 else rng.uniform(-1, 2 * max(edges))
+
+    return (near(30, 50), round(near(0.3, 0.5), 10), near(60, 120), int(near(3, 5)))
+
+
+# Oracles and implementations -----------------------------------------------
+
+def reference_decision(rows: List[Row], rules: TiltRules = TiltRules(),
+                       reference: Optional[Dict[str, Callable]] = None) -> Decision:
+    """Decision of the DataFrame rules on the valid rows (stable-sorted as load_csv_data does)."""
+    reference = reference or load_reference()
+    df = pd.DataFrame(valid_rows(rows), columns=["timestamp", "bet_amount", "outcome", "balance"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"].astype("int64"), unit="ns")
+    df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+    spin = reference["rapid_spinning"](df, rules.spin_window_minutes, rules.threshold_spins)
+    drop = reference["balance_drop"](df, rules.drop_window_minutes, rules.drop_threshold)
+    return Decision(
+        spin.details["spin_count"] if spin else None,
+        (float(drop.details["start_balance"]), float(drop.details["end_balance"])) if drop else None,
+    )
+
+
+def _decision(engine: TiltEngine) -> Decision:
+    hits = {hit.rule: hit.metrics for hit in engine.check_player(DEFAULT_PLAYER_ID)}
+    spin = hits.get(RULE_RAPID_SPINNING)
+    drop = hits.get(RULE_BALANCE_DROP)
+    return Decision(spin["spin_count"] if spin else None,
+                    (drop["start_balance"], drop["end_balance"]) if drop else None)
+
+
+def _events(rows: List[Row]) -> List[BetEvent]:
+    return [BetEvent(DEFAULT_PLAYER_ID, *row) for row in valid_rows(rows)]
+
+
+def engine_batch(rows: List[Row], rules: TiltRules) -> Decision:
+    """TiltEngine fed the whole session at once."""
+    engine = TiltEngine(rules)
+    engine.ingest(_events(rows))
+    return _decision(engine)
+
+
+def engine_incremental(rows: List[Row], rules: TiltRules) -> Decision:
+    """TiltEngine fed in uneven appends, as the file tail delivers them."""
+    engine = TiltEngine(rules)
+    rng = random.Random(len(rows))
+    events, start = _events(rows), 0
+    while start < len(events):
+        size = rng.choice((1, 1, 2, 7, 30))
+        engine.ingest(events[start:start + size])
+        start += size
+    return _decision(engine)
+
+
+def engine_restored(rows: List[Row], rules: TiltRules) -> Decision:
+    """TiltEngine checkpointed (JSON) halfway and restored into a new engine."""
+    engine = TiltEngine(rules)
+    events = _events(rows)
+    engine.ingest(events[:len(events) // 2])
+    restored = TiltEngine(rules)
+    restored.restore(json.loads(json.dumps(engine.snapshot())))
+    restored.ingest(events[len(events) // 2:])
+    return _decision(restored)
+
+
+def engine_file_tail(rows: List[Row], rules: TiltRules) -> Decision:
+    """TiltEngine fed by SessionFileTail from a CSV file (parses and rejects rows itself)."""
+    engine = TiltEngine(rules)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance\n")
+            for timestamp, bet_amount, outcome, balance in rows:
+                f.write(f"{pd.Timestamp(timestamp).isoformat()},{bet_amount!r},{outcome},{balance!r}\n")
+        engine.ingest(SessionFileTail(path).read_new())
+    return _decision(engine)
+
+
+DETECTOR_IMPLEMENTATIONS: Dict[str, Callable[[List[Row], TiltRules], Decision]] = {
+    "tilt_engine.batch": engine_batch,
+    "tilt_engine.incremental": engine_incremental,
+    "tilt_engine.checkpoint_restore": engine_restored,
+    "tilt_engine.file_tail": engine_file_tail,
+}
+
+
+def reference_score(metrics: Metrics) -> Tuple[float, str]:
+    """Tilt score and risk level from the scorer's reference functions."""
+    agent = _solana_agent()
+    score = agent._calculate_tilt_score(*metrics)
+    return score, agent._get_risk_level(score)
+
+
+def _session(metrics: Metrics) -> Dict:
+    bet_frequency, balance_volatility, duration, loss_streak = metrics
+    return {"session_id": "differential", "bet_frequency": bet_frequency,
+            "balance_volatility": balance_volatility, "duration_minutes": duration, "loss_streak": loss_streak}
+
+
+def score_single(metrics: Metrics) -> Tuple[float, str]:
+    """analyze_behavioral_data, one session per call."""
+    result = _solana_agent().analyze_behavioral_data(_session(metrics))
+    return result["tilt_score"], result["risk_level"]
+
+
+def score_batch(metrics: Metrics) -> Tuple[float, str]:
+    """analyze_batch, the micro-batched scoring service path."""
+    agent = _solana_agent()
+    filler = [_session((0, 0, 0, 0)), _session((99, 0.9, 200, 9))]
+    result = agent.analyze_batch(filler + [_session(metrics)] + filler)[len(filler)]
+    return result["tilt_score"], result["risk_level"]
+
+
+def score_compact(metrics: Metrics) -> Tuple[float, str]:
+    """analyze_batch_compact, scored into AnalysisRecord tuples."""
+    record = _solana_agent().analyze_batch_compact([_session(metrics)])[0]
+    return record.tilt_score, record.risk_level
+
+
+SCORE_IMPLEMENTATIONS: Dict[str, Callable[[Metrics], Tuple[float, str]]] = {
+    "solana_agent.analyze_behavioral_data": score_single,
+    "solana_agent.analyze_batch": score_batch,
+    "solana_agent.analyze_batch_compact": score_compact,
+}
+
+
+# Minimization ------------------------------------------------------------
+
+def _outcome(func, *args):
+    try:
+        return func(*args)
+    except Exception as e:  # a crash is a divergence too
+        return f"{type(e).__name__}: {e}"
+
+
+def minimize_session(rows: List[Row], diverges: Callable[[List[Row]], bool]) -> List[Row]:
+    """Delta debugging: drop chunks, then single bets, while the divergence persists."""
+    chunks = 2
+    while len(rows) >= 2:
+        size = max(1, len(rows) // chunks)
+        for start in range(0, len(rows), size):
+            candidate = rows[:start] + rows[start + size:]
+            if diverges(candidate):
+                rows = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            chunks = min(chunks * 2, len(rows))
+    return rows
+
+
+def minimize_metrics(metrics: Metrics, diverges: Callable[[Metrics], bool]) -> Metrics:
+    """Replace each metric by 0, then by a rounded value, while the divergence persists."""
+    metrics = list(metrics)
+    for index in range(len(metrics)):
+        for simpler in (0, round(metrics[index]), round(metrics[index], 2)):
+            candidate = metrics[:index] + [type(metrics[index])(simpler)] + metrics[index + 1:]
+            if candidate != metrics and diverges(tuple(candidate)):
+                metrics = candidate
+                break
+    return tuple(metrics)
+
+
+# Runner ------------------------------------------------------------------
+
+def check_session(rows: List[Row], rules: TiltRules, reference: Dict[str, Callable],
+                  implementations: Dict[str, Callable]) -> List[Divergence]:
+    """Compare every detector with the oracle on one session."""
+    expected = reference_decision(rows, rules, reference)
+    divergences = []
+    for name, implementation in implementations.items():
+        if _outcome(implementation, rows, rules) == expected:
+            continue
+
+        def diverges(candidate, implementation=implementation):
+            return _outcome(implementation, candidate, rules) != reference_decision(candidate, rules, reference)
+
+        minimal = minimize_session(list(rows), diverges)
+        divergences.append(Divergence("session", name, minimal, reference_decision(minimal, rules, reference),
+                                      _outcome(implementation, minimal, rules), len(rows)))
+    return divergences
+
+
+def check_score(metrics: Metrics, implementations: Dict[str, Callable]) -> List[Divergence]:
+    """Compare every scorer path with the oracle on one set of metrics."""
+    expected = reference_score(metrics)
+    divergences = []
+    for name, implementation in implementations.items():
+        if _outcome(implementation, metrics) == expected:
+            continue
+
+        def diverges(candidate, implementation=implementation):
+            return _outcome(implementation, candidate) != reference_score(candidate)
+
+        minimal = minimize_metrics(metrics, diverges)
+        divergences.append(Divergence("score", name, minimal, reference_score(minimal),
+                                      _outcome(implementation, minimal), 4))
+    return divergences
+
+
+def run_harness(sessions: int = 500, scores: int = 500, seed: int = 0, rules: TiltRules = TiltRules(),
+                reference: str = "demo_agent",
+                detectors: Optional[Dict[str, Callable]] = None,
+                scorers: Optional[Dict[str, Callable]] = None) -> HarnessReport:
+    """
+    Compare all implementations with the reference oracles.
+
+    Args:
+        sessions: Generated sessions (spread over SESSION_KINDS)
+        scores: Generated scorer inputs
+        seed: Random seed; the same seed generates the same inputs
+        rules: Rule thresholds for both sides
+        reference: "demo_agent" or "agent" (see load_reference)
+        detectors: Detector implementations (default DETECTOR_IMPLEMENTATIONS)
+        scorers: Scorer implementations (default SCORE_IMPLEMENTATIONS)
+
+    Returns:
+        HarnessReport with one minimized Divergence per failing input and implementation
+
+    Raises:
+        RuntimeError: If demo_agent's rule copies no longer match agent.py
+    """
+    if reference == "demo_agent":
+        drifted = reference_drift()
+        if drifted:
+            raise RuntimeError(f"demo_agent rules differ from agent.py: {', '.join(drifted)}")
+    rng = random.Random(seed)
+    oracle = load_reference(reference)
+    detectors = DETECTOR_IMPLEMENTATIONS if detectors is None else detectors
+    scorers = SCORE_IMPLEMENTATIONS if scorers is None else scorers
+
+    divergences = []
+    for i in range(sessions):
+        rows = generate_session(rng, SESSION_KINDS[i % len(SESSION_KINDS)], rules)
+        divergences.extend(check_session(rows, rules, oracle, detectors))
+    for _ in range(scores):
+        divergences.extend(check_score(generate_metrics(rng), scorers))
+    return HarnessReport(sessions, scores, divergences)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the harness and report divergences."""
+    parser = argparse.ArgumentParser(description="Compare TiltCheck detector implementations with the reference rules")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--scores", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference", choices=("demo_agent", "agent"), default="demo_agent")
+    parser.add_argument("--output", help="Directory for reproducer files")
+    args = parser.parse_args(argv)
+
+    # Thousands of generated alerts and scores; keep only errors on the console
+    logging.disable(logging.WARNING)
+    try:
+        report = run_harness(args.sessions, args.scores, args.seed, reference=args.reference)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+    finally:
+        logging.disable(logging.NOTSET)
+    print(f"Checked {report.sessions} sessions against {len(DETECTOR_IMPLEMENTATIONS)} detectors and "
+          f"{report.scores} scorer inputs against {len(SCORE_IMPLEMENTATIONS)} scorers")
+    if not report.divergences:
+        print("✅ No divergences from the reference rules")
+        return 0
+
+    for n, divergence in enumerate(report.divergences):
+        print(f"\n❌ {divergence.implementation}: expected {divergence.expected}, got {divergence.actual} "
+              f"(reduced from {divergence.original_size} to {len(divergence.input)} inputs)")
+        print(divergence.reproducer())
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+            extension = "json" if divergence.family == "score" else "csv"
+            with open(os.path.join(args.output, f"divergence-{n}.{extension}"), "w") as f:
+                f.write(divergence.reproducer())
+    print(f"{len(report.divergences)} divergence(s)")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Risk-Adaptive Evaluation Scheduler
+
+Decides when each player's tilt rules are evaluated. New bets are still
+ingested as soon as they arrive, but the rule evaluation for a player is
+scheduled according to how close the player is to tilt:
+- at or above `urgent_risk` (default 0.8 of an alert threshold) the player
+  is due after `urgent_interval` seconds (0 = in the same tick),
+- below that the delay grows geometrically from `min_interval` towards
+  `max_interval` as the risk approaches zero,
+- players without new bets are not scheduled at all: the rules are anchored
+  at a player's latest bet, so re-checking an idle player cannot change
+  the outcome.
+
+A player can only trigger an alert at a risk ratio of 1.0 or more, so the
+deferred low-risk evaluations never delay an alert; they only stop the
+agent from re-running the rules for every quiet player on every append.
+
+Because risk is re-computed on every ingest, a player who crosses a
+threshold is pulled forward immediately; a pending evaluation is never
+postponed by later, lower-risk updates.
+
+Due times live in a heapq priority queue with lazy deletion: rescheduling
+pushes a new entry and stale entries are skipped when popped.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EvalScheduler:
+    """Priority queue of per-player evaluation due times."""
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 120.0,
+                 urgent_risk: float = 0.8, urgent_interval: float = 0.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_interval: Delay for players just below urgent_risk (seconds)
+            max_interval: Delay for players with zero risk (seconds)
+            urgent_risk: Risk ratio (1.0 = alert threshold) treated as urgent
+            urgent_interval: Delay for players at or above urgent_risk (seconds)
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Need 0 < min_interval <= max_interval")
+        self.urgent_interval = urgent_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.urgent_risk = urgent_risk
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped = False
+
+        self.scheduled = 0
+        self.evaluated = 0
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def interval_for(self, risk: float) -> float:
+        """Evaluation delay for a player with the given risk ratio."""
+        if risk >= self.urgent_risk:
+            return self.urgent_interval
+        fraction = max(risk, 0.0) / self.urgent_risk
+        return self.max_interval * (self.min_interval / self.max_interval) ** fraction
+
+    def schedule(self, player_id: str, risk: float, now: Optional[float] = None) -> float:
+        """
+        Schedule a player that received new bets.
+
+        Returns:
+            The player's due time (an earlier pending due time is kept)
+        """
+        now = time.monotonic() if now is None else now
+        due = now + self.interval_for(risk)
+        current = self._due.get(player_id)
+        if current is not None and current <= due:
+            return current
+
+        self._due[player_id] = due
+        heapq.heappush(self._heap, (due, next(self._sequence), player_id))
+        self.scheduled += 1
+
+        if self._wakeup is not None and self._heap[0][2] == player_id:
+            self._wakeup.set()
+        return due
+
+    def next_due(self) -> Optional[float]:
+        """Earliest pending due time, or None if nothing is scheduled."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return every player whose evaluation is due."""
+        now = time.monotonic() if now is None else now
+        due_players = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due, _, player_id = heapq.heappop(heap)
+            if self._due.get(player_id) == due:
+                del self._due[player_id]
+                due_players.append(player_id)
+        self.evaluated += len(due_players)
+        return due_players
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    async def run(self, evaluate: Callable[[List[str]], Awaitable[None]]):
+        """
+        Evaluate due players until stop() is called.
+
+        Args:
+            evaluate: Coroutine function awaited with each batch of due players
+        """
+        self._wakeup = asyncio.Event()
+        while not self._stopped:
+            players = self.pop_due()
+            if players:
+                try:
+                    await evaluate(players)
+                except Exception:
+                    logger.exception("Scheduled evaluation failed")
+
+            next_due = self.next_due()
+            delay = self.max_interval if next_due is None else max(0.0, next_due - time.monotonic())
+            self._wakeup.clear()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0)
+        self._wakeup = None
+
+    def stop(self):
+        """Stop the run loop."""
+        self._stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def metrics(self) -> Dict[str, int]:
+        """Return scheduler counters."""
+        return {"pending": len(self._due), "scheduled": self.scheduled, "evaluated": self.evaluated}
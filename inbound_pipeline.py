@@ -0,0 +1,182 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Inbound Message Pipeline
+
+Bounded asyncio queue between the uAgents message handlers and the code
+that processes peer messages. Handlers only enqueue; consumer tasks drain
+the queue in batches and yield to the event loop between batches, so a
+burst from peer agents cannot delay a tilt check.
+
+Overflow policies when the queue is full:
+- drop_oldest: discard the oldest queued message to make room
+- reject: refuse the new message
+- block: wait for room (backpressure on the sender's handler)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_REJECT = "reject"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_REJECT, OVERFLOW_BLOCK)
+
+
+class InboundPipeline:
+    """Bounded queue with batch-draining consumers and queue-depth metrics."""
+
+    def __init__(self, handler: Callable[[List[Any]], Awaitable[None]],
+                 maxsize: int = 1000, batch_size: int = 50, consumers: int = 1,
+                 overflow: str = OVERFLOW_DROP_OLDEST,
+                 block_timeout: Optional[float] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            handler: Coroutine function called with each batch of items
+            maxsize: Maximum number of queued items
+            batch_size: Maximum number of items per handler call
+            consumers: Number of consumer tasks
+            overflow: Overflow policy (drop_oldest, reject or block)
+            block_timeout: With the block policy, give up after this many
+                seconds and count the item as rejected (None waits forever)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if maxsize < 1 or batch_size < 1 or consumers < 1:
+            raise ValueError("maxsize, batch_size and consumers must be positive")
+
+        self.handler = handler
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.consumers = consumers
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so the queue binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    def start(self):
+        """Start the consumer tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.ensure_future(self._consume()) for _ in range(self.consumers)]
+        logger.info("Inbound pipeline started: maxsize=%d batch_size=%d consumers=%d overflow=%s",
+                    self.maxsize, self.batch_size, self.consumers, self.overflow)
+
+    async def stop(self, drain: bool = True):
+        """
+        Stop the consumers.
+
+        Args:
+            drain: Process everything already queued before stopping
+        """
+        if drain and self._tasks:
+            await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, item: Any) -> bool:
+        """
+        Enqueue an item according to the overflow policy.
+
+        Returns:
+            True if the item was queued, False if it was rejected
+        """
+        queue = self.queue
+        if queue.full():
+            if self.overflow == OVERFLOW_REJECT:
+                self.rejected += 1
+                return False
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                try:
+                    queue.get_nowait()
+                    queue.task_done()
+                    self.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+            elif self.overflow == OVERFLOW_BLOCK:
+                try:
+                    await asyncio.wait_for(queue.put(item), self.block_timeout)
+                except asyncio.TimeoutError:
+                    self.rejected += 1
+                    return False
+                self._record_enqueue()
+                return True
+
+        queue.put_nowait(item)
+        self._record_enqueue()
+        return True
+
+    def _record_enqueue(self):
+        self.enqueued += 1
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    async def _consume(self):
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await self.handler(batch)
+                self.processed += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error("Inbound batch of %d failed: %s", len(batch), e)
+            finally:
+                self.batches += 1
+                for _ in batch:
+                    queue.task_done()
+
+            # Let detection and other handlers run between batches
+            await asyncio.sleep(0)
+
+    def metrics(self) -> Dict[str, int]:
+        """Return queue depth and throughput counters."""
+        return {
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
@@ -0,0 +1,277 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Ingestion Deduplication
+
+Upstream feeds retry, and a re-delivered burst of bet rows would otherwise
+be counted twice by the tilt rules. EventDeduplicator drops events that
+were already ingested, keyed on the event_id column when the feed has one,
+otherwise on (player, timestamp, bet_amount, balance).
+
+Per player it keeps:
+- an exact set of 64-bit fingerprints for events inside a time window
+  behind the player's latest bet (and at most `max_recent` of them), and
+- two generations of a fixed-size Bloom filter for the events that left
+  the window.
+
+Events newer than anything moved to the Bloom filter are checked against
+the exact set only, so live traffic is never dropped by a false positive.
+Only late or replayed events consult the filter; at the default size a
+generation holds about 800 events at a 1% false positive rate before it
+rotates. Memory per player is fixed: `max_recent` fingerprints plus two
+filters, and evict_idle() drops players that stopped betting.
+
+The state is small and JSON-serializable (state()/restore()), so it goes
+into the detector checkpoint and a feed re-delivering after a restart is
+filtered without re-reading any history.
+"""
+
+import base64
+import logging
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from community_stats import hash64
+from session_schema import EVENT_ID_COLUMN, PLAYER_COLUMN
+from tilt_engine import BetEvent
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying a bet when the feed has no event_id column
+DEDUP_KEY_COLUMNS = ['timestamp', 'bet_amount', 'balance']
+
+
+def event_fingerprint(event: BetEvent) -> int:
+    """Stable 64-bit identity of a bet (explicit event ID when present)."""
+    if event.event_id:
+        return hash64(f"id|{event.event_id}")
+    return hash64(f"{event.player_id}|{event.timestamp}|{event.bet_amount!r}|{event.balance!r}")
+
+
+def duplicate_key_columns(columns: Iterable[str]) -> List[str]:
+    """DataFrame columns that identify a bet, for drop_duplicates(subset=...)."""
+    columns = list(columns)
+    if EVENT_ID_COLUMN in columns:
+        return [EVENT_ID_COLUMN]
+    player = [PLAYER_COLUMN] if PLAYER_COLUMN in columns else []
+    return player + DEDUP_KEY_COLUMNS
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit fingerprints."""
+
+    __slots__ = ("bits", "hashes", "count")
+
+    def __init__(self, bits: int = 8192, hashes: int = 7):
+        self.bits = bytearray((bits + 7) // 8)
+        self.hashes = hashes
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        """Insertions at which the false positive rate reaches its design point."""
+        return int(len(self.bits) * 8 * math.log(2) / self.hashes)
+
+    def _positions(self, fingerprint: int) -> List[int]:
+        # Kirsch-Mitzenmacher, as in CountMinSketch
+        size = len(self.bits) * 8
+        h1, h2 = fingerprint & 0xFFFFFFFF, (fingerprint >> 32) | 1
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, fingerprint: int):
+        for position in self._positions(fingerprint):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fingerprint: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(fingerprint))
+
+    def to_dict(self) -> Dict:
+        return {"bits": base64.b64encode(bytes(self.bits)).decode('ascii'),
+                "hashes": self.hashes, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BloomFilter":
+        bloom = cls(0, data["hashes"])
+        bloom.bits = bytearray(base64.b64decode(data["bits"]))
+        bloom.count = data["count"]
+        return bloom
+
+
+class PlayerDedup:
+    """Recent fingerprints (exact) and older ones (Bloom) for one player."""
+
+    __slots__ = ("recent", "order", "latest", "through", "bloom", "previous", "touched")
+
+    def __init__(self, bloom_bits: int, bloom_hashes: int):
+        self.recent: Set[int] = set()
+        # (timestamp, fingerprint) in arrival order, for eviction
+        self.order: Deque[Tuple[int, int]] = deque()
+        self.latest: Optional[int] = None
+        # Newest timestamp moved to the Bloom filter (None: nothing moved yet)
+        self.through: Optional[int] = None
+        self.bloom = BloomFilter(bloom_bits, bloom_hashes)
+        self.previous: Optional[BloomFilter] = None
+        # Wall-clock time of the last recorded event, for idle eviction
+        self.touched = time.time()
+
+    def seen(self, timestamp: int, fingerprint: int) -> bool:
+        if fingerprint in self.recent:
+            return True
+        if self.through is None or timestamp > self.through:
+            return False
+        return fingerprint in self.bloom or (self.previous is not None and fingerprint in self.previous)
+
+    def add(self, timestamp: int, fingerprint: int):
+        self.recent.add(fingerprint)
+        self.order.append((timestamp, fingerprint))
+        if self.latest is None or timestamp > self.latest:
+            self.latest = timestamp
+
+    def evict(self, window_ns: int, max_recent: int):
+        """Move fingerprints that left the window (or exceed the cap) to the Bloom filter."""
+        cutoff = self.latest - window_ns
+        order = self.order
+        while order and (order[0][0] < cutoff or len(order) > max_recent):
+            timestamp, fingerprint = order.popleft()
+            self.recent.discard(fingerprint)
+            if self.bloom.count >= self.bloom.capacity:
+                self.previous = self.bloom
+                self.bloom = BloomFilter(len(self.bloom.bits) * 8, self.bloom.hashes)
+            self.bloom.add(fingerprint)
+            if self.through is None or timestamp > self.through:
+                self.through = timestamp
+
+
+class EventDeduplicator:
+    """Drops bet events that were already ingested."""
+
+    def __init__(self, window_seconds: float = 900.0, max_recent: int = 2048,
+                 bloom_bits: int = 8192, bloom_hashes: int = 7):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            window_seconds: Exact-set window behind each player's latest bet
+                (should cover the feed's retry horizon and the longest rule window)
+            max_recent: Most fingerprints kept exactly per player
+            bloom_bits: Size of each Bloom filter generation
+            bloom_hashes: Hash functions per Bloom filter
+        """
+        self.window_ns = int(window_seconds * 1_000_000_000)
+        self.max_recent = max_recent
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self.players: Dict[str, PlayerDedup] = {}
+        self.duplicates = 0
+
+    def filter(self, events: Iterable[BetEvent]) -> List[BetEvent]:
+        """
+        Return the events not seen before, in their original order, and
+        remember them.
+
+        Duplicates within the same batch are dropped as well.
+        """
+        fresh = self.unseen(events)
+        self.record(fresh)
+        return fresh
+
+    def unseen(self, events: Iterable[BetEvent]) -> List[BetEvent]:
+        """
+        Return the events not seen before without remembering them.
+
+        Call record() once the events were accepted downstream, so a batch
+        that fails to ingest is not dropped as a duplicate on its retry.
+        """
+        fresh = []
+        batch = set()
+        before = self.duplicates
+        for event in events:
+            fingerprint = event_fingerprint(event)
+            player = self.players.get(event.player_id)
+            key = (event.player_id, fingerprint)
+            if key in batch or (player is not None and player.seen(event.timestamp, fingerprint)):
+                self.duplicates += 1
+                continue
+            batch.add(key)
+            fresh.append(event)
+
+        if self.duplicates > before:
+            logger.info("Dropped %d duplicate events (%d total)", self.duplicates - before, self.duplicates)
+        return fresh
+
+    def record(self, events: Iterable[BetEvent]):
+        """Remember events returned by unseen() that were ingested."""
+        touched = set()
+        for event in events:
+            player = self.players.get(event.player_id)
+            if player is None:
+                player = self.players[event.player_id] = PlayerDedup(self.bloom_bits, self.bloom_hashes)
+            player.add(event.timestamp, event_fingerprint(event))
+            touched.add(event.player_id)
+
+        now = time.time()
+        for player_id in touched:
+            player = self.players[player_id]
+            player.touched = now
+            player.evict(self.window_ns, self.max_recent)
+
+    def evict_idle(self, idle_seconds: float, now: Optional[float] = None) -> List[str]:
+        """
+        Forget players that recorded no events for `idle_seconds`.
+
+        Call it alongside TiltEngine.evict_idle: a re-delivery after that
+        long is older than the feed's retry horizon. Evicted players also
+        leave the checkpoint state.
+
+        Returns:
+            The evicted player IDs
+        """
+        now = time.time() if now is None else now
+        idle = [player_id for player_id, player in self.players.items() if now - player.touched >= idle_seconds]
+        for player_id in idle:
+            del self.players[player_id]
+        if idle:
+            logger.debug("Evicted %d idle players from deduplication (%d left)", len(idle), len(self.players))
+        return idle
+
+    def state(self) -> Dict:
+        """Export as JSON-serializable data (for the detector checkpoint)."""
+        players = {}
+        for player_id, player in self.players.items():
+            players[player_id] = {
+                "latest": player.latest,
+                "through": player.through,
+                "recent": [list(entry) for entry in player.order],
+                "bloom": player.bloom.to_dict(),
+                "previous": player.previous.to_dict() if player.previous is not None else None,
+            }
+        return {"players": players, "duplicates": self.duplicates}
+
+    def restore(self, state: Dict):
+        """Replace the state with a state() export."""
+        self.players = {}
+        for player_id, data in state.get("players", {}).items():
+            player = PlayerDedup(self.bloom_bits, self.bloom_hashes)
+            for timestamp, fingerprint in data["recent"]:
+                player.recent.add(fingerprint)
+                player.order.append((timestamp, fingerprint))
+            player.latest = data["latest"]
+            player.through = data["through"]
+            player.bloom = BloomFilter.from_dict(data["bloom"])
+            if data["previous"] is not None:
+                player.previous = BloomFilter.from_dict(data["previous"])
+            self.players[player_id] = player
+        self.duplicates = state.get("duplicates", 0)
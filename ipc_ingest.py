@@ -0,0 +1,353 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Local Bet Ingestion (Unix socket)
+
+Lets producers on the same host (the Discord bot, casino feed relays) hand
+bets straight to the detectors instead of appending to session_data.csv
+and waiting for the next file check.
+
+A connection speaks one of two framings:
+
+- NDJSON: one JSON value per line, either a single bet object, an array
+  of bets, or {"id": ..., "bets": [...]}. Bets use the session CSV columns
+  (timestamp, bet_amount, outcome, balance, and optionally player_id, game,
+  event_id). Numeric timestamps are Unix seconds; timestamps that are not
+  finite or fall outside the int64 nanosecond range (such as milliseconds
+  sent as seconds) make the batch invalid. Every line is answered with one
+  line:
+      {"id": ..., "accepted": 3, "queued": 1}
+      {"id": ..., "error": "busy", "retry_after_ms": 500}
+      {"id": ..., "error": "<why the batch was invalid>"}
+
+- Binary: the connection starts with the 4 bytes b"TCB1", then frames of
+  a little-endian u32 payload length and a payload of a u16 bet count and
+  per bet `<qddb` (timestamp ns, bet amount and balance as float64,
+  outcome code) followed by u8-length-prefixed UTF-8
+  player_id, game and event_id (empty player_id = single-player file).
+  Every frame is answered with `<BI`: status (0 accepted, 1 busy,
+  2 invalid) and the accepted count, or retry delay in ms when busy.
+
+A batch is acknowledged once it is queued for the detectors. The queue is
+bounded; when it is full the server stops reading from the connection
+(so the producer's writes block in the kernel) for up to `block_timeout`
+seconds and then answers busy. "queued" in NDJSON acks is the queue depth
+after the batch and lets producers pace themselves before that happens.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import stat
+import struct
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from inbound_pipeline import OVERFLOW_BLOCK, InboundPipeline
+from session_schema import DEFAULT_PLAYER_ID, REQUIRED_COLUMNS, decode_outcome, encode_outcome, parse_timestamp
+from tilt_engine import BetEvent
+
+logger = logging.getLogger(__name__)
+
+BINARY_MAGIC = b"TCB1"
+FRAME_HEADER = struct.Struct("<I")
+BATCH_HEADER = struct.Struct("<H")
+BET_RECORD = struct.Struct("<qddb")
+ACK = struct.Struct("<BI")
+
+STATUS_ACCEPTED = 0
+STATUS_BUSY = 1
+STATUS_INVALID = 2
+
+# Largest NDJSON line or binary frame accepted
+MAX_MESSAGE_BYTES = 1 << 20
+
+
+def parse_bet(data: Dict) -> BetEvent:
+    """
+    Build a BetEvent from a JSON bet (session CSV column names).
+
+    Raises:
+        ValueError: If a required field is missing or malformed
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a bet object, got {type(data).__name__}")
+    missing = [column for column in REQUIRED_COLUMNS if column not in data]
+    if missing:
+        raise ValueError(f"Bet is missing {missing}")
+    try:
+        event = BetEvent(
+            str(data.get("player_id") or DEFAULT_PLAYER_ID),
+            parse_timestamp(data["timestamp"]),
+            float(data["bet_amount"]),
+            str(data["outcome"]),
+            float(data["balance"]),
+            str(data.get("game") or ""),
+            str(data.get("event_id") or ""),
+        )
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid bet {data}: {e}") from None
+    check_amounts(event)
+    return event
+
+
+def check_amounts(event: BetEvent):
+    """
+    Reject bets the detectors cannot compare (NaN or infinite amounts).
+
+    Raises:
+        ValueError: If the bet amount or balance is not finite
+    """
+    if not (math.isfinite(event.bet_amount) and math.isfinite(event.balance)):
+        raise ValueError(f"Non-finite amount in bet at {event.timestamp}")
+
+
+def _pack_text(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    if len(raw) > 255:
+        raise ValueError(f"Text field longer than 255 bytes: {text[:40]!r}...")
+    return bytes((len(raw),)) + raw
+
+
+def encode_batch(events: List[BetEvent]) -> bytes:
+    """Binary payload for a batch of bets (without the frame header)."""
+    if len(events) > 0xFFFF:
+        raise ValueError(f"At most 65535 bets per frame, got {len(events)}")
+    parts = [BATCH_HEADER.pack(len(events))]
+    for event in events:
+        parts.append(BET_RECORD.pack(event.timestamp, event.bet_amount,
+                                     event.balance, encode_outcome(event.outcome)))
+        player_id = "" if event.player_id == DEFAULT_PLAYER_ID else event.player_id
+        parts.extend(_pack_text(text) for text in (player_id, event.game, event.event_id))
+    return b"".join(parts)
+
+
+def decode_batch(payload: bytes) -> List[BetEvent]:
+    """
+    Decode an encode_batch() payload.
+
+    Raises:
+        ValueError: If the payload is truncated, has trailing bytes or a
+            non-finite amount
+    """
+    try:
+        (count,) = BATCH_HEADER.unpack_from(payload, 0)
+        offset = BATCH_HEADER.size
+        events = []
+        for _ in range(count):
+            timestamp, bet, balance, outcome = BET_RECORD.unpack_from(payload, offset)
+            offset += BET_RECORD.size
+            texts = []
+            for _ in range(3):
+                length = payload[offset]
+                texts.append(payload[offset + 1:offset + 1 + length].decode("utf-8"))
+                offset += 1 + length
+            if offset > len(payload):
+                raise ValueError("Truncated bet")
+            event = BetEvent(texts[0] or DEFAULT_PLAYER_ID, timestamp, bet,
+                             decode_outcome(outcome), balance, texts[1], texts[2])
+            check_amounts(event)
+            events.append(event)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed batch: {e}") from None
+    if offset != len(payload):
+        raise ValueError(f"{len(payload) - offset} trailing bytes after {count} bets")
+    return events
+
+
+class IngestServer:
+    """Unix socket listener feeding received bet batches to a coroutine."""
+
+    def __init__(self, handler: Callable[[List[BetEvent]], Awaitable[None]],
+                 maxsize: int = 256, block_timeout: float = 0.5):
+        """
+        Initialize the server.
+
+        Args:
+            handler: Coroutine called with the bets of one queued batch
+            maxsize: Maximum queued batches
+            block_timeout: Seconds a producer waits for queue room before "busy"
+        """
+        self.handler = handler
+        self.block_timeout = block_timeout
+        self.pipeline = InboundPipeline(self._process, maxsize=maxsize, batch_size=16,
+                                        overflow=OVERFLOW_BLOCK, block_timeout=block_timeout)
+        self.path: Optional[str] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.connections = 0
+        self.bets = 0
+        self.invalid = 0
+        self.failed = 0
+
+    async def start(self, path: str):
+        """Listen on a Unix socket path (a stale socket file is replaced)."""
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self.handle_connection, path=path,
+                                                       limit=MAX_MESSAGE_BYTES)
+        os.chmod(path, 0o660)
+        self.path = path
+        self.pipeline.start()
+        logger.info("Bet ingestion listening on %s (queue %d batches)", path, self.pipeline.maxsize)
+
+    async def stop(self):
+        """Stop listening, process what is queued and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.pipeline.stop(drain=True)
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _process(self, batches: List[List[BetEvent]]):
+        # One handler call per producer batch, so a batch the detectors
+        # reject does not take other producers' acknowledged bets with it
+        for events in batches:
+            try:
+                await self.handler(events)
+            except Exception:
+                self.failed += 1
+                logger.exception("Ingest handler failed on a batch of %d bets", len(events))
+            else:
+                self.bets += len(events)
+
+    async def _queue(self, events: List[BetEvent]) -> bool:
+        return not events or await self.pipeline.submit(events)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one producer until it closes its side of the connection."""
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            first = await reader.read(1)
+            if first == BINARY_MAGIC[:1]:
+                if await reader.readexactly(len(BINARY_MAGIC) - 1) != BINARY_MAGIC[1:]:
+                    raise ValueError("Unknown binary protocol")
+                await self._serve_binary(reader, writer)
+            elif first:
+                await self._serve_ndjson(first, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.debug("Ingest connection closed: %s", e)
+        finally:
+            self.connections -= 1
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _serve_ndjson(self, first: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        line = first + await reader.readline()
+        while line:
+            if line.strip():
+                writer.write(json.dumps(await self._handle_line(line)).encode() + b"\n")
+                await writer.drain()
+            line = await reader.readline()
+
+    async def _handle_line(self, line: bytes) -> Dict:
+        request_id = None
+        try:
+            message = json.loads(line)
+            if isinstance(message, dict) and "bets" in message:
+                request_id = message.get("id")
+                bets = message["bets"]
+            else:
+                bets = message if isinstance(message, list) else [message]
+            if not isinstance(bets, list):
+                raise ValueError("\"bets\" must be an array")
+            events = [parse_bet(bet) for bet in bets]
+        except ValueError as e:
+            self.invalid += 1
+            return {"id": request_id, "error": str(e)}
+
+        if not await self._queue(events):
+            return {"id": request_id, "error": "busy", "retry_after_ms": int(self.block_timeout * 1000)}
+        return {"id": request_id, "accepted": len(events), "queued": self.pipeline.queue.qsize()}
+
+    async def _serve_binary(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            header = await reader.read(FRAME_HEADER.size)
+            if not header:
+                return
+            if len(header) < FRAME_HEADER.size:
+                header += await reader.readexactly(FRAME_HEADER.size - len(header))
+            (length,) = FRAME_HEADER.unpack(header)
+            if length > MAX_MESSAGE_BYTES:
+                writer.write(ACK.pack(STATUS_INVALID, 0))
+                await writer.drain()
+                raise ValueError(f"Frame of {length} bytes exceeds {MAX_MESSAGE_BYTES}")
+
+            try:
+                events = decode_batch(await reader.readexactly(length))
+            except ValueError as e:
+                self.invalid += 1
+                logger.warning("Rejected binary bet batch: %s", e)
+                writer.write(ACK.pack(STATUS_INVALID, 0))
+            else:
+                if await self._queue(events):
+                    writer.write(ACK.pack(STATUS_ACCEPTED, len(events)))
+                else:
+                    writer.write(ACK.pack(STATUS_BUSY, int(self.block_timeout * 1000)))
+            await writer.drain()
+
+    def metrics(self) -> Dict:
+        """Return connection, bet and queue counters."""
+        return dict(self.pipeline.metrics(), connections=self.connections,
+                    bets=self.bets, invalid=self.invalid, failed_batches=self.failed)
+
+
+class IngestClient:
+    """Minimal producer: sends one batch at a time and waits for its ack."""
+
+    def __init__(self, binary: bool = False):
+        self.binary = binary
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, path: str) -> "IngestClient":
+        self._reader, self._writer = await asyncio.open_unix_connection(path, limit=MAX_MESSAGE_BYTES)
+        if self.binary:
+            self._writer.write(BINARY_MAGIC)
+        return self
+
+    async def send(self, bets: List[Dict]) -> Dict:
+        """
+        Send a batch of JSON bets.
+
+        Returns:
+            The ack: {"accepted": n, ...} or {"error": ...}
+        """
+        if not self.binary:
+            self._writer.write(json.dumps({"bets": bets}).encode() + b"\n")
+            return json.loads(await self._reader.readline())
+
+        try:
+            payload = encode_batch([parse_bet(bet) for bet in bets])
+        except ValueError as e:
+            return {"error": str(e)}
+        self._writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+        status, value = ACK.unpack(await self._reader.readexactly(ACK.size))
+        if status == STATUS_ACCEPTED:
+            return {"accepted": value}
+        if status == STATUS_BUSY:
+            return {"error": "busy", "retry_after_ms": value}
+        return {"error": "invalid batch"}
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Agent Load Test
+
+Drives a running TiltCheck agent's uAgents endpoint with ChatMessage and
+TiltAlert traffic from N local stand-in sender identities and reports
+throughput, error rates and delivery latency percentiles.
+
+Senders are derived from fixed seeds and post signed envelopes straight to
+the agent's HTTP endpoint, so no testnet funding, Almanac registration or
+network access is needed. Envelopes are prepared and signed before the
+clock starts, and sends follow an open-loop schedule: latency is measured
+from each message's scheduled send time, so a slow agent shows up as
+latency instead of silently lowering the offered rate.
+
+Usage:
+    python agent.py &
+    python load_test_agent.py --senders 20 --rate 500 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import aiohttp
+from uagents_core.envelope import Envelope
+from uagents_core.identity import Identity
+
+from agent_models import ChatMessage, TiltAlert
+
+DEFAULT_AGENT_SEED = "tiltcheck_secure_seed_phrase_2024"
+DEFAULT_ENDPOINT = "http://localhost:8001/submit"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_message(kind: str, index: int, message_size: int):
+    """Build a ChatMessage or TiltAlert whose text is padded to message_size bytes."""
+    text = f"load-test message {index} "
+    text = (text + "x" * max(0, message_size - len(text)))[:max(message_size, len(text))]
+    now = datetime.now().isoformat()
+
+    if kind == "alert":
+        return TiltAlert(
+            alert_message=text,
+            risk_level="HIGH",
+            timestamp=now,
+            details={"source": "load_test", "index": index}
+        )
+    return ChatMessage(message=text, timestamp=now, alert_type="LOAD_TEST")
+
+
+def prepare_envelopes(senders: List[Identity], target: str, count: int,
+                      kind: str, message_size: int) -> List[str]:
+    """Sign `count` envelopes round-robin across the sender identities."""
+    envelopes = []
+    expires = int(time.time()) + 3600
+    for i in range(count):
+        message_kind = kind if kind != "mixed" else ("alert" if i % 2 else "chat")
+        message = build_message(message_kind, i, message_size)
+        sender = senders[i % len(senders)]
+
+        env = Envelope(
+            version=1,
+            sender=sender.address,
+            target=target,
+            session=uuid.uuid4(),
+            schema_digest=message.build_schema_digest(message),
+            expires=expires,
+        )
+        env.encode_payload(message.model_dump_json())
+        env.sign(sender)
+        envelopes.append(env.model_dump_json())
+    return envelopes
+
+
+class LoadTestResult:
+    """Collects per-message outcomes during a run."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.sent = 0
+        self.started = 0.0
+        self.finished = 0.0
+
+    def record_error(self, reason: str):
+        self.errors[reason] = self.errors.get(reason, 0) + 1
+
+    def summary(self) -> Dict:
+        latencies = sorted(self.latencies)
+        elapsed = max(self.finished - self.started, 1e-9)
+        failed = sum(self.errors.values())
+        return {
+            "sent": self.sent,
+            "delivered": len(latencies),
+            "failed": failed,
+            "error_rate": failed / self.sent if self.sent else 0.0,
+            "elapsed_s": elapsed,
+            "throughput_msg_s": len(latencies) / elapsed,
+            "latency_ms": {
+                "p50": percentile(latencies, 50) * 1000,
+                "p90": percentile(latencies, 90) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "max": (latencies[-1] if latencies else 0.0) * 1000,
+            },
+            "errors": dict(self.errors),
+        }
+
+
+async def run_load(endpoint: str, envelopes: List[str], rate: float,
+                   max_in_flight: int, timeout: float) -> LoadTestResult:
+    """
+    Send the prepared envelopes at a fixed aggregate rate.
+
+    Args:
+        endpoint: Agent submit URL
+        envelopes: Pre-signed envelope JSON bodies
+        rate: Messages per second across all senders
+        max_in_flight: Cap on concurrent HTTP requests
+        timeout: Per-request timeout in seconds
+    """
+    result = LoadTestResult()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    headers = {"content-type": "application/json"}
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+
+        async def send_one(body: str, scheduled: float):
+            async with semaphore:
+                try:
+                    async with session.post(endpoint, data=body, headers=headers) as resp:
+                        await resp.read()
+                        if resp.status == 200:
+                            result.latencies.append(time.perf_counter() - scheduled)
+                        else:
+                            result.record_error(f"http_{resp.status}")
+                except asyncio.TimeoutError:
+                    result.record_error("timeout")
+                except aiohttp.ClientError as e:
+                    result.record_error(type(e).__name__)
+
+        tasks = []
+        interval = 1.0 / rate
+        result.started = time.perf_counter()
+        for i, body in enumerate(envelopes):
+            scheduled = result.started + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send_one(body, scheduled)))
+            result.sent += 1
+
+        await asyncio.gather(*tasks)
+        result.finished = time.perf_counter()
+
+    return result
+
+
+async def wait_for_port(endpoint: str, deadline: float) -> bool:
+    """Wait until the agent's HTTP server accepts connections."""
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(endpoint.rsplit("/", 1)[0] + "/"):
+                    return True
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.5)
+    return False
+
+
+def print_summary(summary: Dict, args):
+    print("\n" + "=" * 70)
+    print(" TiltCheck Agent - Load Test Results ")
+    print("=" * 70)
+    print(f"Target: {args.endpoint}")
+    print(f"Senders: {args.senders} | Offered rate: {args.rate:.0f} msg/s | "
+          f"Kind: {args.kind} | Message size: {args.message_size} bytes")
+    print(f"  - Sent: {summary['sent']}")
+    print(f"  - Delivered: {summary['delivered']}")
+    print(f"  - Failed: {summary['failed']} ({summary['error_rate'] * 100:.2f}%)")
+    print(f"  - Achieved throughput: {summary['throughput_msg_s']:.1f} msg/s")
+    latency = summary["latency_ms"]
+    print(f"  - Latency p50/p90/p99/max: {latency['p50']:.1f} / {latency['p90']:.1f} / "
+          f"{latency['p99']:.1f} / {latency['max']:.1f} ms")
+    for reason, count in sorted(summary["errors"].items()):
+        print(f"  - Error {reason}: {count}")
+    print("=" * 70)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the load test"""
+    parser = argparse.ArgumentParser(description="Load test the TiltCheck agent endpoint")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help="Agent submit URL")
+    parser.add_argument("--agent-seed", default=os.environ.get("AGENT_SEED_PHRASE", DEFAULT_AGENT_SEED),
+                        help="Seed of the agent under test (used to derive its address)")
+    parser.add_argument("--senders", type=int, default=10, help="Number of stand-in sender identities")
+    parser.add_argument("--sender-seed", default="tiltcheck_load_test_sender",
+                        help="Seed prefix for sender identities")
+    parser.add_argument("--rate", type=float, default=100.0, help="Aggregate messages per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--message-size", type=int, default=128, help="Message text size in bytes")
+    parser.add_argument("--kind", choices=["chat", "alert", "mixed"], default="chat",
+                        help="Message type to send")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Concurrent request cap")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--spawn-agent", action="store_true",
+                        help="Start agent.py as a subprocess for the duration of the test")
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.rate <= 0 or args.duration <= 0 or args.senders < 1:
+        parser.error("--rate, --duration and --senders must be positive")
+
+    target = Identity.from_seed(args.agent_seed, 0).address
+    senders = [Identity.from_seed(f"{args.sender_seed}_{i}", 0) for i in range(args.senders)]
+    count = max(1, int(args.rate * args.duration))
+
+    print(f"Preparing {count} signed envelopes from {args.senders} senders...")
+    envelopes = prepare_envelopes(senders, target, count, args.kind, args.message_size)
+
+    agent_process = None
+    if args.spawn_agent:
+        env = dict(os.environ, AGENT_SEED_PHRASE=args.agent_seed)
+        agent_process = subprocess.Popen([sys.executable, "agent.py"], env=env,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        if not asyncio.run(wait_for_port(args.endpoint, time.monotonic() + 60)):
+            print(f"❌ Agent endpoint not reachable: {args.endpoint}")
+            return 1
+
+        result = asyncio.run(run_load(args.endpoint, envelopes, args.rate,
+                                      args.max_in_flight, args.timeout))
+    finally:
+        if agent_process is not None:
+            agent_process.terminate()
+            agent_process.wait(10)
+
+    summary = result.summary()
+    print_summary(summary, args)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
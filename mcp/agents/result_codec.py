@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Analysis Result Codec
+
+Versioned binary encoding of analyze_behavioral_data() results for
+on-chain storage. A result is about 450 bytes as JSON and 24 bytes plus
+the session ID as a binary record.
+
+Layout (version 1, little-endian):
+
+    offset  size  field
+    0       1     format version (1)
+    1       1     risk level (index into RISK_LEVELS)
+    2       8     timestamp, int64 microseconds since the epoch (UTC)
+    10      2     tilt_score x 100              (0 - 655.35)
+    12      2     bet_frequency x 10            (0 - 6553.5 bets/hour)
+    14      2     balance_volatility x 10000    (0 - 6.5535)
+    16      2     session_duration x 10         (0 - 6553.5 minutes)
+    18      2     loss_streak                   (0 - 65535)
+    20      4     recommendation bitmask (bit i = RECOMMENDATIONS entry i,
+                  so the catalog can grow to 32 entries within version 1)
+    24      1     session ID length in bytes (0 = no session ID)
+    25      n     session ID, UTF-8
+
+Numbers are stored as fixed-point, so decoding is lossy below each field's
+precision:
+
+    field               precision
+    timestamp           1 microsecond, converted to naive UTC
+    tilt_score          0.01 (agent scores are whole steps of 5: exact)
+    bet_frequency       0.1 bets/hour
+    balance_volatility  0.0001
+    session_duration    0.1 minutes
+    loss_streak         1
+
+A value is rounded to the nearest step on encoding, so a decoded value is
+within half a step of the original, and a result whose session inputs were
+already at that precision decodes to an equal dict.
+
+Recommendations decode in catalog order, which is the order the agent
+produces them in. Values that do not fit their field raise ValueError
+instead of being clipped. AnalysisRecord results (analyze_batch_compact)
+are packed directly, without building or looking up the result dict.
+"""
+
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Union
+
+from tiltcheck_solana_agent import RECOMMENDATIONS, RISK_LEVELS, AnalysisRecord
+
+FORMAT_VERSION = 1
+
+RECORD = struct.Struct("<BBqHHHHHI")
+COUNT = struct.Struct("<H")
+MAX_SESSION_ID_BYTES = 255
+
+RECOMMENDATION_TEXTS = list(RECOMMENDATIONS.values())
+RECOMMENDATION_IDS = {text: index for index, text in enumerate(RECOMMENDATION_TEXTS)}
+RISK_LEVEL_IDS = {level: index for index, level in enumerate(RISK_LEVELS)}
+
+# (result metrics key, scale) for the fixed-point metric fields, in layout order
+METRIC_FIELDS = [
+    ('bet_frequency', 10),
+    ('balance_volatility', 10_000),
+    ('session_duration', 10),
+    ('loss_streak', 1),
+]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _fixed(name: str, value, scale: int, limit: int = 0xFFFF) -> int:
+    scaled = int(round((value or 0) * scale))
+    if not 0 <= scaled <= limit:
+        raise ValueError(f"{name}={value} does not fit the result record")
+    return scaled
+
+
+def _to_micros(timestamp: str) -> int:
+    parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = parsed - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _created_micros(created: float) -> int:
+    # Rounds like datetime.fromtimestamp, so it matches the record's timestamp string
+    whole = int(created)
+    return whole * 1_000_000 + round((created - whole) * 1e6)
+
+
+def encode_record(record: AnalysisRecord) -> bytes:
+    """Encode an AnalysisRecord (same bytes as encode_result of its dict)."""
+    session_bytes = str(record.session_id).encode('utf-8') if record.session_id else b""
+    if len(session_bytes) > MAX_SESSION_ID_BYTES:
+        raise ValueError(f"session_id longer than {MAX_SESSION_ID_BYTES} bytes")
+    values = (record.bet_frequency, record.balance_volatility, record.session_duration, record.loss_streak)
+    packed = RECORD.pack(
+        FORMAT_VERSION,
+        RISK_LEVEL_IDS[record.risk_level],
+        _created_micros(record.created),
+        _fixed('tilt_score', record.tilt_score, 100),
+        *(_fixed(key, value, scale) for (key, scale), value in zip(METRIC_FIELDS, values)),
+        record.recommendations,
+    )
+    return packed + bytes([len(session_bytes)]) + session_bytes
+
+
+def encode_result(result: Union[Dict, AnalysisRecord]) -> bytes:
+    """
+    Encode one analysis result.
+
+    Args:
+        result: Dict returned by analyze_behavioral_data(), or an AnalysisRecord
+
+    Returns:
+        Binary record (24 bytes + session ID)
+
+    Raises:
+        ValueError: If a value does not fit its field, or the risk level or a
+            recommendation is not in the catalog
+    """
+    if isinstance(result, AnalysisRecord):
+        return encode_record(result)
+    try:
+        risk = RISK_LEVEL_IDS[result['risk_level']]
+        mask = 0
+        for text in result.get('recommendations', []):
+            mask |= 1 << RECOMMENDATION_IDS[text]
+    except KeyError as e:
+        raise ValueError(f"Not in the result catalog: {e}") from None
+
+    metrics = result.get('metrics', {})
+    session_id = result.get('session_id')
+    session_bytes = str(session_id).encode('utf-8') if session_id else b""
+    if len(session_bytes) > MAX_SESSION_ID_BYTES:
+        raise ValueError(f"session_id longer than {MAX_SESSION_ID_BYTES} bytes")
+
+    record = RECORD.pack(
+        FORMAT_VERSION,
+        risk,
+        _to_micros(result['timestamp']),
+        _fixed('tilt_score', result['tilt_score'], 100),
+        *(_fixed(key, metrics.get(key), scale) for key, scale in METRIC_FIELDS),
+        mask,
+    )
+    return record + bytes([len(session_bytes)]) + session_bytes
+
+
+def decode_result(data: bytes, offset: int = 0) -> Dict:
+    """Decode one record, with numbers at field precision (see decode_result_from for records inside a buffer)."""
+    return decode_result_from(data, offset)[0]
+
+
+def decode_result_from(data: bytes, offset: int = 0):
+    """
+    Decode the record starting at `offset`.
+
+    Returns:
+        (result dict, offset just past the record)
+
+    Raises:
+        ValueError: On an unknown version, unknown IDs or truncated data
+    """
+    if len(data) < offset + RECORD.size + 1:
+        raise ValueError("Truncated result record")
+    version = data[offset]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result format version {version}")
+
+    _, risk, micros, score, *fields, mask = RECORD.unpack_from(data, offset)
+    end = offset + RECORD.size
+    length = data[end]
+    session_bytes = bytes(data[end + 1:end + 1 + length])
+    if len(session_bytes) != length:
+        raise ValueError("Truncated session ID")
+    if risk >= len(RISK_LEVELS) or mask >> len(RECOMMENDATION_TEXTS):
+        raise ValueError("Unknown risk level or recommendation ID")
+
+    metrics = {}
+    for (key, scale), value in zip(METRIC_FIELDS, fields):
+        metrics[key] = value if scale == 1 else value / scale
+    timestamp = _EPOCH + timedelta(microseconds=micros)
+
+    result = {
+        'session_id': session_bytes.decode('utf-8') if length else None,
+        'timestamp': timestamp.isoformat(),
+        'tilt_score': score / 100,
+        'risk_level': RISK_LEVELS[risk],
+        'recommendations': [text for index, text in enumerate(RECOMMENDATION_TEXTS) if mask >> index & 1],
+        'metrics': metrics,
+    }
+    return result, end + 1 + length
+
+
+def encode_results(results: Iterable[Union[Dict, AnalysisRecord]]) -> bytes:
+    """Encode several results into one buffer (uint16 count, then records)."""
+    records = [encode_result(result) for result in results]
+    if len(records) > 0xFFFF:
+        raise ValueError("Too many results for one buffer")
+    return COUNT.pack(len(records)) + b"".join(records)
+
+
+def decode_results(data: bytes) -> List[Dict]:
+    """Decode a buffer written by encode_results()."""
+    if len(data) < COUNT.size:
+        raise ValueError("Truncated result buffer")
+    (count,) = COUNT.unpack_from(data)
+    offset = COUNT.size
+    results = []
+    for _ in range(count):
+        result, offset = decode_result_from(data, offset)
+        results.append(result)
+    if offset != len(data):
+        raise ValueError("Trailing bytes after the last result")
+    return results
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Scoring Service
+
+Asyncio request/response service around TiltCheckSolanaAgent for the
+Discord bot. It listens on a Unix socket or TCP port and speaks
+newline-delimited JSON:
+
+    -> {"id": 1, "session": {"session_id": "...", "bet_frequency": 45, ...}}
+    <- {"id": 1, "result": {...analyze_behavioral_data result...}}
+    <- {"id": 2, "error": "..."}
+    -> {"id": 3, "op": "metrics"}
+
+A client can pipeline many requests on one connection. Replies are written
+as soon as the request's batch is scored, so they may arrive out of order;
+match them by "id". A request line longer than MAX_REQUEST_BYTES gets an
+error reply and the connection is closed.
+
+Requests from all connections are collected into micro-batches. A batch
+is scored when it reaches `max_batch` requests or when `max_delay` seconds
+have passed since its first request, whichever comes first. Each batch is
+scored with one analyze_batch() call.
+
+With --result-log (or TILTCHECK_SCORING_RESULT_LOG_DIR) every analysis is
+also appended to an AlertLog in that directory. The log's writer thread
+does the file writes, so scoring never waits on disk.
+
+Usage:
+    python scoring_service.py --socket /tmp/tiltcheck_scoring.sock
+    python scoring_service.py --host 127.0.0.1 --port 8765
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from tiltcheck_solana_agent import TiltCheckSolanaAgent
+
+logger = logging.getLogger(__name__)
+
+# Wait for the socket to drain once this many reply bytes are queued
+WRITE_HIGH_WATER = 256 * 1024
+# Longest accepted request line (StreamReader limit)
+MAX_REQUEST_BYTES = 64 * 1024
+
+# alert_log.py lives at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class MicroBatcher:
+    """Collects submitted sessions into batches bounded by size and delay."""
+
+    def __init__(self, score_batch: Callable[[List[Dict]], List[Dict]],
+                 max_batch: int = 64, max_delay: float = 0.002):
+        """
+        Initialize the batcher.
+
+        Args:
+            score_batch: Scores a list of sessions, returning results in order.
+                Runs on the event loop, so it must be fast (CPU-light).
+            max_batch: Score as soon as this many requests are waiting
+            max_delay: Longest a request waits for its batch to fill (seconds)
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    def submit(self, session: Dict) -> asyncio.Future:
+        """Queue a session; the returned future resolves to its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((session, future))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return future
+
+    def flush(self):
+        """Score everything that is waiting."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        try:
+            results = self.score_batch([session for session, _ in batch])
+        except Exception:
+            # Score one by one so a bad session only fails its own request
+            logger.exception("Batch of %d failed; scoring individually", len(batch))
+            for session, future in batch:
+                self._score_one(session, future)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _score_one(self, session: Dict, future: asyncio.Future):
+        if future.done():
+            return
+        try:
+            future.set_result(self.score_batch([session])[0])
+        except Exception as e:
+            future.set_exception(e)
+
+    def metrics(self) -> Dict:
+        """Return batching counters."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
+
+
+class ScoringService:
+    """NDJSON request/response server backed by a MicroBatcher."""
+
+    def __init__(self, agent: Optional[TiltCheckSolanaAgent] = None,
+                 max_batch: int = 64, max_delay: float = 0.002):
+        self.agent = agent or TiltCheckSolanaAgent()
+        self.batcher = MicroBatcher(self.agent.analyze_batch, max_batch, max_delay)
+        self.connections = 0
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 8765):
+        """Start listening on a Unix socket path, or on host:port if path is None."""
+        if path:
+            return await asyncio.start_unix_server(self.handle_connection, path=path, limit=MAX_REQUEST_BYTES)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one client until it closes its side of the connection."""
+        self.connections += 1
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line over the reader limit; the stream can't be resynced
+                    logger.warning("Closing client connection after a request over %d bytes", MAX_REQUEST_BYTES)
+                    self._write(writer, {"id": None, "error": f"Request longer than {MAX_REQUEST_BYTES} bytes"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                self._dispatch(line, writer, pending)
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+
+            if pending:
+                await asyncio.wait(pending)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.debug("Client connection lost: %s", e)
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    def _dispatch(self, line: bytes, writer: asyncio.StreamWriter, pending: set):
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+        except (ValueError, AttributeError):
+            self._write(writer, {"id": None, "error": "Invalid JSON request"})
+            return
+
+        op = request.get("op", "analyze")
+        if op == "metrics":
+            self._write(writer, {"id": request_id, "result": self.metrics()})
+            return
+        session = request.get("session")
+        if op != "analyze" or not isinstance(session, dict):
+            self._write(writer, {"id": request_id, "error": "Expected {\"id\", \"session\": {...}}"})
+            return
+
+        future = self.batcher.submit(session)
+        pending.add(future)
+        future.add_done_callback(pending.discard)
+        future.add_done_callback(partial(self._reply, writer, request_id))
+
+    def _reply(self, writer: asyncio.StreamWriter, request_id, future: asyncio.Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._write(writer, {"id": request_id, "error": str(error)})
+        else:
+            self._write(writer, {"id": request_id, "result": future.result()})
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, message: Dict):
+        if not writer.is_closing():
+            writer.write(json.dumps(message).encode() + b"\n")
+
+    def metrics(self) -> Dict:
+        """Return service counters."""
+        return dict(self.batcher.metrics(), connections=self.connections)
+
+
+class ScoringClient:
+    """Minimal async client that pipelines requests over one connection."""
+
+    def __init__(self):
+        self._reader = None
+        self._writer = None
+        self._ids = itertools.count(1)
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._receiver = None
+
+    async def connect(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 8765):
+        if path:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._receiver = asyncio.ensure_future(self._receive())
+        return self
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            future = self._waiting.pop(reply.get("id"), None)
+            if future is None or future.done():
+                continue
+            if "error" in reply:
+                future.set_exception(RuntimeError(reply["error"]))
+            else:
+                future.set_result(reply["result"])
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Scoring service closed the connection"))
+        self._waiting.clear()
+
+    async def request(self, message: Dict):
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(json.dumps(dict(message, id=request_id)).encode() + b"\n")
+        return await future
+
+    async def analyze(self, session: Dict) -> Dict:
+        """Score one session."""
+        return await self.request({"session": session})
+
+    async def metrics(self) -> Dict:
+        return await self.request({"op": "metrics"})
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            if self._receiver is not None:
+                await self._receiver
+
+
+async def serve(service: ScoringService, path: Optional[str], host: str, port: int):
+    """Run the service until cancelled."""
+    server = await service.start(path, host, port)
+    logger.info("Scoring service listening on %s (max batch %d, max delay %.1f ms)",
+                path or f"{host}:{port}", service.batcher.max_batch, service.batcher.max_delay * 1000)
+    async with server:
+        await server.serve_forever()
+
+
+def open_result_log(directory: str):
+    """AlertLog for analysis results, written from its background thread."""
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+    from alert_log import AlertLog
+    return AlertLog(directory, background=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the scoring service."""
+    parser = argparse.ArgumentParser(description="Serve TiltCheck session scoring over NDJSON")
+    parser.add_argument("--socket", default=os.environ.get("TILTCHECK_SCORING_SOCKET"),
+                        help="Unix socket path (takes precedence over --host/--port)")
+    parser.add_argument("--host", default=os.environ.get("TILTCHECK_SCORING_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("TILTCHECK_SCORING_PORT", "8765")))
+    parser.add_argument("--max-batch", type=int,
+                        default=int(os.environ.get("TILTCHECK_SCORING_MAX_BATCH", "64")))
+    parser.add_argument("--max-delay-ms", type=float,
+                        default=float(os.environ.get("TILTCHECK_SCORING_MAX_DELAY_MS", "2")))
+    parser.add_argument("--result-log", default=os.environ.get("TILTCHECK_SCORING_RESULT_LOG_DIR"),
+                        help="AlertLog directory for analysis results")
+    args = parser.parse_args(argv)
+
+    result_log = open_result_log(args.result_log) if args.result_log else None
+    service = ScoringService(agent=TiltCheckSolanaAgent(result_log=result_log),
+                             max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+    try:
+        asyncio.run(serve(service, args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("Scoring service stopped: %s", service.metrics())
+    finally:
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        if result_log is not None:
+            result_log.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Signing Pool
+
+Signs batches of messages (for example encoded analysis results from
+result_codec.py) for many tenants, each with its own Solana keypair.
+
+- KeypairCache loads Solana wallet files (JSON arrays of 64 secret key
+  bytes) once and keeps them in an LRU. A file is reloaded when its
+  modification time changes.
+- SigningPool spreads Ed25519 signing over a process pool. Messages are
+  grouped by key and sent in chunks. Each worker keeps its own LRU of
+  signing keys (WORKER_KEY_CACHE_SIZE), so a key is usually expanded
+  only once per worker. With
+  workers=0 everything is signed inline.
+
+Ed25519 signatures are deterministic, so the pool returns exactly the
+signatures serial signing would. Secret keys are sent to the worker
+processes over local pipes and never leave the host.
+
+Usage (benchmark with generated stand-in keys):
+    python signing_pool.py --benchmark --messages 20000 --workers 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from nacl.signing import SigningKey
+
+logger = logging.getLogger(__name__)
+
+SECRET_KEY_BYTES = 64
+DEFAULT_CHUNK_SIZE = 512
+WORKER_KEY_CACHE_SIZE = 256
+
+# Per-process LRU of expanded signing keys (lives in each worker)
+_worker_keys: "OrderedDict[bytes, SigningKey]" = OrderedDict()
+
+
+def load_secret_key(path: str) -> bytes:
+    """
+    Read a Solana wallet file.
+
+    Returns:
+        64 secret key bytes (32-byte seed followed by the public key)
+
+    Raises:
+        ValueError: If the file is not a valid Solana keypair
+    """
+    with open(os.path.expanduser(path), 'r') as f:
+        secret_key = bytes(json.load(f))
+    if len(secret_key) != SECRET_KEY_BYTES:
+        raise ValueError(f"{path}: expected {SECRET_KEY_BYTES} key bytes, got {len(secret_key)}")
+    if bytes(SigningKey(secret_key[:32]).verify_key) != secret_key[32:]:
+        raise ValueError(f"{path}: public key does not match the secret key")
+    return secret_key
+
+
+def _signing_key(secret_key: bytes) -> SigningKey:
+    key = _worker_keys.get(secret_key)
+    if key is not None:
+        _worker_keys.move_to_end(secret_key)
+        return key
+    key = _worker_keys[secret_key] = SigningKey(secret_key[:32])
+    while len(_worker_keys) > WORKER_KEY_CACHE_SIZE:
+        _worker_keys.popitem(last=False)
+    return key
+
+
+def sign_chunk(secret_key: bytes, messages: List[bytes]) -> List[bytes]:
+    """Sign messages with one key, returning 64-byte detached signatures."""
+    key = _signing_key(secret_key)
+    return [key.sign(message).signature for message in messages]
+
+
+class KeypairCache:
+    """LRU of loaded wallet files, refreshed when a file changes."""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str) -> bytes:
+        """Secret key bytes of a wallet file, loading it if needed."""
+        path = os.path.expanduser(path)
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            self._entries.move_to_end(path)
+            return entry[1]
+
+        secret_key = load_secret_key(path)
+        self.loads += 1
+        self._entries[path] = (mtime, secret_key)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return secret_key
+
+
+class SigningPool:
+    """Signs batches of (key ID, message) pairs across worker processes."""
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 cache: Optional[KeypairCache] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            workers: Worker processes (None = CPU count, 0 = sign inline)
+            chunk_size: Messages per task sent to a worker
+            cache: Wallet file cache (a new one by default)
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.cache = cache or KeypairCache()
+        self._keys: Dict[str, bytes] = {}
+        self._paths: Dict[str, str] = {}
+        self._executor = ProcessPoolExecutor(self.workers) if self.workers > 0 else None
+        self.signed = 0
+
+    def add_key(self, key_id: str, secret_key: bytes):
+        """Register a key held in memory."""
+        if len(secret_key) != SECRET_KEY_BYTES:
+            raise ValueError(f"Expected {SECRET_KEY_BYTES} key bytes, got {len(secret_key)}")
+        self._keys[key_id] = bytes(secret_key)
+        self._paths.pop(key_id, None)
+
+    def add_wallet(self, key_id: str, path: str):
+        """Register a key by wallet file; the file is read through the cache."""
+        self.cache.get(path)
+        self._paths[key_id] = path
+        self._keys.pop(key_id, None)
+
+    def _secret_key(self, key_id: str) -> bytes:
+        path = self._paths.get(key_id)
+        if path is not None:
+            return self.cache.get(path)
+        try:
+            return self._keys[key_id]
+        except KeyError:
+            raise KeyError(f"No key registered for {key_id!r}") from None
+
+    def public_key(self, key_id: str) -> bytes:
+        """32-byte public key for a key ID."""
+        return self._secret_key(key_id)[32:]
+
+    def sign_many(self, requests: Iterable[Tuple[str, bytes]]) -> List[bytes]:
+        """
+        Sign many messages.
+
+        Args:
+            requests: (key ID, message) pairs
+
+        Returns:
+            Signatures in the same order as requests
+        """
+        requests = list(requests)
+        by_key = defaultdict(list)
+        for index, (key_id, _) in enumerate(requests):
+            by_key[key_id].append(index)
+
+        tasks = []
+        for key_id, indexes in by_key.items():
+            secret_key = self._secret_key(key_id)
+            for start in range(0, len(indexes), self.chunk_size):
+                chunk = indexes[start:start + self.chunk_size]
+                tasks.append((chunk, secret_key, [requests[i][1] for i in chunk]))
+
+        signatures: List[Optional[bytes]] = [None] * len(requests)
+        if self._executor is None:
+            chunk_results = (sign_chunk(secret_key, messages) for _, secret_key, messages in tasks)
+        else:
+            futures = [self._executor.submit(sign_chunk, secret_key, messages)
+                       for _, secret_key, messages in tasks]
+            chunk_results = (future.result() for future in futures)
+        for (chunk, _, _), chunk_signatures in zip(tasks, chunk_results):
+            for index, signature in zip(chunk, chunk_signatures):
+                signatures[index] = signature
+
+        self.signed += len(requests)
+        return signatures
+
+    def sign(self, key_id: str, message: bytes) -> bytes:
+        """Sign one message inline (no worker round trip)."""
+        return sign_chunk(self._secret_key(key_id), [message])[0]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def generate_secret_key() -> bytes:
+    """New random stand-in keypair in Solana's 64-byte layout."""
+    key = SigningKey.generate()
+    return bytes(key) + bytes(key.verify_key)
+
+
+def benchmark(messages: int = 20000, workers: Optional[int] = None, tenants: int = 8,
+              message_size: int = 64) -> Dict:
+    """
+    Measure signing throughput with generated stand-in keys.
+
+    Returns:
+        Dict with signatures/second overall and per worker core, plus the
+        serial (inline) rate for comparison
+    """
+    keys = {f"tenant{i}": generate_secret_key() for i in range(tenants)}
+    requests = [(f"tenant{i % tenants}", os.urandom(message_size)) for i in range(messages)]
+
+    def run(pool: SigningPool) -> float:
+        for key_id, secret_key in keys.items():
+            pool.add_key(key_id, secret_key)
+        pool.sign_many(requests[:tenants * 4])  # start workers and warm key caches
+        start = time.perf_counter()
+        pool.sign_many(requests)
+        return messages / (time.perf_counter() - start)
+
+    with SigningPool(workers=0) as serial_pool:
+        serial_rate = run(serial_pool)
+    with SigningPool(workers=workers) as pool:
+        pool_rate = run(pool)
+        cores = min(pool.workers, os.cpu_count() or 1)
+    return {
+        "messages": messages,
+        "workers": pool.workers,
+        "serial_per_second": serial_rate,
+        "pool_per_second": pool_rate,
+        "pool_per_core": pool_rate / cores,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the signing benchmark."""
+    parser = argparse.ArgumentParser(description="TiltCheck signing pool")
+    parser.add_argument("--benchmark", action="store_true", help="Measure signatures per second")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--tenants", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    if not args.benchmark:
+        parser.print_help()
+        return 1
+    result = benchmark(args.messages, args.workers, args.tenants)
+    print(f"Serial:  {result['serial_per_second']:,.0f} signatures/s")
+    print(f"Pool:    {result['pool_per_second']:,.0f} signatures/s with {result['workers']} workers "
+          f"({result['pool_per_core']:,.0f}/s per core)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck analysis result codec
+
+Round-trips real agent results through the binary format, checks record
+sizes against JSON, and checks that bad input is rejected.
+"""
+
+import json
+import random
+import struct
+import sys
+
+from result_codec import RECORD, decode_result, decode_results, encode_result, encode_results
+from tiltcheck_solana_agent import RECOMMENDATIONS, AnalysisRecord, TiltCheckSolanaAgent
+
+
+def make_results(count, seed=2):
+    rng = random.Random(seed)
+    agent = TiltCheckSolanaAgent()
+    return [agent.analyze_behavioral_data({
+        'session_id': f"session-{i:06d}",
+        'bet_frequency': rng.randrange(0, 120),
+        'balance_volatility': round(rng.random(), 4),
+        'duration_minutes': round(rng.uniform(0, 240), 1),
+        'loss_streak': rng.randrange(0, 12),
+    }) for i in range(count)]
+
+
+def test_round_trip():
+    """Test that decoded results equal the agent's results at field precision"""
+    print("Testing round-trip...")
+    results = make_results(500)
+    for result in results:
+        assert decode_result(encode_result(result)) == result, result['session_id']
+
+    anonymous = dict(results[0], session_id=None, timestamp="2025-03-01T12:00:00+00:00")
+    decoded = decode_result(encode_result(anonymous))
+    assert decoded['session_id'] is None
+    assert decoded['timestamp'] == "2025-03-01T12:00:00"
+    seen = {text for result in results for text in result['recommendations']}
+    assert seen == set(RECOMMENDATIONS.values()), "not every recommendation was exercised"
+
+    raw = TiltCheckSolanaAgent().analyze_behavioral_data({
+        'session_id': "raw", 'bet_frequency': 47.26, 'balance_volatility': 0.123456, 'duration_minutes': 61.04,
+        'loss_streak': 4})
+    metrics = decode_result(encode_result(raw))['metrics']
+    assert metrics == {'bet_frequency': 47.3, 'balance_volatility': 0.1235, 'session_duration': 61.0,
+                       'loss_streak': 4}, metrics
+    print(f"✅ {len(results)} results at field precision round-trip exactly; others round to it")
+
+
+def test_size():
+    """Test record and batch sizes against JSON"""
+    print("\nTesting payload size...")
+    results = make_results(100)
+    record = encode_result(results[0])
+    assert len(record) == RECORD.size + 1 + len("session-000000") == 39
+    json_size = len(json.dumps(results[0], ensure_ascii=False).encode())
+
+    batch = encode_results(results)
+    assert decode_results(batch) == results
+    per_result = len(batch) / len(results)
+    assert per_result < 40
+    print(f"✅ {len(record)} bytes per record vs {json_size} bytes of JSON; "
+          f"{len(results)} results in {len(batch)} bytes")
+
+
+def test_rejects_bad_input():
+    """Test out-of-range values, unknown catalog entries and bad buffers"""
+    print("\nTesting validation...")
+    result = make_results(1)[0]
+    bad_inputs = [
+        dict(result, recommendations=["Go all in"]),
+        dict(result, risk_level="EXTREME"),
+        dict(result, metrics=dict(result['metrics'], bet_frequency=-1)),
+        dict(result, metrics=dict(result['metrics'], session_duration=10_000)),
+        dict(result, session_id="x" * 256),
+    ]
+    for bad in bad_inputs:
+        try:
+            encode_result(bad)
+            raise AssertionError(f"accepted {bad}")
+        except ValueError:
+            pass
+
+    record = encode_result(result)
+    bad_buffers = [
+        record[:-1],
+        b"\x02" + record[1:],
+        record[:20] + struct.pack("<I", 1 << 31) + record[24:],
+        encode_results([result]) + b"\x00",
+    ]
+    for buffer in bad_buffers:
+        try:
+            decode_results(buffer) if len(buffer) > len(record) else decode_result(buffer)
+            raise AssertionError(f"decoded {buffer!r}")
+        except ValueError:
+            pass
+    print("✅ Bad results and buffers raise ValueError")
+
+
+def legacy_recommendations(tilt_score, loss_streak, duration):
+    """The recommendation lists the agent built before catalog IDs."""
+    if tilt_score >= 70:
+        keys = ["mandatory_break", "vault_balance", "breathing"]
+    elif tilt_score >= 40:
+        keys = ["short_break", "review_stats", "lower_stakes"]
+    else:
+        keys = ["playing_well", "keep_tracking"]
+    if loss_streak > 3:
+        keys.append("loss_streak")
+    if duration > 90:
+        keys.append("long_session")
+    return [RECOMMENDATIONS[key] for key in keys]
+
+
+def test_compact_records():
+    """Test AnalysisRecord rendering, JSON and direct binary encoding"""
+    print("\nTesting compact analysis records...")
+    rng = random.Random(5)
+    agent = TiltCheckSolanaAgent()
+    sessions = [{
+        'session_id': f"session-{i:06d}",
+        'bet_frequency': rng.choice((0, 30, 31, 50, 51, rng.randrange(0, 120))),
+        'balance_volatility': rng.choice((0.3, 0.5, round(rng.random(), 4))),
+        'duration_minutes': rng.choice((60, 90, 91, 121, round(rng.uniform(0, 240), 1))),
+        'loss_streak': rng.randrange(0, 8),
+    } for i in range(1000)]
+
+    records = agent.analyze_batch_compact(sessions)
+    for session, record in zip(sessions, records):
+        result = record.to_dict()
+        assert result['recommendations'] == legacy_recommendations(
+            record.tilt_score, session['loss_streak'], session['duration_minutes'])
+        assert result['risk_level'] == agent._get_risk_level(record.tilt_score)
+        assert encode_result(record) == encode_result(result)
+        assert decode_result(encode_result(record)) == result
+        assert AnalysisRecord.from_json_dict(json.loads(record.to_json())) == record
+    texts = {id(text) for record in records for text in record.to_dict()['recommendations']}
+    assert len(texts) <= len(RECOMMENDATIONS), "recommendation strings are not shared"
+    assert encode_results(records) == encode_results([record.to_dict() for record in records])
+    print(f"✅ {len(records)} records match the result dicts, legacy recommendations and encodings")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Result Codec - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Round-Trip Test", test_round_trip),
+        ("Payload Size Test", test_size),
+        ("Validation Test", test_rejects_bad_input),
+        ("Compact Record Test", test_compact_records),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck scoring service
+
+Checks the micro-batch bounds, serves many concurrent pipelined clients
+over a Unix socket against direct analyze_behavioral_data results, and
+checks that bad requests only fail themselves and that results reach the
+result log.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from scoring_service import MAX_REQUEST_BYTES, MicroBatcher, ScoringClient, ScoringService, open_result_log
+from tiltcheck_solana_agent import TiltCheckSolanaAgent
+
+
+def make_session(rng, index):
+    return {
+        'session_id': f"s{index}",
+        'bet_frequency': rng.randrange(0, 80),
+        'balance_volatility': rng.random(),
+        'duration_minutes': rng.randrange(0, 180),
+        'loss_streak': rng.randrange(0, 9),
+    }
+
+
+def test_batch_bounds():
+    """Test that batches close on size and on delay"""
+    print("Testing micro-batch bounds...")
+    sizes = []
+
+    def score(sessions):
+        sizes.append(len(sessions))
+        return [s["n"] * 2 for s in sessions]
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch=8, max_delay=0.01)
+        futures = [batcher.submit({"n": n}) for n in range(20)]
+        assert sizes == [8, 8], "size bound not applied"
+        start = time.monotonic()
+        results = await asyncio.gather(*futures)
+        assert results == [n * 2 for n in range(20)]
+        assert sizes == [8, 8, 4]
+        assert time.monotonic() - start < 0.5
+        return batcher.metrics()
+
+    metrics = asyncio.run(run())
+    assert metrics["batches"] == 3 and metrics["largest_batch"] == 8
+    print(f"✅ Batches of {sizes}; remainder flushed after the delay")
+
+
+def test_concurrent_clients():
+    """Test pipelined clients get the same results as direct calls"""
+    print("\nTesting concurrent pipelined clients...")
+    rng = random.Random(4)
+    agent = TiltCheckSolanaAgent()
+    clients, per_client = 20, 200
+    sessions = [[make_session(rng, c * per_client + i) for i in range(per_client)] for c in range(clients)]
+
+    async def run(path):
+        service = ScoringService(agent, max_batch=64, max_delay=0.002)
+        server = await service.start(path)
+
+        async def client_run(batch):
+            client = await ScoringClient().connect(path)
+            results = await asyncio.gather(*(client.analyze(s) for s in batch))
+            await client.close()
+            return results
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client_run(batch) for batch in sessions))
+        elapsed = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+        return results, elapsed, service.metrics()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results, elapsed, metrics = asyncio.run(run(os.path.join(tmp, "scoring.sock")))
+
+    for batch, batch_results in zip(sessions, results):
+        for session, result in zip(batch, batch_results):
+            expected = agent.analyze_behavioral_data(session)
+            expected.pop('timestamp')
+            result.pop('timestamp')
+            assert result == expected, session['session_id']
+
+    total = clients * per_client
+    assert metrics["requests"] == total
+    assert metrics["mean_batch"] > 4, metrics
+    print(f"✅ {total} requests in {elapsed:.2f}s ({total / elapsed:.0f}/s), "
+          f"mean batch {metrics['mean_batch']:.1f}")
+
+
+def test_bad_requests():
+    """Test that malformed requests are answered without failing others"""
+    print("\nTesting bad requests...")
+
+    async def run(path):
+        service = ScoringService(TiltCheckSolanaAgent(), max_batch=16, max_delay=0.005)
+        server = await service.start(path)
+
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"not json\n{\"id\": 7}\n")
+        invalid = await reader.readline()
+        missing = await reader.readline()
+        writer.close()
+
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"{\"id\": 8, \"session\": \"" + b"x" * MAX_REQUEST_BYTES + b"\"}\n")
+        oversized = await reader.readline()
+        closed = await reader.read()
+        writer.close()
+
+        client = await ScoringClient().connect(path)
+        good = {'session_id': 'ok', 'bet_frequency': 60, 'loss_streak': 6}
+        bad = {'session_id': 'bad', 'bet_frequency': "fast"}
+        results = await asyncio.gather(client.analyze(good), client.analyze(bad), return_exceptions=True)
+        metrics = await client.metrics()
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        return invalid, missing, oversized, closed, results, metrics
+
+    with tempfile.TemporaryDirectory() as tmp:
+        invalid, missing, oversized, closed, results, metrics = asyncio.run(run(os.path.join(tmp, "scoring.sock")))
+
+    assert b"Invalid JSON" in invalid
+    assert b'"id": 7' in missing and b"error" in missing
+    assert b"Request longer than" in oversized and closed == b"", "oversized line left the connection open"
+    assert results[0]['tilt_score'] == 55.0
+    assert isinstance(results[1], RuntimeError), results[1]
+    assert metrics["requests"] == 2
+    print("✅ Errors are returned per request")
+
+
+def test_result_log():
+    """Test that served analyses are appended to the result log"""
+    print("\nTesting the result log...")
+    rng = random.Random(9)
+    sessions = [make_session(rng, i) for i in range(50)]
+
+    async def run(path, log):
+        service = ScoringService(TiltCheckSolanaAgent(result_log=log), max_batch=16, max_delay=0.002)
+        server = await service.start(path)
+        client = await ScoringClient().connect(path)
+        results = await asyncio.gather(*(client.analyze(s) for s in sessions))
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        return results
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = open_result_log(os.path.join(tmp, "results"))
+        results = asyncio.run(run(os.path.join(tmp, "scoring.sock"), log))
+        log.close()
+        logged = {r["player_id"]: r["data"]["tilt_score"] for r in log.query(kind="analysis")}
+    assert logged == {s['session_id']: r['tilt_score'] for s, r in zip(sessions, results)}
+    print(f"✅ {len(logged)} analyses written to the result log")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Scoring Service - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Batch Bounds Test", test_batch_bounds),
+        ("Concurrent Clients Test", test_concurrent_clients),
+        ("Bad Requests Test", test_bad_requests),
+        ("Result Log Test", test_result_log),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
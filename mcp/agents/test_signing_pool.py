@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck signing pool
+
+Uses generated stand-in keys only. Checks wallet file loading and caching,
+that pooled signatures equal serial ones and verify, that the per-process
+key cache stays bounded, and runs a short throughput benchmark.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import signing_pool
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+
+from signing_pool import KeypairCache, SigningPool, benchmark, generate_secret_key, load_secret_key
+
+
+def write_wallet(path, secret_key):
+    with open(path, 'w') as f:
+        json.dump(list(secret_key), f)
+
+
+def test_keypair_cache():
+    """Test wallet validation, cache hits and reload on change"""
+    print("Testing keypair cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tenant.json")
+        first = generate_secret_key()
+        write_wallet(path, first)
+
+        cache = KeypairCache(max_size=2)
+        assert cache.get(path) == first and cache.get(path) == first
+        assert cache.loads == 1, "wallet read twice"
+
+        second = generate_secret_key()
+        write_wallet(path, second)
+        os.utime(path, ns=(1, 1))
+        assert cache.get(path) == second and cache.loads == 2
+
+        for i in range(3):
+            other = os.path.join(tmp, f"other{i}.json")
+            write_wallet(other, generate_secret_key())
+            cache.get(other)
+        assert len(cache) == 2
+
+        broken = os.path.join(tmp, "broken.json")
+        write_wallet(broken, first[:32] + second[32:])
+        try:
+            load_secret_key(broken)
+            raise AssertionError("mismatched keypair accepted")
+        except ValueError:
+            pass
+    print("✅ Wallets load once, reload on change and are validated")
+
+
+def test_pool_matches_serial():
+    """Test pooled signatures equal serial signatures and verify"""
+    print("\nTesting pooled signing...")
+    keys = {f"tenant{i}": generate_secret_key() for i in range(5)}
+    requests = [(f"tenant{i % 5}", f"result-{i}".encode()) for i in range(3000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wallet = os.path.join(tmp, "wallet.json")
+        write_wallet(wallet, keys["tenant0"])
+
+        with SigningPool(workers=0) as serial, SigningPool(workers=2, chunk_size=128) as pool:
+            for key_id, secret_key in keys.items():
+                serial.add_key(key_id, secret_key)
+                pool.add_key(key_id, secret_key)
+            pool.add_wallet("tenant0", wallet)
+
+            expected = serial.sign_many(requests)
+            signatures = pool.sign_many(requests)
+            assert signatures == expected
+            assert pool.sign("tenant3", requests[3][1]) == expected[3]
+
+            for (key_id, message), signature in zip(requests, signatures):
+                VerifyKey(pool.public_key(key_id)).verify(message, signature)
+            try:
+                VerifyKey(pool.public_key("tenant1")).verify(requests[0][1], signatures[0])
+                raise AssertionError("signature verified under the wrong key")
+            except BadSignatureError:
+                pass
+            try:
+                pool.sign_many([("unknown", b"x")])
+                raise AssertionError("unknown key accepted")
+            except KeyError:
+                pass
+
+            cache_size = signing_pool.WORKER_KEY_CACHE_SIZE
+            signing_pool.WORKER_KEY_CACHE_SIZE = 2
+            signing_pool._worker_keys.clear()
+            try:
+                assert serial.sign_many(requests) == expected
+                assert len(signing_pool._worker_keys) == 2, "signing key cache not bounded"
+            finally:
+                signing_pool.WORKER_KEY_CACHE_SIZE = cache_size
+    print(f"✅ {len(requests)} pooled signatures match serial signing and verify")
+
+
+def test_benchmark():
+    """Test the throughput benchmark"""
+    print("\nTesting benchmark...")
+    result = benchmark(messages=4000, workers=2, tenants=4)
+    assert result["serial_per_second"] > 0 and result["pool_per_second"] > 0
+    print(f"✅ Serial {result['serial_per_second']:,.0f}/s, pool {result['pool_per_second']:,.0f}/s "
+          f"({result['pool_per_core']:,.0f}/s per core on {os.cpu_count()} CPUs)")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Signing Pool - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Keypair Cache Test", test_keypair_cache),
+        ("Pooled Signing Test", test_pool_matches_serial),
+        ("Benchmark Test", test_benchmark),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,11 +19,17 @@ for transparent, verifiable behavioral analysis.
 
 import os
 import json
+import time
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
-from solana.rpc.api import Client
-from solana.keypair import Keypair
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    from solana.rpc.api import Client
+    from solana.keypair import Keypair
+except ImportError:  # scoring works without the Solana SDK; storage does not
+    Client = None
+    Keypair = None
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +38,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Recommendation catalog. A recommendation's ID is its position in this
+# dict and is what gets stored on-chain (see result_codec.py), so new
+# entries must only ever be appended.
+RECOMMENDATIONS = {
+    "mandatory_break": "🛑 STOP: Take a mandatory break for at least 30 minutes",
+    "vault_balance": "💰 Vault your remaining balance to prevent further losses",
+    "breathing": "🧘 Practice deep breathing or meditation",
+    "short_break": "⚠️ WARNING: Consider taking a 10-minute break",
+    "review_stats": "📊 Review your session stats before continuing",
+    "lower_stakes": "🎯 Switch to lower stakes or different game",
+    "playing_well": "✅ You're playing well - stay focused",
+    "keep_tracking": "📈 Keep tracking your sessions for insights",
+    "loss_streak": "🔄 Loss streak detected - vary your strategy",
+    "long_session": "⏰ Long session - fatigue may affect judgment",
+}
+
+# Risk levels in enum order (stored on-chain by index)
+RISK_LEVELS = ("LOW", "MEDIUM", "HIGH")
+
+RECOMMENDATION_TEXTS = tuple(RECOMMENDATIONS.values())
+RECOMMENDATION_BITS = {key: 1 << index for index, key in enumerate(RECOMMENDATIONS)}
+
+# Recommendations for each tilt score band, as a bitmask of catalog IDs
+BAND_RECOMMENDATIONS = (
+    (70, RECOMMENDATION_BITS["mandatory_break"] | RECOMMENDATION_BITS["vault_balance"]
+     | RECOMMENDATION_BITS["breathing"]),
+    (40, RECOMMENDATION_BITS["short_break"] | RECOMMENDATION_BITS["review_stats"]
+     | RECOMMENDATION_BITS["lower_stakes"]),
+    (float("-inf"), RECOMMENDATION_BITS["playing_well"] | RECOMMENDATION_BITS["keep_tracking"]),
+)
+
+# Recommendation mask -> catalog texts, filled on first use (there are only
+# a dozen combinations, so every result shares the same interned strings)
+_recommendation_texts: Dict[int, Tuple[str, ...]] = {}
+
+
+def recommendation_mask(tilt_score: float, loss_streak: float, duration_minutes: float) -> int:
+    """Catalog IDs (bit i = RECOMMENDATIONS entry i) recommended for a session."""
+    for floor, mask in BAND_RECOMMENDATIONS:
+        if tilt_score >= floor:
+            break
+    if loss_streak > 3:
+        mask |= RECOMMENDATION_BITS["loss_streak"]
+    if duration_minutes > 90:
+        mask |= RECOMMENDATION_BITS["long_session"]
+    return mask
+
+
+def recommendation_texts(mask: int) -> Tuple[str, ...]:
+    """Texts for a recommendation mask, in catalog order."""
+    texts = _recommendation_texts.get(mask)
+    if texts is None:
+        texts = tuple(text for index, text in enumerate(RECOMMENDATION_TEXTS) if mask >> index & 1)
+        _recommendation_texts[mask] = texts
+    return texts
+
+
+def risk_level(tilt_score: float) -> str:
+    """Risk level for a tilt score."""
+    return "HIGH" if tilt_score >= 70 else "MEDIUM" if tilt_score >= 40 else "LOW"
+
+
+class AnalysisRecord(NamedTuple):
+    """
+    Compact analysis result: numbers and a recommendation mask.
+
+    to_dict() renders the analyze_behavioral_data() result dict; the
+    timestamp and recommendation texts are only produced there.
+    """
+    session_id: Optional[str]
+    created: float  # epoch seconds
+    tilt_score: float
+    bet_frequency: float
+    balance_volatility: float
+    session_duration: float
+    loss_streak: int
+    recommendations: int  # bitmask of RECOMMENDATIONS IDs
+
+    @property
+    def risk_level(self) -> str:
+        return risk_level(self.tilt_score)
+
+    @property
+    def timestamp(self) -> str:
+        """Naive UTC ISO timestamp."""
+        return datetime.fromtimestamp(self.created, timezone.utc).replace(tzinfo=None).isoformat()
+
+    def to_dict(self) -> Dict:
+        """The analyze_behavioral_data() result dict."""
+        return {
+            'session_id': self.session_id,
+            'timestamp': self.timestamp,
+            'tilt_score': self.tilt_score,
+            'risk_level': self.risk_level,
+            'recommendations': list(recommendation_texts(self.recommendations)),
+            'metrics': {
+                'bet_frequency': self.bet_frequency,
+                'balance_volatility': self.balance_volatility,
+                'session_duration': self.session_duration,
+                'loss_streak': self.loss_streak
+            }
+        }
+
+    def to_json_dict(self) -> Dict:
+        """Numeric JSON form (no texts or formatted timestamp)."""
+        return {"session_id": self.session_id, "ts": self.created, "tilt_score": self.tilt_score,
+                "metrics": [self.bet_frequency, self.balance_volatility, self.session_duration,
+                            self.loss_streak],
+                "recommendations": self.recommendations}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_json_dict(), separators=(',', ':'), ensure_ascii=False)
+
+    @classmethod
+    def from_json_dict(cls, data: Dict) -> "AnalysisRecord":
+        return cls(data["session_id"], data["ts"], data["tilt_score"], *data["metrics"], data["recommendations"])
+
 
 class TiltCheckSolanaAgent:
     """
@@ -41,19 +164,27 @@ class TiltCheckSolanaAgent:
     stores results on Solana, and provides verifiable tilt detection.
     """
     
-    def __init__(self, solana_rpc_url: Optional[str] = None):
+    def __init__(self, solana_rpc_url: Optional[str] = None, result_log=None):
         """
         Initialize the trustless Solana agent.
         
         Args:
             solana_rpc_url: Solana RPC endpoint (defaults to devnet)
+            result_log: Optional sink for analysis results with an
+                append(kind, player_id, data) method (e.g. alert_log.AlertLog)
         """
         self.solana_rpc_url = solana_rpc_url or "https://api.devnet.solana.com"
-        self.solana_client = Client(self.solana_rpc_url)
-        
-        # Load or generate keypair for signing
-        wallet_path = os.environ.get("SOLANA_WALLET_PATH", "~/.config/solana/id.json")
-        self.keypair = self._load_keypair(wallet_path)
+        self.result_log = result_log
+        if Client is None:
+            logger.warning("solana package not installed; running in scoring-only mode")
+            self.solana_client = None
+            self.keypair = None
+        else:
+            self.solana_client = Client(self.solana_rpc_url)
+            
+            # Load or generate keypair for signing
+            wallet_path = os.environ.get("SOLANA_WALLET_PATH", "~/.config/solana/id.json")
+            self.keypair = self._load_keypair(wallet_path)
         
         logger.info(f"TiltCheck Trustless Solana Agent initialized")
         logger.info(f"Solana RPC: {self.solana_rpc_url}")
@@ -88,7 +219,43 @@ class TiltCheckSolanaAgent:
             Analysis results with tilt score and recommendations
         """
         logger.info(f"Analyzing behavioral data for session {session_data.get('session_id', 'unknown')}")
+        return self._analyze(session_data, time.time()).to_dict()
+    
+    def analyze_batch(self, sessions: List[Dict]) -> List[Dict]:
+        """
+        Analyze several sessions together.
+        
+        Produces the same results as calling analyze_behavioral_data for
+        each session, sharing one timestamp and one log line per batch.
+        
+        Args:
+            sessions: List of session data dicts
+            
+        Returns:
+            Analysis results in the same order as sessions
+        """
+        return [record.to_dict() for record in self.analyze_batch_compact(sessions)]
+    
+    def analyze_batch_compact(self, sessions: List[Dict]) -> List[AnalysisRecord]:
+        """
+        Analyze several sessions into compact records.
+        
+        Same scores as analyze_batch; result dicts are only built by
+        AnalysisRecord.to_dict(), and result_codec.encode_result() packs
+        records directly.
         
+        Args:
+            sessions: List of session data dicts
+            
+        Returns:
+            AnalysisRecord per session, in order
+        """
+        logger.debug(f"Analyzing batch of {len(sessions)} sessions")
+        created = time.time()
+        return [self._analyze(session_data, created) for session_data in sessions]
+    
+    def _analyze(self, session_data: Dict, created: float) -> AnalysisRecord:
+        """Score one session."""
         # Extract key metrics
         bet_frequency = session_data.get('bet_frequency', 0)
         balance_volatility = session_data.get('balance_volatility', 0)
@@ -101,28 +268,20 @@ class TiltCheckSolanaAgent:
             bet_frequency, balance_volatility, session_duration, loss_streak
         )
         
-        # Generate recommendations
-        recommendations = self._generate_recommendations(tilt_score, session_data)
+        # Recommendations as catalog IDs
+        recommendations = recommendation_mask(tilt_score, loss_streak, session_duration)
         
-        # Prepare results
-        result = {
-            'session_id': session_data.get('session_id'),
-            'timestamp': datetime.utcnow().isoformat(),
-            'tilt_score': tilt_score,
-            'risk_level': self._get_risk_level(tilt_score),
-            'recommendations': recommendations,
-            'metrics': {
-                'bet_frequency': bet_frequency,
-                'balance_volatility': balance_volatility,
-                'session_duration': session_duration,
-                'loss_streak': loss_streak
-            }
-        }
+        record = AnalysisRecord(session_data.get('session_id'), created, tilt_score, bet_frequency,
+                                balance_volatility, session_duration, loss_streak, recommendations)
         
         # Store on Solana (in production)
-        # self._store_on_solana(result)
+        # self._store_on_solana(record.to_dict())
         
-        return result
+        if self.result_log is not None:
+            player_id = session_data.get('player_id') or session_data.get('session_id') or 'unknown'
+            self.result_log.append("analysis", player_id, record.to_json_dict(), ts=created)
+        
+        return record
     
     def _calculate_tilt_score(self, bet_freq: float, balance_vol: float, 
                              duration: float, loss_streak: int) -> float:
@@ -158,37 +317,13 @@ class TiltCheckSolanaAgent:
     
     def _get_risk_level(self, tilt_score: float) -> str:
         """Convert tilt score to risk level."""
-        if tilt_score >= 70:
-            return "HIGH"
-        elif tilt_score >= 40:
-            return "MEDIUM"
-        else:
-            return "LOW"
+        return risk_level(tilt_score)
     
     def _generate_recommendations(self, tilt_score: float, session_data: Dict) -> List[str]:
         """Generate personalized recommendations based on tilt score."""
-        recommendations = []
-        
-        if tilt_score >= 70:
-            recommendations.append("🛑 STOP: Take a mandatory break for at least 30 minutes")
-            recommendations.append("💰 Vault your remaining balance to prevent further losses")
-            recommendations.append("🧘 Practice deep breathing or meditation")
-        elif tilt_score >= 40:
-            recommendations.append("⚠️ WARNING: Consider taking a 10-minute break")
-            recommendations.append("📊 Review your session stats before continuing")
-            recommendations.append("🎯 Switch to lower stakes or different game")
-        else:
-            recommendations.append("✅ You're playing well - stay focused")
-            recommendations.append("📈 Keep tracking your sessions for insights")
-        
-        # Add specific recommendations based on metrics
-        if session_data.get('loss_streak', 0) > 3:
-            recommendations.append("🔄 Loss streak detected - vary your strategy")
-        
-        if session_data.get('duration_minutes', 0) > 90:
-            recommendations.append("⏰ Long session - fatigue may affect judgment")
-        
-        return recommendations
+        mask = recommendation_mask(tilt_score, session_data.get('loss_streak', 0),
+                                   session_data.get('duration_minutes', 0))
+        return list(recommendation_texts(mask))
     
     def _store_on_solana(self, result: Dict) -> Optional[str]:
         """
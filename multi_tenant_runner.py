@@ -0,0 +1,442 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Multi-Tenant Runner
+
+Hosts many logical TiltCheck agents (one per partner casino or Discord
+guild) in a single process. Every tenant keeps its own seed, agent address,
+session file, alert subscribers and rule thresholds, while all tenants
+share:
+- one event loop and one HTTP server (a uAgents Bureau), so the submit
+  endpoint routes envelopes to the tenant by destination address,
+- one TiltEngine, with players keyed as "<tenant>/<player_id>" and rules
+  looked up per tenant,
+- one inbound message pipeline, one detector checkpoint and one set of
+  community statistics covering every tenant.
+
+Tenants are listed in a JSON manifest:
+
+    {
+        "port": 8001,
+        "endpoint": "http://localhost:8001/submit",
+        "checkpoint_file": "tiltcheck_tenants_checkpoint.json",
+        "alert_log_dir": "alerts",
+        "tenants": [
+            {
+                "name": "casino_a",
+                "seed_env": "CASINO_A_SEED",
+                "session_file": "sessions/casino_a.csv",
+                "rules": {"threshold_spins": 40, "drop_threshold": 0.25},
+                "subscribers": ["agent1q..."],
+                "allowed_subscribers": ["agent1q..."]
+            }
+        ]
+    }
+
+"seed_env" names an environment variable holding the seed; "seed" may be
+used instead for local testing. "rules" accepts any TiltRules field.
+Runtime AlertSubscription requests are only accepted from agents in
+"subscribers" or "allowed_subscribers".
+
+With "alert_log_dir" (or TILTCHECK_ALERT_LOG_DIR) every tenant's alerts are
+written to one AlertLog, keyed by "<tenant>/<player_id>".
+
+Usage:
+    python multi_tenant_runner.py --manifest tenants.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from uagents import Agent, Bureau, Context
+
+from agent_logging import configure_logging
+from agent_models import AlertSubscription, ChatMessage, TiltAlert
+from alert_log import AlertLog, KIND_ALERT, alert_record
+from alert_records import AlertRecord, record_from_hit
+from alert_delivery import AlertDispatcher, SubscriberRegistry
+from checkpoint import DetectorCheckpoint
+from ingest_dedup import EventDeduplicator
+from community_stats import CommunityStats
+from inbound_pipeline import InboundPipeline
+from session_watcher import SessionFileWatcher
+from tilt_engine import RuleHit, SessionFileTail, TiltEngine, TiltRules
+
+logger = logging.getLogger(__name__)
+
+TENANT_SEPARATOR = "/"
+TENANT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+IDLE_EVICTION_INTERVAL = 60.0
+
+
+def tenant_key(tenant: str, player_id: str) -> str:
+    """Engine key for a tenant's player."""
+    return f"{tenant}{TENANT_SEPARATOR}{player_id}"
+
+
+def split_tenant_key(key: str) -> Tuple[str, str]:
+    """Split an engine key back into (tenant, player_id)."""
+    tenant, _, player_id = key.partition(TENANT_SEPARATOR)
+    return tenant, player_id
+
+
+class TenantConfig(NamedTuple):
+    """One tenant from the manifest."""
+    name: str
+    seed: str
+    session_file: str
+    rules: TiltRules
+    subscribers: List[str]
+    allowed_subscribers: List[str]
+
+
+def parse_tenant(entry: Dict) -> TenantConfig:
+    """
+    Validate one manifest tenant entry.
+
+    Raises:
+        ValueError: If the entry is incomplete or invalid
+    """
+    name = entry.get("name", "")
+    if not TENANT_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid tenant name: {name!r}")
+
+    seed = entry.get("seed")
+    if entry.get("seed_env"):
+        seed = os.environ.get(entry["seed_env"])
+    if not seed:
+        raise ValueError(f"Tenant {name} has no seed (set 'seed_env' or 'seed')")
+
+    if not entry.get("session_file"):
+        raise ValueError(f"Tenant {name} has no session_file")
+
+    rules = entry.get("rules", {})
+    unknown = set(rules) - set(TiltRules._fields)
+    if unknown:
+        raise ValueError(f"Tenant {name} has unknown rules: {sorted(unknown)}")
+
+    return TenantConfig(
+        name=name,
+        seed=seed,
+        session_file=entry["session_file"],
+        rules=TiltRules(**rules),
+        subscribers=list(entry.get("subscribers", [])),
+        allowed_subscribers=list(entry.get("allowed_subscribers", []))
+    )
+
+
+def load_manifest(path: str) -> Dict:
+    """
+    Load and validate a tenant manifest.
+
+    Returns:
+        The manifest with "tenants" parsed into TenantConfig entries
+
+    Raises:
+        ValueError: If the manifest is invalid
+    """
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+
+    tenants = [parse_tenant(entry) for entry in manifest.get("tenants", [])]
+    if not tenants:
+        raise ValueError(f"No tenants in {path}")
+
+    names = [tenant.name for tenant in tenants]
+    duplicates = sorted(set(n for n in names if names.count(n) > 1))
+    if duplicates:
+        raise ValueError(f"Duplicate tenant names: {duplicates}")
+
+    manifest["tenants"] = tenants
+    return manifest
+
+
+class Tenant:
+    """Runtime objects of one tenant."""
+
+    def __init__(self, config: TenantConfig, watch_mode: str = "auto"):
+        self.config = config
+        self.name = config.name
+        self.agent = Agent(name=f"tiltcheck_{config.name}", seed=config.seed)
+        self.watcher = SessionFileWatcher(config.session_file, mode=watch_mode)
+        self.tail = SessionFileTail(config.session_file)
+        self.registry = SubscriberRegistry(initial=config.subscribers)
+        # Agents that may subscribe at runtime
+        self.allowed_subscribers = set(config.subscribers) | set(config.allowed_subscribers)
+        self.dispatcher = AlertDispatcher(self.registry)
+
+
+class MultiTenantRunner:
+    """Runs every tenant's agent in one Bureau on a shared detection engine."""
+
+    def __init__(self, tenants: List[TenantConfig], port: int = 8001,
+                 endpoint: Optional[str] = None, checkpoint_file: Optional[str] = None,
+                 checkpoint_interval: float = 30.0, watch_mode: str = "auto",
+                 idle_player_seconds: float = 3600.0, alert_log_dir: Optional[str] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            tenants: Tenant configurations
+            port: Port of the shared HTTP server
+            endpoint: Public submit URL (defaults to localhost on `port`)
+            checkpoint_file: Detector checkpoint path (None disables checkpoints)
+            checkpoint_interval: Minimum seconds between periodic checkpoints
+            watch_mode: SessionFileWatcher mode for every tenant
+            idle_player_seconds: Seconds without new bets after which a
+                player's detection window and deduplication state are dropped
+            alert_log_dir: AlertLog directory for every tenant's alerts
+                (None disables the log)
+        """
+        self.tenants: Dict[str, Tenant] = {}
+        self.engine = TiltEngine(rules_for=self._rules_for)
+        self.bureau = Bureau(port=port, endpoint=[endpoint or f"http://localhost:{port}/submit"])
+        self.inbound = InboundPipeline(self._process_batch)
+        self.stats = CommunityStats()
+        self.dedup = EventDeduplicator()
+        self.checkpoint = (DetectorCheckpoint(checkpoint_file, interval=checkpoint_interval)
+                           if checkpoint_file else None)
+        self.alert_log = AlertLog(alert_log_dir, background=True) if alert_log_dir else None
+        self.idle_player_seconds = idle_player_seconds
+        self.last_idle_eviction = time.monotonic()
+
+        for config in tenants:
+            tenant = Tenant(config, watch_mode=watch_mode)
+            self.tenants[config.name] = tenant
+            self._register_handlers(tenant)
+            self.bureau.add(tenant.agent)
+            logger.info("Tenant %s: address %s, session file %s",
+                        config.name, tenant.agent.address, config.session_file)
+
+        self.restore()
+
+    def _rules_for(self, key: str) -> Optional[TiltRules]:
+        tenant = self.tenants.get(split_tenant_key(key)[0])
+        return tenant.config.rules if tenant else None
+
+    def _register_handlers(self, tenant: Tenant):
+        agent = tenant.agent
+
+        @agent.on_event("startup")
+        async def startup_handler(ctx: Context):
+            await self.start_tenant(tenant, ctx)
+
+        @agent.on_interval(period=30.0)
+        async def check_tilt_interval(ctx: Context):
+            await self.check_tenant(tenant)
+
+        @agent.on_message(model=ChatMessage)
+        async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
+            if not await self.inbound.submit((tenant.name, sender, msg)):
+                logger.warning("Inbound queue full, rejected message for %s from %s", tenant.name, sender)
+
+        @agent.on_message(model=TiltAlert)
+        async def handle_tilt_alert(ctx: Context, sender: str, msg: TiltAlert):
+            if not await self.inbound.submit((tenant.name, sender, msg)):
+                logger.warning("Inbound queue full, rejected alert for %s from %s", tenant.name, sender)
+
+        @agent.on_message(model=AlertSubscription)
+        async def handle_alert_subscription(ctx: Context, sender: str, msg: AlertSubscription):
+            if msg.action == "subscribe":
+                if sender not in tenant.allowed_subscribers:
+                    logger.warning("Rejected alert subscription to %s from unlisted agent %s",
+                                   tenant.name, sender)
+                    return
+                if tenant.registry.add(sender):
+                    logger.info("Alert subscriber added to %s: %s", tenant.name, sender)
+            elif msg.action == "unsubscribe":
+                if tenant.registry.remove(sender):
+                    logger.info("Alert subscriber removed from %s: %s", tenant.name, sender)
+            else:
+                logger.warning("Unknown subscription action from %s: %s", sender, msg.action)
+
+        @agent.on_event("shutdown")
+        async def shutdown_handler(ctx: Context):
+            await self.stop_tenant(tenant)
+
+    async def start_tenant(self, tenant: Tenant, ctx: Context):
+        """Start a tenant's watcher and alert delivery (called on agent startup)."""
+        self.inbound.start()
+        asyncio.ensure_future(tenant.watcher.run(lambda: self.check_tenant(tenant)))
+        tenant.dispatcher.bind(ctx.send)
+        tenant.dispatcher.start()
+
+    async def stop_tenant(self, tenant: Tenant):
+        """Stop a tenant's watcher (called on agent shutdown)."""
+        tenant.watcher.stop()
+
+    async def check_tenant(self, tenant: Tenant) -> List[AlertRecord]:
+        """
+        Run the tilt check for one tenant.
+
+        Reads the rows appended to the tenant's session file, evaluates the
+        tenant's players on the shared engine and publishes the alerts to
+        the tenant's subscribers.
+        """
+        # Idle players of all tenants, at most once a minute
+        if time.monotonic() - self.last_idle_eviction >= IDLE_EVICTION_INTERVAL:
+            self.last_idle_eviction = time.monotonic()
+            self.engine.evict_idle(self.idle_player_seconds)
+            self.dedup.evict_idle(self.idle_player_seconds)
+
+        if tenant.watcher.claim_change() is None:
+            return []
+
+        events = self.dedup.unseen(event._replace(player_id=tenant_key(tenant.name, event.player_id))
+                                   for event in tenant.tail.read_new())
+        changed_players = self.engine.ingest(events)
+        self.stats.ingest(events)
+        # Fingerprints only once the engine took the bets, so a failed check
+        # does not drop the feed's re-delivery as duplicates
+        self.dedup.record(events)
+
+        alerts = [self.alert_for(tenant, hit) for hit in self.engine.evaluate(changed_players)]
+        logger.info("Tilt check for %s: %d new bets, %d players checked, %d alerts detected",
+                    tenant.name, len(events), len(changed_players), len(alerts))
+
+        for alert in alerts:
+            fields = alert.to_json_dict()
+            logger.warning(
+                "🚨 TILT ALERT DETECTED 🚨 [%s] %s | risk=%s | %s",
+                tenant.name, alert.alert_message, alert.risk_level, fields,
+                extra={"fields": {
+                    "event": "tilt_alert",
+                    "tenant": tenant.name,
+                    "risk_level": alert.risk_level,
+                    "alert": fields
+                }}
+            )
+            tenant.dispatcher.publish(alert)
+            if self.alert_log is not None:
+                self.alert_log.append(KIND_ALERT, tenant_key(tenant.name, alert.player_id), alert_record(alert),
+                                      ts=alert.created)
+
+        if self.alert_log is not None:
+            self.alert_log.maybe_flush()
+        if self.checkpoint is not None:
+            await self.checkpoint.maybe_save(self.state)
+        return alerts
+
+    @staticmethod
+    def alert_for(tenant: Tenant, hit: RuleHit) -> AlertRecord:
+        """Build the alert for a hit, with the tenant's own player ID."""
+        return record_from_hit(hit._replace(player_id=split_tenant_key(hit.player_id)[1]))._replace(
+            tenant=tenant.name)
+
+    async def _process_batch(self, batch: List[tuple]):
+        for tenant_name, sender, msg in batch:
+            if isinstance(msg, TiltAlert):
+                logger.info("[%s] Received tilt alert from %s: %s | Risk Level: %s",
+                            tenant_name, sender, msg.alert_message, msg.risk_level)
+            else:
+                logger.info("[%s] Received message from %s: %s | Alert Type: %s",
+                            tenant_name, sender, msg.message, msg.alert_type)
+
+    def state(self) -> Dict:
+        """Snapshot of the shared engine and every tenant's file position."""
+        return {
+            "tenants": {
+                name: {"session_file": os.path.abspath(t.config.session_file), "tail": t.tail.state()}
+                for name, t in self.tenants.items()
+            },
+            "engine": self.engine.snapshot(),
+            "dedup": self.dedup.state()
+        }
+
+    def restore(self) -> bool:
+        """
+        Restore the last checkpoint.
+
+        Players of tenants that were removed from the manifest, or whose
+        session file changed, are dropped.
+        """
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state:
+            return False
+
+        valid = set()
+        for name, tenant_state in state.get("tenants", {}).items():
+            tenant = self.tenants.get(name)
+            if tenant and tenant_state["session_file"] == os.path.abspath(tenant.config.session_file):
+                tenant.tail.restore(tenant_state["tail"])
+                valid.add(name)
+
+        engine_state = state["engine"]
+        engine_state["players"] = {k: v for k, v in engine_state.get("players", {}).items()
+                                   if split_tenant_key(k)[0] in valid}
+        engine_state["cooldowns"] = {k: v for k, v in engine_state.get("cooldowns", {}).items()
+                                     if split_tenant_key(k)[0] in valid}
+        self.engine.restore(engine_state)
+        dedup_state = state.get("dedup", {})
+        dedup_state["players"] = {k: v for k, v in dedup_state.get("players", {}).items()
+                                  if split_tenant_key(k)[0] in valid}
+        self.dedup.restore(dedup_state)
+        logger.info("Resumed %d tenants with %d players", len(valid), len(self.engine.players))
+        return True
+
+    def run(self):
+        """Run all tenants until interrupted, then write a final checkpoint and the alert log buffer."""
+        try:
+            self.bureau.run()
+        finally:
+            # Saved here rather than in the agents' shutdown handlers, which
+            # the Bureau runs one agent at a time after Almanac updates
+            if self.checkpoint is not None:
+                self.checkpoint.save(self.state())
+                logger.info("Detector state saved to %s", self.checkpoint.filepath)
+            if self.alert_log is not None:
+                self.alert_log.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the multi-tenant runner."""
+    parser = argparse.ArgumentParser(description="Run many TiltCheck agents in one process")
+    parser.add_argument("--manifest", default=os.environ.get("TILTCHECK_TENANTS_FILE", "tenants.json"),
+                        help="Tenant manifest (JSON)")
+    args = parser.parse_args(argv)
+
+    configure_logging(
+        mode=os.environ.get("TILTCHECK_LOG_MODE", "sync"),
+        fmt=os.environ.get("TILTCHECK_LOG_FORMAT", "text"),
+        level=logging.INFO,
+        sample_burst=int(os.environ.get("TILTCHECK_LOG_SAMPLE_BURST", "0"))
+    )
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        logger.error("Could not load tenant manifest %s: %s", args.manifest, e)
+        return 1
+
+    runner = MultiTenantRunner(
+        manifest["tenants"],
+        port=int(manifest.get("port", 8001)),
+        endpoint=manifest.get("endpoint"),
+        checkpoint_file=manifest.get("checkpoint_file"),
+        checkpoint_interval=float(os.environ.get("TILTCHECK_CHECKPOINT_INTERVAL", "30.0")),
+        watch_mode=os.environ.get("TILTCHECK_WATCH_MODE", "auto"),
+        idle_player_seconds=float(os.environ.get("TILTCHECK_IDLE_PLAYER_SECONDS", "3600")),
+        alert_log_dir=manifest.get("alert_log_dir", os.environ.get("TILTCHECK_ALERT_LOG_DIR"))
+    )
+    logger.info("Starting %d tenants on port %d", len(runner.tenants), manifest.get("port", 8001))
+    runner.run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
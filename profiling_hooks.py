@@ -0,0 +1,193 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck On-Demand Profiling
+
+Diagnostics that can be switched on in a running agent, on live traffic:
+- CPU: request_profile(n) runs cProfile over the next n calls of a
+  function wrapped with profiled() (the agent wraps check_tilt_interval
+  and ingest_socket_bets) and writes a .prof file (load with pstats or snakeviz) plus a text
+  summary of the top functions by cumulative time.
+- Memory: the first snapshot_memory() call starts tracemalloc and records
+  a baseline; every later call writes the top allocation sites and the
+  biggest changes since the previous snapshot. stop_memory() ends tracing.
+
+While idle the only cost is one integer comparison per wrapped call;
+tracemalloc is not started until memory snapshots are requested. The
+profiler is enabled across the awaits of a wrapped tick, so work that other
+tasks do during the tick is included. Wrapped calls may overlap (a socket
+batch arriving during a file check): the profiler stays enabled until the
+last of them returns, and each counts as one tick.
+
+Both can be triggered by signal (install_signal_handlers: SIGUSR1 profiles,
+SIGUSR2 snapshots memory) or by message (agent.py's ProfilingRequest).
+Files are written to `output_dir`.
+"""
+
+import asyncio
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingHooks:
+    """cProfile of the next N ticks and tracemalloc snapshot diffs, on request."""
+
+    def __init__(self, output_dir: str = "profiles", top: int = 25, frames: int = 1):
+        """
+        Initialize the hooks.
+
+        Args:
+            output_dir: Directory for profiles and memory reports
+            top: Entries listed in the text summaries
+            frames: Traceback frames tracemalloc keeps per allocation
+        """
+        self.output_dir = output_dir
+        self.top = top
+        self.frames = frames
+        self._profiler: Optional[cProfile.Profile] = None
+        self._ticks_left = 0
+        self._ticks = 0
+        self._active = 0  # wrapped calls in progress
+        self._started = 0.0
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self.files: List[str] = []
+
+    @property
+    def profiling(self) -> bool:
+        return self._ticks_left > 0
+
+    @property
+    def tracing_memory(self) -> bool:
+        return self._snapshot is not None
+
+    def _path(self, kind: str, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.output_dir, f"{kind}-{stamp}{extension}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.output_dir, f"{kind}-{stamp}-{counter}{extension}")
+            counter += 1
+        return path
+
+    def request_profile(self, ticks: int = 10):
+        """Profile the next `ticks` calls of profiled() functions."""
+        if ticks < 1:
+            raise ValueError(f"ticks must be positive, got {ticks}")
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._ticks = 0
+            self._started = time.monotonic()
+        self._ticks_left = ticks
+        logger.info("Profiling the next %d ticks", ticks)
+
+    def profiled(self, func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Wrap a coroutine function so requested profiles cover its calls."""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if self._ticks_left <= 0:
+                return await func(*args, **kwargs)
+            if self._active == 0:
+                self._profiler.enable()
+            self._active += 1
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._active -= 1
+                self._ticks += 1
+                self._ticks_left = max(self._ticks_left - 1, 0)
+                if self._active == 0:
+                    self._profiler.disable()
+                    if self._ticks_left == 0:
+                        self._write_profile()
+        return wrapper
+
+    def _write_profile(self) -> str:
+        profiler, self._profiler = self._profiler, None
+        path = self._path("profile", ".prof")
+        profiler.dump_stats(path)
+
+        summary = io.StringIO()
+        summary.write(f"{self._ticks} ticks over {time.monotonic() - self._started:.1f}s\n\n")
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(self.top)
+        with open(path[:-len(".prof")] + ".txt", "w") as f:
+            f.write(summary.getvalue())
+
+        self.files.append(path)
+        logger.info("Profile of %d ticks written to %s", self._ticks, path)
+        return path
+
+    def snapshot_memory(self) -> Optional[str]:
+        """
+        Take a tracemalloc snapshot.
+
+        The first call starts tracing and records the baseline; later calls
+        write a report of top allocations and changes since the last one.
+
+        Returns:
+            Report path, or None for the baseline call
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._snapshot = None
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            logger.info("Memory tracing started; the next snapshot reports changes since now")
+            return None
+
+        current, peak = tracemalloc.get_traced_memory()
+        path = self._path("memory", ".txt")
+        with open(path, "w") as f:
+            f.write(f"Traced memory: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)\n")
+            f.write(f"\nTop {self.top} changes since the previous snapshot:\n")
+            for stat in snapshot.compare_to(previous, "lineno")[:self.top]:
+                f.write(f"  {stat}\n")
+            f.write(f"\nTop {self.top} allocation sites:\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                f.write(f"  {stat}\n")
+        self.files.append(path)
+        logger.info("Memory report written to %s", path)
+        return path
+
+    @staticmethod
+    def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def stop_memory(self):
+        """Stop tracemalloc (its overhead ends with it)."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._snapshot = None
+        logger.info("Memory tracing stopped")
+
+    def install_signal_handlers(self, loop: asyncio.AbstractEventLoop, ticks: int = 10):
+        """SIGUSR1 profiles the next `ticks` ticks, SIGUSR2 takes a memory snapshot."""
+        try:
+            loop.add_signal_handler(signal.SIGUSR1, self.request_profile, ticks)
+            loop.add_signal_handler(signal.SIGUSR2, self.snapshot_memory)
+        except (NotImplementedError, AttributeError, RuntimeError) as e:
+            logger.warning("Profiling signals not available: %s", e)
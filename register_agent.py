@@ -22,11 +22,38 @@ Requirements:
 
 Environment Variables:
 Set these in your environment or .env file before running this script.
+
+Bulk mode registers a fleet of agents from a JSON manifest concurrently,
+under a concurrency and rate limit, and skips agents whose registration
+details have not changed since the last successful run:
+
+    python register_agent.py --manifest agent_fleet.json
+
+    {
+        "agents": [
+            {"name": "TiltCheck Casino A", "endpoint": "https://a.example.com/agent",
+             "seed_env": "CASINO_A_SEED", "description": "..."}
+        ]
+    }
+
+"seed_env" names an environment variable holding the seed; "seed" may be
+given inline for local testing. A content hash per agent is kept in the
+state file; it covers the agent address derived from the seed, never the
+seed itself.
 """
 
+import argparse
+import asyncio
+import hashlib
+import json
 import os
 import sys
 import logging
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from uagents_core.config import AgentverseConfig
+from uagents_core.identity import Identity
 from uagents_core.utils.registration import (
     register_chat_agent,
     RegistrationRequestCredentials,
@@ -102,8 +129,237 @@ def register_tiltcheck_agent():
         raise
 
 
-def main():
+class FleetAgent(NamedTuple):
+    """One agent from a fleet manifest."""
+    name: str
+    endpoint: str
+    seed: str
+    active: bool = True
+    description: Optional[str] = None
+    readme: Optional[str] = None
+
+    @property
+    def address(self) -> str:
+        """Agent address derived from the seed, as register_chat_agent derives it."""
+        return Identity.from_seed(self.seed, 0).address
+
+    def content_hash(self, agentverse_url: str) -> str:
+        """Hash of everything that is sent at registration (the agent by its address)."""
+        content = {
+            "name": self.name,
+            "endpoint": self.endpoint,
+            "address": self.address,
+            "active": self.active,
+            "description": self.description,
+            "readme": self.readme,
+            "agentverse": agentverse_url,
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def parse_fleet_agent(entry: Dict) -> FleetAgent:
+    """
+    Validate one manifest agent entry.
+
+    Raises:
+        ValueError: If the entry is incomplete or invalid
+    """
+    name = entry.get("name")
+    if not name:
+        raise ValueError(f"Agent entry has no name: {entry}")
+
+    endpoint = entry.get("endpoint", "")
+    if urlparse(endpoint).scheme not in ("http", "https"):
+        raise ValueError(f"Agent {name} has an invalid endpoint: {endpoint!r}")
+
+    seed = entry.get("seed")
+    if entry.get("seed_env"):
+        seed = os.environ.get(entry["seed_env"])
+    if not seed:
+        raise ValueError(f"Agent {name} has no seed (set 'seed_env' or 'seed')")
+
+    return FleetAgent(
+        name=name,
+        endpoint=endpoint,
+        seed=seed,
+        active=bool(entry.get("active", True)),
+        description=entry.get("description"),
+        readme=entry.get("readme"),
+    )
+
+
+def load_fleet_manifest(path: str) -> List[FleetAgent]:
+    """
+    Load and validate a fleet manifest.
+
+    Raises:
+        ValueError: If the manifest is invalid
+    """
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+
+    agents = [parse_fleet_agent(entry) for entry in manifest.get("agents", [])]
+    if not agents:
+        raise ValueError(f"No agents in {path}")
+
+    names = [agent.name for agent in agents]
+    duplicates = sorted(set(n for n in names if names.count(n) > 1))
+    if duplicates:
+        raise ValueError(f"Duplicate agent names: {duplicates}")
+    return agents
+
+
+def agentverse_config_for(url: Optional[str]) -> AgentverseConfig:
+    """AgentverseConfig for a base URL such as http://127.0.0.1:8999 (None = production)."""
+    if not url:
+        return AgentverseConfig()
+    parsed = urlparse(url)
+    return AgentverseConfig(base_url=parsed.netloc + parsed.path.rstrip("/"), http_prefix=parsed.scheme)
+
+
+def load_registration_state(path: str) -> Dict[str, str]:
+    """Agent name -> content hash from the last run (empty if there is no usable state file)."""
+    try:
+        with open(path, 'r') as f:
+            return dict(json.load(f)["agents"])
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable registration state {path}: {e}")
+        return {}
+
+
+def save_registration_state(path: str, registered: Dict[str, str]):
+    """Write the registration state atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"agents": registered}, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class RateLimiter:
+    """Spaces out starts to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def acquire(self):
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next)
+        self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def register_fleet(agents: List[FleetAgent], agentverse_key: str, state_file: str,
+                         concurrency: int = 8, rate: float = 5.0,
+                         agentverse_url: Optional[str] = None, force: bool = False,
+                         register: Callable[..., bool] = register_chat_agent) -> Dict[str, str]:
+    """
+    Register many agents concurrently, skipping unchanged ones.
+
+    Args:
+        agents: Agents to register
+        agentverse_key: Agentverse API key used for every agent
+        state_file: JSON file with the content hash of each registered agent
+        concurrency: Registrations in flight at once
+        rate: Registrations started per second at most
+        agentverse_url: Agentverse base URL (None = production)
+        force: Register every agent even if unchanged
+        register: Registration function (register_chat_agent signature)
+
+    Returns:
+        Agent name -> "registered", "unchanged" or "failed: <reason>"
+    """
+    registered = load_registration_state(state_file)
+    config = agentverse_config_for(agentverse_url)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    results: Dict[str, str] = {}
+
+    async def register_one(agent: FleetAgent):
+        content_hash = agent.content_hash(config.url)
+        if not force and registered.get(agent.name) == content_hash:
+            results[agent.name] = "unchanged"
+            return
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                await asyncio.to_thread(
+                    register,
+                    agent.name,
+                    agent.endpoint,
+                    active=agent.active,
+                    credentials=RegistrationRequestCredentials(
+                        agentverse_api_key=agentverse_key,
+                        agent_seed_phrase=agent.seed,
+                    ),
+                    description=agent.description,
+                    readme=agent.readme,
+                    agentverse_config=config,
+                )
+            except Exception as e:
+                logger.error(f"❌ Registration of {agent.name} failed: {e}")
+                results[agent.name] = f"failed: {e}"
+                return
+        registered[agent.name] = content_hash
+        results[agent.name] = "registered"
+        logger.info(f"✅ Registered {agent.name} at {agent.endpoint}")
+
+    try:
+        await asyncio.gather(*(register_one(agent) for agent in agents))
+    finally:
+        save_registration_state(state_file, registered)
+    return results
+
+
+def register_fleet_from_manifest(args) -> int:
+    """Run bulk registration for the command line; returns the exit code."""
+    agentverse_key = os.environ.get("AGENTVERSE_KEY")
+    if not agentverse_key:
+        logger.error("❌ AGENTVERSE_KEY environment variable is not set")
+        return 1
+    try:
+        agents = load_fleet_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ Invalid fleet manifest: {e}")
+        return 1
+
+    logger.info(f"Registering {len(agents)} agents from {args.manifest} "
+                f"(concurrency {args.concurrency}, {args.rate}/s)")
+    results = asyncio.run(register_fleet(
+        agents, agentverse_key, args.state_file, concurrency=args.concurrency, rate=args.rate,
+        agentverse_url=args.agentverse_url, force=args.force,
+    ))
+    counts = {status: 0 for status in ("registered", "unchanged", "failed")}
+    for status in results.values():
+        counts[status.split(":")[0]] += 1
+    logger.info(f"Fleet registration: {counts['registered']} registered, "
+                f"{counts['unchanged']} unchanged, {counts['failed']} failed")
+    return 1 if counts["failed"] else 0
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the registration script"""
+    parser = argparse.ArgumentParser(description="Register TiltCheck agents with Agentverse")
+    parser.add_argument("--manifest", default=os.environ.get("TILTCHECK_AGENT_FLEET"),
+                        help="Fleet manifest for bulk registration")
+    parser.add_argument("--state-file", default=os.environ.get(
+        "TILTCHECK_REGISTRATION_STATE", "registration_state.json"),
+                        help="Where content hashes of registered agents are kept")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="Registrations started per second")
+    parser.add_argument("--agentverse-url", default=os.environ.get("AGENTVERSE_URL"),
+                        help="Agentverse base URL (default: production)")
+    parser.add_argument("--force", action="store_true", help="Re-register unchanged agents")
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        return register_fleet_from_manifest(args)
+
     logger.info("=" * 70)
     logger.info(" TiltCheck Agent - Agentverse Registration ")
     logger.info("=" * 70)
@@ -0,0 +1,218 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Risk Leaderboard
+
+Live top-K view of the players closest to tilt, maintained incrementally
+instead of re-running the tilt checks for every player and sorting.
+
+Each player's risk is the highest of its component ratios, where 1.0 means
+"at the alert threshold":
+- engine: spins in the window / threshold_spins, and balance drop /
+  drop_threshold (from TiltEngine),
+- tilt_score: TiltCheckSolanaAgent tilt score / 70 (the HIGH risk level).
+
+Scores live in an indexed binary max-heap (heap array plus a player ->
+position map), so a score change is O(log n). top(k) walks the heap from
+the root with a small frontier heap and only touches O(k) nodes; the result
+is cached and only invalidated by updates that can change it.
+
+Players that get no updates for a while are dropped with evict_idle(), so
+a player who left keeps neither a heap slot nor a stale top-K position.
+"""
+
+import time
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+from tilt_engine import TiltEngine
+
+SOURCE_ENGINE = "engine"
+SOURCE_TILT_SCORE = "tilt_score"
+
+# TiltCheckSolanaAgent._get_risk_level: scores >= 70 are HIGH risk
+HIGH_TILT_SCORE = 70.0
+
+
+def engine_risk(engine: TiltEngine, player_id: str) -> float:
+    """Risk ratio of a player from the engine's current windows."""
+    rules = engine.rules_for(player_id)
+    risk = engine.spin_count(player_id) / rules.threshold_spins
+    drop = engine.balance_drop(player_id)
+    if drop is not None:
+        risk = max(risk, drop["drop_percentage"] / rules.drop_threshold)
+    return risk
+
+
+def tilt_score_risk(tilt_score: float) -> float:
+    """Risk ratio of a TiltCheckSolanaAgent tilt score (0-100)."""
+    return tilt_score / HIGH_TILT_SCORE
+
+
+class RiskLeaderboard:
+    """Indexed max-heap of player risk scores with cached top-K queries."""
+
+    def __init__(self):
+        self._heap: List[str] = []
+        self._position: Dict[str, int] = {}
+        self._score: Dict[str, float] = {}
+        # player_id -> source -> risk ratio
+        self._components: Dict[str, Dict[str, float]] = {}
+        # player_id -> wall-clock time of the last update
+        self._updated: Dict[str, float] = {}
+
+        self._cache: Optional[List[Tuple[str, float]]] = None
+        self._cache_k = 0
+        self._cache_members: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._position
+
+    def score(self, player_id: str) -> Optional[float]:
+        """Current risk score of a player, or None if not tracked."""
+        return self._score.get(player_id)
+
+    def components(self, player_id: str) -> Dict[str, float]:
+        """Risk ratio per source for a player."""
+        return dict(self._components.get(player_id, {}))
+
+    def update(self, player_id: str, source: str, risk: float, now: Optional[float] = None):
+        """
+        Set one risk component of a player and re-rank it.
+
+        Args:
+            player_id: Player to update
+            source: SOURCE_ENGINE, SOURCE_TILT_SCORE or a custom source name
+            risk: Risk ratio for that source (1.0 = at the alert threshold)
+            now: Wall-clock time for evict_idle() (defaults to time.time())
+        """
+        components = self._components.setdefault(player_id, {})
+        components[source] = risk
+        self._updated[player_id] = time.time() if now is None else now
+        self._set_score(player_id, max(components.values()))
+
+    def evict_idle(self, idle_seconds: float, now: Optional[float] = None) -> List[str]:
+        """
+        Stop tracking players without updates for `idle_seconds`.
+
+        Returns:
+            The removed player IDs
+        """
+        now = time.time() if now is None else now
+        idle = [player_id for player_id, updated in self._updated.items() if now - updated >= idle_seconds]
+        for player_id in idle:
+            self.remove(player_id)
+        return idle
+
+    def remove(self, player_id: str) -> bool:
+        """Stop tracking a player. Returns False if it was not tracked."""
+        index = self._position.pop(player_id, None)
+        if index is None:
+            return False
+        del self._score[player_id]
+        del self._components[player_id]
+        del self._updated[player_id]
+        self._invalidate_for(player_id, None)
+
+        last = self._heap.pop()
+        if index < len(self._heap):
+            self._heap[index] = last
+            self._position[last] = index
+            self._sift_up(index)
+            self._sift_down(self._position[last])
+        return True
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """
+        The k highest-risk players as (player_id, score), highest first.
+
+        Ties are broken by heap position, so equal scores have no
+        guaranteed order.
+        """
+        if k <= 0 or not self._heap:
+            return []
+        if self._cache is not None and k <= self._cache_k:
+            return self._cache[:k]
+
+        heap, score = self._heap, self._score
+        size = len(heap)
+        result = []
+        frontier = [(-score[heap[0]], 0)]
+        while frontier and len(result) < k:
+            negative, index = heappop(frontier)
+            result.append((heap[index], -negative))
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size:
+                    heappush(frontier, (-score[heap[child]], child))
+
+        self._cache = result
+        self._cache_k = k
+        self._cache_members = dict(result)
+        return list(result)
+
+    def _set_score(self, player_id: str, new_score: float):
+        old_score = self._score.get(player_id)
+        if old_score == new_score:
+            return
+        self._invalidate_for(player_id, new_score)
+        self._score[player_id] = new_score
+
+        index = self._position.get(player_id)
+        if index is None:
+            index = len(self._heap)
+            self._heap.append(player_id)
+            self._position[player_id] = index
+            self._sift_up(index)
+        elif new_score > old_score:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def _invalidate_for(self, player_id: str, new_score: Optional[float]):
+        """Drop the cached top-K if this change can alter it."""
+        if self._cache is None:
+            return
+        if (player_id in self._cache_members
+                or len(self._cache) < self._cache_k
+                or (new_score is not None and new_score >= self._cache[-1][1])):
+            self._cache = None
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i]] = i
+        self._position[heap[j]] = j
+
+    def _sift_up(self, index: int):
+        heap, score = self._heap, self._score
+        while index > 0:
+            parent = (index - 1) >> 1
+            if score[heap[index]] <= score[heap[parent]]:
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index: int):
+        heap, score = self._heap, self._score
+        size = len(heap)
+        while True:
+            largest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and score[heap[child]] > score[heap[largest]]:
+                    largest = child
+            if largest == index:
+                return
+            self._swap(index, largest)
+            index = largest
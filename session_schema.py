@@ -0,0 +1,117 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Session Data Schema
+
+Column names and value codes shared by every component that reads or
+stores gambling session data.
+"""
+
+import math
+import re
+from datetime import datetime, timezone
+
+# Columns every session data source must provide
+REQUIRED_COLUMNS = ['timestamp', 'bet_amount', 'outcome', 'balance']
+
+# Optional column identifying the player; single-player files omit it
+PLAYER_COLUMN = 'player_id'
+DEFAULT_PLAYER_ID = 'default'
+
+# Optional column naming the game (slot title, table) a bet was placed on
+GAME_COLUMN = 'game'
+
+# Optional column with a feed-assigned unique ID per bet (used to drop retries)
+EVENT_ID_COLUMN = 'event_id'
+
+# Compact integer codes for the outcome column
+OUTCOME_CODES = {'loss': 0, 'win': 1, 'push': 2}
+OUTCOME_NAMES = {code: name for name, code in OUTCOME_CODES.items()}
+UNKNOWN_OUTCOME = -1
+
+# Timestamps are int64 nanoseconds (the range pandas datetime64[ns] covers)
+MIN_TIMESTAMP_NS = -(1 << 63)
+MAX_TIMESTAMP_NS = (1 << 63) - 1
+
+# Nanoseconds per unit of a numeric timestamp
+TIMESTAMP_UNITS = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+# pandas reads a numeric CSV timestamp column as nanoseconds since the epoch
+CSV_TIMESTAMP_UNIT = "ns"
+
+INTEGER = re.compile(r"^[+-]?\d+$")
+ISO_FRACTION = re.compile(r"(\d{2}:\d{2}:\d{2})\.(\d+)")
+
+
+def encode_outcome(outcome: str) -> int:
+    """Map an outcome string to its integer code (-1 if unknown)."""
+    return OUTCOME_CODES.get(str(outcome).strip().lower(), UNKNOWN_OUTCOME)
+
+
+def decode_outcome(code: int) -> str:
+    """Map an integer outcome code back to its string."""
+    return OUTCOME_NAMES.get(int(code), 'unknown')
+
+
+def parse_timestamp(value, unit: str = "s") -> int:
+    """
+    Parse a session timestamp into integer nanoseconds since the epoch.
+
+    Accepts ISO format strings (naive values are treated as UTC, fractions
+    down to nanoseconds are kept) and numeric Unix timestamps in `unit`.
+    Integer nanoseconds keep window boundary comparisons exact.
+
+    Args:
+        value: ISO string, number or numeric string
+        unit: Unit of numeric timestamps ("s", "ms", "us" or "ns"); session
+            CSV files use CSV_TIMESTAMP_UNIT
+
+    Raises:
+        ValueError: If the value is malformed, not finite or outside the
+            int64 nanosecond range (years 1677-2262)
+    """
+    scale = TIMESTAMP_UNITS[unit]
+    try:
+        if isinstance(value, int):
+            return _check_range(value * scale, value)
+        if isinstance(value, float):
+            return _check_range(int(round(value * scale)), value)
+        text = str(value).strip()
+        if INTEGER.match(text):
+            return _check_range(int(text) * scale, value)
+        try:
+            number = float(text)
+        except ValueError:
+            pass
+        else:
+            if not math.isfinite(number):
+                raise ValueError(f"Non-finite timestamp: {value!r}")
+            return _check_range(int(round(number * scale)), value)
+
+        # datetime keeps microseconds only; take the fraction apart
+        fraction_ns = 0
+        match = ISO_FRACTION.search(text)
+        if match:
+            fraction_ns = int(match.group(2)[:9].ljust(9, '0'))
+            text = text[:match.start(2) - 1] + text[match.end(2):]
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        delta = parsed - datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return _check_range((delta.days * 86_400 + delta.seconds) * 1_000_000_000 + fraction_ns, value)
+    except OverflowError:
+        raise ValueError(f"Timestamp out of range: {value!r}") from None
+
+
+def _check_range(nanoseconds: int, value) -> int:
+    if not MIN_TIMESTAMP_NS <= nanoseconds <= MAX_TIMESTAMP_NS:
+        raise ValueError(f"Timestamp out of range: {value!r}")
+    return nanoseconds
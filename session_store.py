@@ -0,0 +1,357 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Shared Session Store
+
+Single-writer, multi-reader columnar store for session data in
+multiprocessing.shared_memory, so several processes on one host (the tilt
+agent, the demo dashboard, the Solana scorer) can share one copy of the
+data instead of each loading its own DataFrame.
+
+Layout:
+- A small control segment named `<name>` holds the current generation.
+- Each publish writes an immutable data segment `<name>_g<generation>`
+  with rows grouped by player and sorted by timestamp, stored as
+  contiguous columns (int64 ns timestamps, float64 amounts, int8 outcomes)
+  plus a JSON directory of per-player row ranges.
+
+The agent republishes from a worker thread at most once per `interval`
+(maybe_publish()), so reloading a large session file never blocks its
+event loop. Readers attach to the current generation and get zero-copy
+NumPy views.
+Old generations are unlinked by the writer after a new one is published;
+readers that still map them keep a valid view until they refresh.
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from session_schema import DEFAULT_PLAYER_ID, PLAYER_COLUMN, OUTCOME_NAMES, encode_outcome
+
+logger = logging.getLogger(__name__)
+
+STORE_MAGIC = b"TCSTORE\0"
+STORE_VERSION = 1
+
+# Control segment: magic, version, generation
+CONTROL_HEADER = struct.Struct("<8sIQ")
+# Data segment: magic, version, row count, directory length
+DATA_HEADER = struct.Struct("<8sIQI")
+
+# Column order and dtypes in a data segment (int8 last to keep alignment)
+COLUMNS = [
+    ('timestamp', np.int64),
+    ('bet_amount', np.float64),
+    ('balance', np.float64),
+    ('outcome', np.int8),
+]
+
+
+def _segment_name(name: str, generation: int) -> str:
+    return f"{name}_g{generation}"
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without letting this process unlink it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=False, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13 registers every attached segment with the resource
+    # tracker, which would unlink it when this reader exits
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name, create=False)
+    finally:
+        resource_tracker.register = register
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class SessionStoreWriter:
+    """Publishes session data snapshots into shared memory (single writer)."""
+
+    def __init__(self, name: str = "tiltcheck_sessions", interval: float = 10.0):
+        """
+        Create the control segment for a store.
+
+        Args:
+            name: Shared memory name readers attach to
+            interval: Minimum seconds between maybe_publish() snapshots
+        """
+        self.name = name
+        self.interval = interval
+        self.generation = 0
+        # Set when the source data changed since the last snapshot
+        self.stale = True
+        self.last_published: Optional[float] = None
+        self._publishing = False
+        self._segment: Optional[shared_memory.SharedMemory] = None
+
+        try:
+            self._control = shared_memory.SharedMemory(name=name, create=True, size=CONTROL_HEADER.size)
+        except FileExistsError:
+            # Left behind by a writer that crashed; take it over
+            self._control = _attach(name)
+            _, _, self.generation = CONTROL_HEADER.unpack_from(self._control.buf, 0)
+        CONTROL_HEADER.pack_into(self._control.buf, 0, STORE_MAGIC, STORE_VERSION, self.generation)
+
+    def publish(self, df: pd.DataFrame) -> int:
+        """
+        Publish a new snapshot of session data.
+
+        Args:
+            df: DataFrame with the session columns and an optional player_id column
+
+        Returns:
+            The generation number of the published snapshot
+        """
+        if PLAYER_COLUMN in df.columns:
+            players = df[PLAYER_COLUMN].astype(str)
+        else:
+            players = pd.Series(DEFAULT_PLAYER_ID, index=df.index)
+
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        order = np.lexsort((timestamps, players.to_numpy()))
+        sorted_players = players.to_numpy()[order]
+
+        directory: Dict[str, List[int]] = {}
+        if len(sorted_players):
+            bounds = np.flatnonzero(sorted_players[1:] != sorted_players[:-1]) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [len(sorted_players)]))
+            for start, end in zip(starts, ends):
+                directory[str(sorted_players[start])] = [int(start), int(end)]
+
+        columns = {
+            'timestamp': timestamps[order],
+            'bet_amount': df['bet_amount'].to_numpy(dtype=np.float64)[order],
+            'balance': df['balance'].to_numpy(dtype=np.float64)[order],
+            'outcome': np.fromiter((encode_outcome(o) for o in df['outcome']),
+                                   dtype=np.int8, count=len(df))[order],
+        }
+
+        dir_bytes = json.dumps(directory, separators=(',', ':')).encode('utf-8')
+        nrows = len(df)
+        offset = _align(DATA_HEADER.size + len(dir_bytes))
+        size = offset + sum(nrows * np.dtype(dtype).itemsize for _, dtype in COLUMNS)
+
+        generation = self.generation + 1
+        segment = shared_memory.SharedMemory(name=_segment_name(self.name, generation),
+                                             create=True, size=max(size, 1))
+        DATA_HEADER.pack_into(segment.buf, 0, STORE_MAGIC, STORE_VERSION, nrows, len(dir_bytes))
+        segment.buf[DATA_HEADER.size:DATA_HEADER.size + len(dir_bytes)] = dir_bytes
+        for column, dtype in COLUMNS:
+            view = np.ndarray((nrows,), dtype=dtype, buffer=segment.buf, offset=offset)
+            view[:] = columns[column]
+            offset += nrows * np.dtype(dtype).itemsize
+            del view
+
+        # Flip readers to the new generation, then retire the old segment
+        CONTROL_HEADER.pack_into(self._control.buf, 0, STORE_MAGIC, STORE_VERSION, generation)
+        self._retire_segment()
+        self._segment = segment
+        self.generation = generation
+
+        logger.debug("Published %d rows for %d players (generation %d)", nrows, len(directory), generation)
+        return generation
+
+    async def maybe_publish(self, load_fn: Callable[[], Optional[pd.DataFrame]]) -> bool:
+        """
+        Publish if the data is stale and at least `interval` seconds passed
+        since the last snapshot (the first one is published right away).
+
+        Loading and publishing run in the default executor, off the event
+        loop. A failed load leaves the store stale, so it is retried.
+
+        Args:
+            load_fn: Loads the session data (None if it cannot be loaded);
+                only called when a publish is due
+        """
+        if not self.stale or self._publishing:
+            return False
+        if self.last_published is not None and time.monotonic() - self.last_published < self.interval:
+            return False
+        self.stale = False
+        self._publishing = True
+        try:
+            published = await asyncio.get_running_loop().run_in_executor(None, self._load_and_publish, load_fn)
+        except BaseException:
+            self.stale = True
+            raise
+        finally:
+            self._publishing = False
+        if not published:
+            self.stale = True
+        return published
+
+    def _load_and_publish(self, load_fn: Callable[[], Optional[pd.DataFrame]]) -> bool:
+        df = load_fn()
+        if df is None:
+            return False
+        self.publish(df)
+        self.last_published = time.monotonic()
+        return True
+
+    def _retire_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+    def close(self, unlink: bool = True):
+        """Release the store; with unlink=True readers can no longer attach."""
+        self._retire_segment()
+        self._control.close()
+        if unlink:
+            self._control.unlink()
+
+
+class SessionStoreReader:
+    """Attaches to a shared session store and exposes zero-copy column views."""
+
+    def __init__(self, name: str = "tiltcheck_sessions"):
+        """
+        Attach to a store published by a SessionStoreWriter.
+
+        Args:
+            name: Shared memory name of the store
+        """
+        self.name = name
+        self.generation = 0
+        self._control = _attach(name)
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._directory: Dict[str, List[int]] = {}
+        self.refresh()
+
+    def _current_generation(self) -> int:
+        magic, version, generation = CONTROL_HEADER.unpack_from(self._control.buf, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise ValueError(f"Shared memory {self.name} is not a TiltCheck session store")
+        return generation
+
+    def refresh(self) -> bool:
+        """
+        Attach to the latest published generation if it changed.
+
+        Returns:
+            True if a newer snapshot is now visible
+        """
+        for _ in range(3):
+            generation = self._current_generation()
+            if generation == self.generation:
+                return False
+            try:
+                segment = _attach(_segment_name(self.name, generation))
+            except FileNotFoundError:
+                # The writer published again and retired this generation
+                continue
+            self._load_segment(segment)
+            self.generation = generation
+            return True
+        return False
+
+    def _load_segment(self, segment: shared_memory.SharedMemory):
+        magic, version, nrows, dir_len = DATA_HEADER.unpack_from(segment.buf, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            segment.close()
+            raise ValueError(f"Unexpected data segment layout in {segment.name}")
+
+        directory = json.loads(bytes(segment.buf[DATA_HEADER.size:DATA_HEADER.size + dir_len]))
+        offset = _align(DATA_HEADER.size + dir_len)
+        columns = {}
+        for column, dtype in COLUMNS:
+            view = np.ndarray((nrows,), dtype=dtype, buffer=segment.buf, offset=offset)
+            view.flags.writeable = False
+            columns[column] = view
+            offset += nrows * np.dtype(dtype).itemsize
+
+        self._release_segment()
+        self._segment = segment
+        self._columns = columns
+        self._directory = directory
+
+    def players(self) -> List[str]:
+        """Return the player IDs in the current snapshot."""
+        return list(self._directory)
+
+    def __len__(self) -> int:
+        return len(self._columns.get('timestamp', ()))
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a read-only view of a whole column."""
+        return self._columns[name]
+
+    def player_window(self, player_id: str, since: Optional[pd.Timestamp] = None) -> Dict[str, np.ndarray]:
+        """
+        Return zero-copy views of one player's rows.
+
+        Args:
+            player_id: Player to select
+            since: Only include rows at or after this timestamp
+
+        Returns:
+            Dict of column name to read-only NumPy view (empty views if unknown)
+        """
+        start, end = self._directory.get(str(player_id), (0, 0))
+        if since is not None and end > start:
+            since_ns = pd.Timestamp(since).value
+            start += int(np.searchsorted(self._columns['timestamp'][start:end], since_ns, side='left'))
+        return {column: view[start:end] for column, view in self._columns.items()}
+
+    def to_dataframe(self, player_id: Optional[str] = None) -> pd.DataFrame:
+        """Materialize a (copied) DataFrame in the load_csv_data layout."""
+        if player_id is None:
+            columns = self._columns
+            players = np.empty(len(self), dtype=object)
+            for pid, (start, end) in self._directory.items():
+                players[start:end] = pid
+        else:
+            columns = self.player_window(player_id)
+            players = np.full(len(columns['timestamp']), str(player_id), dtype=object)
+
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(columns['timestamp'], unit='ns'),
+            'bet_amount': np.array(columns['bet_amount']),
+            'outcome': [OUTCOME_NAMES.get(int(code), 'unknown') for code in columns['outcome']],
+            'balance': np.array(columns['balance']),
+            PLAYER_COLUMN: players,
+        })
+
+    def _release_segment(self):
+        # Views must be dropped before the mapping can be closed
+        self._columns = {}
+        self._directory = {}
+        if self._segment is not None:
+            try:
+                self._segment.close()
+            except BufferError:
+                logger.debug("Views into %s still held; leaving it mapped", self._segment.name)
+            self._segment = None
+
+    def close(self):
+        """Detach from the store. Views handed out earlier must not be used afterwards."""
+        self._release_segment()
+        self._control.close()
@@ -0,0 +1,288 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Session Summary Engine
+
+Builds session reports in a single pass over the bets. Each session has a
+fixed-size accumulator that is updated once per bet, so the input can be
+streamed (CSV files read row by row, DataFrames, BetEvents) and many
+sessions are summarized at once.
+
+Per session:
+- first/last bet time, duration and bets per minute,
+- start/end balance, total bet amount,
+- wins, losses and win rate,
+- longest win and loss streaks,
+- peak drawdown (largest fall from a running balance peak).
+
+Streaks and drawdown follow the order in which bets arrive, so each
+session's rows must be fed in time order (session files are written that
+way). The report is a columnar table: column name -> list of values.
+
+Usage:
+    python session_summary.py sessions/*.csv --output nightly_report.csv
+"""
+
+import argparse
+import csv
+import logging
+import math
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from session_schema import DEFAULT_PLAYER_ID, OUTCOME_CODES, PLAYER_COLUMN, REQUIRED_COLUMNS, \
+    CSV_TIMESTAMP_UNIT, encode_outcome, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+NS_PER_MINUTE = 60_000_000_000
+WIN = OUTCOME_CODES['win']
+LOSS = OUTCOME_CODES['loss']
+
+# Columns of the report table, in order
+SUMMARY_COLUMNS = [
+    'session_id', 'bets', 'first_timestamp', 'last_timestamp', 'duration_minutes',
+    'bets_per_minute', 'start_balance', 'end_balance', 'net_change', 'total_bet',
+    'wins', 'losses', 'win_rate', 'longest_win_streak', 'longest_loss_streak',
+    'peak_drawdown', 'peak_drawdown_pct',
+]
+
+
+class SessionAccumulator:
+    """Running totals for one session, updated once per bet."""
+
+    __slots__ = (
+        "bets", "first_ts", "last_ts", "start_balance", "end_balance", "total_bet",
+        "wins", "losses", "streak_outcome", "streak", "longest_win_streak",
+        "longest_loss_streak", "peak_balance", "peak_drawdown", "peak_drawdown_pct",
+    )
+
+    def __init__(self):
+        self.bets = 0
+        self.first_ts = None
+        self.last_ts = None
+        self.start_balance = 0.0
+        self.end_balance = 0.0
+        self.total_bet = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.streak_outcome = None
+        self.streak = 0
+        self.longest_win_streak = 0
+        self.longest_loss_streak = 0
+        self.peak_balance = None
+        self.peak_drawdown = 0.0
+        self.peak_drawdown_pct = 0.0
+
+    def add(self, timestamp: int, bet_amount: float, outcome: int, balance: float):
+        """
+        Add one bet.
+
+        Args:
+            timestamp: Nanoseconds since the epoch
+            bet_amount: Amount wagered
+            outcome: Outcome code (session_schema.encode_outcome)
+            balance: Balance after the bet
+        """
+        if self.bets == 0:
+            self.first_ts = self.last_ts = timestamp
+            self.start_balance = self.end_balance = balance
+        elif timestamp < self.first_ts:
+            self.first_ts = timestamp
+            self.start_balance = balance
+        elif timestamp >= self.last_ts:
+            self.last_ts = timestamp
+            self.end_balance = balance
+        self.bets += 1
+        self.total_bet += bet_amount
+
+        if outcome == WIN:
+            self.wins += 1
+        elif outcome == LOSS:
+            self.losses += 1
+        if outcome == self.streak_outcome:
+            self.streak += 1
+        else:
+            self.streak_outcome = outcome
+            self.streak = 1
+        if outcome == WIN and self.streak > self.longest_win_streak:
+            self.longest_win_streak = self.streak
+        elif outcome == LOSS and self.streak > self.longest_loss_streak:
+            self.longest_loss_streak = self.streak
+
+        if self.peak_balance is None or balance > self.peak_balance:
+            self.peak_balance = balance
+        drawdown = self.peak_balance - balance
+        if drawdown > self.peak_drawdown:
+            self.peak_drawdown = drawdown
+            self.peak_drawdown_pct = drawdown / self.peak_balance * 100 if self.peak_balance > 0 else 0.0
+
+    def row(self, session_id: str) -> List:
+        """Report values in SUMMARY_COLUMNS order."""
+        duration = (self.last_ts - self.first_ts) / NS_PER_MINUTE if self.bets else 0.0
+        return [
+            session_id, self.bets, self.first_ts, self.last_ts, duration,
+            self.bets / duration if duration > 0 else 0.0,
+            self.start_balance, self.end_balance, self.end_balance - self.start_balance,
+            self.total_bet, self.wins, self.losses,
+            self.wins / self.bets * 100 if self.bets else 0.0,
+            self.longest_win_streak, self.longest_loss_streak,
+            self.peak_drawdown, self.peak_drawdown_pct,
+        ]
+
+
+class SessionSummaryEngine:
+    """Summarizes many sessions at once from streamed bets."""
+
+    def __init__(self):
+        self.sessions: Dict[str, SessionAccumulator] = {}
+        # CSV rows skipped by add_rows (malformed, non-finite or out of range)
+        self.bad_rows = 0
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def add(self, session_id: str, timestamp: int, bet_amount: float, outcome, balance: float):
+        """Add one bet to a session (outcome as string or code)."""
+        accumulator = self.sessions.get(session_id)
+        if accumulator is None:
+            accumulator = self.sessions[session_id] = SessionAccumulator()
+        if isinstance(outcome, str):
+            outcome = encode_outcome(outcome)
+        accumulator.add(timestamp, bet_amount, outcome, balance)
+
+    def add_events(self, events: Iterable, session_id: Optional[str] = None):
+        """Add BetEvents, keyed by session_id or else by each event's player_id."""
+        for event in events:
+            self.add(session_id or event.player_id, event.timestamp, event.bet_amount,
+                     event.outcome, event.balance)
+
+    def add_rows(self, rows: Iterable[Dict[str, str]], session_id: str):
+        """
+        Add CSV rows (dicts of strings). Rows with a player_id column are
+        kept apart as `<session_id>/<player_id>`. Malformed rows, non-finite
+        amounts and out-of-range timestamps are skipped and counted in
+        bad_rows.
+        """
+        for row in rows:
+            player = row.get(PLAYER_COLUMN)
+            key = f"{session_id}/{player}" if player else session_id
+            try:
+                bet_amount = float(row['bet_amount'])
+                balance = float(row['balance'])
+                if not (math.isfinite(bet_amount) and math.isfinite(balance)):
+                    raise ValueError("non-finite amount")
+                self.add(key, parse_timestamp(row['timestamp'], CSV_TIMESTAMP_UNIT), bet_amount,
+                         row['outcome'], balance)
+            except (KeyError, TypeError, ValueError, OverflowError) as e:
+                self.bad_rows += 1
+                logger.warning("Skipping malformed row in %s: %s", session_id, e)
+
+    def add_file(self, path: str, session_id: Optional[str] = None) -> str:
+        """
+        Stream one session CSV file.
+
+        Returns:
+            The session ID used (defaults to the file name without extension)
+        """
+        session_id = session_id or os.path.splitext(os.path.basename(path))[0]
+        with open(path, newline='') as f:
+            reader = csv.DictReader(f)
+            missing = [col for col in REQUIRED_COLUMNS if col not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"{path} is missing columns: {missing}")
+            self.add_rows(reader, session_id)
+        return session_id
+
+    def add_dataframe(self, df, session_id: Optional[str] = None):
+        """
+        Add a loaded session DataFrame in one pass over its columns.
+
+        Rows are keyed by session_id, or by the player_id column when
+        session_id is not given (DEFAULT_PLAYER_ID if there is none).
+        """
+        if df['timestamp'].dtype.kind == 'M':
+            timestamps = df['timestamp'].to_numpy(dtype='datetime64[ns]').astype('int64').tolist()
+        else:
+            timestamps = [parse_timestamp(value, CSV_TIMESTAMP_UNIT) for value in df['timestamp']]
+        if session_id is not None:
+            keys = [session_id] * len(df)
+        elif PLAYER_COLUMN in df.columns:
+            keys = df[PLAYER_COLUMN].astype(str).tolist()
+        else:
+            keys = [DEFAULT_PLAYER_ID] * len(df)
+        outcomes = [encode_outcome(value) for value in df['outcome'].tolist()]
+
+        for key, timestamp, bet, outcome, balance in zip(
+                keys, timestamps, df['bet_amount'].astype(float).tolist(), outcomes,
+                df['balance'].astype(float).tolist()):
+            self.add(key, timestamp, bet, outcome, balance)
+
+    def summary(self, session_id: str) -> Dict:
+        """Report for one session as a dict."""
+        return dict(zip(SUMMARY_COLUMNS, self.sessions[session_id].row(session_id)))
+
+    def table(self) -> Dict[str, List]:
+        """Columnar report: column name -> values, one entry per session (sorted by ID)."""
+        table = {column: [] for column in SUMMARY_COLUMNS}
+        columns = [table[column] for column in SUMMARY_COLUMNS]
+        for session_id in sorted(self.sessions):
+            for column, value in zip(columns, self.sessions[session_id].row(session_id)):
+                column.append(value)
+        return table
+
+    def to_dataframe(self):
+        """Report as a pandas DataFrame (requires pandas)."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.table(), columns=SUMMARY_COLUMNS)
+        for column in ('first_timestamp', 'last_timestamp'):
+            df[column] = pd.to_datetime(df[column], unit='ns')
+        return df
+
+    def write_csv(self, f: TextIO):
+        """Write the report as CSV to an open text file."""
+        table = self.table()
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_COLUMNS)
+        writer.writerows(zip(*(table[column] for column in SUMMARY_COLUMNS)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Summarize session files into one report."""
+    parser = argparse.ArgumentParser(description="Summarize TiltCheck session files in one pass")
+    parser.add_argument("files", nargs="+", help="Session CSV files")
+    parser.add_argument("--output", help="Report CSV path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    engine = SessionSummaryEngine()
+    for path in args.files:
+        try:
+            engine.add_file(path)
+        except (OSError, ValueError) as e:
+            logger.error("Skipping %s: %s", path, e)
+    if engine.bad_rows:
+        logger.warning("Skipped %d malformed rows", engine.bad_rows)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            engine.write_csv(f)
+        logger.info("Wrote %d session summaries to %s", len(engine), args.output)
+    else:
+        engine.write_csv(sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
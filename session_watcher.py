@@ -0,0 +1,260 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Session File Watcher
+
+Triggers tilt evaluation as soon as the session data file changes instead of
+waiting for the next fixed timer tick. On Linux the watcher uses inotify
+(through ctypes, no extra dependencies); everywhere else it falls back to
+polling the file's stat fingerprint.
+
+Bursts of appends are debounced into a single evaluation, and an evaluation
+is skipped entirely when the file's fingerprint has not changed since the
+last one.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (inode, size, mtime in ns) - cheap to read and changes on every append
+Fingerprint = Tuple[int, int, int]
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def file_fingerprint(filepath: str) -> Optional[Fingerprint]:
+    """
+    Return a cheap fingerprint of a file, or None if it does not exist.
+
+    Args:
+        filepath: Path to the watched file
+
+    Returns:
+        Tuple of (inode, size, mtime_ns) or None
+    """
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class _Inotify:
+    """Minimal ctypes binding for a single inotify directory watch."""
+
+    def __init__(self, directory: str):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Watch the directory, not the file, so atomic replaces and
+        # re-creation of the file are picked up as well
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read_names(self) -> list:
+        """Drain pending events and return the file names they refer to."""
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                names.append(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SessionFileWatcher:
+    """
+    Watch a session data file and invoke a callback when it changes.
+
+    The callback is awaited at most once per debounce window, and only
+    when the file fingerprint differs from the one last claimed.
+    """
+
+    def __init__(self, filepath: str, debounce: float = 0.05,
+                 max_delay: float = 0.5, poll_interval: float = 1.0,
+                 mode: str = "auto"):
+        """
+        Initialize the watcher.
+
+        Args:
+            filepath: Path to the session data file
+            debounce: Quiet period (seconds) that ends a burst of writes
+            max_delay: Upper bound (seconds) on how long a burst can
+                postpone the evaluation
+            poll_interval: Stat interval (seconds) for the polling fallback
+            mode: "auto", "inotify" or "poll"
+        """
+        if mode not in ("auto", "inotify", "poll"):
+            raise ValueError(f"Unknown watch mode: {mode}")
+
+        self.filepath = filepath
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.mode = mode
+
+        self._last_fingerprint: Optional[Fingerprint] = None
+        self._changed = asyncio.Event()
+        self._stopped = False
+
+        self.evaluations = 0
+        self.skipped = 0
+
+    def claim_change(self) -> Optional[Fingerprint]:
+        """
+        Record the current fingerprint if it changed since the last claim.
+
+        Returns:
+            The new fingerprint, or None when the file is unchanged or missing
+        """
+        fingerprint = file_fingerprint(self.filepath)
+        if fingerprint is None or fingerprint == self._last_fingerprint:
+            self.skipped += 1
+            return None
+        self._last_fingerprint = fingerprint
+        self.evaluations += 1
+        return fingerprint
+
+    def notify(self):
+        """Signal that the file may have changed."""
+        self._changed.set()
+
+    def stop(self):
+        """Stop the watch loop after the current iteration."""
+        self._stopped = True
+        self._changed.set()
+
+    async def run(self, on_change: Callable[[], Awaitable[None]]):
+        """
+        Run the watch loop until stop() is called.
+
+        Args:
+            on_change: Coroutine function awaited after each debounced burst
+        """
+        inotify = self._open_inotify()
+        poller = None
+        loop = asyncio.get_running_loop()
+
+        if inotify is not None:
+            target = os.path.basename(self.filepath)
+
+            def _on_readable():
+                if target in inotify.read_names():
+                    self._changed.set()
+
+            loop.add_reader(inotify.fd, _on_readable)
+            logger.info("Watching %s with inotify", self.filepath)
+        else:
+            poller = asyncio.ensure_future(self._poll())
+            logger.info("Watching %s by polling every %.2fs", self.filepath, self.poll_interval)
+
+        # Evaluate whatever is already on disk once at startup
+        self._changed.set()
+
+        try:
+            while not self._stopped:
+                await self._changed.wait()
+                if self._stopped:
+                    break
+                await self._debounce()
+                try:
+                    await on_change()
+                except Exception:
+                    # A failed check must not stop the watcher; the next
+                    # change (or the interval fallback) retries
+                    logger.exception("Session change handler failed for %s", self.filepath)
+        finally:
+            if inotify is not None:
+                loop.remove_reader(inotify.fd)
+                inotify.close()
+            if poller is not None:
+                poller.cancel()
+
+    async def _debounce(self):
+        """Wait until writes go quiet for `debounce` seconds or `max_delay` passes."""
+        deadline = time.monotonic() + self.max_delay
+        while True:
+            self._changed.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(self.debounce, remaining))
+            except asyncio.TimeoutError:
+                return
+            if self._stopped:
+                return
+
+    async def _poll(self):
+        """Polling fallback: signal when the stat fingerprint moves."""
+        last_seen = file_fingerprint(self.filepath)
+        while not self._stopped:
+            await asyncio.sleep(self.poll_interval)
+            current = file_fingerprint(self.filepath)
+            if current != last_seen:
+                last_seen = current
+                self._changed.set()
+
+    def _open_inotify(self) -> Optional[_Inotify]:
+        if self.mode == "poll" or not sys.platform.startswith("linux"):
+            return None
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        try:
+            return _Inotify(directory)
+        except OSError as e:
+            if self.mode == "inotify":
+                raise
+            logger.warning("inotify unavailable (%s), falling back to polling", e)
+            return None
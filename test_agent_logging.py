@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck agent logging
+
+Checks structured output, sampling of repetitive messages and that async
+mode does not block the caller on a slow stream.
+"""
+
+import io
+import json
+import logging
+import sys
+import time
+
+from agent_logging import LazyQueueHandler, SamplingFilter, StructuredFormatter, configure_logging
+
+
+class SlowStream(io.StringIO):
+    """Stream that takes 50 ms per write, like a congested log driver."""
+
+    def write(self, s):
+        time.sleep(0.05)
+        return super().write(s)
+
+
+def _record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord("agent", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_structured_format():
+    """Test one JSON line per record with extra fields"""
+    print("Testing structured formatter...")
+    record = _record("alert %s", "x", fields={"event": "tilt_alert", "risk_level": "HIGH"})
+    line = StructuredFormatter().format(record)
+    entry = json.loads(line)
+    assert "\n" not in line
+    assert entry["msg"] == "alert x" and entry["event"] == "tilt_alert" and entry["risk_level"] == "HIGH"
+    print("✅ Alert fields rendered as one JSON line")
+
+
+def test_sampling():
+    """Test that repeats are rate limited but warnings always pass"""
+    print("\nTesting sampling filter...")
+    sampler = SamplingFilter(burst=3, interval=60.0)
+    passed = [sampler.filter(_record("Running tilt check...")) for _ in range(10)]
+    assert passed.count(True) == 3
+    assert all(sampler.filter(_record("alert", level=logging.WARNING)) for _ in range(10))
+
+    # After the window the next record reports what was dropped
+    sampler.interval = 0.0
+    record = _record("Running tilt check...")
+    assert sampler.filter(record) and record.suppressed == 7
+    print("✅ 7 of 10 repeats suppressed, warnings never sampled")
+
+
+def test_async_does_not_block():
+    """Test that logging calls return immediately in async mode"""
+    print("\nTesting async mode with a slow stream...")
+    listener = configure_logging(mode="async")
+    stream = SlowStream()
+    listener.handlers[0].setStream(stream)
+    try:
+        logger = logging.getLogger("agent")
+        start = time.perf_counter()
+        for i in range(20):
+            logger.info("tick %d", i)
+        elapsed = time.perf_counter() - start
+        assert isinstance(logging.getLogger().handlers[0], LazyQueueHandler)
+        assert elapsed < 0.05, f"logging blocked for {elapsed:.3f}s"
+    finally:
+        listener.stop()
+        configure_logging(mode="sync")
+    assert stream.getvalue().count("tick") == 20
+    print(f"✅ 20 records queued in {elapsed * 1000:.1f} ms and all written")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Agent Logging - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Structured Format Test", test_structured_format),
+        ("Sampling Test", test_sampling),
+        ("Async Logging Test", test_async_does_not_block),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
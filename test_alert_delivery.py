@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck alert delivery
+
+Uses an in-process stand-in for ctx.send to check concurrent fan-out,
+retries, that a slow subscriber does not hold up the others and that a
+stalled one fills the bounded queue instead of piling up deliveries.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from alert_delivery import AlertDispatcher, SubscriberRegistry
+
+
+class FakeNetwork:
+    """Stand-in for ctx.send with per-address latency and failures."""
+
+    def __init__(self, latency=None, failures=None):
+        self.latency = latency or {}
+        self.failures = dict(failures or {})
+        self.received = {}
+
+    async def send(self, address, message):
+        await asyncio.sleep(self.latency.get(address, 0.001))
+        if self.failures.get(address, 0) > 0:
+            self.failures[address] -= 1
+            raise ConnectionError("unreachable")
+        self.received.setdefault(address, []).append((time.perf_counter(), message))
+
+
+def test_slow_subscriber_isolated():
+    """Test that one slow subscriber does not delay the rest"""
+    print("Testing failure isolation...")
+
+    async def run():
+        network = FakeNetwork(latency={"slow": 5.0})
+        registry = SubscriberRegistry(initial=["discord", "dashboard", "vault", "slow"])
+        dispatcher = AlertDispatcher(registry, send=network.send, timeout=0.1, retries=1, backoff=0.01)
+        dispatcher.start()
+
+        start = time.perf_counter()
+        for i in range(3):
+            assert dispatcher.publish(f"alert-{i}")
+        await asyncio.sleep(0.05)
+        fast_done = {a: len(network.received.get(a, [])) for a in ("discord", "dashboard", "vault")}
+        elapsed = time.perf_counter() - start
+
+        await dispatcher.stop(drain=True)
+        return fast_done, elapsed, dispatcher.metrics(), dispatcher.per_destination["slow"]
+
+    fast_done, elapsed, metrics, slow_stats = asyncio.run(run())
+    assert all(count == 3 for count in fast_done.values()), fast_done
+    assert metrics["delivered"] == 9 and metrics["failed"] == 3, metrics
+    assert slow_stats == {"delivered": 0, "failed": 3}
+    print(f"✅ Fast subscribers got all alerts in {elapsed * 1000:.0f} ms despite a 5 s subscriber")
+
+
+def test_retry_with_backoff():
+    """Test that transient failures are retried"""
+    print("\nTesting retries...")
+
+    async def run():
+        network = FakeNetwork(failures={"flaky": 2})
+        registry = SubscriberRegistry(initial=["flaky"])
+        dispatcher = AlertDispatcher(registry, send=network.send, retries=3, backoff=0.01)
+        dispatcher.start()
+        result = await dispatcher.deliver("alert")
+        await dispatcher.stop()
+        return result, dispatcher.metrics()
+
+    result, metrics = asyncio.run(run())
+    assert result == {"flaky": True} and metrics["retried"] == 2
+    print("✅ Delivered after 2 retries")
+
+
+def test_stalled_subscriber_bounded():
+    """Test that stalled sends cap deliveries in flight and drop the oldest alerts"""
+    print("\nTesting backpressure from a stalled subscriber...")
+
+    async def run():
+        release = asyncio.Event()
+
+        async def stalled_send(address, message):
+            await release.wait()
+
+        registry = SubscriberRegistry(initial=["stalled"])
+        dispatcher = AlertDispatcher(registry, send=stalled_send, timeout=60.0, retries=0,
+                                     queue_size=3, max_deliveries=2)
+        dispatcher.start()
+        for i in range(10):
+            assert dispatcher.publish(f"alert-{i}")
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        stalled = dispatcher.metrics()
+
+        release.set()
+        await dispatcher.stop(drain=True)
+        return stalled, dispatcher.metrics()
+
+    stalled, drained = asyncio.run(run())
+    assert stalled["in_flight"] == 2 and stalled["queued"] == 3, stalled
+    assert stalled["dropped"] == 5, stalled
+    assert drained["delivered"] == 5 and drained["in_flight"] == 0, drained
+    print(f"✅ {stalled['in_flight']} deliveries in flight, {stalled['dropped']} oldest alerts dropped")
+
+
+def test_registry_persistence():
+    """Test that subscriptions survive a restart"""
+    print("\nTesting subscriber persistence...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "subscribers.json")
+        registry = SubscriberRegistry(path=path)
+        assert registry.add("agent1abc") and not registry.add("agent1abc")
+        registry.add("agent1def")
+        registry.remove("agent1abc")
+        assert list(SubscriberRegistry(path=path)) == ["agent1def"]
+    print("✅ Subscribers reloaded from disk")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Alert Delivery - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Failure Isolation Test", test_slow_subscriber_isolated),
+        ("Retry Test", test_retry_with_backoff),
+        ("Stalled Subscriber Test", test_stalled_subscriber_bounded),
+        ("Registry Persistence Test", test_registry_persistence),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
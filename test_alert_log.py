@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck alert log
+
+Checks batched writes, size and time rotation, indexed player/time
+queries, recovery after a crash mid-write, the background writer thread
+and the query CLI.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from alert_log import AlertLog, KIND_ALERT, KIND_ANALYSIS, alert_record, main as alert_log_main
+from tilt_alerts import build_balance_drop_alert
+
+DAY = 24 * 3600
+START = 1_705_312_800.0  # 2024-01-15T10:00:00Z
+
+
+def fill(log, players=20, per_player=50, step=60.0):
+    for i in range(per_player):
+        for p in range(players):
+            kind = KIND_ALERT if i % 2 else KIND_ANALYSIS
+            log.append(kind, f"p{p}", {"n": i, "tilt_score": p + i}, ts=START + i * step + p)
+
+
+def test_batching_and_queries():
+    """Test buffered writes and player/time/kind filters"""
+    print("Testing batched writes and queries...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AlertLog(tmp, batch_size=100, flush_interval=3600, fsync=False)
+        fill(log, players=10, per_player=25)
+        assert log.metrics()["written"] == 200 and log.metrics()["buffered"] == 50
+
+        history = list(log.query("p3"))
+        assert [r["data"]["n"] for r in history] == list(range(25)), "buffered records missing"
+        window = list(log.query("p3", since=START + 600, until=START + 1200, kind=KIND_ALERT))
+        assert [r["data"]["n"] for r in window] == [11, 13, 15, 17, 19]
+        assert len(list(log.query(since=START + 1440))) == 10
+
+        alert = build_balance_drop_alert(1000.0, 650.0, 10, 0.30, "p3")
+        log.append(KIND_ALERT, "p3", alert_record(alert), ts=START + 5000)
+        log.close()
+
+        reopened = AlertLog(tmp, fsync=False)
+        last = list(reopened.query("p3", kind=KIND_ALERT))[-1]
+        assert last["data"]["details"]["player_id"] == "p3" and last["data"]["risk_level"] == alert.risk_level
+        assert reopened.metrics()["records"] == 251
+    print("✅ 251 records written in batches; player, time and kind filters exact")
+
+
+def test_rotation_and_index():
+    """Test size and time rotation and index-driven segment skipping"""
+    print("\nTesting rotation and indexes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AlertLog(tmp, batch_size=50, segment_bytes=16 * 1024, fsync=False)
+        fill(log, players=20, per_player=100)
+        log.rotate()
+        segments = len(log.sealed)
+        assert segments > 5 and all(os.path.exists(s.index_path) for s in log.sealed)
+
+        reopened = AlertLog(tmp, fsync=False)
+        late = [s for s in reopened.sealed if s.overlaps(START + 99 * 60, None, "p7")]
+        assert len(late) == 1, "time range should select one segment"
+        assert [r["data"]["n"] for r in reopened.query("p7", since=START + 99 * 60)] == [99]
+        assert len(list(reopened.query("p7"))) == 100
+
+        timed = AlertLog(os.path.join(tmp, "timed"), batch_size=1, segment_seconds=0.05, fsync=False)
+        timed.append(KIND_ALERT, "p1", {})
+        time.sleep(0.1)
+        timed.append(KIND_ALERT, "p1", {})
+        assert len(timed.sealed) == 1 and timed.active.count == 1
+    print(f"✅ {segments} sealed segments; time-range queries read one segment")
+
+
+def test_crash_recovery():
+    """Test that a torn write and a missing index are repaired on start"""
+    print("\nTesting crash recovery...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AlertLog(tmp, batch_size=10, segment_bytes=4096, fsync=False)
+        fill(log, players=5, per_player=40)
+        log.flush()
+        os.remove(log.sealed[0].index_path)
+        with open(log.active.path, "ab") as f:
+            f.write(b'{"ts": 1705312800, "kind": "al')  # killed mid-write
+        size = os.path.getsize(log.active.path)
+
+        readonly = AlertLog(tmp, read_only=True)
+        assert readonly.metrics()["records"] == 200 and os.path.getsize(log.active.path) == size
+        assert not os.path.exists(log.sealed[0].index_path), "read-only open wrote an index"
+
+        recovered = AlertLog(tmp, batch_size=1, fsync=False)
+        assert os.path.exists(log.sealed[0].index_path)
+        assert recovered.metrics()["records"] == 200
+        recovered.append(KIND_ALERT, "p0", {"n": "after"}, ts=START + DAY)
+        history = list(AlertLog(tmp, read_only=True).query("p0"))
+        assert len(history) == 41 and history[-1]["data"]["n"] == "after"
+    print("✅ Torn line cut off, lost index rebuilt, appends continue")
+
+
+def test_player_query_speed():
+    """Test that indexed player queries beat a full scan"""
+    print("\nTesting indexed query speed...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AlertLog(tmp, batch_size=1000, segment_bytes=512 * 1024, fsync=False)
+        fill(log, players=500, per_player=100, step=7200.0)
+        log.rotate()
+
+        reopened = AlertLog(tmp, read_only=True)
+        started = time.perf_counter()
+        history = list(reopened.query("p42", since=START + 7 * DAY, until=START + 8 * DAY))
+        indexed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scanned = [r for r in reopened.query(since=START + 7 * DAY, until=START + 8 * DAY) if r["player_id"] == "p42"]
+        full = time.perf_counter() - started
+        assert history == scanned and len(history) == 12
+        assert indexed * 5 < full, (indexed, full)
+    print(f"✅ One player's day out of 50,000 records: {indexed * 1000:.1f} ms indexed, "
+          f"{full * 1000:.1f} ms scanning the day")
+
+
+def test_query_cli():
+    """Test the query command line"""
+    print("\nTesting query CLI...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AlertLog(tmp, fsync=False)
+        fill(log, players=3, per_player=10)
+        log.close()
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = alert_log_main([tmp, "--player", "p1", "--since", "2024-01-15T10:05:00Z",
+                                   "--kind", KIND_ALERT])
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert code == 0 and [r["data"]["n"] for r in records] == [5, 7, 9]
+        assert alert_log_main([os.path.join(tmp, "missing")]) == 1
+    print("✅ CLI prints matching records as JSON lines")
+
+
+def test_background_writer():
+    """Test that background mode writes batches from the writer thread only"""
+    print("\nTesting the background writer...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = AlertLog(tmp, batch_size=100, flush_interval=3600, fsync=False, background=True)
+        writers = []
+        flush = log._flush
+
+        def tracked_flush():
+            writers.append(threading.get_ident())
+            flush()
+
+        log._flush = tracked_flush
+        fill(log, players=10, per_player=15)
+        deadline = time.monotonic() + 5
+        while log.metrics()["written"] < 100 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        metrics = log.metrics()
+        assert metrics["written"] >= 100 and metrics["written"] + metrics["buffered"] == 150
+        assert writers and threading.get_ident() not in writers, "append wrote on the caller thread"
+        assert len(list(log.query("p3"))) == 15
+
+        log.close()
+        assert not log._writer and log.metrics()["buffered"] == 0
+        assert AlertLog(tmp, read_only=True).metrics()["records"] == 150
+    print("✅ Full batches written by the writer thread; close() writes the rest")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Alert Log - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Batching and Query Test", test_batching_and_queries),
+        ("Rotation and Index Test", test_rotation_and_index),
+        ("Crash Recovery Test", test_crash_recovery),
+        ("Indexed Query Speed Test", test_player_query_speed),
+        ("Background Writer Test", test_background_writer),
+        ("Query CLI Test", test_query_cli),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck compact alert records
+
+Checks that records render exactly the TiltAlert payloads subscribers
+always received, that the JSON and binary forms round-trip, and that
+records allocate far less than building TiltAlert models.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import tracemalloc
+
+from agent_models import TiltAlert
+from alert_delivery import AlertDispatcher, SubscriberRegistry
+from alert_records import (AlertRecord, balance_drop_record, decode_alert, decode_alerts, encode_alert,
+                           encode_alerts, rapid_spin_record, record_from_hit)
+from tilt_alerts import build_balance_drop_alert, build_rapid_spin_alert
+from tilt_engine import RULE_BALANCE_DROP, RULE_RAPID_SPINNING, RuleHit
+
+
+def test_legacy_payloads():
+    """Test that details and TiltAlerts match the original format"""
+    print("Testing TiltAlert compatibility...")
+    spin = build_rapid_spin_alert(63, 5, 50, "p1")
+    assert isinstance(spin, TiltAlert)
+    assert spin.alert_message == "⚠️ Tilt Alert: You've been spinning too fast. Take a break."
+    assert spin.details == {"spin_count": 63, "time_window_minutes": 5, "threshold": 50,
+                            "avg_spin_rate": "12.6 spins/min", "player_id": "p1"}
+
+    drop = build_balance_drop_alert(1000, 650.5, 10, 0.30)
+    assert drop.risk_level == "HIGH"
+    assert drop.details == {"start_balance": 1000.0, "end_balance": 650.5, "balance_lost": 349.5,
+                            "drop_percentage": "34.9%", "time_window_minutes": 10, "threshold": "30.0%"}
+
+    hit = RuleHit("p2", RULE_BALANCE_DROP, {"start_balance": 200.0, "end_balance": 100.0,
+                                            "time_window_minutes": 10, "threshold": 0.3})
+    record = record_from_hit(hit)._replace(tenant="casino_a")
+    assert record.details["tenant"] == "casino_a" and record.details["drop_percentage"] == "50.0%"
+    assert record.to_tilt_alert().details == record.details
+    assert abs(time.time() - time.mktime(time.strptime(record.timestamp[:19], "%Y-%m-%dT%H:%M:%S"))) < 2
+    print("✅ Records render the same alert text, details and timestamp format")
+
+
+def test_serialization_round_trip():
+    """Test JSON and binary round trips"""
+    print("\nTesting JSON and binary serialization...")
+    records = [
+        rapid_spin_record(51 + i, 5, 50, f"player-{i}") if i % 2 else
+        balance_drop_record(1000 + i, 600.25, 10, 0.3, None)._replace(tenant="guild_b" if i % 3 else None)
+        for i in range(200)
+    ]
+    for record in records:
+        assert AlertRecord.from_json_dict(record.to_json_dict()) == record
+        assert decode_alert(encode_alert(record)) == record
+    batch = encode_alerts(records)
+    assert decode_alerts(batch) == records
+    assert len(encode_alert(records[1])) == 40 + 1 + len("player-1") + 1
+    json_size = sum(len(record.to_tilt_alert().json()) for record in records)
+
+    for func, bad in ((decode_alerts, batch[:-1]), (decode_alerts, batch + b"\x00"),
+                      (decode_alert, b"\x02" + encode_alert(records[0])[1:]),
+                      (encode_alert, records[0]._replace(rule="unknown"))):
+        try:
+            func(bad)
+            raise AssertionError(f"{func.__name__} accepted bad input")
+        except ValueError:
+            pass
+    print(f"✅ {len(records)} alerts in {len(batch)} bytes (TiltAlert JSON: {json_size} bytes)")
+
+
+def test_allocations():
+    """Test that records allocate much less than TiltAlert models"""
+    print("\nTesting allocations...")
+    count = 5000
+
+    def measure(build):
+        tracemalloc.start()
+        kept = [build(i) for i in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return size / count
+
+    logging.disable(logging.WARNING)  # the builders log every alert
+    try:
+        record_bytes = measure(lambda i: rapid_spin_record(60 + i % 7, 5, 50, "p1"))
+        alert_bytes = measure(lambda i: build_rapid_spin_alert(60 + i % 7, 5, 50, "p1"))
+    finally:
+        logging.disable(logging.NOTSET)
+    assert record_bytes * 3 < alert_bytes, (record_bytes, alert_bytes)
+    print(f"✅ {record_bytes:.0f} bytes per record vs {alert_bytes:.0f} per TiltAlert")
+
+
+def test_lazy_delivery():
+    """Test that TiltAlerts are only built for actual deliveries"""
+    print("\nTesting deferred TiltAlert construction...")
+    sent = []
+
+    async def send(address, message):
+        sent.append((address, message))
+
+    async def run():
+        registry = SubscriberRegistry()
+        dispatcher = AlertDispatcher(registry)
+        dispatcher.bind(send)
+        dispatcher.start()
+        record = rapid_spin_record(70, 5, 50, "p1")
+        assert not dispatcher.publish(record), "published without subscribers"
+        registry.add("agent1qsubscriber")
+        registry.add("agent1qother")
+        assert dispatcher.publish(record)
+        await dispatcher.stop()
+        return record
+
+    record = asyncio.run(run())
+    assert len(sent) == 2 and all(isinstance(message, TiltAlert) for _, message in sent)
+    assert sent[0][1] is sent[1][1], "one TiltAlert per delivery, not per subscriber"
+    assert sent[0][1].details == record.details
+    print("✅ No TiltAlert without subscribers; one shared TiltAlert per delivery")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Alert Records - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Legacy Payload Test", test_legacy_payloads),
+        ("Serialization Test", test_serialization_round_trip),
+        ("Allocation Test", test_allocations),
+        ("Deferred Delivery Test", test_lazy_delivery),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
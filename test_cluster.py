@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck detector cluster
+
+Checks ring balance and minimal movement, that a node keeps handed-off
+players until the handoff is confirmed, then runs real node processes on
+Unix sockets and verifies that the cluster fires exactly the alerts a
+single engine fires, across node joins and leaves.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from cluster import ClusterClient, ClusterNode, HashRing
+from tilt_engine import BetEvent, TiltEngine
+
+AUTHKEY = b"tiltcheck-cluster-test"
+
+
+def test_ring_balance_and_movement():
+    """Test even spread and that a join moves only the new node's share"""
+    print("Testing hash ring balance...")
+    players = [f"player{i}" for i in range(20000)]
+    ring = HashRing(["n1", "n2", "n3", "n4"])
+    before = {p: ring.node_for(p) for p in players}
+    counts = Counter(before.values())
+    assert max(counts.values()) / min(counts.values()) < 1.5, counts
+
+    ring.add("n5")
+    after = {p: ring.node_for(p) for p in players}
+    moved = [p for p in players if before[p] != after[p]]
+    assert all(after[p] == "n5" for p in moved), "players moved between old nodes"
+    assert 0.1 < len(moved) / len(players) < 0.3, len(moved)
+    print(f"✅ Spread {dict(counts)}; join moved {len(moved) / len(players):.1%} of players")
+
+
+def make_batches(seed=5):
+    """Bets for 200 players over 20 minutes, a tenth of them tilting"""
+    rng = random.Random(seed)
+    start = 1_700_000_000 * 1_000_000_000
+    balances = {f"p{i}": 1000.0 for i in range(200)}
+    batches = []
+    for minute in range(20):
+        batch = []
+        for player, balance in balances.items():
+            tilting = int(player[1:]) % 10 == 0
+            for _ in range(rng.randrange(15 if tilting else 4)):
+                balances[player] = max(1.0, balances[player] - (25 if tilting else rng.choice([-5, 5])))
+                timestamp = start + minute * 60_000_000_000 + rng.randrange(60_000_000_000)
+                batch.append(BetEvent(player, timestamp, 5.0, "loss", balances[player]))
+        batches.append(sorted(batch, key=lambda e: e.timestamp))
+    return batches
+
+
+def start_node(tmp, node_id):
+    address = os.path.join(tmp, f"{node_id}.sock")
+    env = dict(os.environ, TILTCHECK_CLUSTER_KEY=AUTHKEY.decode())
+    process = subprocess.Popen([sys.executable, "cluster.py", "--node-id", node_id, "--address", address],
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(address):
+        assert time.monotonic() < deadline, f"node {node_id} did not start"
+        time.sleep(0.05)
+    return process, address
+
+
+def test_handoff_keeps_players_until_release():
+    """Test that moved players stay on the old node until release()"""
+    print("\nTesting handoff before release...")
+    node = ClusterNode("n1", ["n1"])
+    node.ingest(make_batches()[0])
+    players = set(node.engine.players)
+
+    handoff = node.set_members(["n1", "n2"])
+    moved = set(handoff["n2"]["players"])
+    assert moved and set(node.engine.players) == players, "players dropped before the handoff"
+    assert node.release() == len(moved)
+    assert set(node.engine.players) == players - moved and node.release() == 0
+
+    target = ClusterNode("n2", ["n1", "n2"])
+    assert target.accept_handoff(handoff["n2"]) == len(moved)
+    assert set(target.engine.players) == moved
+    print(f"✅ {len(moved)} players exported, kept, then released after the handoff")
+
+
+def test_cluster_matches_single_engine():
+    """Test alerts and state handoff across joins and leaves with real processes"""
+    print("\nTesting multi-process cluster against a single engine...")
+    batches = make_batches()
+    single = TiltEngine()
+    expected = []
+    for minute, batch in enumerate(batches):
+        expected.append({(h.player_id, h.rule) for h in single.evaluate(single.ingest(batch), now=minute * 60.0)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        processes, addresses = {}, {}
+        for node_id in ("n1", "n2", "n3", "n4"):
+            processes[node_id], addresses[node_id] = start_node(tmp, node_id)
+
+        try:
+            members = {n: addresses[n] for n in ("n1", "n2", "n3")}
+            client = ClusterClient(members, AUTHKEY)
+            client.rebalance(members)  # announce the initial membership
+
+            for minute, batch in enumerate(batches):
+                if minute == 7:
+                    members = {n: addresses[n] for n in ("n1", "n2", "n3", "n4")}
+                    moved = client.rebalance(members)
+                    assert moved > 0 and client.players("n4"), "nothing handed to the new node"
+                if minute == 14:
+                    members = {n: addresses[n] for n in ("n1", "n3", "n4")}
+                    client.rebalance(members)
+
+                hits = {(h.player_id, h.rule) for h in client.ingest(batch, now=minute * 60.0)}
+                assert hits == expected[minute], f"minute {minute}: {hits ^ expected[minute]}"
+
+            held = [p for n in members for p in client.players(n)]
+            assert len(held) == len(set(held)) == len(single.players), "players lost or duplicated"
+            assert all(client.node_for(p) == n for n in members for p in client.players(n))
+            print(f"✅ {sum(map(len, expected))} alerts identical through a join and a leave")
+        finally:
+            for node_id in processes:
+                try:
+                    ClusterClient({node_id: addresses[node_id]}, AUTHKEY).shutdown(node_id)
+                except Exception:
+                    pass
+            for process in processes.values():
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Detector Cluster - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Ring Balance Test", test_ring_balance_and_movement),
+        ("Handoff Release Test", test_handoff_keeps_players_until_release),
+        ("Multi-Process Cluster Test", test_cluster_matches_single_engine),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck community statistics sketches
+
+Checks sketch error bounds against exact counts, and that stats merged
+from shards match stats built from all events at once.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+
+from community_stats import CommunityStats, CountMinSketch, HeavyHitters, HyperLogLog, hash64
+from tilt_engine import BetEvent, NS_PER_MINUTE, SessionFileTail
+
+GAMES = ["starburst", "book_of_dead", "sweet_bonanza", "gates_of_olympus", "blackjack"]
+
+
+def make_events(count, players, seed=1):
+    """Skewed random bets over ten minutes: a few players and games dominate"""
+    rng = random.Random(seed)
+    start = 1_700_000_000 * 1_000_000_000
+    events = []
+    for i in range(count):
+        player = f"player{int(rng.paretovariate(1.2)) % players}"
+        game = GAMES[min(int(rng.expovariate(1.0)), len(GAMES) - 1)]
+        timestamp = start + i * (10 * NS_PER_MINUTE // count)
+        events.append(BetEvent(player, timestamp, 1.0, "loss", 100.0, game))
+    return events
+
+
+def test_hyperloglog_accuracy():
+    """Test distinct counts within a few standard errors"""
+    print("Testing HyperLogLog accuracy...")
+    for n in (10, 1000, 100_000):
+        hll = HyperLogLog(precision=12)
+        for i in range(n):
+            hll.add(f"player{i}")
+        error = abs(hll.count() - n) / n
+        assert error < 0.05, f"{n} distinct: estimate {hll.count()} ({error:.1%} off)"
+        print(f"  ✅ {n} distinct: estimate {hll.count()} ({error:.2%} off)")
+
+
+def test_count_min_and_heavy_hitters():
+    """Test count-min overcount bound and heavy hitter recall"""
+    print("\nTesting count-min sketch and heavy hitters...")
+    events = make_events(50_000, players=5000)
+    exact = Counter(e.player_id for e in events)
+    cms = CountMinSketch(width=1024, depth=4)
+    hitters = HeavyHitters(capacity=32)
+    for event in events:
+        cms.add(event.player_id)
+        hitters.add(event.player_id)
+
+    bound = 2.72 / 1024 * len(events)
+    for player, count in exact.items():
+        estimate = cms.estimate(player)
+        assert count <= estimate <= count + 3 * bound, (player, count, estimate)
+
+    threshold = len(events) / (hitters.capacity + 1)
+    for player, count in exact.items():
+        if count > threshold:
+            assert player in hitters.counters, f"heavy hitter {player} ({count}) missing"
+            assert count - threshold <= hitters.counters[player] <= count
+    print(f"✅ Count-min within bound; all players above {threshold:.0f} spins kept")
+
+
+def test_shard_merge():
+    """Test that merging shards matches a single pass over all events"""
+    print("\nTesting shard merge and serialization...")
+    events = make_events(20_000, players=2000, seed=3)
+    single = CommunityStats()
+    single.ingest(events)
+
+    shards = [CommunityStats() for _ in range(3)]
+    for event in events:
+        shards[hash64(event.player_id) % 3].ingest([event])
+    merged = CommunityStats()
+    for shard in shards:
+        # Round-trip through JSON as a shard would ship its stats
+        merged.merge(CommunityStats.from_dict(json.loads(json.dumps(shard.to_dict()))))
+
+    assert merged.per_minute() == single.per_minute()
+    assert merged.summary()["distinct_players"] == single.summary()["distinct_players"]
+    exact_games = Counter(e.game for e in events).most_common(1)[0][0]
+    assert merged.summary(k=1)["top_games"][0][0] == exact_games
+    print(f"✅ {len(single.buckets)} minutes identical after merging 3 shards")
+
+
+def test_retention_and_game_column():
+    """Test bucket retention and reading the optional game column"""
+    print("\nTesting retention and game column...")
+    stats = CommunityStats(retention_minutes=3)
+    stats.ingest(make_events(1000, players=10))
+    assert len(stats.buckets) == 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance,player_id,game\n")
+            f.write("2024-01-15T10:00:00,10,loss,1000,alice,starburst\n")
+            f.write("2024-01-15T10:00:05,10,win,1010,bob,blackjack\n")
+        events = SessionFileTail(path).read_new()
+    assert [e.game for e in events] == ["starburst", "blackjack"]
+    print("✅ Old minutes are dropped and games are read from the session file")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Community Statistics - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("HyperLogLog Accuracy Test", test_hyperloglog_accuracy),
+        ("Count-Min and Heavy Hitters Test", test_count_min_and_heavy_hitters),
+        ("Shard Merge Test", test_shard_merge),
+        ("Retention and Game Column Test", test_retention_and_game_column),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
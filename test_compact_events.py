@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck compact event storage
+
+Checks exact round-trips, the memory saving over BetEvent lists, zero-copy
+slicing, DataFrame conversion and that engine snapshots are unchanged.
+"""
+
+import random
+import sys
+import tracemalloc
+
+import pandas as pd
+
+from compact_events import BYTES_PER_EVENT, EventColumns
+from tilt_engine import BetEvent, TiltEngine
+
+
+def make_events(count, seed=3):
+    rng = random.Random(seed)
+    start = 1_700_000_000 * 1_000_000_000
+    balance = 1000.0
+    events = []
+    for i in range(count):
+        bet = round(rng.uniform(0.1, 50.0), 2)
+        outcome = rng.choice(["win", "loss"])
+        balance = round(balance + (bet if outcome == "win" else -bet), 2)
+        events.append(BetEvent("p1", start + i * 1_500_000_000, bet, outcome, balance))
+    return events
+
+
+def test_round_trip():
+    """Test that rows decode to exactly the values stored"""
+    print("Testing round-trip...")
+    events = make_events(2000)
+    columns = EventColumns()
+    columns.extend(events)
+    assert len(columns) == len(events)
+    for i, event in enumerate(events):
+        assert columns.row(i) == [event.timestamp, event.bet_amount, event.outcome, event.balance], i
+    values = EventColumns()
+    for i, value in enumerate((0.0, 0.1, 12.3456, -99.99, 1e9 + 0.01, 100.00004, 0.00015, 1e-9)):
+        values.append(i, value, "win", value)
+        assert values.bet(i) == value and values.balance(i) == value, value
+
+    columns.delete_prefix(500)
+    assert len(columns) == 1500 and columns.timestamps[0] == events[500].timestamp
+    columns.insert(0, events[499].timestamp, 1.5, "win", 10.25)
+    assert columns.row(0) == [events[499].timestamp, 1.5, "win", 10.25]
+    print("✅ Timestamps, outcomes and amounts round-trip exactly")
+
+
+def test_memory():
+    """Test per-bet memory against a list of BetEvent tuples"""
+    print("\nTesting memory footprint...")
+    count = 50_000
+    events = make_events(count)
+    raw = [(e.timestamp, e.bet_amount, e.outcome, e.balance) for e in events]
+    del events
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Fresh numbers, as the CSV parser produces for every row
+    objects = [BetEvent("p1", ts + 1, bet + 0.0, outcome, bal + 0.0) for ts, bet, outcome, bal in raw]
+    object_bytes = tracemalloc.get_traced_memory()[0] - before
+    del objects
+
+    before = tracemalloc.get_traced_memory()[0]
+    columns = EventColumns()
+    for row in raw:
+        columns.append(*row)
+    column_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert columns.nbytes == count * BYTES_PER_EVENT
+    assert column_bytes * 4 < object_bytes, (column_bytes, object_bytes)
+    print(f"✅ {object_bytes / count:.0f} bytes/bet as objects, {column_bytes / count:.0f} as columns")
+
+
+def test_views_and_dataframe():
+    """Test zero-copy views, NumPy export and DataFrame conversion"""
+    print("\nTesting views and DataFrame conversion...")
+    events = make_events(100)
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime([e.timestamp for e in events], unit='ns'),
+        'bet_amount': [e.bet_amount for e in events],
+        'outcome': [e.outcome for e in events],
+        'balance': [e.balance for e in events],
+    })
+    columns = EventColumns.from_dataframe(df)
+    assert [columns.row(i) for i in range(len(columns))] == [
+        [e.timestamp, e.bet_amount, e.outcome, e.balance] for e in events]
+
+    arrays = columns.to_numpy(10, 20)
+    assert arrays["timestamp"].tolist() == list(columns.timestamps[10:20])
+    columns.balances[10] = 0
+    assert arrays["balance"][0] == 0, "NumPy array is a copy"
+
+    try:
+        columns.append(0, 1.0, "win", 1.0)
+        raise AssertionError("append succeeded while a view was alive")
+    except BufferError:
+        pass
+    del arrays
+    columns.append(0, 1.0, "win", 1.0)
+    assert len(columns) == 101
+    print("✅ Slices share memory; appends resume once views are released")
+
+
+def test_engine_snapshot():
+    """Test that engine snapshots and rule results are unchanged"""
+    print("\nTesting engine on compact windows...")
+    events = make_events(300)
+    engine = TiltEngine()
+    engine.evaluate(engine.ingest(events), now=0.0)
+    snapshot = engine.snapshot()
+    assert snapshot["players"]["p1"]["events"] == [
+        [e.timestamp, e.bet_amount, e.outcome, e.balance] for e in events
+        if e.timestamp >= engine.players["p1"].timestamps[0]]
+
+    restored = TiltEngine()
+    restored.restore(snapshot)
+    assert restored.snapshot() == snapshot
+    assert restored.spin_count("p1") == engine.spin_count("p1")
+    assert restored.balance_drop("p1") == engine.balance_drop("p1")
+    print("✅ Snapshot and restore round-trip through compact windows")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Compact Events - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Round-Trip Test", test_round_trip),
+        ("Memory Test", test_memory),
+        ("Views and DataFrame Test", test_views_and_dataframe),
+        ("Engine Snapshot Test", test_engine_snapshot),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
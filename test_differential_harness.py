@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck differential harness
+
+Checks that the current fast paths agree with the reference rules on
+generated sessions, that deliberately broken implementations are caught
+and shrunk to small reproducers, and that the demo_agent oracle still
+matches agent.py.
+"""
+
+import logging
+import random
+import sys
+
+import differential_harness as harness
+from tilt_engine import TiltRules
+
+
+def off_by_one_drop(rows, rules):
+    """Balance drop with a strict threshold (misses exact 30% drops)."""
+    strict = TiltRules(rules.spin_window_minutes, rules.threshold_spins,
+                       rules.drop_window_minutes, rules.drop_threshold + 1e-9)
+    return harness.engine_batch(rows, strict)
+
+
+def unsorted_engine(rows, rules):
+    """Engine fed without the stable sort: keeps file order for the start balance."""
+    decision = harness.engine_batch(rows, rules)
+    if decision.balance_drop and rows and rows[0][3] != decision.balance_drop[0]:
+        return decision._replace(balance_drop=(rows[0][3], decision.balance_drop[1]))
+    return decision
+
+
+def fixed_point_engine(rows, rules):
+    """Engine on amounts rounded to 4 decimals (the old fixed-point columns)."""
+    return harness.engine_batch([(t, bet, outcome, round(balance, 4)) for t, bet, outcome, balance in rows], rules)
+
+
+def nan_passing_engine(rows, rules):
+    """Engine that lets non-finite rows through (counts them as spins)."""
+    engine = harness.TiltEngine(rules)
+    engine.ingest([harness.BetEvent(harness.DEFAULT_PLAYER_ID, *row) for row in rows])
+    return harness._decision(engine)
+
+
+def strict_risk_score(metrics):
+    """Scorer whose top frequency rule uses >= 50 instead of > 50."""
+    score, level = harness.reference_score(metrics)
+    if metrics[0] == 50:
+        score = min(score + 15, 100)
+        level = harness._solana_agent()._get_risk_level(score)
+    return score, level
+
+
+def test_current_implementations_agree():
+    """Test that every registered implementation matches the oracles"""
+    print("Testing current implementations against the reference rules...")
+    report = harness.run_harness(sessions=350, scores=300, seed=11)
+    assert not report.divergences, report.divergences[0]
+    print(f"✅ {report.sessions} sessions x {len(harness.DETECTOR_IMPLEMENTATIONS)} detectors and "
+          f"{report.scores} scores x {len(harness.SCORE_IMPLEMENTATIONS)} scorers agree")
+
+
+def test_boundary_mutant_minimized():
+    """Test that an off-by-one drop threshold is caught with a tiny reproducer"""
+    print("\nTesting off-by-one detector mutant...")
+    report = harness.run_harness(sessions=140, scores=0, seed=3, detectors={"mutant": off_by_one_drop})
+    assert report.divergences, "mutant not caught"
+    smallest = min(report.divergences, key=lambda d: len(d.input))
+    assert len(smallest.input) == 2, smallest
+    assert smallest.expected.balance_drop and not smallest.actual.balance_drop
+    assert smallest.reproducer().count("\n") == 3
+    print(f"✅ {len(report.divergences)} divergences, smallest reproducer {len(smallest.input)} bets")
+
+
+def test_ordering_mutant_caught():
+    """Test that ignoring the timestamp sort is caught by unsorted sessions"""
+    print("\nTesting ordering mutant...")
+    report = harness.run_harness(sessions=140, scores=0, seed=5, detectors={"mutant": unsorted_engine})
+    assert report.divergences, "mutant not caught"
+    assert all(len(d.input) <= d.original_size for d in report.divergences)
+    print(f"✅ {len(report.divergences)} divergences on unsorted input")
+
+
+def test_precision_and_non_finite_mutants():
+    """Test that rounded amounts and unfiltered NaN/inf rows are caught"""
+    print("\nTesting precision and non-finite mutants...")
+    report = harness.run_harness(sessions=180, scores=0, seed=4, detectors={"mutant": fixed_point_engine})
+    assert report.divergences, "fixed-point mutant not caught"
+    assert any(len(d.input) == 2 for d in report.divergences), report.divergences[0]
+
+    report = harness.run_harness(sessions=180, scores=0, seed=4, detectors={"mutant": nan_passing_engine})
+    assert report.divergences, "non-finite mutant not caught"
+    assert all(len(harness.valid_rows(d.input)) < len(d.input) for d in report.divergences)
+    print(f"✅ Both caught, e.g.\n{report.divergences[0].reproducer()}")
+
+
+def test_reference_in_sync():
+    """Test that demo_agent's rule copies match agent.py"""
+    print("\nTesting reference rule copies...")
+    assert harness.reference_drift() == []
+    print("✅ demo_agent runs the same rule bodies as agent.py")
+
+
+def test_score_mutant_minimized():
+    """Test that a strict scorer threshold is caught and simplified"""
+    print("\nTesting scorer mutant...")
+    report = harness.run_harness(sessions=0, scores=300, seed=2, scorers={"mutant": strict_risk_score})
+    assert report.divergences, "mutant not caught"
+    assert all(d.input[0] == 50 for d in report.divergences)
+    assert any(d.input[1:] == (0, 0, 0) for d in report.divergences), report.divergences[:3]
+    print(f"✅ {len(report.divergences)} divergences, e.g. {report.divergences[0].reproducer()}")
+
+
+def test_minimize_session():
+    """Test delta debugging on a known failure condition"""
+    print("\nTesting session minimization...")
+    rows = harness.generate_session(random.Random(0), "random")
+    marked = rows[len(rows) // 3], rows[-2]
+    minimal = harness.minimize_session(rows, lambda c: all(r in c for r in marked))
+    assert minimal == list(marked)
+    print(f"✅ {len(rows)} bets reduced to the 2 that matter")
+
+
+def main():
+    """Run all tests"""
+    logging.disable(logging.CRITICAL)
+    print("=" * 70)
+    print(" TiltCheck Differential Harness - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Agreement Test", test_current_implementations_agree),
+        ("Boundary Mutant Test", test_boundary_mutant_minimized),
+        ("Ordering Mutant Test", test_ordering_mutant_caught),
+        ("Precision and Non-Finite Mutant Test", test_precision_and_non_finite_mutants),
+        ("Reference Sync Test", test_reference_in_sync),
+        ("Scorer Mutant Test", test_score_mutant_minimized),
+        ("Minimization Test", test_minimize_session),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck risk-adaptive evaluation scheduler
+
+Checks the cadence, lazy rescheduling, the async run loop, and that
+scheduled evaluation fires the same alerts as evaluating every player on
+every append while running the rules less often.
+"""
+
+import asyncio
+import random
+import sys
+
+from eval_scheduler import EvalScheduler
+from risk_leaderboard import engine_risk
+from tilt_engine import BetEvent, TiltEngine, TiltRules
+
+
+def test_cadence():
+    """Test that delays shrink as risk grows"""
+    print("Testing cadence...")
+    scheduler = EvalScheduler(min_interval=1.0, max_interval=120.0, urgent_risk=0.8)
+    delays = [scheduler.interval_for(risk) for risk in (0.0, 0.2, 0.4, 0.6, 0.79)]
+    assert delays[0] == 120.0
+    assert all(a > b for a, b in zip(delays, delays[1:])), delays
+    assert delays[-1] >= 1.0
+    assert scheduler.interval_for(0.8) == scheduler.interval_for(5.0) == 0.0
+    print(f"✅ Delays: {[round(d, 1) for d in delays]} then 0 when urgent")
+
+
+def test_reschedule():
+    """Test pull-forward, no postponement and due order"""
+    print("\nTesting rescheduling...")
+    scheduler = EvalScheduler(min_interval=1.0, max_interval=100.0)
+    scheduler.schedule("idle", 0.0, now=0.0)        # due at 100
+    scheduler.schedule("warm", 0.4, now=0.0)        # due at 10
+    scheduler.schedule("warm", 0.0, now=5.0)        # lower risk: keeps 10
+    scheduler.schedule("idle", 0.9, now=20.0)       # urgent: pulled to 20
+    assert len(scheduler) == 2
+    assert scheduler.pop_due(now=9.0) == []
+    assert scheduler.pop_due(now=20.0) == ["warm", "idle"]
+    assert scheduler.pop_due(now=1000.0) == [], "stale entry evaluated"
+    assert scheduler.next_due() is None
+    print("✅ Urgent updates pull players forward; stale entries are skipped")
+
+
+def test_run_loop():
+    """Test that the async loop wakes up for newly scheduled players"""
+    print("\nTesting async run loop...")
+    scheduler = EvalScheduler(min_interval=0.05, max_interval=0.2)
+    evaluated = []
+
+    async def evaluate(players):
+        evaluated.extend(players)
+
+    async def run():
+        task = asyncio.ensure_future(scheduler.run(evaluate))
+        await asyncio.sleep(0.01)
+        scheduler.schedule("urgent", 1.0)
+        scheduler.schedule("quiet", 0.0)
+        await asyncio.sleep(0.05)
+        assert evaluated == ["urgent"], evaluated
+        await asyncio.sleep(0.3)
+        scheduler.stop()
+        await asyncio.wait_for(task, 1.0)
+
+    asyncio.run(run())
+    assert evaluated == ["urgent", "quiet"], evaluated
+    print("✅ Urgent player evaluated immediately, quiet player after its delay")
+
+
+def test_same_alerts_fewer_evaluations():
+    """Test scheduled evaluation against evaluating every change"""
+    print("\nTesting alerts against evaluate-every-change...")
+    rng = random.Random(11)
+    rules = TiltRules(threshold_spins=200, cooldown_seconds=1e9)
+    eager, lazy = TiltEngine(rules), TiltEngine(rules)
+    scheduler = EvalScheduler(min_interval=1.0, max_interval=60.0)
+
+    players = [f"p{i}" for i in range(50)]
+    balances = {p: 1000.0 for p in players}
+    rates = {p: rng.choice([0.05, 0.2, 0.5]) for p in players}  # bets per second
+    tilting = set(players[:5])
+    for p in tilting:
+        rates[p] = 0.8
+    eager_alerts, lazy_alerts = set(), set()
+    eager_checks = 0
+    start = 1_700_000_000 * 1_000_000_000
+
+    for second in range(600):
+        batch = []
+        for p in players:
+            if rng.random() < rates[p]:
+                change = -20 if p in tilting else rng.choice([-10, -5, 5, 10])
+                balances[p] = max(1.0, balances[p] + change)
+                batch.append(BetEvent(p, start + second * 1_000_000_000, 5.0, "loss", balances[p]))
+
+        changed = eager.ingest(batch)
+        eager_checks += len(changed)
+        eager_alerts.update((h.player_id, h.rule) for h in eager.evaluate(changed, now=second))
+
+        for p in lazy.ingest(batch):
+            scheduler.schedule(p, engine_risk(lazy, p), now=second)
+        due = scheduler.pop_due(now=second)
+        lazy_alerts.update((h.player_id, h.rule) for h in lazy.evaluate(due, now=second))
+
+    lazy_alerts.update((h.player_id, h.rule) for h in lazy.evaluate(scheduler.pop_due(now=1e9), now=1e9))
+    assert eager_alerts, "scenario produced no alerts"
+    assert lazy_alerts == eager_alerts, eager_alerts ^ lazy_alerts
+    assert scheduler.evaluated < eager_checks * 0.6, (scheduler.evaluated, eager_checks)
+    print(f"✅ Same {len(eager_alerts)} alerts with {scheduler.evaluated} evaluations instead of {eager_checks}")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Evaluation Scheduler - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Cadence Test", test_cadence),
+        ("Rescheduling Test", test_reschedule),
+        ("Run Loop Test", test_run_loop),
+        ("Alert Equivalence Test", test_same_alerts_fewer_evaluations),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck bulk agent registration
+
+Runs the real register_chat_agent against a local stand-in Agentverse
+server and checks concurrency, rate limiting, skipping of unchanged
+agents and per-agent failures.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from register_agent import FleetAgent, load_fleet_manifest, register_fleet
+
+API_KEY = "test-agentverse-key"
+
+
+class StandInAgentverse:
+    """Minimal Agentverse API: identity challenge, agent registration, status."""
+
+    def __init__(self, delay=0.05, reject=()):
+        self.delay = delay
+        self.reject = set(reject)
+        self.known = set()
+        self.registrations = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body=None):
+                data = json.dumps(body or {}).encode()
+                self.send_response(code)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.startswith("/v2/identity/") and self.path.endswith("/challenge"):
+                    return self._reply(200, {"challenge": "stand-in-challenge"})
+                if self.path.startswith("/v2/agents/"):
+                    address = self.path.rsplit("/", 1)[1]
+                    return self._reply(200 if address in service.known else 404)
+                self._reply(404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+                if self.path.startswith("/v1/almanac/agents/"):
+                    return self._reply(200)
+                if self.headers.get("authorization") != f"Bearer {API_KEY}":
+                    return self._reply(401, {"detail": "Invalid API key"})
+                if self.path == "/v2/identity":
+                    service.known.add(body["address"])
+                    return self._reply(200)
+                if self.path == "/v2/agents":
+                    with service.lock:
+                        service.in_flight += 1
+                        service.max_in_flight = max(service.max_in_flight, service.in_flight)
+                    time.sleep(service.delay)
+                    with service.lock:
+                        service.in_flight -= 1
+                    if body["name"] in service.reject:
+                        return self._reply(409, {"detail": "Agent name conflict"})
+                    service.registrations.append((body["name"], body["url"]))
+                    return self._reply(200)
+                self._reply(404)
+
+        return Handler
+
+
+def make_fleet(count):
+    return [FleetAgent(f"TiltCheck Tenant {i}", f"https://tenant{i}.example.com/agent", f"fleet-seed-{i}")
+            for i in range(count)]
+
+
+def run_fleet(agents, state_file, service, **kwargs):
+    return asyncio.run(register_fleet(agents, API_KEY, state_file, agentverse_url=service.url, **kwargs))
+
+
+def test_concurrent_and_idempotent():
+    """Test concurrent registration, then skipping of unchanged agents"""
+    print("Testing concurrent idempotent registration...")
+    service = StandInAgentverse(delay=0.1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            state_file = os.path.join(tmp, "state.json")
+            agents = make_fleet(20)
+
+            start = time.monotonic()
+            results = run_fleet(agents, state_file, service, concurrency=5, rate=1000)
+            elapsed = time.monotonic() - start
+            assert set(results.values()) == {"registered"}, results
+            assert sorted(service.registrations) == sorted((a.name, a.endpoint) for a in agents)
+            assert 1 < service.max_in_flight <= 5, service.max_in_flight
+            assert elapsed < 20 * 0.1, f"not concurrent: {elapsed:.2f}s"
+
+            results = run_fleet(agents, state_file, service)
+            assert set(results.values()) == {"unchanged"}
+            assert len(service.registrations) == 20
+
+            agents[3] = agents[3]._replace(endpoint="https://moved.example.com/agent")
+            results = run_fleet(agents, state_file, service)
+            assert [n for n, s in results.items() if s == "registered"] == [agents[3].name]
+            assert service.registrations[-1] == (agents[3].name, "https://moved.example.com/agent")
+
+            agents[5] = agents[5]._replace(seed="fleet-seed-rotated")
+            results = run_fleet(agents, state_file, service)
+            assert [n for n, s in results.items() if s == "registered"] == [agents[5].name]
+
+            with open(state_file) as f:
+                text = f.read()
+            assert "fleet-seed" not in text, "seed written to the state file"
+            assert sorted(json.loads(text)["agents"]) == sorted(a.name for a in agents)
+    finally:
+        service.close()
+    print(f"✅ 20 agents in {elapsed:.2f}s with {service.max_in_flight} in flight; reruns skip unchanged agents")
+
+
+def test_failures_and_rate_limit():
+    """Test that failures are isolated and retried, and the rate limit holds"""
+    print("\nTesting failures and rate limit...")
+    service = StandInAgentverse(delay=0.0, reject={"TiltCheck Tenant 2"})
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            state_file = os.path.join(tmp, "state.json")
+            agents = make_fleet(6)
+
+            start = time.monotonic()
+            results = run_fleet(agents, state_file, service, concurrency=6, rate=10)
+            elapsed = time.monotonic() - start
+            assert results["TiltCheck Tenant 2"].startswith("failed"), results
+            assert sum(s == "registered" for s in results.values()) == 5
+            assert elapsed >= 0.45, f"rate limit not applied: {elapsed:.2f}s"
+
+            service.reject.clear()
+            results = run_fleet(agents, state_file, service, rate=1000)
+            assert results["TiltCheck Tenant 2"] == "registered"
+            assert sum(s == "unchanged" for s in results.values()) == 5
+
+            results = asyncio.run(register_fleet(agents[:1], "wrong-key", state_file,
+                                                 agentverse_url=service.url, force=True))
+            assert results[agents[0].name].startswith("failed")
+    finally:
+        service.close()
+    print(f"✅ One rejected agent did not block the others; 6 starts at 10/s took {elapsed:.2f}s")
+
+
+def test_manifest_validation():
+    """Test fleet manifest parsing"""
+    print("\nTesting manifest validation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fleet.json")
+        os.environ["TEST_FLEET_SEED"] = "seed-from-env"
+        try:
+            with open(path, "w") as f:
+                json.dump({"agents": [{"name": "A", "endpoint": "https://a.example.com", "seed_env": "TEST_FLEET_SEED"},
+                                      {"name": "B", "endpoint": "https://b.example.com", "seed": "b", "active": False}]}, f)
+            agents = load_fleet_manifest(path)
+            assert agents[0].seed == "seed-from-env" and agents[1].active is False
+
+            for bad in ({"agents": []},
+                        {"agents": [{"name": "A", "endpoint": "a.example.com", "seed": "x"}]},
+                        {"agents": [{"name": "A", "endpoint": "https://a", "seed_env": "UNSET_FLEET_SEED"}]},
+                        {"agents": [{"name": "A", "endpoint": "https://a", "seed": "x"}] * 2}):
+                with open(path, "w") as f:
+                    json.dump(bad, f)
+                try:
+                    load_fleet_manifest(path)
+                    raise AssertionError(f"accepted {bad}")
+                except ValueError:
+                    pass
+        finally:
+            del os.environ["TEST_FLEET_SEED"]
+    print("✅ Manifest entries are validated")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Fleet Registration - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Concurrent Idempotent Registration Test", test_concurrent_and_idempotent),
+        ("Failures and Rate Limit Test", test_failures_and_rate_limit),
+        ("Manifest Validation Test", test_manifest_validation),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
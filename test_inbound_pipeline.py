@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck inbound message pipeline
+
+Covers batch draining, the three overflow policies and that a burst of
+peer messages does not hold up other work on the event loop.
+"""
+
+import asyncio
+import sys
+
+from inbound_pipeline import InboundPipeline
+
+
+def test_batching():
+    """Test that consumers drain the queue in batches"""
+    print("Testing batch draining...")
+
+    async def run():
+        batches = []
+
+        async def handler(batch):
+            batches.append(list(batch))
+
+        pipeline = InboundPipeline(handler, maxsize=100, batch_size=10)
+        for i in range(25):
+            assert await pipeline.submit(i)
+        pipeline.start()
+        await pipeline.stop(drain=True)
+        return batches, pipeline.metrics()
+
+    batches, metrics = asyncio.run(run())
+    assert [len(b) for b in batches] == [10, 10, 5], batches
+    assert sum(batches, []) == list(range(25))
+    assert metrics["processed"] == 25 and metrics["max_depth"] == 25
+    print("✅ 25 messages drained in 3 batches")
+
+
+def test_overflow_policies():
+    """Test drop_oldest, reject and block overflow handling"""
+    print("\nTesting overflow policies...")
+
+    async def run(policy):
+        seen = []
+
+        async def handler(batch):
+            seen.extend(batch)
+
+        pipeline = InboundPipeline(handler, maxsize=3, overflow=policy, block_timeout=0.05)
+        accepted = [await pipeline.submit(i) for i in range(5)]
+        pipeline.start()
+        await pipeline.stop(drain=True)
+        return accepted, seen, pipeline.metrics()
+
+    accepted, seen, metrics = asyncio.run(run("drop_oldest"))
+    assert all(accepted) and seen == [2, 3, 4] and metrics["dropped"] == 2
+    print("✅ drop_oldest keeps the newest messages")
+
+    accepted, seen, metrics = asyncio.run(run("reject"))
+    assert accepted == [True, True, True, False, False] and seen == [0, 1, 2]
+    assert metrics["rejected"] == 2
+    print("✅ reject refuses messages when full")
+
+    accepted, seen, metrics = asyncio.run(run("block"))
+    assert accepted == [True, True, True, False, False] and metrics["rejected"] == 2
+    print("✅ block waits for room and times out")
+
+
+def test_burst_does_not_starve_loop():
+    """Test that other tasks keep running during a large burst"""
+    print("\nTesting event loop fairness under a burst...")
+
+    async def run():
+        ticks = []
+
+        async def handler(batch):
+            pass
+
+        pipeline = InboundPipeline(handler, maxsize=10000, batch_size=50)
+        for i in range(5000):
+            await pipeline.submit(i)
+
+        async def detector_tick():
+            for _ in range(20):
+                ticks.append(pipeline.metrics()["depth"])
+                await asyncio.sleep(0)
+
+        pipeline.start()
+        await asyncio.gather(detector_tick(), pipeline.stop(drain=True))
+        return ticks
+
+    ticks = asyncio.run(run())
+    # The tick ran while most of the burst was still queued
+    assert len(ticks) == 20 and ticks[5] > 4000, ticks[:6]
+    print("✅ Detection tick interleaves with batch processing")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Inbound Pipeline - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Batching Test", test_batching),
+        ("Overflow Policy Test", test_overflow_policies),
+        ("Burst Fairness Test", test_burst_does_not_starve_loop),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck ingestion deduplication
+
+Checks that a retried burst no longer inflates the spin count, that old
+replays are caught by the Bloom filter with bounded memory, that the
+state survives a checkpoint round trip, and that idle players are evicted
+from it.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from ingest_dedup import EventDeduplicator, duplicate_key_columns
+from tilt_engine import BetEvent, SessionFileTail, TiltEngine
+
+START = 1_700_000_000 * 1_000_000_000
+
+
+def make_bets(player, count, start=START, step_ns=3_000_000_000):
+    return [BetEvent(player, start + i * step_ns, 5.0, "loss", 1000.0 - 5 * i) for i in range(count)]
+
+
+def test_retried_burst():
+    """Test that a re-delivered burst does not trigger rapid spinning"""
+    print("Testing retried burst...")
+    bets = make_bets("p1", 40)
+    retried = bets[:20] + bets[10:40] + bets[25:40]
+
+    raw_engine, engine = TiltEngine(), TiltEngine()
+    raw_engine.ingest(retried)
+    dedup = EventDeduplicator()
+    engine.ingest(dedup.filter(retried[:30]))
+    engine.ingest(dedup.filter(retried[30:]))
+
+    assert raw_engine.spin_count("p1") > 50, "burst should inflate the raw spin count"
+    assert engine.spin_count("p1") == 40
+    assert not [hit for hit in engine.check_player("p1") if hit.rule == "rapid_spinning"]
+    assert dedup.duplicates == len(retried) - 40
+
+    # Explicit event IDs win over the bet fields
+    same_fields = [BetEvent("p2", START, 5.0, "loss", 100.0, event_id=f"bet-{i}") for i in range(3)]
+    assert len(dedup.filter(same_fields + same_fields[:1])) == 3
+
+    # Unrecorded batches (the engine failed to take them) pass again on retry
+    retry = [BetEvent("p3", START + i, 5.0, "loss", 100.0) for i in range(3)]
+    assert dedup.unseen(retry + retry[:1]) == retry
+    assert dedup.unseen(retry) == retry
+    dedup.record(retry)
+    assert dedup.unseen(retry) == []
+    print(f"✅ {len(retried)} delivered, 40 kept; spin count {engine.spin_count('p1')} "
+          f"instead of {raw_engine.spin_count('p1')}")
+
+
+def test_bloom_and_memory_bound():
+    """Test old replays, bounded per-player memory and no false drops of live bets"""
+    print("\nTesting Bloom filter and memory bound...")
+    dedup = EventDeduplicator(window_seconds=60.0, max_recent=500)
+    bets = make_bets("p1", 3000, step_ns=1_000_000_000)
+    assert dedup.filter(bets) == bets, "live bets were dropped"
+
+    player = dedup.players["p1"]
+    exact = len(player.recent)
+    assert exact <= 61 and len(player.order) == exact
+    assert len(player.bloom.bits) == len(player.previous.bits) == 1024
+
+    # Recent replays are exact; older replays are mostly caught by the filters
+    assert dedup.filter(bets[-61:]) == []
+    caught = len(bets[2200:2900]) - len(dedup.filter(bets[2200:2900]))
+    assert caught == 700, f"only {caught} of 700 old replays caught"
+
+    # Late bets that were never seen are dropped only by a false positive
+    late = [bet._replace(bet_amount=7.0) for bet in bets[2200:2900]]
+    false_drops = len(late) - len(dedup.filter(late))
+    assert false_drops <= 21, f"{false_drops} false positives"
+
+    capped = EventDeduplicator(window_seconds=3600.0, max_recent=100)
+    capped.filter(make_bets("p1", 1000))
+    assert len(capped.players["p1"].recent) == 100
+    assert capped.filter(make_bets("p1", 1000)) == []
+    print(f"✅ {exact} exact fingerprints + 2 KB of filters per player; "
+          f"{false_drops}/700 late bets falsely dropped")
+
+
+def test_restart_redelivery():
+    """Test that a checkpointed state filters a full re-delivery after restart"""
+    print("\nTesting re-delivery after restart...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.csv")
+        with open(path, 'w') as f:
+            f.write("event_id,player_id,timestamp,bet_amount,outcome,balance\n")
+            for i in range(200):
+                f.write(f"e{i},p{i % 4},{1_700_000_000 + i},5,loss,{1000 - i}\n")
+            for i in range(150, 200):
+                f.write(f"e{i},p{i % 4},{1_700_000_000 + i},5,loss,{1000 - i}\n")
+
+        events = SessionFileTail(path).read_new()
+        assert len(events) == 250 and events[0].event_id == "e0"
+        dedup = EventDeduplicator(window_seconds=30.0, max_recent=16)
+        assert len(dedup.filter(events)) == 200
+
+        state = json.loads(json.dumps(dedup.state()))
+        restarted = EventDeduplicator(window_seconds=30.0, max_recent=16)
+        restarted.restore(state)
+        assert restarted.filter(SessionFileTail(path).read_new()) == []
+        assert restarted.duplicates == 50 + 250
+        assert len(json.dumps(state)) < 12_000
+
+        df = pd.read_csv(path)
+        assert len(df.drop_duplicates(subset=duplicate_key_columns(df.columns))) == 200
+        assert duplicate_key_columns(["timestamp", "bet_amount", "outcome", "balance"]) == \
+            ["timestamp", "bet_amount", "balance"]
+    print(f"✅ Full re-delivery dropped after restore; state is {len(json.dumps(state))} bytes")
+
+
+def test_idle_eviction():
+    """Test that idle players are dropped from the deduplicator and its checkpoint"""
+    print("\nTesting idle eviction...")
+    dedup = EventDeduplicator()
+    dedup.filter(make_bets("p1", 10) + make_bets("p2", 10))
+    dedup.players["p1"].touched -= 7200
+
+    assert dedup.evict_idle(3600.0) == ["p1"]
+    assert list(dedup.players) == ["p2"]
+    assert list(dedup.state()["players"]) == ["p2"], "evicted player still checkpointed"
+    assert dedup.evict_idle(3600.0) == []
+
+    # The remaining player still filters its replays; the evicted one starts over
+    assert dedup.filter(make_bets("p2", 10)) == []
+    assert len(dedup.filter(make_bets("p1", 10))) == 10
+    print("✅ Idle players leave the deduplicator and the checkpoint state")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Ingestion Deduplication - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Retried Burst Test", test_retried_burst),
+        ("Bloom Filter and Memory Test", test_bloom_and_memory_bound),
+        ("Restart Re-delivery Test", test_restart_redelivery),
+        ("Idle Eviction Test", test_idle_eviction),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck local bet ingestion
+
+Sends bets over a real Unix socket in both framings and checks that they
+reach a tilt engine within milliseconds, that a full queue pushes back
+with "busy", that invalid batches (including out-of-range timestamps) are
+rejected without closing the connection, and that one failing batch does
+not fail the others.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from ipc_ingest import IngestClient, IngestServer, decode_batch, encode_batch, parse_bet
+from tilt_engine import TiltEngine
+
+
+def make_bets(player, count, start=1_700_000_000):
+    return [{"player_id": player, "timestamp": start + i, "bet_amount": 5, "outcome": "loss",
+             "balance": 1000 - 5 * i, "event_id": f"{player}-{i}"} for i in range(count)]
+
+
+def run_with_server(scenario, **kwargs):
+    """Run scenario(server, path, received) against a listening server."""
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ingest.sock")
+            received = []
+
+            async def handler(events):
+                if any(event.player_id == kwargs.get("fail_player") for event in events):
+                    raise RuntimeError("detector rejected the batch")
+                received.append((time.perf_counter(), events))
+                if kwargs.get("slow"):
+                    await asyncio.sleep(kwargs["slow"])
+
+            server = IngestServer(handler, maxsize=kwargs.get("maxsize", 256),
+                                  block_timeout=kwargs.get("block_timeout", 0.5))
+            await server.start(path)
+            try:
+                return await scenario(server, path, received)
+            finally:
+                await server.stop()
+                assert not os.path.exists(path), "socket file left behind"
+    return asyncio.run(run())
+
+
+def test_latency_both_framings():
+    """Test that bets reach the engine within milliseconds in both framings"""
+    print("Testing NDJSON and binary ingestion latency...")
+
+    async def scenario(server, path, received):
+        engine = TiltEngine()
+        latencies = {}
+        for binary in (False, True):
+            client = await IngestClient(binary=binary).connect(path)
+            samples = []
+            for batch in range(50):
+                bets = make_bets(f"p{int(binary)}", 2, start=1_700_000_000 + batch * 2)
+                before = len(received)
+                sent = time.perf_counter()
+                ack = await client.send(bets)
+                assert ack["accepted"] == 2, ack
+                while len(received) == before:
+                    await asyncio.sleep(0)
+                samples.append(received[-1][0] - sent)
+                engine.ingest(received[-1][1])
+            await client.close()
+            latencies["binary" if binary else "ndjson"] = statistics.median(samples) * 1000
+        assert engine.spin_count("p0") == engine.spin_count("p1") == 100
+        return latencies
+
+    latencies = run_with_server(scenario)
+    assert max(latencies.values()) < 50, latencies
+    print(f"✅ Median send-to-detector latency: NDJSON {latencies['ndjson']:.2f} ms, "
+          f"binary {latencies['binary']:.2f} ms")
+
+
+def test_binary_round_trip():
+    """Test the binary batch encoding"""
+    print("\nTesting binary batch encoding...")
+    events = [parse_bet(bet) for bet in make_bets("p1", 5)]
+    events.append(parse_bet({"timestamp": "2025-01-01T00:00:00", "bet_amount": 0.3333,
+                             "outcome": "push", "balance": 12.5, "game": "blackjack"}))
+    payload = encode_batch(events)
+    assert decode_batch(payload) == events
+    nan_bet = events[0]._replace(balance=float("nan"))
+    for bad in (payload[:-1], payload + b"\x00", encode_batch([nan_bet])):
+        try:
+            decode_batch(bad)
+            raise AssertionError("bad payload decoded")
+        except ValueError:
+            pass
+    for amount in ("NaN", "inf", float("-inf")):
+        try:
+            parse_bet(dict(make_bets("p1", 1)[0], bet_amount=amount))
+            raise AssertionError(f"bet with amount {amount} parsed")
+        except ValueError:
+            pass
+    print(f"✅ {len(events)} bets in {len(payload)} bytes round-trip exactly")
+
+
+def test_backpressure():
+    """Test that a full queue answers busy and recovers"""
+    print("\nTesting backpressure...")
+
+    async def scenario(server, path, received):
+        client = await IngestClient().connect(path)
+        acks = [await client.send(make_bets("p1", 1, start=1_700_000_000 + i)) for i in range(6)]
+        busy = [ack for ack in acks if ack.get("error") == "busy"]
+        assert busy and busy[0]["retry_after_ms"] == 50, acks
+        assert max(ack.get("queued", 0) for ack in acks) <= 2
+
+        await asyncio.sleep(1.0)
+        assert (await client.send(make_bets("p1", 1, start=1_800_000_000)))["accepted"] == 1
+        await client.close()
+        return len(busy), server.metrics()
+
+    busy, metrics = run_with_server(scenario, maxsize=2, block_timeout=0.05, slow=0.3)
+    assert metrics["rejected"] == busy
+    print(f"✅ {busy} of 6 batches answered busy while the detector was slow; accepted again after")
+
+
+def test_invalid_batches():
+    """Test that invalid batches are rejected and the connection stays usable"""
+    print("\nTesting invalid batches...")
+
+    async def scenario(server, path, received):
+        client = await IngestClient().connect(path)
+        for bad in ([{"timestamp": 1, "bet_amount": 5, "outcome": "loss"}],
+                    [{"timestamp": "yesterday", "bet_amount": 5, "outcome": "loss", "balance": 1}],
+                    [{"timestamp": "inf", "bet_amount": 5, "outcome": "loss", "balance": 1}],
+                    [{"timestamp": "nan", "bet_amount": 5, "outcome": "loss", "balance": 1}],
+                    [{"timestamp": 1_729_350_000_000, "bet_amount": 5, "outcome": "loss", "balance": 1}]):
+            ack = await client.send(bad)
+            assert "error" in ack and ack["error"] != "busy", ack
+        client._writer.write(b"not json\n")
+        assert "error" in json.loads(await client._reader.readline())
+        assert (await client.send(make_bets("p1", 3)))["accepted"] == 3
+        await client.close()
+
+        binary = await IngestClient(binary=True).connect(path)
+        binary._writer.write(b"\x05\x00\x00\x00\x01\x00\x00\x00\x00")
+        status = await binary._reader.readexactly(5)
+        assert status[0] == 2
+        assert (await binary.send(make_bets("p2", 2)))["accepted"] == 2
+        await binary.close()
+        await asyncio.sleep(0.05)
+        return server.metrics()
+
+    metrics = run_with_server(scenario)
+    assert metrics["invalid"] == 7 and metrics["bets"] == 5, metrics
+    print("✅ Invalid JSON, missing fields, out-of-range timestamps and bad frames rejected; "
+          "connections kept open")
+
+
+def test_failed_batch_isolated():
+    """Test that a batch the handler rejects does not fail other producers' batches"""
+    print("\nTesting handler failure isolation...")
+
+    async def scenario(server, path, received):
+        clients = [await IngestClient().connect(path) for _ in range(3)]
+        acks = await asyncio.gather(*(client.send(make_bets(player, 2))
+                                      for client, player in zip(clients, ("p1", "bad", "p2"))))
+        assert all(ack.get("accepted") == 2 for ack in acks), acks
+        for client in clients:
+            await client.close()
+        await asyncio.sleep(0.05)
+        return server.metrics()
+
+    metrics = run_with_server(scenario, fail_player="bad")
+    assert metrics["bets"] == 4 and metrics["failed_batches"] == 1, metrics
+    print("✅ Only the rejected producer batch failed")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Socket Ingestion - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Latency Test", test_latency_both_framings),
+        ("Binary Encoding Test", test_binary_round_trip),
+        ("Backpressure Test", test_backpressure),
+        ("Invalid Batch Test", test_invalid_batches),
+        ("Failed Batch Isolation Test", test_failed_batch_isolated),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
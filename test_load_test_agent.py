@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck agent load test
+
+Checks that the target address derived from the agent seed is the address
+the agent runs under, that prepared envelopes are signed, addressed and
+spread round-robin over the senders, and the latency summary.
+"""
+
+import asyncio
+import sys
+
+from ecdsa import BadSignatureError
+from uagents import Agent
+from uagents_core.envelope import Envelope
+from uagents_core.identity import Identity
+
+from agent_models import ChatMessage, TiltAlert
+from load_test_agent import DEFAULT_AGENT_SEED, LoadTestResult, build_message, percentile, prepare_envelopes
+
+
+def test_address_derivation():
+    """Test that the load test targets the agent's own address"""
+    print("Testing address derivation...")
+    target = Identity.from_seed(DEFAULT_AGENT_SEED, 0).address
+    loop = asyncio.new_event_loop()
+    try:
+        agent = Agent(name="tiltcheck_load_test_target", seed=DEFAULT_AGENT_SEED, loop=loop)
+        assert target == agent.address
+    finally:
+        loop.close()
+
+    senders = [Identity.from_seed(f"tiltcheck_load_test_sender_{i}", 0) for i in range(3)]
+    assert len({sender.address for sender in senders}) == 3, "sender identities collide"
+    assert senders[0].address == Identity.from_seed("tiltcheck_load_test_sender_0", 0).address
+    print(f"✅ Target {target[:16]}... matches the agent's address; senders are stable")
+
+
+def test_prepare_envelopes():
+    """Test that envelopes are signed, addressed and round-robin over senders"""
+    print("\nTesting envelope preparation...")
+    target = Identity.from_seed(DEFAULT_AGENT_SEED, 0).address
+    senders = [Identity.from_seed(f"tiltcheck_load_test_sender_{i}", 0) for i in range(3)]
+    bodies = prepare_envelopes(senders, target, 10, "mixed", 200)
+    envelopes = [Envelope.model_validate_json(body) for body in bodies]
+
+    assert len(envelopes) == 10
+    assert [env.sender for env in envelopes] == [senders[i % 3].address for i in range(10)]
+    assert all(env.target == target and env.verify() for env in envelopes), "bad signature or target"
+    assert len({env.session for env in envelopes}) == 10, "sessions reused"
+
+    for i, env in enumerate(envelopes):
+        model = TiltAlert if i % 2 else ChatMessage
+        message = model.model_validate_json(env.decode_payload())
+        assert env.schema_digest == model.build_schema_digest(message)
+        text = message.alert_message if i % 2 else message.message
+        assert len(text) == 200 and text.startswith(f"load-test message {i} ")
+
+    tampered = envelopes[0].model_copy(update={"target": senders[1].address})
+    try:
+        verified = tampered.verify()
+    except BadSignatureError:
+        verified = False
+    assert not verified, "signature does not cover the target"
+    print(f"✅ {len(envelopes)} envelopes signed by {len(senders)} senders, alternating message kinds")
+
+
+def test_summary():
+    """Test nearest-rank percentiles and the run summary"""
+    print("\nTesting the latency summary...")
+    values = [i / 100 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.5 and percentile(values, 99) == 0.99 and percentile([], 50) == 0.0
+    assert len(build_message("chat", 7, 4).message) == len("load-test message 7 "), "short text truncated"
+
+    result = LoadTestResult()
+    result.sent, result.started, result.finished = 4, 10.0, 12.0
+    result.latencies = [0.3, 0.1, 0.2]
+    result.record_error("timeout")
+    summary = result.summary()
+    assert summary["delivered"] == 3 and summary["failed"] == 1 and summary["error_rate"] == 0.25
+    assert summary["throughput_msg_s"] == 1.5 and summary["latency_ms"]["max"] == 300.0
+    assert summary["errors"] == {"timeout": 1}
+    print("✅ Percentiles and summary fields are correct")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Agent Load Test - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Address Derivation Test", test_address_derivation),
+        ("Envelope Preparation Test", test_prepare_envelopes),
+        ("Summary Test", test_summary),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
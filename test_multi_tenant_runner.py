@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck multi-tenant runner
+
+Checks manifest validation, per-tenant rules on the shared engine, the
+shared alert log, that checkpoints only restore tenants still in the
+manifest and that a failed check does not deduplicate the re-delivery.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from alert_log import KIND_ALERT
+from multi_tenant_runner import MultiTenantRunner, load_manifest, tenant_key
+from tilt_engine import TiltRules
+
+
+def write_manifest(tmp, tenants):
+    path = os.path.join(tmp, "tenants.json")
+    with open(path, "w") as f:
+        json.dump({"port": 8101, "tenants": tenants}, f)
+    return path
+
+
+def test_manifest_validation():
+    """Test that invalid manifests are rejected"""
+    print("Testing manifest validation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        good = {"name": "casino_a", "seed": "seed_a", "session_file": "a.csv",
+                "rules": {"threshold_spins": 40}}
+        manifest = load_manifest(write_manifest(tmp, [good]))
+        assert manifest["tenants"][0].rules == TiltRules(threshold_spins=40)
+
+        bad_entries = [
+            [good, dict(good)],                                   # duplicate name
+            [dict(good, name="bad/name")],                        # separator in name
+            [dict(good, seed=None)],                              # no seed
+            [dict(good, rules={"spin_limit": 3})],                # unknown rule
+            [dict(good, seed_env="TILTCHECK_TEST_MISSING_SEED")], # env var not set
+        ]
+        for entries in bad_entries:
+            try:
+                load_manifest(write_manifest(tmp, entries))
+            except ValueError:
+                continue
+            raise AssertionError(f"manifest accepted: {entries}")
+    print("✅ Invalid manifests are rejected")
+
+
+def test_per_tenant_rules():
+    """Test two tenants with different rules on one engine"""
+    print("\nTesting per-tenant rules on the shared engine...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("strict", "lenient"):
+            shutil.copy("session_data_both_alerts.csv", os.path.join(tmp, f"{name}.csv"))
+        manifest = load_manifest(write_manifest(tmp, [
+            {"name": "strict", "seed": "tenant_test_strict", "session_file": os.path.join(tmp, "strict.csv"),
+             "subscribers": ["agent1qbot"], "allowed_subscribers": ["agent1qdashboard"]},
+            {"name": "lenient", "seed": "tenant_test_lenient", "session_file": os.path.join(tmp, "lenient.csv"),
+             "rules": {"threshold_spins": 500, "drop_threshold": 0.95}},
+        ]))
+
+        async def run():
+            runner = MultiTenantRunner(manifest["tenants"], port=8101, watch_mode="poll",
+                                       alert_log_dir=os.path.join(tmp, "alerts"))
+            strict = await runner.check_tenant(runner.tenants["strict"])
+            lenient = await runner.check_tenant(runner.tenants["lenient"])
+            return runner, strict, lenient
+
+        runner, strict, lenient = asyncio.run(run())
+        addresses = {tenant.agent.address for tenant in runner.tenants.values()}
+        assert len(addresses) == 2, "tenants share an address"
+        assert set(runner.engine.players) == {tenant_key("strict", "default"), tenant_key("lenient", "default")}
+        assert len(strict) == 2 and lenient == [], (strict, lenient)
+        assert all(a.details["tenant"] == "strict" and a.details["player_id"] == "default" for a in strict)
+        assert runner.tenants["strict"].allowed_subscribers == {"agent1qbot", "agent1qdashboard"}
+        assert runner.tenants["lenient"].allowed_subscribers == set(), "runtime subscriptions open by default"
+
+        runner.alert_log.close()
+        logged = list(runner.alert_log.query(tenant_key("strict", "default"), kind=KIND_ALERT))
+        assert [r["data"]["rule"] for r in logged] == [a.rule for a in strict]
+        assert runner.alert_log.players() == [tenant_key("strict", "default")]
+    print("✅ Each tenant is evaluated with its own rules; alerts are logged per tenant")
+
+
+def test_checkpoint_drops_removed_tenants():
+    """Test that a checkpoint only restores tenants still in the manifest"""
+    print("\nTesting tenant checkpoint restore...")
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, "checkpoint.json")
+        entries = []
+        for name in ("a", "b"):
+            path = os.path.join(tmp, f"{name}.csv")
+            shutil.copy("session_data.csv", path)
+            entries.append({"name": name, "seed": f"tenant_test_{name}", "session_file": path})
+        manifest = load_manifest(write_manifest(tmp, entries))
+
+        async def run(tenants):
+            runner = MultiTenantRunner(tenants, port=8101, checkpoint_file=checkpoint, watch_mode="poll")
+            for tenant in runner.tenants.values():
+                await runner.check_tenant(tenant)
+            runner.checkpoint.save(runner.state())
+            return runner
+
+        asyncio.run(run(manifest["tenants"]))
+        restored = asyncio.run(run(manifest["tenants"][:1]))
+        assert set(restored.engine.players) == {tenant_key("a", "default")}
+        assert restored.tenants["a"].tail.offset == os.path.getsize(entries[0]["session_file"])
+    print("✅ Removed tenants are dropped on restore")
+
+
+def test_failed_check_keeps_redelivery():
+    """Test that bets from a failed check are not deduplicated on re-delivery"""
+    print("\nTesting re-delivery after a failed check...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a.csv")
+        rows = "".join(f"e{i},2024-01-15T10:00:{i:02d},10,loss,{1000 - 10 * i}\n" for i in range(5))
+        with open(path, "w") as f:
+            f.write("event_id,timestamp,bet_amount,outcome,balance\n" + rows)
+        manifest = load_manifest(write_manifest(tmp, [
+            {"name": "a", "seed": "tenant_test_redelivery", "session_file": path}]))
+
+        async def run():
+            runner = MultiTenantRunner(manifest["tenants"], port=8101, watch_mode="poll")
+            tenant = runner.tenants["a"]
+            ingest = runner.engine.ingest
+
+            def failing_ingest(events):
+                raise RuntimeError("engine unavailable")
+
+            runner.engine.ingest = failing_ingest
+            try:
+                await runner.check_tenant(tenant)
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("check did not fail")
+            runner.engine.ingest = ingest
+
+            # The feed re-delivers the batch it got no confirmation for
+            with open(path, "a") as f:
+                f.write(rows)
+            await runner.check_tenant(tenant)
+            return runner
+
+        runner = asyncio.run(run())
+        assert runner.engine.spin_count(tenant_key("a", "default")) == 5
+        assert runner.dedup.duplicates == 0
+    print("✅ A failed check leaves its bets unrecorded, so the re-delivery is ingested")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Multi-Tenant Runner - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Manifest Validation Test", test_manifest_validation),
+        ("Per-Tenant Rules Test", test_per_tenant_rules),
+        ("Checkpoint Restore Test", test_checkpoint_drops_removed_tenants),
+        ("Failed Check Re-delivery Test", test_failed_check_keeps_redelivery),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for TiltCheck on-demand profiling
+
+Checks that a requested profile covers exactly the next N ticks, also
+when wrapped calls overlap, that memory reports point at the allocating line, that signals trigger both,
+and that idle hooks add almost no overhead.
+"""
+
+import asyncio
+import os
+import pstats
+import signal
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from profiling_hooks import ProfilingHooks
+
+retained = []
+
+
+def busy_rule_check():
+    return sum(i * i for i in range(2000))
+
+
+def test_profile_next_ticks():
+    """Test that the next N ticks are profiled and written"""
+    print("Testing tick profiling...")
+    with tempfile.TemporaryDirectory() as tmp:
+        hooks = ProfilingHooks(tmp)
+        calls = []
+
+        @hooks.profiled
+        async def tick(n):
+            calls.append(n)
+            await asyncio.sleep(0)
+            return busy_rule_check()
+
+        async def run():
+            await tick(0)
+            hooks.request_profile(3)
+            for n in range(1, 6):
+                assert await tick(n) == busy_rule_check()
+
+        asyncio.run(run())
+        assert calls == [0, 1, 2, 3, 4, 5]
+        assert len(hooks.files) == 1 and not hooks.profiling
+        stats = pstats.Stats(hooks.files[0])
+        ticks = [v[0] for k, v in stats.stats.items() if k[2] == "busy_rule_check"]
+        assert ticks == [3], ticks
+        with open(hooks.files[0].replace(".prof", ".txt")) as f:
+            summary = f.read()
+        assert summary.startswith("3 ticks") and "busy_rule_check" in summary
+
+        try:
+            hooks.request_profile(0)
+            raise AssertionError("accepted 0 ticks")
+        except ValueError:
+            pass
+    print("✅ Exactly 3 ticks profiled; .prof and summary written")
+
+
+def test_overlapping_ticks():
+    """Test overlapping wrapped calls share one profile"""
+    print("\nTesting overlapping ticks...")
+    with tempfile.TemporaryDirectory() as tmp:
+        hooks = ProfilingHooks(tmp)
+
+        @hooks.profiled
+        async def check(release):
+            await release.wait()
+            return busy_rule_check()
+
+        @hooks.profiled
+        async def socket_batch():
+            await asyncio.sleep(0)
+            return busy_rule_check()
+
+        async def run():
+            hooks.request_profile(3)
+            release = asyncio.Event()
+            slow = asyncio.ensure_future(check(release))
+            await asyncio.sleep(0)
+            await socket_batch()
+            await socket_batch()
+            assert not hooks.files, "profile written while a tick was still running"
+            release.set()
+            await slow
+
+        asyncio.run(run())
+        assert len(hooks.files) == 1 and not hooks.profiling
+        stats = pstats.Stats(hooks.files[0])
+        calls = [v[0] for k, v in stats.stats.items() if k[2] == "busy_rule_check"]
+        assert calls == [3], calls
+    print("✅ 3 overlapping ticks profiled once, written after the last returned")
+
+
+def test_memory_snapshots():
+    """Test that memory reports show the growing allocation site"""
+    print("\nTesting memory snapshots...")
+    with tempfile.TemporaryDirectory() as tmp:
+        hooks = ProfilingHooks(tmp, top=10)
+        try:
+            assert hooks.snapshot_memory() is None and hooks.tracing_memory
+            retained.extend(bytearray(1024) for _ in range(2000))  # leak under test
+            path = hooks.snapshot_memory()
+            with open(path) as f:
+                report = f.read()
+            changes = report.split("Top 10 changes")[1].split("Top 10 allocation")[0]
+            assert "test_profiling_hooks.py" in changes.splitlines()[1], changes
+        finally:
+            hooks.stop_memory()
+            retained.clear()
+        assert not tracemalloc.is_tracing() and not hooks.tracing_memory
+    print("✅ Growth since the last snapshot is attributed to the allocating line")
+
+
+def test_signals():
+    """Test SIGUSR1 and SIGUSR2 triggers"""
+    print("\nTesting signal triggers...")
+    with tempfile.TemporaryDirectory() as tmp:
+        hooks = ProfilingHooks(tmp)
+
+        @hooks.profiled
+        async def tick():
+            await asyncio.sleep(0.01)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            hooks.install_signal_handlers(loop, ticks=2)
+            try:
+                os.kill(os.getpid(), signal.SIGUSR1)
+                await asyncio.sleep(0.05)
+                assert hooks.profiling
+                for _ in range(2):
+                    await tick()
+                os.kill(os.getpid(), signal.SIGUSR2)
+                await asyncio.sleep(0.05)
+                os.kill(os.getpid(), signal.SIGUSR2)
+                await asyncio.sleep(0.05)
+            finally:
+                loop.remove_signal_handler(signal.SIGUSR1)
+                loop.remove_signal_handler(signal.SIGUSR2)
+                hooks.stop_memory()
+
+        asyncio.run(run())
+        kinds = sorted(os.path.basename(path).split("-")[0] for path in hooks.files)
+        assert kinds == ["memory", "profile"], hooks.files
+    print("✅ SIGUSR1 profiled 2 ticks, SIGUSR2 wrote a memory report")
+
+
+def test_idle_overhead():
+    """Test that idle hooks add negligible per-tick overhead"""
+    print("\nTesting idle overhead...")
+    hooks = ProfilingHooks()
+
+    async def raw():
+        return None
+
+    wrapped = hooks.profiled(raw)
+
+    async def measure(func, calls=50_000):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await func()
+        return (time.perf_counter() - start) / calls
+
+    async def run():
+        await measure(raw, 1000)
+        return min([await measure(raw) for _ in range(3)]), min([await measure(wrapped) for _ in range(3)])
+
+    raw_time, wrapped_time = asyncio.run(run())
+    overhead_us = (wrapped_time - raw_time) * 1e6
+    assert overhead_us < 5, f"{overhead_us:.2f} µs per call"
+    print(f"✅ Idle overhead {overhead_us:.2f} µs per tick")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Profiling Hooks - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Tick Profiling Test", test_profile_next_ticks),
+        ("Overlapping Tick Test", test_overlapping_ticks),
+        ("Memory Snapshot Test", test_memory_snapshots),
+        ("Signal Trigger Test", test_signals),
+        ("Idle Overhead Test", test_idle_overhead),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
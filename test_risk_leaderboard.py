@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck risk leaderboard
+
+Checks top-K answers against a full sort under random updates and
+removals, and the engine-derived risk ratios.
+"""
+
+import random
+import sys
+
+from risk_leaderboard import (RiskLeaderboard, SOURCE_ENGINE, SOURCE_TILT_SCORE,
+                              engine_risk, tilt_score_risk)
+from session_schema import DEFAULT_PLAYER_ID
+from tilt_engine import SessionFileTail, TiltEngine
+
+
+def test_matches_full_sort():
+    """Test top-K against sorting every player, with cached queries in between"""
+    print("Testing top-K against a full sort...")
+    rng = random.Random(7)
+    board = RiskLeaderboard()
+    expected = {}
+
+    for step in range(5000):
+        player_id = f"p{rng.randrange(300)}"
+        action = rng.random()
+        if action < 0.1:
+            board.remove(player_id)
+            expected.pop(player_id, None)
+        else:
+            # Integer scores make ties common
+            board.update(player_id, SOURCE_ENGINE, rng.randrange(50) / 10)
+            expected[player_id] = board.score(player_id)
+
+        if step % 7 == 0:
+            k = rng.choice([1, 5, 20, 500])
+            top = board.top(k)
+            reference = sorted(expected.values(), reverse=True)[:k]
+            assert [score for _, score in top] == reference, f"step {step}: {top[:5]} != {reference[:5]}"
+            assert all(expected[p] == s for p, s in top)
+            # Repeated query is served from the cache and must agree
+            assert board.top(k) == top
+
+    assert len(board) == len(expected)
+    print(f"✅ {len(board)} players ranked correctly after 5000 updates")
+
+
+def test_combines_sources():
+    """Test that a player's risk is the highest of its sources"""
+    print("\nTesting risk sources...")
+    board = RiskLeaderboard()
+    board.update("alice", SOURCE_ENGINE, 0.5)
+    board.update("alice", SOURCE_TILT_SCORE, tilt_score_risk(70))
+    board.update("bob", SOURCE_ENGINE, 0.9)
+    assert board.top(2) == [("alice", 1.0), ("bob", 0.9)]
+
+    board.update("alice", SOURCE_TILT_SCORE, tilt_score_risk(0))
+    assert board.top(2) == [("bob", 0.9), ("alice", 0.5)]
+    assert board.components("alice") == {SOURCE_ENGINE: 0.5, SOURCE_TILT_SCORE: 0.0}
+
+    # Idle players leave the board
+    board.update("carol", SOURCE_ENGINE, 2.0, now=0.0)
+    board.update("bob", SOURCE_ENGINE, 0.9, now=3000.0)
+    assert board.top(1) == [("carol", 2.0)]
+    assert board.evict_idle(3600.0, now=3600.0) == ["carol"]
+    assert "carol" not in board and board.top(1)[0][0] == "bob"
+    print("✅ Highest source wins, drops re-rank the player and idle players are evicted")
+
+
+def test_engine_risk():
+    """Test engine risk ratios on the sample sessions"""
+    print("\nTesting engine risk ratios...")
+    for filename, should_alert in [("session_data.csv", True), ("session_data_both_alerts.csv", True)]:
+        engine = TiltEngine()
+        engine.ingest(SessionFileTail(filename).read_new())
+        risk = engine_risk(engine, DEFAULT_PLAYER_ID)
+        fired = bool(engine.check_player(DEFAULT_PLAYER_ID))
+        assert (risk > 1.0) == fired == should_alert, (filename, risk, fired)
+        print(f"  ✅ {filename}: risk {risk:.2f}")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Risk Leaderboard - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Full Sort Comparison Test", test_matches_full_sort),
+        ("Risk Sources Test", test_combines_sources),
+        ("Engine Risk Test", test_engine_risk),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
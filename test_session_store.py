@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck shared session store
+
+Publishes session data from one process and reads it back from another
+through zero-copy NumPy views, and checks that throttled snapshots are
+loaded off the event loop.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+
+import pandas as pd
+
+from session_store import SessionStoreReader, SessionStoreWriter
+
+
+def _sample_frame():
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime([
+            '2024-01-15T10:00:30', '2024-01-15T10:00:00', '2024-01-15T10:01:00',
+            '2024-01-15T10:00:10', '2024-01-15T10:00:20',
+        ]),
+        'bet_amount': [10.0, 10.0, 20.0, 5.0, 5.0],
+        'outcome': ['loss', 'win', 'loss', 'push', 'loss'],
+        'balance': [990.0, 1000.0, 970.0, 500.0, 495.0],
+        'player_id': ['alice', 'alice', 'alice', 'bob', 'bob'],
+    })
+
+
+def _read_in_child(name, queue):
+    reader = SessionStoreReader(name)
+    window = reader.player_window('alice', since=pd.Timestamp('2024-01-15T10:00:30'))
+    queue.put((reader.generation, sorted(reader.players()), list(window['balance']),
+               window['balance'].base is not None))
+    del window
+    reader.close()
+
+
+def test_cross_process_read():
+    """Test that another process sees per-player windows"""
+    print("Testing cross-process reads...")
+    name = f"tiltcheck_test_{os.getpid()}"
+    writer = SessionStoreWriter(name)
+    try:
+        writer.publish(_sample_frame())
+        queue = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_read_in_child, args=(name, queue))
+        child.start()
+        generation, players, balances, is_view = queue.get(timeout=10)
+        child.join(10)
+
+        assert generation == 1
+        assert players == ['alice', 'bob']
+        assert balances == [990.0, 970.0], balances
+        assert is_view, "player window is not a view into shared memory"
+        print("✅ Reader process sees sorted per-player windows as views")
+    finally:
+        writer.close()
+
+
+def test_refresh_generation():
+    """Test that readers pick up newly published snapshots"""
+    print("\nTesting generation refresh...")
+    name = f"tiltcheck_test_refresh_{os.getpid()}"
+    writer = SessionStoreWriter(name)
+    try:
+        df = _sample_frame()
+        writer.publish(df)
+        reader = SessionStoreReader(name)
+        assert len(reader) == 5
+        assert not reader.refresh()
+
+        writer.publish(df[df['player_id'] == 'bob'])
+        assert reader.refresh()
+        assert reader.players() == ['bob']
+        frame = reader.to_dataframe('bob')
+        assert list(frame['outcome']) == ['push', 'loss']
+        reader.close()
+        print("✅ Reader refreshes to the latest generation")
+    finally:
+        writer.close()
+
+
+def test_throttled_publish():
+    """Test that maybe_publish loads off the event loop and honours the interval"""
+    print("\nTesting throttled publishing...")
+    name = f"tiltcheck_test_throttle_{os.getpid()}"
+    writer = SessionStoreWriter(name, interval=60.0)
+    loads = []
+
+    def load():
+        loads.append(threading.get_ident())
+        return _sample_frame()
+
+    async def run():
+        assert await writer.maybe_publish(load), "first snapshot is not throttled"
+        assert not await writer.maybe_publish(load), "published without changes"
+        writer.stale = True
+        assert not await writer.maybe_publish(load), "published within the interval"
+        writer.last_published -= 60.0
+        assert await writer.maybe_publish(load)
+        writer.stale = True
+        writer.last_published -= 60.0
+        assert not await writer.maybe_publish(lambda: None)
+        assert writer.stale, "a failed load is not retried"
+
+    try:
+        asyncio.run(run())
+        assert writer.generation == 2
+        assert len(loads) == 2 and threading.get_ident() not in loads, "loaded on the event loop"
+        print("✅ Snapshots load in a worker thread at most once per interval")
+    finally:
+        writer.close()
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Shared Session Store - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Cross-Process Read Test", test_cross_process_read),
+        ("Generation Refresh Test", test_refresh_generation),
+        ("Throttled Publish Test", test_throttled_publish),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
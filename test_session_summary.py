@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck session summary engine
+
+Compares the single-pass summaries against pandas reference computations
+for many sessions, and checks streaming from files, the CLI report and
+that bad rows are skipped and counted.
+"""
+
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+from session_summary import SUMMARY_COLUMNS, SessionSummaryEngine, main as summary_main
+
+
+def make_sessions(count=40, seed=9):
+    """DataFrame with bets for `count` players"""
+    rng = random.Random(seed)
+    rows = []
+    base = pd.Timestamp("2024-01-15 10:00:00")
+    for i in range(count):
+        balance = 1000.0
+        time = base + pd.Timedelta(seconds=rng.randrange(3600))
+        for _ in range(rng.randrange(1, 120)):
+            bet = float(rng.choice([5, 10, 25]))
+            outcome = rng.choice(["win", "loss", "loss", "push"])
+            balance += bet if outcome == "win" else (-bet if outcome == "loss" else 0.0)
+            time += pd.Timedelta(seconds=rng.randrange(1, 30))
+            rows.append({"player_id": f"p{i}", "timestamp": time, "bet_amount": bet,
+                         "outcome": outcome, "balance": balance})
+    return pd.DataFrame(rows)
+
+
+def longest_streak(outcomes, target):
+    best = run = 0
+    for outcome in outcomes:
+        run = run + 1 if outcome == target else 0
+        best = max(best, run)
+    return best
+
+
+def reference(group):
+    """Multi-scan summary of one session, as the demo used to compute it"""
+    duration = (group['timestamp'].max() - group['timestamp'].min()).total_seconds() / 60
+    drawdown = (group['balance'].cummax() - group['balance']).max()
+    return {
+        'bets': len(group),
+        'duration_minutes': duration,
+        'start_balance': group.iloc[0]['balance'],
+        'end_balance': group.iloc[-1]['balance'],
+        'total_bet': group['bet_amount'].sum(),
+        'wins': len(group[group['outcome'] == 'win']),
+        'losses': len(group[group['outcome'] == 'loss']),
+        'longest_win_streak': longest_streak(group['outcome'], 'win'),
+        'longest_loss_streak': longest_streak(group['outcome'], 'loss'),
+        'peak_drawdown': drawdown,
+    }
+
+
+def test_matches_reference():
+    """Test every summary field against pandas for many sessions"""
+    print("Testing summaries against pandas...")
+    df = make_sessions()
+    engine = SessionSummaryEngine()
+    engine.add_dataframe(df)
+    assert len(engine) == df['player_id'].nunique()
+
+    table = engine.table()
+    assert list(table) == SUMMARY_COLUMNS
+    assert all(len(values) == len(engine) for values in table.values())
+
+    for player_id, group in df.groupby('player_id'):
+        summary = engine.summary(player_id)
+        for field, expected in reference(group).items():
+            assert abs(summary[field] - expected) < 1e-9, (player_id, field, summary[field], expected)
+        if summary['duration_minutes'] > 0:
+            assert abs(summary['bets_per_minute'] - len(group) / summary['duration_minutes']) < 1e-9
+    print(f"✅ {len(engine)} sessions match the multi-scan results")
+
+
+def test_streaks_and_drawdown():
+    """Test streak breaks and drawdown on a hand-made session"""
+    print("\nTesting streaks and drawdown...")
+    engine = SessionSummaryEngine()
+    sequence = [("win", 110), ("win", 120), ("push", 120), ("win", 130),
+                ("loss", 100), ("loss", 80), ("loss", 60), ("win", 90)]
+    for i, (outcome, balance) in enumerate(sequence):
+        engine.add("s1", i * 60_000_000_000, 10.0, outcome, float(balance))
+    summary = engine.summary("s1")
+    assert summary['longest_win_streak'] == 2, "push must break a streak"
+    assert summary['longest_loss_streak'] == 3
+    assert summary['peak_drawdown'] == 70.0
+    assert abs(summary['peak_drawdown_pct'] - 70 / 130 * 100) < 1e-9
+    assert summary['bets_per_minute'] == 8 / 7
+
+    engine.add("single", 5, 1.0, "loss", 9.0)
+    single = engine.summary("single")
+    assert single['duration_minutes'] == 0.0 and single['bets_per_minute'] == 0.0
+    print("✅ Streaks, drawdown and single-bet sessions handled")
+
+
+def test_streaming_files():
+    """Test streaming CSV files and the CLI report"""
+    print("\nTesting file streaming and CLI...")
+    df = make_sessions(count=6)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for player_id, group in df.groupby('player_id'):
+            path = os.path.join(tmp, f"{player_id}.csv")
+            group.drop(columns=['player_id']).to_csv(path, index=False)
+            paths.append(path)
+        output = os.path.join(tmp, "report.csv")
+        assert summary_main(paths + ["--output", output]) == 0
+
+        with open(output, newline='') as f:
+            report = list(csv.DictReader(f))
+        assert [row['session_id'] for row in report] == sorted(df['player_id'].unique())
+
+        frame_engine = SessionSummaryEngine()
+        frame_engine.add_dataframe(df)
+        for row in report:
+            expected = frame_engine.summary(row['session_id'])
+            assert int(row['bets']) == expected['bets']
+            assert int(row['first_timestamp']) == expected['first_timestamp']
+            assert float(row['total_bet']) == expected['total_bet']
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            summary_main(paths[:1])
+        assert stdout.getvalue().startswith(",".join(SUMMARY_COLUMNS))
+    print(f"✅ {len(report)} files streamed into one report")
+
+
+def test_bad_rows():
+    """Test that non-finite and out-of-range rows are skipped and counted"""
+    print("\nTesting bad rows...")
+    header = ['timestamp', 'bet_amount', 'outcome', 'balance']
+    rows = [
+        ['2024-01-15T10:00:00', '10', 'loss', '1000'],
+        ['2024-01-15T10:00:05', 'nan', 'loss', '990'],
+        ['2024-01-15T10:00:10', '10', 'loss', 'inf'],
+        ['inf', '10', 'loss', '980'],
+        ['1e30', '10', 'loss', '980'],
+        ['9999-01-01T00:00:00', '10', 'loss', '980'],
+        ['2024-01-15T10:00:15', '10', 'win'],
+        ['2024-01-15T10:00:20', '10', 'win', '990'],
+    ]
+    engine = SessionSummaryEngine()
+    engine.add_rows((dict(zip(header, row)) for row in rows), "s1")
+    assert engine.bad_rows == 6, engine.bad_rows
+    summary = engine.summary("s1")
+    assert summary['bets'] == 2 and summary['total_bet'] == 20.0, summary
+    assert summary['end_balance'] == 990.0
+    print(f"✅ {engine.bad_rows} bad rows skipped and counted")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Session Summary - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Reference Comparison Test", test_matches_reference),
+        ("Streaks and Drawdown Test", test_streaks_and_drawdown),
+        ("Streaming Files Test", test_streaming_files),
+        ("Bad Rows Test", test_bad_rows),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
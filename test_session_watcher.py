@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck session file watcher
+
+Checks that appends trigger a debounced evaluation and that an unchanged
+file is never re-evaluated, for both the inotify and the polling mode.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+from session_watcher import SessionFileWatcher, file_fingerprint
+
+
+async def _watch_appends(mode):
+    """Append a burst of rows and count how many evaluations it causes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance\n")
+
+        watcher = SessionFileWatcher(path, debounce=0.05, poll_interval=0.02, mode=mode)
+        calls = []
+
+        async def on_change():
+            if watcher.claim_change() is not None:
+                calls.append(file_fingerprint(path))
+
+        task = asyncio.ensure_future(watcher.run(on_change))
+        await asyncio.sleep(0.2)
+        assert len(calls) == 1, f"expected initial evaluation, got {len(calls)}"
+
+        # A burst of appends is debounced into a single evaluation
+        for i in range(10):
+            with open(path, "a") as f:
+                f.write(f"2024-01-15T10:00:{i:02d},10,loss,{1000 - i * 10}\n")
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.3)
+        assert len(calls) == 2, f"expected one debounced evaluation, got {len(calls) - 1}"
+
+        # Unchanged file: nothing new is claimed
+        watcher.notify()
+        await asyncio.sleep(0.2)
+        assert len(calls) == 2, "unchanged file was re-evaluated"
+        assert watcher.claim_change() is None
+
+        watcher.stop()
+        await asyncio.wait_for(task, 1.0)
+
+
+def test_inotify_watch():
+    """Test change detection through inotify (auto mode)"""
+    print("Testing inotify/auto watch mode...")
+    asyncio.run(_watch_appends("auto"))
+    print("✅ Appends trigger a single debounced evaluation")
+
+
+def test_poll_watch():
+    """Test change detection through the polling fallback"""
+    print("\nTesting polling watch mode...")
+    asyncio.run(_watch_appends("poll"))
+    print("✅ Polling fallback detects appends and skips unchanged files")
+
+
+def test_missing_file():
+    """Test that a missing file is never claimed"""
+    print("\nTesting missing session file...")
+    watcher = SessionFileWatcher("/nonexistent/session_data.csv", mode="poll")
+    assert file_fingerprint(watcher.filepath) is None
+    assert watcher.claim_change() is None
+    print("✅ Missing file is skipped")
+
+
+def test_handler_failure():
+    """Test that a failing change handler does not stop the watcher"""
+    print("\nTesting handler failure...")
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session_data.csv")
+            with open(path, "w") as f:
+                f.write("timestamp,bet_amount,outcome,balance\n")
+
+            watcher = SessionFileWatcher(path, debounce=0.02, poll_interval=0.02, mode="poll")
+            calls = []
+
+            async def on_change():
+                calls.append(watcher.claim_change())
+                if len(calls) == 1:
+                    raise RuntimeError("check failed")
+
+            task = asyncio.ensure_future(watcher.run(on_change))
+            await asyncio.sleep(0.2)
+            with open(path, "a") as f:
+                f.write("2024-01-15T10:00:00,10,loss,1000\n")
+            await asyncio.sleep(0.3)
+            assert not task.done(), "watcher stopped after a handler error"
+            assert len(calls) == 2, calls
+
+            watcher.stop()
+            await asyncio.wait_for(task, 1.0)
+
+    asyncio.run(run())
+    print("✅ Watcher keeps running after a handler error")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Session Watcher - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Inotify Watch Test", test_inotify_watch),
+        ("Poll Watch Test", test_poll_watch),
+        ("Missing File Test", test_missing_file),
+        ("Handler Failure Test", test_handler_failure),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the TiltCheck incremental detection engine and checkpoints
+
+Compares the engine with the DataFrame tilt rules on the sample session
+files, checks that a restored checkpoint replays only new rows
+without repeating alerts, and that tailed timestamps match pandas at
+nanosecond precision.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+
+import demo_agent
+from checkpoint import DetectorCheckpoint
+from session_schema import DEFAULT_PLAYER_ID
+from tilt_engine import (NS_PER_MINUTE, RULE_BALANCE_DROP, RULE_RAPID_SPINNING, BetEvent, SessionFileTail,
+                         TiltEngine)
+
+SAMPLE_FILES = ["session_data.csv", "session_data_both_alerts.csv", "session_data_tilt_example.csv"]
+
+
+def test_matches_reference_rules():
+    """Test the engine against check_rapid_spinning/check_balance_drop"""
+    print("Testing engine against the DataFrame rules...")
+    for filename in SAMPLE_FILES:
+        df = demo_agent.load_csv_data(filename)
+        expected = set()
+        if demo_agent.check_rapid_spinning(df):
+            expected.add(RULE_RAPID_SPINNING)
+        if demo_agent.check_balance_drop(df):
+            expected.add(RULE_BALANCE_DROP)
+
+        # Feed the file in small increments, as appends would arrive
+        engine = TiltEngine()
+        tail = SessionFileTail(filename)
+        engine.ingest(tail.read_new())
+        fired = {hit.rule for hit in engine.check_player(DEFAULT_PLAYER_ID)}
+        assert fired == expected, f"{filename}: engine {fired} != reference {expected}"
+        print(f"  ✅ {filename}: {sorted(fired) or 'no alerts'}")
+
+
+def test_tail_reads_only_appends():
+    """Test that only complete appended rows are read"""
+    print("\nTesting incremental file tail...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance,player_id\n")
+            f.write("2024-01-15T10:00:00,10,loss,1000,alice\n")
+        tail = SessionFileTail(path)
+        assert len(tail.read_new()) == 1
+        assert tail.read_new() == []
+
+        with open(path, "a") as f:
+            f.write("2024-01-15T10:00:05,10,win,1010,bob\n2024-01-15T10:00:06,10,lo")
+        events = tail.read_new()
+        assert [e.player_id for e in events] == ["bob"], events
+
+        with open(path, "a") as f:
+            f.write("ss,1000,bob\n")
+        assert [e.outcome for e in tail.read_new()] == ["loss"]
+    print("✅ Partial lines are held back until complete")
+
+
+def test_checkpoint_restart():
+    """Test resuming from a checkpoint without duplicate alerts"""
+    print("\nTesting checkpoint restore...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        shutil.copy("session_data_both_alerts.csv", path)
+        checkpoint = DetectorCheckpoint(os.path.join(tmp, "checkpoint.json"))
+
+        engine, tail = TiltEngine(), SessionFileTail(path)
+        changed = engine.ingest(tail.read_new())
+        assert len(engine.evaluate(changed, now=1000.0)) == 2
+        checkpoint.save({"engine": engine.snapshot(), "tail": tail.state()})
+
+        with open(path, "a") as f:
+            f.write("2024-01-15T10:05:00,10,loss,400\n")
+
+        # "Restart": fresh objects restored from the checkpoint
+        state = checkpoint.load()
+        engine, tail = TiltEngine(), SessionFileTail(path)
+        engine.restore(state["engine"])
+        tail.restore(state["tail"])
+
+        events = tail.read_new()
+        assert len(events) == 1, "replayed more than the rows after the checkpoint"
+        changed = engine.ingest(events)
+        assert engine.check_player(DEFAULT_PLAYER_ID), "restored windows lost"
+        assert engine.evaluate(changed, now=1060.0) == [], "alerts repeated within cooldown"
+        assert len(engine.evaluate(changed, now=2000.0)) == 2
+    print("✅ Restart replays only new rows and keeps alert cooldowns")
+
+
+def test_amount_precision():
+    """Test that balance drops compare the amounts exactly as parsed"""
+    print("\nTesting balance-drop precision...")
+    cases = [
+        ("100.00004", "70.00003"),  # 29.99999...%: just under the threshold
+        ("0.00015", "0.0001"),  # sub-cent balances, 33.3% drop
+        ("1000", "700"),  # exactly 30%
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        for start, end in cases:
+            with open(path, "w") as f:
+                f.write("timestamp,bet_amount,outcome,balance\n")
+                f.write(f"2024-01-15T10:00:00,0.00001,loss,{start}\n")
+                f.write(f"2024-01-15T10:01:00,0.00001,loss,{end}\n")
+            expected = demo_agent.check_balance_drop(demo_agent.load_csv_data(path)) is not None
+            engine = TiltEngine()
+            engine.ingest(SessionFileTail(path).read_new())
+            fired = any(hit.rule == RULE_BALANCE_DROP for hit in engine.check_player(DEFAULT_PLAYER_ID))
+            assert fired == expected, f"{start} -> {end}: engine {fired} != reference {expected}"
+            print(f"  ✅ {start} -> {end}: {'alert' if fired else 'no alert'}")
+
+
+def test_non_finite_rows():
+    """Test that NaN and infinite amounts are skipped as bad rows"""
+    print("\nTesting non-finite amounts...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance\n")
+            f.write("2024-01-15T10:00:00,10,loss,1000\n")
+            f.write("2024-01-15T10:00:05,nan,loss,990\n")
+            f.write("2024-01-15T10:00:10,10,loss,inf\n")
+            f.write("2024-01-15T10:00:15,10,loss,-Infinity\n")
+            f.write("2024-01-15T10:00:20,10,win,1000\n")
+        tail = SessionFileTail(path)
+        events = tail.read_new()
+        assert [e.balance for e in events] == [1000.0, 1000.0], events
+        assert tail.bad_rows == 3, tail.bad_rows
+
+        engine = TiltEngine()
+        changed = engine.ingest(events)
+        assert engine.evaluate(changed, now=0.0) == []
+    print("✅ Non-finite rows are counted in bad_rows and never reach the engine")
+
+
+def test_timestamp_precision():
+    """Test that tailed timestamps match pandas and bad timestamps are skipped"""
+    print("\nTesting timestamp precision and range...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_data.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance\n")
+            f.write("2024-01-15T10:00:59.999999999,10,loss,1000\n")
+            f.write("2024-01-15T10:00:59.999999,10,loss,990\n")
+            f.write("2024-01-15T10:01:00+02:00,10,loss,980\n")
+            f.write("inf,10,loss,970\n")
+            f.write("1e30,10,loss,960\n")
+            f.write("9999-01-01T00:00:00,10,loss,950\n")
+        events = SessionFileTail(path).read_new()
+        expected = [pd.Timestamp(value).value for value in
+                    ("2024-01-15T10:00:59.999999999", "2024-01-15T10:00:59.999999", "2024-01-15T08:01:00")]
+        assert [e.timestamp for e in events] == expected, events
+
+        tail = SessionFileTail(path)
+        tail.read_new()
+        assert tail.bad_rows == 3, tail.bad_rows
+
+        # Numeric timestamps use the unit pandas reads them in
+        path = os.path.join(tmp, "numeric.csv")
+        with open(path, "w") as f:
+            f.write("timestamp,bet_amount,outcome,balance\n")
+            f.write("1705312800000000000,10,loss,1000\n")
+        events = SessionFileTail(path).read_new()
+        assert [e.timestamp for e in events] == pd.to_datetime(pd.read_csv(path)['timestamp']).astype('int64').tolist()
+    print("✅ Nanosecond ISO and numeric timestamps match pandas; out-of-range rows are bad rows")
+
+
+def test_async_checkpoint_and_idle_eviction():
+    """Test off-loop checkpoint writes and idle player eviction"""
+    print("\nTesting async checkpoint and idle eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = DetectorCheckpoint(os.path.join(tmp, "checkpoint.json"), interval=30.0)
+
+        async def run():
+            assert await checkpoint.maybe_save(lambda: {"n": 1})
+            assert not await checkpoint.maybe_save(lambda: {"n": 2}), "saved within the interval"
+
+        asyncio.run(run())
+        assert checkpoint.load() == {"n": 1}
+
+        # A write serialized earlier never replaces a newer checkpoint
+        stale = checkpoint.serialize({"n": 2})
+        checkpoint.save({"n": 3})
+        checkpoint.write(stale, 1)
+        assert checkpoint.load() == {"n": 3}
+
+    engine = TiltEngine()
+    bets = [BetEvent(player, i * NS_PER_MINUTE, 10.0, "loss", 1000.0 - 200 * i)
+            for player in ("active", "idle", "cooling") for i in range(3)]
+    engine.ingest(bets, now=0.0)
+    assert [hit.player_id for hit in engine.evaluate(["cooling"], now=3600.0)] == ["cooling"]
+    engine.ingest([BetEvent("active", 4 * NS_PER_MINUTE, 10.0, "loss", 300.0)], now=3500.0)
+
+    assert engine.evict_idle(3600.0, now=3700.0) == ["idle"]
+    assert set(engine.players) == {"active", "cooling"}
+    assert engine.evict_idle(3600.0, now=3600.0 + 300.0) == ["cooling"], "cooldown expired"
+    assert engine.evict_idle(3600.0, now=10_000.0) == ["active"]
+    assert engine.players == {} and engine.cooldowns == {}
+    print("✅ Checkpoints write off the loop in order; idle players are dropped after their cooldown")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Detection Engine - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("Reference Rules Test", test_matches_reference_rules),
+        ("File Tail Test", test_tail_reads_only_appends),
+        ("Checkpoint Restart Test", test_checkpoint_restart),
+        ("Amount Precision Test", test_amount_precision),
+        ("Non-Finite Rows Test", test_non_finite_rows),
+        ("Timestamp Precision Test", test_timestamp_precision),
+        ("Async Checkpoint and Idle Eviction Test", test_async_checkpoint_and_idle_eviction),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+Test script for the registration code validation engine
+
+Checks the single-pass file scan, manifest-driven runs over glob patterns
+in parallel, failing empty globs, exact requirement names, and that the
+default manifest passes on this repository.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from validate_registration_code import DEFAULT_MANIFEST, FileScan, main, run_validation
+
+AGENT_SOURCE = '''
+import os
+from uagents_core.utils.registration import register_chat_agent
+
+async def main():
+    register_chat_agent("TiltCheck", "https://tiltcheck.it.com/agent", active=True)
+    return os.environ["AGENTVERSE_KEY"]
+'''
+
+
+def write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_file_scan():
+    """Test that one pass collects imports, functions, calls and strings"""
+    print("Testing file scan...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "agent.py")
+        write(path, AGENT_SOURCE)
+        scan = FileScan(path)
+        assert scan.error is None
+        assert scan.has_import("uagents_core") and scan.has_import("os") and not scan.has_import("uagents")
+        assert scan.functions == {"main"}
+        assert scan.has_call("register_chat_agent", ["TiltCheck", "https://tiltcheck.it.com/agent"])
+        assert not scan.has_call("register_chat_agent", ["Other"])
+        assert "AGENTVERSE_KEY" in scan.strings
+
+        write(path, "def broken(:\n")
+        assert FileScan(path).error.startswith("Syntax error")
+    print("✅ Imports, functions, call arguments and strings collected in one pass")
+
+
+def test_manifest_over_variants():
+    """Test a manifest with a glob pattern, run in parallel and inline"""
+    print("\nTesting manifest over agent variants...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(4):
+            write(os.path.join(tmp, f"agent_{i}.py"), AGENT_SOURCE)
+        write(os.path.join(tmp, "agent_bad.py"), AGENT_SOURCE.replace('"TiltCheck"', '"Wrong"'))
+        manifest = {"python": {os.path.join(tmp, "agent_*.py"): {
+            "imports": ["os", "uagents_core"],
+            "functions": ["main"],
+            "calls": {"register_chat_agent": ["TiltCheck"]},
+            "strings": ["AGENTVERSE_KEY"],
+        }}}
+
+        parallel = run_validation(manifest, jobs=2)
+        inline = run_validation(manifest, jobs=1)
+        assert parallel == inline
+        assert len(parallel) == 5 * 5
+        failed = [result for result in parallel if not result.passed]
+        assert len(failed) == 1 and failed[0].name == "register_chat_agent call"
+        assert any("agent_bad.py" in line for line in failed[0].lines)
+
+        manifest_path = os.path.join(tmp, "checks.json")
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        assert main(["--manifest", manifest_path, "--jobs", "2"]) == 1
+    print(f"✅ {len(parallel)} checks over 5 variants; the one bad call is reported")
+
+
+def test_default_manifest():
+    """Test that the built-in checks pass on this repository"""
+    print("\nTesting default manifest...")
+    results = run_validation(DEFAULT_MANIFEST, jobs=1)
+    assert all(result.passed for result in results), [r.name for r in results if not r.passed]
+    assert main(["--jobs", "1"]) == 0
+    print(f"✅ {len(results)} default checks pass")
+
+
+def test_unmatched_patterns_and_requirements():
+    """Test that empty globs fail and requirements match exact package names"""
+    print("\nTesting unmatched patterns and requirement names...")
+    with tempfile.TemporaryDirectory() as tmp:
+        requirements = os.path.join(tmp, "requirements.txt")
+        write(requirements, "# agents\nuagents_core>=0.1.0  # registration\nPandas[performance]>=2.0; python_version>'3.8'\n"
+                            "-r extra.txt\n")
+        manifest = {
+            "python": {os.path.join(tmp, "agents", "*.py"): {"imports": ["os"]}},
+            "requirements": {requirements: ["uagents", "uagents-core", "pandas", "numpy"]},
+        }
+        results = run_validation(manifest, jobs=1)
+        assert [r.passed for r in results] == [False, False]
+        assert any("No files match" in line for line in results[0].lines)
+        missing = [line for line in results[1].lines if "Missing" in line]
+        assert len(missing) == 2 and "Missing uagents in" in missing[0] and "Missing numpy" in missing[1], missing
+    print("✅ Empty globs fail; uagents_core does not satisfy uagents")
+
+
+def main_tests():
+    """Run all tests"""
+    print("=" * 70)
+    print(" TiltCheck Registration Validation - Test Suite ")
+    print("=" * 70)
+
+    tests = [
+        ("File Scan Test", test_file_scan),
+        ("Manifest Variants Test", test_manifest_over_variants),
+        ("Unmatched Pattern and Requirement Name Test", test_unmatched_patterns_and_requirements),
+        ("Default Manifest Test", test_default_manifest),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            results.append((test_name, True))
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 70)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"Results: {passed}/{len(results)} tests passed")
+    print("=" * 70)
+
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_tests())
@@ -0,0 +1,66 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Alert Builders
+
+Builds the TiltAlert and ChatMessage payloads for fired tilt rules. Shared
+by the single agent (agent.py) and the multi-tenant runner so every tenant
+sends exactly the same alert format. The alert contents come from
+alert_records.AlertRecord.
+"""
+
+from typing import Optional, Union
+
+from agent_models import ChatMessage, TiltAlert
+from alert_records import AlertRecord, balance_drop_record, rapid_spin_record, record_from_hit
+from tilt_engine import RuleHit
+
+
+def build_rapid_spin_alert(spin_count: int, window_minutes: int, threshold_spins: int,
+                           player_id: Optional[str] = None) -> TiltAlert:
+    """Build the rapid spinning TiltAlert."""
+    return rapid_spin_record(spin_count, window_minutes, threshold_spins, player_id).to_tilt_alert()
+
+
+def build_balance_drop_alert(start_balance: float, end_balance: float, window_minutes: int,
+                             drop_threshold: float, player_id: Optional[str] = None) -> TiltAlert:
+    """Build the balance drop TiltAlert."""
+    return balance_drop_record(start_balance, end_balance, window_minutes, drop_threshold,
+                               player_id).to_tilt_alert()
+
+
+def alert_from_hit(hit: RuleHit) -> TiltAlert:
+    """
+    Convert a TiltEngine rule hit into the same TiltAlert the DataFrame
+    checks produce, tagged with the player.
+
+    The running agents use alert_records.record_from_hit instead and only
+    build the TiltAlert when it is delivered.
+    """
+    return record_from_hit(hit).to_tilt_alert()
+
+
+def create_chat_message(alert: Union[TiltAlert, AlertRecord]) -> ChatMessage:
+    """
+    Wrap a TiltAlert into a ChatMessage for the ASI Chat Protocol.
+
+    Args:
+        alert: TiltAlert or AlertRecord
+
+    Returns:
+        ChatMessage ready to be sent
+    """
+    return ChatMessage(
+        message=alert.alert_message,
+        timestamp=alert.timestamp,
+        alert_type=alert.risk_level
+    )
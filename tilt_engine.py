@@ -0,0 +1,406 @@
+"""
+Copyright (c) 2024-2025 JME (jmenichole)
+All Rights Reserved
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying of this file, via any medium, is strictly prohibited.
+
+This file is part of TiltCheck/TrapHouse Discord Bot ecosystem.
+For licensing information, see LICENSE file in the root directory.
+
+---
+
+TiltCheck Incremental Detection Engine
+
+Streaming version of the agent's tilt rules. Instead of re-reading the
+whole session file and re-running check_rapid_spinning/check_balance_drop
+on a DataFrame, the engine:
+- tails the session file from a byte offset (SessionFileTail),
+- keeps a per-player window holding only the events the rules can still
+  see (the longest rule window behind the player's latest bet),
+- re-evaluates only players that received new events, and
+- suppresses repeat alerts per player and rule for a cooldown period.
+
+The rule semantics match the DataFrame versions in agent.py: windows are
+anchored at the player's latest timestamp, the balance drop compares the
+first and last bet inside the window, and ties keep arrival order.
+
+All state can be exported with snapshot() and re-created with restore(),
+which is what checkpoint.py persists across restarts.
+"""
+
+import csv
+import io
+import logging
+import math
+import os
+import time
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from compact_events import EventColumns
+from session_schema import (DEFAULT_PLAYER_ID, EVENT_ID_COLUMN, GAME_COLUMN, PLAYER_COLUMN,
+                            REQUIRED_COLUMNS, CSV_TIMESTAMP_UNIT, parse_timestamp)
+
+logger = logging.getLogger(__name__)
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+
+RULE_RAPID_SPINNING = "rapid_spinning"
+RULE_BALANCE_DROP = "balance_drop"
+
+
+class BetEvent(NamedTuple):
+    """A single bet from the session data."""
+    player_id: str
+    timestamp: int  # nanoseconds since the epoch
+    bet_amount: float
+    outcome: str
+    balance: float
+    game: str = ""  # empty when the session file has no game column
+    event_id: str = ""  # empty when the session file has no event_id column
+
+
+class TiltRules(NamedTuple):
+    """Thresholds for the tilt rules (defaults match agent.py)."""
+    spin_window_minutes: int = 5
+    threshold_spins: int = 50
+    drop_window_minutes: int = 10
+    drop_threshold: float = 0.30
+    cooldown_seconds: float = 300.0
+
+
+class RuleHit(NamedTuple):
+    """A tilt rule that fired for a player."""
+    rule: str
+    player_id: str
+    metrics: Dict
+
+
+class PlayerWindow:
+    """Timestamp-sorted recent events for one player, stored as compact columns."""
+
+    __slots__ = ("columns", "total", "touched")
+
+    def __init__(self):
+        self.columns = EventColumns()
+        # Events ever seen, including evicted ones (rules need at least 2)
+        self.total = 0
+        # Wall-clock time the player last received events
+        self.touched = time.time()
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @property
+    def timestamps(self):
+        return self.columns.timestamps
+
+    def add(self, event: BetEvent):
+        timestamps = self.columns.timestamps
+        if not timestamps or event.timestamp >= timestamps[-1]:
+            index = len(timestamps)
+        else:
+            # bisect_right keeps arrival order among equal timestamps
+            index = bisect_right(timestamps, event.timestamp)
+        self.columns.insert(index, event.timestamp, event.bet_amount, event.outcome, event.balance)
+        self.total += 1
+
+    @property
+    def latest(self) -> int:
+        return self.columns.timestamps[-1]
+
+    def since(self, window_ns: int) -> int:
+        """Index of the first event inside the window ending at the latest event."""
+        return bisect_left(self.columns.timestamps, self.latest - window_ns)
+
+    def evict(self, keep_ns: int):
+        """Drop events that no rule window can reach any more."""
+        self.columns.delete_prefix(self.since(keep_ns))
+
+
+class TiltEngine:
+    """Per-player incremental evaluation of the tilt rules."""
+
+    def __init__(self, rules: Optional[TiltRules] = None,
+                 rules_for: Optional[Callable[[str], TiltRules]] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            rules: Rule thresholds (defaults to the agent.py thresholds)
+            rules_for: Optional player_id -> rules lookup, for engines shared
+                by tenants with different thresholds (falls back to `rules`)
+        """
+        self.rules = rules or TiltRules()
+        self._rules_for = rules_for
+        self.players: Dict[str, PlayerWindow] = {}
+        # player_id -> rule -> wall-clock time of the last alert
+        self.cooldowns: Dict[str, Dict[str, float]] = {}
+
+    def rules_for(self, player_id: str) -> TiltRules:
+        """Rule thresholds that apply to a player."""
+        if self._rules_for is None:
+            return self.rules
+        return self._rules_for(player_id) or self.rules
+
+    def ingest(self, events: Iterable[BetEvent], now: Optional[float] = None) -> Set[str]:
+        """
+        Add events to the per-player windows.
+
+        Args:
+            events: New bets
+            now: Wall-clock time for idle tracking (defaults to time.time())
+
+        Returns:
+            Player IDs that received new events
+        """
+        now = time.time() if now is None else now
+        changed = set()
+        for event in events:
+            window = self.players.get(event.player_id)
+            if window is None:
+                window = self.players[event.player_id] = PlayerWindow()
+            window.add(event)
+            changed.add(event.player_id)
+
+        for player_id in changed:
+            rules = self.rules_for(player_id)
+            keep_ns = max(rules.spin_window_minutes, rules.drop_window_minutes) * NS_PER_MINUTE
+            window = self.players[player_id]
+            window.evict(keep_ns)
+            window.touched = now
+        return changed
+
+    def evict_idle(self, idle_seconds: float, now: Optional[float] = None) -> List[str]:
+        """
+        Forget players that received no events for `idle_seconds`.
+
+        Without this every player ever seen keeps a window. Players with an
+        alert still in cooldown are kept so a returning player is not
+        alerted again early. A player that comes back starts a new window.
+
+        Returns:
+            The evicted player IDs
+        """
+        now = time.time() if now is None else now
+        idle = []
+        for player_id, window in self.players.items():
+            if len(window) and now - window.touched < idle_seconds:
+                continue
+            cooldown = self.rules_for(player_id).cooldown_seconds
+            if any(now - last < cooldown for last in self.cooldowns.get(player_id, {}).values()):
+                continue
+            idle.append(player_id)
+        self.drop_players(idle)
+        if idle:
+            logger.debug("Evicted %d idle players (%d left)", len(idle), len(self.players))
+        return idle
+
+    def spin_count(self, player_id: str) -> int:
+        """Spins in the rapid-spinning window ending at the player's latest bet."""
+        window = self.players.get(player_id)
+        if window is None or not len(window):
+            return 0
+        window_minutes = self.rules_for(player_id).spin_window_minutes
+        return len(window) - window.since(window_minutes * NS_PER_MINUTE)
+
+    def balance_drop(self, player_id: str) -> Optional[Dict]:
+        """First/last balance in the balance-drop window, or None if not computable."""
+        window = self.players.get(player_id)
+        if window is None:
+            return None
+        start = window.since(self.rules_for(player_id).drop_window_minutes * NS_PER_MINUTE)
+        if len(window) - start < 2:
+            return None
+        start_balance = window.columns.balance(start)
+        end_balance = window.columns.balance(len(window) - 1)
+        if start_balance <= 0:
+            return None
+        change = start_balance - end_balance
+        return {
+            "start_balance": start_balance,
+            "end_balance": end_balance,
+            "balance_lost": change,
+            "drop_percentage": change / start_balance,
+        }
+
+    def check_player(self, player_id: str) -> List[RuleHit]:
+        """Evaluate the rules for one player, ignoring cooldowns."""
+        window = self.players.get(player_id)
+        if window is None or window.total < 2:
+            return []
+
+        hits = []
+        rules = self.rules_for(player_id)
+        spin_count = self.spin_count(player_id)
+        if spin_count > rules.threshold_spins:
+            hits.append(RuleHit(RULE_RAPID_SPINNING, player_id, {
+                "spin_count": spin_count,
+                "time_window_minutes": rules.spin_window_minutes,
+                "threshold": rules.threshold_spins,
+            }))
+
+        drop = self.balance_drop(player_id)
+        if drop is not None and drop["drop_percentage"] >= rules.drop_threshold:
+            drop.update({
+                "time_window_minutes": rules.drop_window_minutes,
+                "threshold": rules.drop_threshold,
+            })
+            hits.append(RuleHit(RULE_BALANCE_DROP, player_id, drop))
+        return hits
+
+    def evaluate(self, player_ids: Iterable[str], now: Optional[float] = None) -> List[RuleHit]:
+        """
+        Evaluate players and return hits that are not in cooldown.
+
+        Args:
+            player_ids: Players to evaluate (usually the result of ingest())
+            now: Wall-clock time for cooldowns (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        fired = []
+        for player_id in player_ids:
+            hits = self.check_player(player_id)
+            if not hits:
+                continue
+            cooldown = self.rules_for(player_id).cooldown_seconds
+            for hit in hits:
+                player_cooldowns = self.cooldowns.setdefault(player_id, {})
+                last = player_cooldowns.get(hit.rule)
+                if last is not None and now - last < cooldown:
+                    continue
+                player_cooldowns[hit.rule] = now
+                fired.append(hit)
+        return fired
+
+    def snapshot(self) -> Dict:
+        """Export windows and cooldowns as JSON-serializable data."""
+        return self.export_players(self.players)
+
+    def restore(self, state: Dict):
+        """Replace the engine state with a snapshot() export."""
+        self.players = {}
+        self.cooldowns = {}
+        self.import_players(state)
+
+    def export_players(self, player_ids: Iterable[str]) -> Dict:
+        """Export the windows and cooldowns of some players (snapshot() format)."""
+        players, cooldowns = {}, {}
+        for player_id in player_ids:
+            window = self.players.get(player_id)
+            if window is not None:
+                players[player_id] = {
+                    "total": window.total,
+                    "events": list(window.columns.rows()),
+                }
+            if player_id in self.cooldowns:
+                cooldowns[player_id] = dict(self.cooldowns[player_id])
+        return {"players": players, "cooldowns": cooldowns}
+
+    def import_players(self, state: Dict):
+        """Add or replace the players in an export_players() or snapshot() export."""
+        for player_id, data in state.get("players", {}).items():
+            window = PlayerWindow()
+            for timestamp, bet_amount, outcome, balance in data["events"]:
+                window.add(BetEvent(player_id, timestamp, bet_amount, outcome, balance))
+            window.total = data["total"]
+            self.players[player_id] = window
+        for player_id, player_cooldowns in state.get("cooldowns", {}).items():
+            self.cooldowns[player_id] = dict(player_cooldowns)
+
+    def drop_players(self, player_ids: Iterable[str]):
+        """Forget players (e.g. after handing them to another node)."""
+        for player_id in player_ids:
+            self.players.pop(player_id, None)
+            self.cooldowns.pop(player_id, None)
+
+
+class SessionFileTail:
+    """Reads only the rows appended to a session CSV since the last read."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.header: Optional[List[str]] = None
+        self.bad_rows = 0
+
+    def read_new(self) -> List[BetEvent]:
+        """
+        Parse complete rows appended since the previous call.
+
+        A truncated or replaced file is re-read from the start. A trailing
+        partial line is left for the next call.
+        """
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return []
+
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            if self.inode is not None:
+                logger.info("%s was replaced or truncated, reading from the start", self.filepath)
+            self.inode = st.st_ino
+            self.offset = 0
+            self.header = None
+
+        if st.st_size == self.offset:
+            return []
+
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return []
+        self.offset += end
+
+        reader = csv.reader(io.StringIO(data[:end].decode('utf-8')))
+        if self.header is None:
+            self.header = [column.strip() for column in next(reader, [])]
+            missing = [c for c in REQUIRED_COLUMNS if c not in self.header]
+            if missing:
+                logger.error("Missing required columns. Need: %s", REQUIRED_COLUMNS)
+                self.header = None
+                return []
+
+        return self._parse_rows(reader)
+
+    def _parse_rows(self, rows) -> List[BetEvent]:
+        index = {column: i for i, column in enumerate(self.header)}
+        player_index = index.get(PLAYER_COLUMN)
+        game_index = index.get(GAME_COLUMN)
+        event_id_index = index.get(EVENT_ID_COLUMN)
+        events = []
+        for row in rows:
+            if not row:
+                continue
+            try:
+                bet_amount = float(row[index['bet_amount']])
+                balance = float(row[index['balance']])
+                if not (math.isfinite(bet_amount) and math.isfinite(balance)):
+                    raise ValueError("non-finite amount")
+                events.append(BetEvent(
+                    row[player_index] if player_index is not None else DEFAULT_PLAYER_ID,
+                    parse_timestamp(row[index['timestamp']], CSV_TIMESTAMP_UNIT),
+                    bet_amount,
+                    row[index['outcome']],
+                    balance,
+                    row[game_index] if game_index is not None else "",
+                    row[event_id_index] if event_id_index is not None else "",
+                ))
+            except (IndexError, ValueError, OverflowError) as e:
+                self.bad_rows += 1
+                logger.warning("Skipping malformed row in %s: %s (%s)", self.filepath, row, e)
+        return events
+
+    def state(self) -> Dict:
+        """Position to resume from after a restart."""
+        return {"offset": self.offset, "inode": self.inode, "header": self.header}
+
+    def restore(self, state: Dict):
+        self.offset = state.get("offset", 0)
+        self.inode = state.get("inode")
+        self.header = state.get("header")
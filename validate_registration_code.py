@@ -15,249 +15,349 @@ Validation script for TiltCheck agent registration code
 
 This script validates that the registration code is properly structured
 without requiring uagents_core to be installed.
+
+Each Python file is read and parsed once, and a single visitor pass
+collects everything the checks need: imports, function definitions,
+calls with their constant arguments, and string constants. What is checked
+comes from a declarative manifest (DEFAULT_MANIFEST, or a JSON file given
+with --manifest), and files are validated in parallel worker processes:
+
+    {
+        "python": {
+            "register_agent.py": {
+                "imports": ["os", "uagents_core"],
+                "functions": ["main"],
+                "calls": {"register_chat_agent": ["TiltCheck", "https://tiltcheck.it.com/agent"]},
+                "strings": ["AGENTVERSE_KEY"]
+            },
+            "agents/*.py": {"imports": ["os"]}
+        },
+        "text": {".env.example": ["AGENTVERSE_KEY"]},
+        "requirements": {"requirements.txt": ["uagents_core"]}
+    }
+
+Python file keys may be glob patterns, so one entry can cover every agent
+variant. A pattern that matches no file fails. Requirements are matched by
+normalized package name (PEP 503), so "uagents" is not satisfied by
+"uagents_core>=0.1".
+
+Usage:
+    python validate_registration_code.py [--manifest checks.json] [--jobs 4]
 """
 
+import argparse
 import ast
+import glob
+import json
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
+REQUIREMENT_NAME = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?")
 
-def validate_python_syntax(filepath):
-    """Validate Python syntax by parsing the file"""
-    print(f"\nValidating Python syntax: {filepath}")
+# The checks this script has always run on the TiltCheck registration code
+DEFAULT_MANIFEST = {
+    "python": {
+        "register_agent.py": {
+            "imports": ["os", "logging", "uagents_core"],
+            "functions": ["register_tiltcheck_agent", "main"],
+            "calls": {"register_chat_agent": ["TiltCheck", "https://tiltcheck.it.com/agent"]},
+            "strings": ["AGENTVERSE_KEY", "AGENT_SEED_PHRASE"],
+        },
+        "agent.py": {
+            "imports": ["os"],
+        },
+    },
+    "text": {".env.example": ["AGENTVERSE_KEY", "AGENT_SEED_PHRASE"]},
+    "requirements": {"requirements.txt": ["uagents_core"]},
+}
+
+
+class CheckResult(NamedTuple):
+    """Outcome of one check, with the lines to print for it."""
+    name: str
+    passed: bool
+    lines: List[str]
+
+
+class FileScan:
+    """Everything the checks need from one Python file, collected in one pass."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.error: Optional[str] = None
+        self.imports: Set[str] = set()
+        self.functions: Set[str] = set()
+        self.calls: Dict[str, List[List]] = {}
+        self.strings: Set[str] = set()
+
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=filepath)
+        except SyntaxError as e:
+            self.error = f"Syntax error: {e}"
+            return
+        except Exception as e:
+            self.error = f"Error: {e}"
+            return
+        _Collector(self).visit(tree)
+
+    def has_import(self, required: str) -> bool:
+        """Exact module or a submodule of it."""
+        return any(imp == required or imp.startswith(required + '.') for imp in self.imports)
+
+    def has_call(self, name: str, args: List) -> bool:
+        """Some call to `name` starts with the given constant positional arguments."""
+        return any(call[:len(args)] == args for call in self.calls.get(name, []))
+
+
+class _Collector(ast.NodeVisitor):
+    def __init__(self, scan: FileScan):
+        self.scan = scan
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.scan.imports.add(alias.name)
+
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.scan.imports.add(node.module)
+
+    def visit_FunctionDef(self, node):
+        self.scan.functions.add(node.name)
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node):
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name:
+            args = [arg.value if isinstance(arg, ast.Constant) else None for arg in node.args]
+            self.scan.calls.setdefault(name, []).append(args)
+        self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str):
+            self.scan.strings.add(node.value)
+
+
+def _mark(found: bool) -> str:
+    return "✅" if found else "❌"
+
+
+def check_python_file(filepath: str, spec: Dict) -> List[CheckResult]:
+    """Run every check in `spec` on one file, parsing it once."""
+    scan = FileScan(filepath)
+    results = [CheckResult(
+        f"{filepath} syntax",
+        scan.error is None,
+        [f"\nValidating Python syntax: {filepath}",
+         "✅ Valid Python syntax" if scan.error is None else f"❌ {scan.error}"],
+    )]
+    if scan.error is not None:
+        return results
+
+    if "imports" in spec:
+        found = [(imp, scan.has_import(imp)) for imp in spec["imports"]]
+        results.append(CheckResult(
+            f"{filepath} imports", all(ok for _, ok in found),
+            [f"\nChecking imports in: {filepath}"] +
+            [f"  {_mark(ok)} {'Found' if ok else 'Missing'} import: {imp}" for imp, ok in found],
+        ))
+
+    if "functions" in spec:
+        found = [(name, name in scan.functions) for name in spec["functions"]]
+        results.append(CheckResult(
+            f"{filepath} functions", all(ok for _, ok in found),
+            [f"\nChecking function definitions in: {filepath}"] +
+            [f"  {_mark(ok)} {'Found' if ok else 'Missing'} function: {name}" for name, ok in found],
+        ))
+
+    for call, args in spec.get("calls", {}).items():
+        called = call in scan.calls
+        with_args = scan.has_call(call, list(args))
+        lines = [f"\nChecking {call} call in: {filepath}",
+                 f"  {_mark(called)} {'Found' if called else 'Missing'} {call} call"]
+        if called:
+            shown = ", ".join(repr(arg) for arg in args)
+            lines.append(f"  {_mark(with_args)} {'Called' if with_args else 'Not called'} with ({shown})")
+        results.append(CheckResult(f"{call} call", called and with_args, lines))
+
+    if "strings" in spec:
+        found = [(text, text in scan.strings) for text in spec["strings"]]
+        results.append(CheckResult(
+            f"{filepath} references", all(ok for _, ok in found),
+            [f"\nChecking references in: {filepath}"] +
+            [f"  {_mark(ok)} {'Uses' if ok else 'Missing'} {text}" for text, ok in found],
+        ))
+    return results
+
+
+def check_text_file(filepath: str, required: List[str]) -> CheckResult:
+    """Check that a text file mentions every required string."""
+    lines = [f"\nChecking {filepath} file"]
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            code = f.read()
-        ast.parse(code)
-        print(f"✅ Valid Python syntax")
-        return True
-    except SyntaxError as e:
-        print(f"❌ Syntax error: {e}")
-        return False
+            content = f.read()
     except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+        return CheckResult(filepath, False, lines + [f"❌ Error checking {filepath}: {e}"])
+    found = [(text, text in content) for text in required]
+    lines += [f"  {_mark(ok)} {'Found' if ok else 'Missing'} {text} in {filepath}" for text, ok in found]
+    return CheckResult(filepath, all(ok for _, ok in found), lines)
 
 
-def check_imports_in_file(filepath, required_imports):
-    """Check that required imports are present in the file"""
-    print(f"\nChecking imports in: {filepath}")
+def normalize_package(name: str) -> str:
+    """PEP 503 normalized package name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirement_name(line: str) -> Optional[str]:
+    """Normalized package name of a requirements line (None for comments, options and blanks)."""
+    line = line.split('#', 1)[0].strip()
+    if not line or line.startswith('-'):
+        return None
+    match = REQUIREMENT_NAME.match(line)
+    return normalize_package(match.group(0)) if match else None
+
+
+def check_requirements_file(filepath: str, packages: List[str]) -> CheckResult:
+    """Check that a requirements file lists every package (by exact package name)."""
+    lines = [f"\nChecking {filepath}"]
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        tree = ast.parse(code)
-        found_imports = set()
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    found_imports.add(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    found_imports.add(node.module)
-        
-        all_found = True
-        for required in required_imports:
-            # Check for exact match or if it's a parent module of an import
-            found = (required in found_imports or 
-                    any(imp == required or imp.startswith(required + '.') for imp in found_imports))
-            if found:
-                print(f"  ✅ Found import: {required}")
-            else:
-                print(f"  ❌ Missing import: {required}")
-                all_found = False
-        
-        return all_found
+            names = {requirement_name(line) for line in f}
     except Exception as e:
-        print(f"❌ Error checking imports: {e}")
-        return False
+        return CheckResult(filepath, False, lines + [f"❌ Error checking {filepath}: {e}"])
+    found = [(package, normalize_package(package) in names) for package in packages]
+    lines += [f"  {_mark(ok)} {'Found' if ok else 'Missing'} {package} in {filepath}" for package, ok in found]
+    return CheckResult(filepath, all(ok for _, ok in found), lines)
+
+
+def expand_python_specs(manifest: Dict) -> Tuple[List[tuple], List[CheckResult]]:
+    """
+    Expand glob patterns in the manifest's Python file keys.
+
+    Returns:
+        (filepath, spec) pairs in manifest order, and a failed check for
+        every pattern that matched no file
+    """
+    pairs, unmatched = [], []
+    for pattern, spec in manifest.get("python", {}).items():
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            unmatched.append(CheckResult(pattern, False, [f"\nChecking {pattern}",
+                                                          f"❌ No files match {pattern}"]))
+        pairs.extend((filepath, spec) for filepath in matches)
+    return pairs, unmatched
+
+
+def run_validation(manifest: Dict, jobs: Optional[int] = None) -> List[CheckResult]:
+    """
+    Run every check in a manifest.
+
+    Args:
+        manifest: Declarative checks (see DEFAULT_MANIFEST)
+        jobs: Worker processes for Python files (None = CPU count, 1 = inline)
+
+    Returns:
+        Check results in manifest order
+    """
+    pairs, unmatched = expand_python_specs(manifest)
+    jobs = (os.cpu_count() or 1) if jobs is None else jobs
+    if jobs > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(min(jobs, len(pairs))) as executor:
+            per_file = list(executor.map(check_python_file, *zip(*pairs)))
+    else:
+        per_file = [check_python_file(filepath, spec) for filepath, spec in pairs]
+
+    results = unmatched + [result for file_results in per_file for result in file_results]
+    results += [check_text_file(path, required) for path, required in manifest.get("text", {}).items()]
+    results += [check_requirements_file(path, packages)
+                for path, packages in manifest.get("requirements", {}).items()]
+    return results
+
+
+def _run_single(result: CheckResult) -> bool:
+    print("\n".join(result.lines))
+    return result.passed
+
+
+def validate_python_syntax(filepath):
+    """Validate Python syntax by parsing the file"""
+    return _run_single(check_python_file(filepath, {})[0])
+
+
+def check_imports_in_file(filepath, required_imports):
+    """Check that required imports are present in the file"""
+    results = check_python_file(filepath, {"imports": required_imports})
+    return _run_single(results[-1])
 
 
 def check_function_definitions(filepath, required_functions):
     """Check that required functions are defined in the file"""
-    print(f"\nChecking function definitions in: {filepath}")
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        tree = ast.parse(code)
-        found_functions = set()
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                found_functions.add(node.name)
-        
-        all_found = True
-        for required in required_functions:
-            if required in found_functions:
-                print(f"  ✅ Found function: {required}")
-            else:
-                print(f"  ❌ Missing function: {required}")
-                all_found = False
-        
-        return all_found
-    except Exception as e:
-        print(f"❌ Error checking functions: {e}")
-        return False
+    results = check_python_file(filepath, {"functions": required_functions})
+    return _run_single(results[-1])
 
 
 def check_registration_call(filepath):
     """Check that register_chat_agent is called with correct parameters"""
-    print(f"\nChecking register_chat_agent call in: {filepath}")
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        # Check for the expected call pattern
-        if 'register_chat_agent(' in code:
-            print(f"  ✅ Found register_chat_agent call")
-        else:
-            print(f"  ❌ Missing register_chat_agent call")
-            return False
-        
-        if '"TiltCheck"' in code or "'TiltCheck'" in code:
-            print(f"  ✅ Found agent name: TiltCheck")
-        else:
-            print(f"  ❌ Missing agent name")
-            return False
-        
-        if 'https://tiltcheck.it.com/agent' in code:
-            print(f"  ✅ Found correct endpoint: https://tiltcheck.it.com/agent")
-        else:
-            print(f"  ❌ Missing or incorrect endpoint")
-            return False
-        
-        if 'AGENTVERSE_KEY' in code:
-            print(f"  ✅ Uses AGENTVERSE_KEY environment variable")
-        else:
-            print(f"  ❌ Missing AGENTVERSE_KEY reference")
-            return False
-        
-        if 'AGENT_SEED_PHRASE' in code:
-            print(f"  ✅ Uses AGENT_SEED_PHRASE environment variable")
-        else:
-            print(f"  ❌ Missing AGENT_SEED_PHRASE reference")
-            return False
-        
-        return True
-    except Exception as e:
-        print(f"❌ Error checking registration call: {e}")
-        return False
+    spec = DEFAULT_MANIFEST["python"]["register_agent.py"]
+    results = check_python_file(filepath, {"calls": spec["calls"], "strings": spec["strings"]})
+    if len(results) == 1:
+        return _run_single(results[0])
+    return all([_run_single(result) for result in results[1:]])
 
 
 def check_env_example():
     """Check that .env.example has the required variables"""
-    print(f"\nChecking .env.example file")
-    try:
-        with open('.env.example', 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        if 'AGENTVERSE_KEY' in content:
-            print(f"  ✅ Found AGENTVERSE_KEY in .env.example")
-        else:
-            print(f"  ❌ Missing AGENTVERSE_KEY in .env.example")
-            return False
-        
-        if 'AGENT_SEED_PHRASE' in content:
-            print(f"  ✅ Found AGENT_SEED_PHRASE in .env.example")
-        else:
-            print(f"  ❌ Missing AGENT_SEED_PHRASE in .env.example")
-            return False
-        
-        return True
-    except Exception as e:
-        print(f"❌ Error checking .env.example: {e}")
-        return False
+    return _run_single(check_text_file('.env.example', DEFAULT_MANIFEST["text"][".env.example"]))
 
 
 def check_requirements():
     """Check that requirements.txt has the required packages"""
-    print(f"\nChecking requirements.txt")
-    try:
-        with open('requirements.txt', 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Check if uagents_core appears as a package name (not just a substring)
-        found = False
-        for line in lines:
-            line = line.strip()
-            # Skip comments and empty lines
-            if line.startswith('#') or not line:
-                continue
-            # Check if line starts with uagents_core (as package name)
-            if line.startswith('uagents_core'):
-                found = True
-                break
-        
-        if found:
-            print(f"  ✅ Found uagents_core in requirements.txt")
-        else:
-            print(f"  ❌ Missing uagents_core in requirements.txt")
-            return False
-        
-        return True
-    except Exception as e:
-        print(f"❌ Error checking requirements.txt: {e}")
-        return False
+    return _run_single(check_requirements_file(
+        'requirements.txt', DEFAULT_MANIFEST["requirements"]["requirements.txt"]))
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Run all validation checks"""
+    parser = argparse.ArgumentParser(description="Validate TiltCheck agent registration code")
+    parser.add_argument("--manifest", help="JSON manifest of checks (default: the built-in checks)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    manifest = DEFAULT_MANIFEST
+    if args.manifest:
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
     print("=" * 70)
     print(" TiltCheck Agent Registration - Code Validation ")
     print("=" * 70)
-    
-    results = []
-    
-    # Test 1: Validate register_agent.py syntax
-    results.append(("register_agent.py syntax", validate_python_syntax("register_agent.py")))
-    
-    # Test 2: Check imports in register_agent.py
-    results.append(("register_agent.py imports", check_imports_in_file(
-        "register_agent.py",
-        ["os", "logging", "uagents_core"]
-    )))
-    
-    # Test 3: Check function definitions in register_agent.py
-    results.append(("register_agent.py functions", check_function_definitions(
-        "register_agent.py",
-        ["register_tiltcheck_agent", "main"]
-    )))
-    
-    # Test 4: Check registration call
-    results.append(("register_chat_agent call", check_registration_call("register_agent.py")))
-    
-    # Test 5: Validate agent.py syntax
-    results.append(("agent.py syntax", validate_python_syntax("agent.py")))
-    
-    # Test 6: Check agent.py imports os
-    results.append(("agent.py imports", check_imports_in_file(
-        "agent.py",
-        ["os"]
-    )))
-    
-    # Test 7: Check .env.example
-    results.append((".env.example", check_env_example()))
-    
-    # Test 8: Check requirements.txt
-    results.append(("requirements.txt", check_requirements()))
-    
+
+    results = run_validation(manifest, args.jobs)
+    for result in results:
+        print("\n".join(result.lines))
+
     # Print summary
     print("\n" + "=" * 70)
     print(" Validation Summary ")
     print("=" * 70)
-    
-    passed = sum(1 for _, result in results if result)
+
+    passed = sum(1 for result in results if result.passed)
     total = len(results)
-    
-    for test_name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status}: {test_name}")
-    
+
+    for result in results:
+        status = "✅ PASS" if result.passed else "❌ FAIL"
+        print(f"{status}: {result.name}")
+
     print("=" * 70)
     print(f"Results: {passed}/{total} checks passed")
     print("=" * 70)
-    
+
     if passed == total:
         print("\n🎉 All validation checks passed!")
         print("\nThe registration code is properly structured and ready to use.")